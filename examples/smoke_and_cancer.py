@@ -37,32 +37,13 @@ q1 = variable('q1', constants=tuple(g1.values()))
 p2 = variable('p2', constants=tuple(g2.values()))
 q2 = variable('q2', constants=tuple(g2.values()))
 
-for (x, y) in friends:
-    FOL.tell(Friends(g[x], g[y]))
+FOL.tell_many(Friends(g[x], g[y]) for (x, y) in friends)
+FOL.tell_many(Not(Friends(g[x], g[y])) for group in (g1, g2) for x in group for y in group
+              if (x, y) not in friends and x < y)
 
-for x in g1:
-    for y in g1:
-        if (x, y) not in friends and x < y:
-            FOL.tell(Not(Friends(g[x], g[y])))
+FOL.tell_many(Smokes(g[x]) if x in smokes else Not(Smokes(g[x])) for x in g)
+FOL.tell_many(Cancer(g[x]) if x in cancer else Not(Cancer(g[x])) for x in g1)
 
-for x in g2:
-    for y in g2:
-        if (x, y) not in friends and x < y:
-            FOL.tell(Not(Friends(g[x], g[y])))
-
-for x in smokes:
-    FOL.tell(Smokes(g[x]))
-
-for x in g:
-    if x not in smokes:
-        FOL.tell(Not(Smokes(g[x])))
-
-for x in cancer:
-    FOL.tell(Cancer(g[x]))
-
-for x in g1:
-    if x not in cancer:
-        FOL.tell(Cancer(g[x]).negated())
 FOL.tell(Forall(p, Not(Friends(p, p))))
 
 FOL.tell(Forall((p, q), Friends(p, q) == Friends(q, p)))
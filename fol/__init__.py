@@ -0,0 +1,21 @@
+"""
+:Author: Theodor A. Dumitrescu
+:Date: Oct 18, 2026
+:Version: 0.0.1
+"""
+import importlib
+
+# NOTE(thadumi): `import fol` loads nothing else, the submodules are imported when first accessed (PEP 562) so the
+# short lived scripts pay only for what they use
+_SUBMODULES = ('axiom_store', 'backend', 'cache', 'constant', 'fol_status', 'knowledge_base', 'loaders', 'logic',
+               'predicate', 'service', 'snapshot', 'variable')
+
+
+def __getattr__(name: str):
+    if name in _SUBMODULES:
+        return importlib.import_module('{}.{}'.format(__name__, name))
+    raise AttributeError('module {} has no attribute {}'.format(__name__, name))
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_SUBMODULES))
@@ -0,0 +1,404 @@
+"""
+:Author: Theodor A. Dumitrescu
+:Date: Oct 18, 2026
+:Version: 0.0.1
+"""
+from __future__ import annotations
+
+import logging
+import threading
+from itertools import chain
+from typing import Dict, List, Optional, Set, Tuple, Iterator, Union, Iterable, TYPE_CHECKING
+
+from fol.logic import Logic, LogicalConstant, NotLogicalExpression
+from fol.predicate import LogicalPredicate, Predicate
+
+if TYPE_CHECKING:
+    from fol.backend.truth import TruthTensor
+
+
+class ConstantIndex(object):
+    """
+    Interned bijection between the constants and the dense ids indexing the truth tensors of the predicates.
+    The ids are never reassigned, so the index is shared by the snapshots of a store: the lookups take no lock, only
+    the assignment of a new id does.
+    """
+
+    def __init__(self):
+        self._ids: Dict[LogicalConstant, int] = {}
+        self._constants: List[LogicalConstant] = []
+        self._lock = threading.Lock()
+
+    def id(self, constant: LogicalConstant) -> int:
+        """
+        :return: the id of the constant, a new one is assigned if the constant has never been seen
+        """
+        index = self._ids.get(constant)
+        if index is None:
+            with self._lock:
+                index = self._ids.get(constant)
+                if index is None:
+                    self._constants.append(constant)
+                    index = self._ids[constant] = len(self._constants) - 1
+
+        return index
+
+    def ids(self, constants: Iterable[LogicalConstant]) -> List[int]:
+        return [self.id(constant) for constant in constants]
+
+    def constant(self, index: int) -> LogicalConstant:
+        return self._constants[index]
+
+    def __contains__(self, constant: LogicalConstant) -> bool:
+        return constant in self._ids
+
+    def __len__(self):
+        return len(self._constants)
+
+
+def as_ground_literal(lc: Logic) -> Optional[Tuple[LogicalPredicate, bool]]:
+    """
+    :return: the atom and the polarity of `lc` if it is a ground literal (a predicate over constants, possibly
+             negated), None otherwise
+    """
+    polarity = True
+    if type(lc) is NotLogicalExpression:
+        lc = lc.arg
+        polarity = False
+
+    # noinspection PyProtectedMember
+    if type(lc) is LogicalPredicate and all(type(arg) is LogicalConstant for arg in lc._args):
+        return lc, polarity
+
+    return None
+
+
+def predicates_of(lc: Logic) -> Set[Predicate]:
+    """
+    :return: the predicates occurring in the formula
+    """
+    found = set()
+    visited = set()
+    stack = [lc]
+
+    while stack:
+        node = stack.pop()
+        if id(node) in visited:
+            continue
+        visited.add(id(node))
+
+        if type(node) is LogicalPredicate:
+            found.add(node.predicate)
+        else:
+            # noinspection PyProtectedMember
+            stack.extend(getattr(node, '_args', ()))
+
+    return found
+
+
+class AxiomStore(object):
+    """
+    The axioms of the knowledge base, in the order they have been told, indexed for the common queries:
+        - duplicates are rejected in O(1) since the formulas are hash-consed
+        - the truth of a ground atom is known in O(1), indexing the ground literals by predicate symbol and
+          tuple of constants, the value being the polarity
+        - the axioms mentioning a given predicate are available without scanning every axiom
+    The ground literals of the predicates backed by a truth tensor (see `Predicate.use_storage`) are written in the
+    tensor only, without keeping their formula.
+    The store can be used as a source of facts for `fol.backend.grounding.simplify`.
+    A snapshot of the store (see `snapshot`) is a read-only copy taken in O(1): the containers are shared until the
+    store is written again.
+    """
+
+    def __init__(self, constants: ConstantIndex = None):
+        self.constants: ConstantIndex = constants if constants is not None else ConstantIndex()
+        self.read_only: bool = False
+
+        self._axioms: List[Logic] = []
+        self._known: Set[Logic] = set()
+        self._literals: Dict[Predicate, Dict[Tuple[LogicalConstant, ...], bool]] = {}
+        self._by_predicate: Dict[Predicate, List[Logic]] = {}
+        self._tabled: Dict[Predicate, None] = {}  # predicates having facts in their truth tensor, in order
+        self._tables: Dict[Predicate, TruthTensor] = {}  # the truth tensors of a snapshot, see table
+        self._shared: bool = False  # the containers are shared with a snapshot
+
+    def table(self, predicate: Predicate) -> Optional[TruthTensor]:
+        """
+        :return: the truth tensor of the predicate as seen by the store (the one at the time of the snapshot for a
+                 snapshot), None if it has none
+        """
+        table = self._tables.get(predicate)
+        return table if table is not None else predicate.truth_table
+
+    def snapshot(self) -> AxiomStore:
+        """
+        :return: a read-only copy of the store, not affected by its later writes
+        """
+        view = AxiomStore.__new__(AxiomStore)
+        view.__dict__.update(self.__dict__)
+        view.read_only = True
+        view._tables = {predicate: self.table(predicate).snapshot() for predicate in self._tabled}
+        self._shared = True
+        return view
+
+    def _own(self):
+        """
+        Copies the containers shared with a snapshot before writing them.
+        """
+        if self.read_only:
+            raise ValueError('The snapshot of a knowledge base is read only')
+        if not self._shared:
+            return
+
+        self._axioms = list(self._axioms)
+        self._known = set(self._known)
+        self._literals = {predicate: dict(facts) for predicate, facts in self._literals.items()}
+        self._by_predicate = {predicate: list(axioms) for predicate, axioms in self._by_predicate.items()}
+        self._tabled = dict(self._tabled)
+        self._shared = False
+
+    def _mark_tabled(self, predicate: Predicate):
+        if predicate not in self._tabled:
+            self._own()
+            self._tabled[predicate] = None
+
+    def append(self, lc: Logic) -> bool:
+        """
+        :return: False if the axiom was already known (and has not been added)
+        """
+        if lc in self._known:
+            return False
+
+        literal = as_ground_literal(lc)
+        table = self.table(literal[0].predicate) if literal is not None else None
+        if table is not None:
+            atom, polarity = literal
+            # noinspection PyProtectedMember
+            ids = self.constants.ids(atom._args)
+            known = table.value(*ids)
+            if known == int(polarity):
+                return False
+            if known < 0:
+                self._own()
+                table.set([ids], polarity)
+                self._mark_tabled(atom.predicate)
+                return True
+            # a contradiction is kept as a formula so it reaches the solver
+            logging.warning('[axioms] `{}` contradicts an already known fact'.format(lc))
+
+        self._add_formula(lc, literal)
+        return True
+
+    def append_formula(self, lc: Logic) -> bool:
+        """
+        Appends the axiom as a formula, even a ground literal of a predicate backed by a truth tensor (e.g. a fact
+        contradicting the tensor, restored from a snapshot).
+        :return: False if the axiom was already known (and has not been added)
+        """
+        if lc in self._known:
+            return False
+
+        self._add_formula(lc, as_ground_literal(lc))
+        return True
+
+    def _add_formula(self, lc: Logic, literal: Optional[Tuple[LogicalPredicate, bool]]):
+        """
+        Keeps the axiom as a formula, without writing it in a truth tensor.
+        """
+        self._own()
+        self._known.add(lc)
+        self._axioms.append(lc)
+
+        if literal is not None:
+            atom, polarity = literal
+            # noinspection PyProtectedMember
+            facts = self._literals.setdefault(atom.predicate, {})
+            known = facts.setdefault(atom._args, polarity)
+            if known is not polarity:
+                logging.warning('[axioms] `{}` contradicts an already known fact'.format(lc))
+
+        for predicate in predicates_of(lc):
+            self._by_predicate.setdefault(predicate, []).append(lc)
+
+    def append_facts(self, predicate: Predicate, ids, values) -> int:
+        """
+        Bulk `append` of ground literals of a predicate, written straight into its truth tensor (a sparse one is
+        created if the predicate has none) without building their formulas.
+        The facts already known are skipped, the ones contradicting a known fact (or a previous row of the batch)
+        are kept as formulas as `append` does.
+        :param ids: array of shape (n, arity) of constant ids, see `constants`
+        :param values: the polarity of every literal, or a single one for all of them
+        :return: the number of added facts
+        """
+        import numpy as np
+
+        self._own()
+        table = self.table(predicate) if self.table(predicate) is not None else predicate.use_storage('sparse')
+        ids = np.asarray(ids, dtype=np.int64).reshape(-1, predicate.number_of_arguments)
+        values = np.broadcast_to(np.asarray(values, dtype=bool), (len(ids),))
+        if not len(ids):
+            return 0
+
+        keys = table.pack(ids)
+        unique, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+        inverse = inverse.reshape(-1)
+
+        # the reference value of an atom is the known one or the one of its first row in the batch
+        known = table.get(ids[first])
+        told = self._literals.get(predicate)
+        if told:
+            told_keys = table.pack(np.array([self.constants.ids(args) for args in told], dtype=np.int64))
+            positions = np.searchsorted(unique, told_keys).clip(0, len(unique) - 1)
+            found = unique[positions] == told_keys
+            known[positions[found]] = np.fromiter(told.values(), dtype=np.int8, count=len(told))[found]
+
+        new = known < 0
+        reference = np.where(new, values[first], known == 1)
+
+        table.set(ids[first[new]], reference[new])
+        if new.any():
+            self._mark_tabled(predicate)
+        added = int(np.count_nonzero(new))
+
+        for row in np.flatnonzero(values != reference[inverse]).tolist():
+            atom = predicate(*map(self.constants.constant, ids[row].tolist()))
+            added += self.append(atom if values[row] else NotLogicalExpression(atom))
+
+        return added
+
+    def restore_facts(self, predicate: Predicate, storage: str, arrays: Dict, changes: bool = False) -> TruthTensor:
+        """
+        Writes into the truth tensor of the predicate facts saved by `TruthTensor.arrays` (or the changes of its
+        journal), e.g. read from a snapshot. Unlike `append_facts` the saved values win over the known ones.
+        An empty tensor adopts the saved arrays without copying them.
+        :param storage: the storage of the saved tensor, the predicate is moved to it (see `Predicate.use_storage`)
+        :param arrays: the arrays of `TruthTensor.arrays`, or the packed `keys` and the `values` of the changes
+        :param changes: the arrays are changes of the journal
+        :return: the truth tensor of the predicate
+        """
+        from fol.backend.truth import TruthTensor
+
+        self._own()
+        table = predicate.use_storage(storage)
+        if changes:
+            table.set(table.unpack(arrays['keys']), arrays['values'])
+        elif not table.journal_size:
+            table.restore(**arrays)
+        else:  # merged with the facts already known
+            stored = TruthTensor(predicate.number_of_arguments, storage)
+            stored.restore(**arrays)
+            table.set(*stored.known())
+
+        if table.journal_size:
+            self._mark_tabled(predicate)
+        return table
+
+    def get(self, atom: Logic, default: Optional[bool] = None) -> Optional[bool]:
+        """
+        :return: the truth value of a ground atom if told, `default` otherwise
+        """
+        if type(atom) is not LogicalPredicate:
+            return default
+
+        if atom.predicate in self._tabled:
+            # noinspection PyProtectedMember
+            value = self.table(atom.predicate).value(*self.constants.ids(atom._args))
+            if value >= 0:
+                return bool(value)
+
+        # noinspection PyProtectedMember
+        return self._literals.get(atom.predicate, {}).get(atom._args, default)
+
+    def truth_values(self, predicate: Predicate, ids):
+        """
+        Vectorized lookup of the facts stored in the truth tensor of a predicate.
+        :param ids: array of shape (n, arity) of constant ids, see `constants`
+        :return: int8 array of TRUE_VALUE (1), FALSE_VALUE (0), UNKNOWN_VALUE (-1), see fol.backend.truth
+        """
+        table = self.table(predicate)
+        if table is None:
+            raise ValueError('The predicate {} has no truth tensor'.format(predicate.name))
+
+        return table.get(ids)
+
+    def tabled_predicates(self) -> List[Predicate]:
+        """
+        :return: the predicates having facts stored in their truth tensor
+        """
+        return list(self._tabled)
+
+    def fact_predicates(self) -> List[Predicate]:
+        """
+        :return: the predicates having ground literals, told as formulas or stored in their truth tensor
+        """
+        return list(dict.fromkeys(chain(self._literals, self._tabled)))
+
+    def facts(self, predicate: Predicate, polarity: Optional[bool] = None) -> Iterator[Tuple[LogicalPredicate, bool]]:
+        """
+        :return: the ground literals of the predicate as (atom, polarity), optionally only the ones with the given
+                 polarity
+        """
+        for args, value in self._literals.get(predicate, {}).items():
+            if polarity is None or polarity is value:
+                yield predicate(*args), value
+
+        if predicate in self._tabled:
+            for ids, value in self.table(predicate).items():
+                if polarity is None or polarity is value:
+                    yield predicate(*map(self.constants.constant, ids)), value
+
+    def fact_ids(self, predicate: Predicate, polarity: bool = True):
+        """
+        :return: the constant ids (array of shape (n, arity)) of the ground literals of the predicate having the
+                 given polarity, without building their formulas
+        """
+        import numpy as np
+
+        arity = predicate.number_of_arguments
+        told = [self.constants.ids(args) for args, value in self._literals.get(predicate, {}).items()
+                if value is polarity]
+        ids = np.array(told, dtype=np.int64).reshape(-1, arity)
+
+        if predicate in self._tabled:
+            tabled, values = self.table(predicate).known()
+            ids = np.concatenate([ids, tabled[values == int(polarity)]])
+
+        return ids
+
+    def mentioning(self, predicate: Predicate) -> List[Logic]:
+        """
+        :return: the axioms (ground literals included) where the predicate occurs
+        """
+        return list(self._by_predicate.get(predicate, ()))
+
+    def clear(self):
+        if self.read_only:
+            raise ValueError('The snapshot of a knowledge base is read only')
+
+        for predicate in self._tabled:
+            predicate.truth_table.clear()
+        self._axioms = []
+        self._known = set()
+        self._literals = {}
+        self._by_predicate = {}
+        self._tabled = {}
+        self._shared = False
+
+    def __contains__(self, lc: Logic) -> bool:
+        if lc in self._known:
+            return True
+
+        literal = as_ground_literal(lc)
+        if literal is not None and literal[0].predicate in self._tabled:
+            return self.get(literal[0]) is literal[1]
+
+        return False
+
+    def __getitem__(self, item: Union[int, slice]):
+        return self._axioms[item]
+
+    def __iter__(self) -> Iterator[Logic]:
+        return iter(self._axioms)
+
+    def __len__(self):
+        return len(self._axioms)
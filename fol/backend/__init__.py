@@ -4,5 +4,71 @@
 :Version: 0.0.1
 """
 
+import importlib
 import logging
-import tensorflow as tf
\ No newline at end of file
+import os
+from typing import Dict
+
+from fol.logic import Logic
+
+# the numeric backends evaluating the degree of truth of the formulas, by name, imported when first used.
+# A backend module exposes `satisfaction(lc, store=None, **semantics) -> float`
+BACKENDS: Dict[str, str] = {
+    'numpy': 'fol.backend.fuzzy',
+}
+
+# NOTE(thadumi): importing this package must stay cheap, the engines (numpy evaluators, SAT solver, ...) are loaded
+# only when first used: either through `get_backend` or as attributes of this package, see __getattr__
+_ENGINES = ('chaining', 'cnf', 'fuzzy', 'grounding', 'lifted', 'parallel', 'resolution', 'sat', 'tape', 'truth',
+            'vectorized', 'wmc')
+
+_backend: str = os.environ.get('FOL_BACKEND', 'numpy')
+
+
+def __getattr__(name: str):
+    # PEP 562: `fol.backend.sat` imports the module the first time it is accessed
+    if name in _ENGINES:
+        return importlib.import_module('{}.{}'.format(__name__, name))
+    raise AttributeError('module {} has no attribute {}'.format(__name__, name))
+
+
+def register_backend(name: str, module: str):
+    """
+    Makes a backend available to `use_backend` without importing it.
+    :param name: the name of the backend
+    :param module: the dotted path of its module, imported when the backend is first used
+    """
+    BACKENDS[name] = module
+
+
+def use_backend(name: str):
+    """
+    Selects the backend used by `satisfaction`, the default one can also be chosen with the FOL_BACKEND
+    environment variable.
+    """
+    global _backend
+
+    if name not in BACKENDS:
+        msg = '[backend] Unknown backend `{}`, expected one of {}'.format(name, tuple(BACKENDS))
+        logging.error(msg)
+
+        raise ValueError(msg)
+
+    _backend = name
+
+
+def get_backend():
+    """
+    :return: the module of the selected backend
+    """
+    if _backend not in BACKENDS:
+        raise ValueError('[backend] Unknown backend `{}`, expected one of {}'.format(_backend, tuple(BACKENDS)))
+
+    return importlib.import_module(BACKENDS[_backend])
+
+
+def satisfaction(lc: Logic, store=None, **semantics) -> float:
+    """
+    :return: the degree of truth of a closed formula computed by the selected backend
+    """
+    return get_backend().satisfaction(lc, store, **semantics)
@@ -0,0 +1,429 @@
+"""
+:Author: Theodor A. Dumitrescu
+:Date: Oct 18, 2026
+:Version: 0.0.1
+"""
+from itertools import product
+from operator import itemgetter
+from typing import Callable, Dict, FrozenSet, Iterable, Iterator, List, Optional, Sequence, Set, Tuple, Union
+
+from fol.axiom_store import AxiomStore, as_ground_literal
+from fol.logic import Logic, LogicalConstant, LogicalVariable, AndLogicalExpression, ImplicationLogicalExpression, \
+    UniversalQuantifier, TRUE
+from fol.predicate import LogicalPredicate, Predicate
+
+# the ids of the constants of a ground atom
+Ids = Tuple[int, ...]
+# an argument of an atom of a compiled rule: the id of a constant or a variable
+Term = Union[int, LogicalVariable]
+
+
+class HornRule(object):
+    """
+    A definite clause ∀ variables: body_1 ∧ ... ∧ body_n → head, where the body (possibly empty) and the head are
+    atoms whose arguments are constants or variables of the rule.
+    """
+
+    def __init__(self,
+                 variables: Tuple[LogicalVariable, ...],
+                 body: Tuple[LogicalPredicate, ...],
+                 head: LogicalPredicate):
+        self.variables: Tuple[LogicalVariable, ...] = variables
+        self.body: Tuple[LogicalPredicate, ...] = body
+        self.head: LogicalPredicate = head
+
+    def __str__(self):
+        body = ' ∧ '.join(map(str, self.body)) if self.body else '⊤'
+        return '∀ {}: {} → {}'.format(','.join(map(str, self.variables)), body, self.head)
+
+
+def _atoms(lc: Logic) -> Optional[List[LogicalPredicate]]:
+    """
+    :return: the atoms of `lc` if it is an atom, a conjunction of atoms or ⊤; None otherwise
+    """
+    if lc is TRUE:
+        return []
+
+    operands = lc.args if type(lc) is AndLogicalExpression else (lc,)
+    if all(type(operand) is LogicalPredicate for operand in operands):
+        return list(operands)
+    return None
+
+
+def horn_rules(lc: Logic) -> Optional[List[HornRule]]:
+    """
+    Recognizes the axioms of the shape ∀ x1 ... xn: body → head (or just ∀ x1 ... xn: head), where the body is an
+    atom or a conjunction of atoms and the head an atom or a conjunction of atoms, giving a rule per atom.
+    The variables of the head not occurring in the body range over their constants, so they have to be closed world.
+    :return: the rules equivalent to the axiom, None if it is not Horn
+    """
+    variables: List[LogicalVariable] = []
+    while type(lc) is UniversalQuantifier:
+        variables.extend(lc.variables)
+        lc = lc.proposition
+
+    body, heads = (lc.alpha, lc.beta) if type(lc) is ImplicationLogicalExpression else (TRUE, lc)
+    body, heads = _atoms(body), _atoms(heads)
+    if body is None or not heads:
+        return None
+
+    bound = set(variables)
+    # noinspection PyProtectedMember
+    for arg in (arg for atom in body + heads for arg in atom._args):
+        if type(arg) is LogicalVariable and arg not in bound or type(arg) not in (LogicalVariable, LogicalConstant):
+            return None
+
+    # noinspection PyProtectedMember
+    joined = {arg for atom in body for arg in atom._args}
+    # noinspection PyProtectedMember
+    if any(arg not in joined and type(arg) is LogicalVariable and not arg.is_closed_world
+           for head in heads for arg in head._args):
+        return None
+
+    variables = tuple(dict.fromkeys(variables))
+    return [HornRule(variables, tuple(body), head) for head in heads]
+
+
+def _getter(indexes: Sequence[int]) -> Callable[[Sequence[int]], Ids]:
+    """
+    :return: a function taking the items at the given indexes of a sequence, always as a tuple
+    """
+    if not indexes:
+        return lambda sequence: ()
+    if len(indexes) == 1:
+        index = indexes[0]
+        return lambda sequence: (sequence[index],)
+    return itemgetter(*indexes)
+
+
+class _Relation(object):
+    """
+    The true ground atoms of a predicate as tuples of constant ids, with a hash index for every combination of bound
+    argument positions looked up by the joins, built when first needed and kept up to date afterwards.
+    """
+
+    def __init__(self):
+        self.tuples: Set[Ids] = set()
+        self._indexes: Dict[Tuple[int, ...], Tuple[Callable, Dict[Ids, List[Ids]]]] = {}
+
+    def add(self, ids: Ids) -> bool:
+        """
+        :return: False if the atom was already known
+        """
+        if ids in self.tuples:
+            return False
+
+        self.tuples.add(ids)
+        for key, index in self._indexes.values():
+            index.setdefault(key(ids), []).append(ids)
+        return True
+
+    def lookup(self, positions: Tuple[int, ...], key: Ids) -> Iterable[Ids]:
+        """
+        :return: the atoms having the constants `key` at the argument `positions`
+        """
+        if not positions:
+            return self.tuples
+
+        entry = self._indexes.get(positions)
+        if entry is None:
+            getter, index = entry = self._indexes[positions] = _getter(positions), {}
+            for ids in self.tuples:
+                index.setdefault(getter(ids), []).append(ids)
+
+        return entry[1].get(key, ())
+
+
+class _Step(object):
+    """
+    The match of a body atom in a join plan: the rows of bound values are extended with the values of the variables
+    first bound by the atom.
+    """
+
+    def __init__(self,
+                 predicate: Predicate,
+                 positions: Tuple[int, ...],
+                 key: Callable,
+                 new: Callable,
+                 checks: List[Tuple[int, Optional[int], Optional[FrozenSet[int]]]],
+                 before_delta: bool):
+        self.predicate: Predicate = predicate
+        # the argument positions bound before the atom is matched and the function taking their values from a row
+        self.positions: Tuple[int, ...] = positions
+        self.key: Callable = key
+        # takes the values of the newly bound variables from a matching atom
+        self.new: Callable = new
+        # (position, position of the same variable or None, domain or None) to be checked on a matching atom
+        self.checks = checks
+        # whether the atom precedes the one matched against the delta
+        self.before_delta: bool = before_delta
+
+    def accepts(self, ids: Ids) -> bool:
+        for position, same, domain in self.checks:
+            if same is not None and ids[position] != ids[same]:
+                return False
+            if domain is not None and ids[position] not in domain:
+                return False
+        return True
+
+
+class _Plan(object):
+    """
+    The join of the body of a rule starting from a given atom (the one matched against the delta, if any) and then
+    following the body order. Which variables are bound by every step does not depend on the data, so the bound
+    values are kept in flat tuples (the rows) whose slots are assigned once: the constants of the rule first, then
+    the variables in order of binding.
+    """
+
+    def __init__(self, rule: '_CompiledRule', position: Optional[int]):
+        slots: Dict[Term, int] = {}
+        for _, terms in rule.body + [rule.head]:
+            for term in terms:
+                if type(term) is int and term not in slots:
+                    slots[term] = len(slots)
+        self.prefix: Ids = tuple(slots)
+
+        order = [position] if position is not None else []
+        order.extend(j for j in range(len(rule.body)) if j != position)
+
+        self.steps: List[_Step] = []
+        for j in order:
+            predicate, terms = rule.body[j]
+            positions, bound, new, checks = [], [], [], []
+            first: Dict[LogicalVariable, int] = {}
+            for i, term in enumerate(terms):
+                if term in slots:
+                    positions.append(i)
+                    bound.append(slots[term])
+                elif term in first:
+                    checks.append((i, first[term], None))
+                else:
+                    first[term] = i
+                    new.append(i)
+                    if rule.domains[term] is not None:
+                        checks.append((i, None, rule.domains[term]))
+            for var in first:
+                slots[var] = len(slots)
+
+            self.steps.append(_Step(predicate, tuple(positions), _getter(bound), _getter(new), checks,
+                                    position is not None and j < position))
+
+        # the variables of the head missing from the body range over their constants
+        self.unbound: List[List[int]] = []
+        for var, domain in rule.unbound:
+            slots[var] = len(slots)
+            self.unbound.append(domain)
+        self.head: Callable = _getter([slots[term] for term in rule.head[1]])
+
+
+class _CompiledRule(object):
+    """
+    A HornRule whose atoms have been lowered to (predicate, terms) over the constant ids of the store.
+    """
+
+    def __init__(self, rule: HornRule, store: AxiomStore):
+        def lower(atom: LogicalPredicate) -> Tuple[Predicate, Tuple[Term, ...]]:
+            # noinspection PyProtectedMember
+            return atom.predicate, tuple(arg if type(arg) is LogicalVariable else store.constants.id(arg)
+                                         for arg in atom._args)
+
+        self.rule: HornRule = rule
+        self.body: List[Tuple[Predicate, Tuple[Term, ...]]] = [lower(atom) for atom in rule.body]
+        self.head: Tuple[Predicate, Tuple[Term, ...]] = lower(rule.head)
+        # the ids of the constants of the closed world variables, the open world ones range over every constant
+        self.domains: Dict[LogicalVariable, Optional[FrozenSet[int]]] = {
+            var: frozenset(store.constants.ids(var.constants)) if var.is_closed_world else None
+            for var in rule.variables}
+
+        joined = {term for _, terms in self.body for term in terms}
+        self.unbound: List[Tuple[LogicalVariable, List[int]]] = [
+            (var, sorted(self.domains[var])) for var in dict.fromkeys(self.head[1])
+            if type(var) is LogicalVariable and var not in joined]
+
+        self._plans: Dict[Optional[int], _Plan] = {}
+
+    def plan(self, position: Optional[int]) -> _Plan:
+        plan = self._plans.get(position)
+        if plan is None:
+            plan = self._plans[position] = _Plan(self, position)
+        return plan
+
+
+class Materializer(object):
+    """
+    Forward chaining of the Horn axioms (see `horn_rules`) of an AxiomStore over its true ground facts: the closure
+    holds every ground atom they entail, so an atom of the closure is entailed by the whole knowledge base whatever
+    its other axioms (which can only add consequences).
+    The rules are evaluated semi-naively: every round joins only the atoms derived by the previous one (the delta)
+    with the known ones, through hash indexes on the bound arguments. The closure is kept across calls to `update`,
+    which only visits the axioms told since the previous one and the new facts of the truth tensors (through their
+    journal), so telling facts and rules extends the closure incrementally.
+    Only the predicates occurring in some rule are materialized, the facts of the others are looked up in the store.
+    NOTE(thadumi): changing the constants of a variable of a rule rebuilds the closure from scratch.
+    """
+
+    def __init__(self, store: AxiomStore):
+        self.store: AxiomStore = store
+        self._reset()
+
+    def _reset(self):
+        self.rules: List[HornRule] = []
+        self._by_body: Dict[Predicate, List[Tuple[_CompiledRule, int]]] = {}
+        self._relations: Dict[Predicate, _Relation] = {}
+        self._journal: Dict[Predicate, int] = {}  # positions in the journals of the truth tensors already visited
+        self._position: int = 0  # store[:_position] has been visited
+        self._versions: Dict[LogicalVariable, int] = {}
+        self._size: int = 0
+
+    def __len__(self):
+        """
+        :return: the number of atoms of the closure over the materialized predicates (the known ones included)
+        """
+        return self._size
+
+    def _relation(self, predicate: Predicate) -> _Relation:
+        relation = self._relations.get(predicate)
+        if relation is None:
+            relation = self._relations[predicate] = _Relation()
+            table = self.store.table(predicate)
+            if table is not None:
+                self._journal[predicate] = table.journal_size
+            for ids in self.store.fact_ids(predicate).tolist():
+                self._size += relation.add(tuple(ids))
+
+        return relation
+
+    def update(self) -> int:
+        """
+        Extends the closure with the axioms and the facts told since the previous update.
+        :return: the number of atoms added to the closure
+        """
+        if any(var.version != version for var, version in self._versions.items()):
+            self._reset()
+
+        size = self._size
+        pending: List[Tuple[Predicate, Ids]] = []
+        rules: List[HornRule] = []
+
+        for axiom in self.store[self._position:]:
+            literal = as_ground_literal(axiom)
+            if literal is None:
+                rules.extend(horn_rules(axiom) or ())
+            elif literal[1] and literal[0].predicate in self._relations:
+                atom = literal[0]
+                # noinspection PyProtectedMember
+                pending.append((atom.predicate, tuple(self.store.constants.ids(atom._args))))
+        self._position = len(self.store)
+
+        for predicate in self._relations:
+            table = self.store.table(predicate)
+            if table is None:
+                continue
+            # a truth tensor created after the relation has been loaded (e.g. by a bulk tell) is read from the start
+            ids, values = table.changes_since(self._journal.get(predicate, 0))
+            self._journal[predicate] = table.journal_size
+            pending.extend((predicate, tuple(row)) for row in ids[values == 1].tolist())
+
+        for rule in rules:
+            pending.extend(self._add_rule(rule))
+
+        self._saturate(pending)
+        return self._size - size
+
+    def _add_rule(self, rule: HornRule) -> List[Tuple[Predicate, Ids]]:
+        """
+        :return: the atoms derived by the new rule from the known ones
+        """
+        compiled = _CompiledRule(rule, self.store)
+        self.rules.append(rule)
+        for var in rule.variables:
+            self._versions[var] = var.version
+
+        self._relation(compiled.head[0])
+        for position, (predicate, _) in enumerate(compiled.body):
+            self._relation(predicate)
+            self._by_body.setdefault(predicate, []).append((compiled, position))
+
+        head = compiled.head[0]
+        return [(head, ids) for ids in self._fire(compiled, None, ())]
+
+    def _saturate(self, pending: List[Tuple[Predicate, Ids]]):
+        while pending:
+            delta: Dict[Predicate, List[Ids]] = {}
+            for predicate, ids in pending:
+                if self._relation(predicate).add(ids):
+                    self._size += 1
+                    delta.setdefault(predicate, []).append(ids)
+
+            news = {predicate: set(atoms) for predicate, atoms in delta.items()}
+            pending = [(rule.head[0], ids)
+                       for predicate, atoms in delta.items()
+                       for rule, position in self._by_body.get(predicate, ())
+                       for ids in self._fire(rule, position, atoms, news)]
+
+    def _fire(self,
+              rule: _CompiledRule,
+              position: Optional[int],
+              atoms: Iterable[Ids],
+              delta: Dict[Predicate, Set[Ids]] = None) -> List[Ids]:
+        """
+        :param position: the body atom matched against `atoms` (the delta), None to join the whole relations
+        :param delta: the atoms of the delta by predicate: the body atoms before `position` are matched against the
+                      other ones only, so an instance whose body has many atoms in the delta is derived once
+        :return: the heads of the instances of the rule whose body holds
+        """
+        plan = rule.plan(position)
+        steps = plan.steps
+        rows = [plan.prefix]
+
+        if position is not None:
+            first, steps = steps[0], steps[1:]
+            expected = first.key(plan.prefix)
+            key = _getter(first.positions)
+            rows = [plan.prefix + first.new(ids) for ids in atoms
+                    if key(ids) == expected and (not first.checks or first.accepts(ids))]
+
+        for step in steps:
+            relation = self._relations[step.predicate]
+            excluded = delta.get(step.predicate, ()) if step.before_delta else ()
+            lookup, positions, key, new = relation.lookup, step.positions, step.key, step.new
+            rows = [row + new(ids) for row in rows for ids in lookup(positions, key(row))
+                    if ids not in excluded and (not step.checks or step.accepts(ids))]
+            if not rows:
+                return []
+
+        if plan.unbound:
+            rows = [row + values for row in rows for values in product(*plan.unbound)]
+        return list(map(plan.head, rows))
+
+    def holds(self, lc: Logic) -> bool:
+        """
+        :return: whether `lc`, a ground atom or a conjunction of ground atoms, belongs to the closure computed by the
+                 last update
+        """
+        atoms = _atoms(lc)
+        if not atoms:
+            return False
+
+        for atom in atoms:
+            if self.store.get(atom) is True:
+                continue
+
+            relation = self._relations.get(atom.predicate)
+            # noinspection PyProtectedMember
+            args = atom._args
+            if relation is None or not all(type(arg) is LogicalConstant and arg in self.store.constants
+                                           for arg in args):
+                return False
+            if tuple(self.store.constants.ids(args)) not in relation.tuples:
+                return False
+
+        return True
+
+    def facts(self, predicate: Predicate) -> Iterator[LogicalPredicate]:
+        """
+        :return: the atoms of the predicate in the closure (only for the predicates occurring in some rule)
+        """
+        relation = self._relations.get(predicate)
+        for ids in (relation.tuples if relation is not None else ()):
+            yield predicate(*map(self.store.constants.constant, ids))
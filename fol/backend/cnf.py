@@ -3,15 +3,20 @@
 :Date: 06/12/19
 :Version: 0.0.1
 """
-from typing import List
+from itertools import product, chain, count
+from typing import List, Dict, Optional, Tuple, Iterator, Sequence, Union, Iterable, Any, Mapping, Callable
 
-from constant import LogicalConstant
 from fol.logic import EquivalenceLogicalExpression, AndLogicalExpression, \
     OrLogicalExpression, ImplicationLogicalExpression, LogicalExpression, NotLogicalExpression, \
-    UniversalQuantifier, ExistentialQualifier, Not
-# Eliminate ⇔ , replacing ⇔ (α⇒β)∧(β⇒α).
-from variable import LogicalVariable, variable
+    UniversalQuantifier, ExistentialQualifier, Not, Logic, LogicalConstant, LogicalVariable, LogicalTerm, \
+    LogicalQualifier, TruthLogicalExpression, TRUE, traverse, postorder, rebuild, children
+from fol.cache import memoize
+from fol.predicate import LogicalPredicate, Predicate
+
+Clause = Tuple[int, ...]
+
 
+# Eliminate ⇔ , replacing ⇔ (α⇒β)∧(β⇒α).
 
 # noinspection PyProtectedMember
 def equivalence_to_cnf(lc: EquivalenceLogicalExpression) -> AndLogicalExpression:
@@ -35,116 +40,678 @@ def implication_to_cnf(lc: ImplicationLogicalExpression) -> OrLogicalExpression:
     return ~alpha | beta
 
 
-# noinspection PyProtectedMember
+def _move_not_expand(lc: Logic, negated: bool) -> Sequence[Tuple[Logic, bool]]:
+    op = type(lc)
+    if not negated:
+        return [(lc.arg, True)] if op is NotLogicalExpression else ()
+
+    if op is UniversalQuantifier or op is ExistentialQualifier:
+        return [(lc.proposition, True)]
+    if op is OrLogicalExpression or op is AndLogicalExpression:
+        return [(arg, True) for arg in children(lc)]
+    return ()
+
+
+def _move_not_combine(lc: Logic, negated: bool, args: List[Logic]) -> Logic:
+    op = type(lc)
+    if not negated:
+        return args[0] if op is NotLogicalExpression else lc
+
+    if op is UniversalQuantifier:
+        return ExistentialQualifier(lc.variables, args[0])
+    if op is ExistentialQualifier:
+        return UniversalQuantifier(lc.variables, args[0])
+    if op is OrLogicalExpression:
+        return AndLogicalExpression.of(args)
+    if op is AndLogicalExpression:
+        return OrLogicalExpression.of(args)
+    if op is NotLogicalExpression:
+        return lc.arg
+
+    return Not(lc)  # ground term do need to verify what's inside
+
+
 def move_not_inwards(lc: LogicalExpression) -> LogicalExpression:
-    if not isinstance(lc, NotLogicalExpression):
-        # ground term do need to verify what's inside
-        return lc
+    """
+    Pushes the negation at the top of `lc` through quantifiers, conjunctions, disjunctions and double negations.
+    """
+    return traverse(lc, _move_not_combine, _move_not_expand, False)
 
-    not_arg: LogicalExpression = lc._args[0]
-    not_arg_type = type(not_arg)
 
-    if not_arg_type == UniversalQuantifier:
-        not_arg: UniversalQuantifier
+def _shadows(lc: Logic, positions: Mapping[int, Any]) -> bool:
+    return isinstance(lc, LogicalQualifier) and any(id(var) in positions for var in lc.variables)
 
-        return ExistentialQualifier(not_arg.variables, move_not_inwards(not_arg.proposition.negated()))
 
-    if not_arg_type == ExistentialQualifier:
-        not_arg: ExistentialQualifier
+def _unshadowed(lc: LogicalQualifier, positions: Mapping[int, Any]) -> Dict[int, Any]:
+    """
+    :return: the substituted variables (by id) still free within the quantifier
+    """
+    bound = {id(var) for var in lc.variables}
+    return {key: value for key, value in positions.items() if key not in bound}
 
-        return UniversalQuantifier(not_arg._vars, move_not_inwards(not_arg._proposition.negated()))
 
-    if not_arg_type == OrLogicalExpression:
-        not_arg: OrLogicalExpression
+def _check_capture(lc: LogicalQualifier, values: Iterable[Logic]):
+    bound = {id(var) for var in lc.variables}
+    for value in values:
+        if type(value) is LogicalVariable and id(value) in bound:
+            raise ValueError('The variable {} would be captured by `{}`'.format(value, lc))
 
-        alpha = not_arg.alpha
-        beta = not_arg.beta
 
-        return move_not_inwards(Not(alpha)) & move_not_inwards(Not(beta))
+def _substitute(lc: Logic, terms: Mapping[int, Logic]) -> Logic:
+    def expand(node: Logic) -> Sequence[Logic]:
+        return () if _shadows(node, terms) else children(node)
 
-    if not_arg_type == AndLogicalExpression:
-        not_arg: AndLogicalExpression
-        alpha = not_arg.alpha
-        beta = not_arg.beta
+    def combine(node: Logic, args: List[Logic]) -> Logic:
+        if type(node) is LogicalVariable:
+            return terms.get(id(node), node)
+        if _shadows(node, terms):
+            # NOTE(thadumi): rare, the variables bound by the quantifier are not substituted within it
+            remaining = _unshadowed(node, terms)
+            args = [_substitute(node.proposition, remaining) if remaining else node.proposition]
+        if not args:
+            return node
 
-        return move_not_inwards(Not(alpha)) | move_not_inwards(Not(beta))
+        new = rebuild(node, args)
+        if new is not node and isinstance(node, LogicalQualifier):
+            _check_capture(node, terms.values())
+        return new
 
-    if not_arg_type == NotLogicalExpression:
-        not_arg: NotLogicalExpression
+    return postorder(lc, combine, expand)
 
-        return not_arg.arg
 
-    return lc  # ground term do need to verify what's inside
+def substitute(lc: Logic, bindings: Mapping[LogicalVariable, Logic]) -> Logic:
+    """
+    Replaces in a single visit the free occurrences of every variable of `bindings` with its term (simultaneously, a
+    term is not substituted in turn). The occurrences bound by a quantifier within `lc` are kept, and the
+    sub-formulas without free occurrences are shared with `lc`.
+    :raise ValueError: if a term is a variable bound by a quantifier around some replaced occurrence
+    """
+    if not bindings:
+        return lc
+    return _substitute(lc, {id(var): term for var, term in bindings.items()})
+
+
+# A substitution plan lists in post-order the nodes of a formula having a free occurrence of the substituted
+# variables, the only ones to rebuild: a step is (variable, position of its term), (node, children) where a child is
+# the index of an earlier step or a sub-formula shared as it is, or (quantifier, plan of its proposition) for a
+# quantifier binding some of the variables.
+_Step = Tuple[Logic, Union[int, Tuple[Union[int, Logic], ...], list]]
+
+
+def _substitution_plan(lc: Logic, positions: Mapping[int, int]) -> List[_Step]:
+    """
+    :param positions: the position of the term of every substituted variable (by id)
+    :return: the steps rebuilding `lc`, the last one is the root (no step if no variable occurs free)
+    """
+    steps: List[_Step] = []
+
+    def expand(node: Logic) -> Sequence[Logic]:
+        return () if _shadows(node, positions) else children(node)
+
+    def combine(node: Logic, args: List[Union[int, Logic]]) -> Union[int, Logic]:
+        if type(node) is LogicalVariable:
+            if id(node) not in positions:
+                return node
+            steps.append((node, positions[id(node)]))
+        elif _shadows(node, positions):
+            remaining = _unshadowed(node, positions)
+            nested = _substitution_plan(node.proposition, remaining) if remaining else []
+            if not nested:
+                return node
+            steps.append((node, nested))
+        elif any(type(arg) is int for arg in args):
+            steps.append((node, tuple(args)))
+        else:
+            return node  # shared
+        return len(steps) - 1
+
+    postorder(lc, combine, expand)
+    return steps
+
+
+def _apply(lc: Logic, steps: List[_Step], terms: Sequence[Logic]) -> Logic:
+    if not steps:
+        return lc
+
+    results: List[Logic] = []
+    for node, spec in steps:
+        if type(spec) is int:
+            results.append(terms[spec])
+            continue
+
+        if type(spec) is list:
+            args = [_apply(node.proposition, spec, terms)]
+        else:
+            args = [results[arg] if type(arg) is int else arg for arg in spec]
+        new = rebuild(node, args)
+        if new is not node and isinstance(node, LogicalQualifier):
+            _check_capture(node, terms)
+        results.append(new)
+
+    return results[-1]
+
+
+def substitute_many(lc: Logic,
+                    variables: Sequence[LogicalVariable],
+                    bindings: Iterable[Sequence[Logic]]) -> Iterator[Logic]:
+    """
+    Lazily instantiates `lc` under many bindings of the same variables, see `substitute`. The formula is visited
+    once: every binding rebuilds only the nodes having a free occurrence of the variables.
+    :param bindings: the terms of the variables, in the order of `variables`
+    """
+    steps = _substitution_plan(lc, {id(var): position for position, var in enumerate(variables)})
+    for terms in bindings:
+        yield _apply(lc, steps, terms)
 
 
-# noinspection PyProtectedMember
 def replace_variable(expression: LogicalExpression, old_var: LogicalVariable, skolem_constant: LogicalConstant):
-    if type(expression) is LogicalConstant:
-        return expression
+    """
+    :return: the expression where the free occurrences of `old_var` are replaced by `skolem_constant`, the
+             sub-formulas not containing the variable are shared with `expression`, see `substitute`
+    """
+    return _substitute(expression, {id(old_var): skolem_constant})
+
+
+# First-order clauses, for the formulas whose variables cannot be grounded (see fol.backend.resolution).
+# A term is a variable (an int, the variables of a clause are numbered from 0 in order of occurrence), a
+# LogicalConstant or the application of a Skolem function as a tuple (name, arguments...), so a Skolem constant is
+# (name,). A literal is (polarity, predicate, arguments) and a clause a tuple of literals.
+Term = Union[int, LogicalConstant, tuple]
+FOLiteral = Tuple[bool, Predicate, Tuple[Term, ...]]
+FOClause = Tuple[FOLiteral, ...]
+
+# beyond this number of clauses a disjunction is not distributed, its operands get a definitional predicate
+_DISTRIBUTION_LIMIT = 64
+
+# the Skolem functions and the definitional predicates are unique among every clausified formula
+_SKOLEMS = count()
+_DEFINITIONS = count()
+
+
+def term_variables(term: Term) -> Iterator[int]:
+    """
+    :return: the variables of the term in order of occurrence
+    """
+    stack = [term]
+    while stack:
+        term = stack.pop()
+        if type(term) is int:
+            yield term
+        elif type(term) is tuple:
+            stack.extend(reversed(term[1:]))
+
+
+def map_term(term: Term, resolve: Callable[[Term], Term]) -> Term:
+    """
+    Rebuilds a term without recursion, so the depth of the terms is not bounded by the interpreter stack.
+    :param resolve: applied to every subterm in preorder before visiting it (e.g. mapping a variable to its
+                    binding), the arguments of the compound results are resolved in turn
+    """
+    term = resolve(term)
+    if type(term) is not tuple or len(term) == 1:
+        return term
+
+    stack: List[Tuple[tuple, List[Term]]] = [(term, [])]  # the compound terms being rebuilt, their built arguments
+    while True:
+        compound, args = stack[-1]
+        if len(args) == len(compound) - 1:
+            stack.pop()
+            built = (compound[0],) + tuple(args)
+            if not stack:
+                return built
+            stack[-1][1].append(built)
+            continue
+
+        arg = resolve(compound[len(args) + 1])
+        if type(arg) is tuple and len(arg) > 1:
+            stack.append((arg, []))
+        else:
+            args.append(arg)
+
+
+def _rename_term(term: Term, renaming: Dict[int, int]) -> Term:
+    return map_term(term, lambda t: renaming.setdefault(t, len(renaming)) if type(t) is int else t)
+
+
+def normalize_clause(literals: Iterable[FOLiteral]) -> Optional[FOClause]:
+    """
+    :return: the clause without duplicated literals and with the variables numbered in order of occurrence, None if
+             it is a tautology (it has two complementary literals)
+    """
+    literals = tuple(dict.fromkeys(literals))
+    seen = set(literals)
+    if any((not polarity, predicate, args) in seen for polarity, predicate, args in literals):
+        return None
+
+    renaming: Dict[int, int] = {}
+    return tuple((polarity, predicate, tuple(_rename_term(arg, renaming) for arg in args))
+                 for polarity, predicate, args in literals)
+
+
+class _Clausifier(object):
+    """
+    Converts a formula in NNF into first-order clauses: the quantifiers over closed-world variables are expanded
+    over their constants, the universal ones over open-world variables become clause variables and the existential
+    ones Skolem functions of the enclosing open-world universal variables. The free variables are universal.
+    Every node is visited within the context (bindings of the quantified variables, universal variables in scope).
+    """
+
+    def __init__(self):
+        self._variables = count()
+        self._free: Dict[LogicalVariable, int] = {}
+        self.definitions: List[Tuple[FOLiteral, ...]] = []
+
+    def expand(self, lc: Logic, context) -> Sequence[Tuple[Logic, Any]]:
+        op = type(lc)
+        if op is AndLogicalExpression or op is OrLogicalExpression:
+            return [(arg, context) for arg in lc.args]
+        if op is not UniversalQuantifier and op is not ExistentialQualifier:
+            return ()
+
+        env, universals = context
+        bound = dict(env)
+        closed = [var for var in lc.variables if var.is_closed_world]
+        for var in lc.variables:
+            if var.is_closed_world:
+                continue
+            if op is UniversalQuantifier:
+                bound[var] = next(self._variables)
+                universals += (bound[var],)
+            else:
+                bound[var] = ('sk{}'.format(next(_SKOLEMS)),) + universals
+
+        instances = []
+        for constants in product(*[var.constants for var in closed]):
+            instance = dict(bound)
+            instance.update(zip(closed, constants))
+            instances.append((lc.proposition, (tuple(instance.items()), universals)))
+        return instances
+
+    def combine(self, lc: Logic, context, args: List[List[Tuple[FOLiteral, ...]]]) -> List[Tuple[FOLiteral, ...]]:
+        op = type(lc)
+        if op is AndLogicalExpression or op is UniversalQuantifier:
+            return [clause for clauses in args for clause in clauses]
+        if op is OrLogicalExpression or op is ExistentialQualifier:
+            return self._disjunction(args)
+        if op is TruthLogicalExpression:
+            return [] if lc.value else [()]
+
+        polarity = op is not NotLogicalExpression
+        atom = lc if polarity else lc.arg
+        if type(atom) is not LogicalPredicate:
+            raise ValueError('Expected a formula in NNF, found `{}`'.format(lc))
+
+        env = dict(context[0])
+        # noinspection PyProtectedMember
+        return [((polarity, atom.predicate, tuple(self._term(arg, env) for arg in atom._args)),)]
+
+    def _term(self, arg: Logic, env: Dict[LogicalVariable, Term]) -> Term:
+        if type(arg) is not LogicalVariable:
+            return arg
+
+        term = env.get(arg)
+        if term is None:
+            term = self._free.get(arg)
+            if term is None:
+                term = self._free[arg] = next(self._variables)
+        return term
+
+    def _disjunction(self, args: List[List[Tuple[FOLiteral, ...]]]) -> List[Tuple[FOLiteral, ...]]:
+        size = 1
+        for clauses in args:
+            size *= len(clauses)
+        if size > _DISTRIBUTION_LIMIT:
+            args = [self._define(clauses) if len(clauses) > 1 else clauses for clauses in args]
+
+        return [tuple(chain.from_iterable(clauses)) for clauses in product(*args)]
+
+    def _define(self, clauses: List[Tuple[FOLiteral, ...]]) -> List[Tuple[FOLiteral, ...]]:
+        """
+        :return: the unit clause of a new predicate over the variables of the clauses, which it implies
+        """
+        variables = tuple(sorted({var for clause in clauses for _, _, args in clause
+                                  for arg in args for var in term_variables(arg)}))
+        predicate = Predicate(name='_def{}'.format(next(_DEFINITIONS)), number_of_arguments=len(variables))
+        self.definitions.extend(((False, predicate, variables),) + clause for clause in clauses)
+        return [((True, predicate, variables),)]
+
+
+def first_order_clauses(lc: Logic) -> List[FOClause]:
+    """
+    Converts a formula into first-order clauses: skolemized, with the quantifiers over closed-world variables
+    expanded and the variables of every clause standardized apart (numbered from 0), see `_Clausifier`.
+    The tautologies are dropped.
+    """
+    clausifier = _Clausifier()
+    clauses = traverse(lc.to_nnf(), clausifier.combine, clausifier.expand, ((), ()))
+
+    normalized = (normalize_clause(clause) for clause in chain(clauses, clausifier.definitions))
+    return list(dict.fromkeys(clause for clause in normalized if clause is not None))
+
+
+def _expand_quantifiers_combine(lc: Logic, args: List[Logic]) -> Logic:
+    if is_literal(lc):
+        return lc
+    if not isinstance(lc, LogicalQualifier):
+        return rebuild(lc, args)
 
-    if type(expression) is LogicalVariable:
-        return expression if old_var is not expression else skolem_constant
+    for var in lc.variables:
+        if not var.is_closed_world:
+            raise UnboundVariableError('The variable {} of `{}` is not closed world'.format(var, lc))
 
-    if type(expression) is NotLogicalExpression:
-        return Not(replace_variable(expression._args[0], old_var, skolem_constant))
+    instances = list(substitute_many(args[0], lc.variables, product(*[var.constants for var in lc.variables])))
 
-    if type(expression) is AndLogicalExpression:
-        return replace_variable(expression.alpha, old_var, skolem_constant) & \
-               replace_variable(expression.beta, old_var, skolem_constant)
+    if not instances:
+        raise UnboundVariableError('The variables of `{}` have an empty domain'.format(lc))
 
-    if type(expression) is OrLogicalExpression:
-        return replace_variable(expression.alpha, old_var, skolem_constant) | \
-               replace_variable(expression.beta, old_var, skolem_constant)
+    connective = AndLogicalExpression if type(lc) is UniversalQuantifier else OrLogicalExpression
+    return connective.of(instances)
 
-    if type(expression) is ImplicationLogicalExpression:
-        return replace_variable(expression.alpha, old_var, skolem_constant) >> \
-               replace_variable(expression.beta, old_var, skolem_constant)
 
-    if type(expression) is EquivalenceLogicalExpression:
-        return replace_variable(expression.alpha, old_var, skolem_constant) == \
-               replace_variable(expression.beta, old_var, skolem_constant)
+def _quantified_variables(lc: Logic) -> List[LogicalVariable]:
+    """
+    :return: the variables bound by the quantifiers of the formula
+    """
+    found: Dict[LogicalVariable, None] = {}
+    visited = set()
+    stack = [lc]
+    while stack:
+        node = stack.pop()
+        if id(node) in visited:
+            continue
+        visited.add(id(node))
 
+        if isinstance(node, LogicalQualifier):
+            found.update(dict.fromkeys(node.variables))
+        if not is_literal(node):
+            stack.extend(children(node))
 
-# Standardize variables apart by renaming them: each quantifier should use a different variable
-def standardize_apart(lc, previous_variable=None):
-    if previous_variable is None:
-        previous_variable = set()
+    return list(found)
 
-    if type(lc) is UniversalQuantifier or type(lc) is ExistentialQualifier:
-        variables = set(lc.variables())
-        variables_to_change = previous_variable.intersection(variables)
 
-        new_variable_name = [variable(randomString(), static_value=var.value, constants=var.constants)
-                             for var in variables_to_change]
+def expand_quantifiers(lc: Logic) -> Logic:
+    """
+    Replaces every quantifier over closed-world variables with the conjunction (∀) or the disjunction (∃)
+    of its instances.
+    The expansion is cached in the `ground` namespace of fol.cache until the constants of a quantified variable change.
+    :raise UnboundVariableError: if a quantified variable has no constants
+    """
+    return memoize('ground', lc,
+                   lambda node: postorder(node, _expand_quantifiers_combine,
+                                          lambda child: () if is_literal(child) else children(child)),
+                   _quantified_variables)
 
-        proposition = None  # TODO
-        return UniversalQuantifier(tuple(new_variable_name + list(variables - variables_to_change)), proposition)
 
+def is_literal(lc: Logic) -> bool:
+    if type(lc) is NotLogicalExpression:
+        lc = lc.arg
 
-# noinspection PyProtectedMember
-def skolemization(lc):
-    if type(lc) not in [UniversalQuantifier, ExistentialQualifier]:
-        return lc
+    return type(lc) is LogicalPredicate or isinstance(lc, LogicalTerm) or type(lc) is TruthLogicalExpression
 
-    vars: List[LogicalVariable] = lc.variables
-    proposition: LogicalExpression = lc.proposition
-    # TODO(thadumi): check if there are free variables
 
-    for var in vars:
-        if var.is_closed_world():
-            for constant in var.constants:
-                replace_variable(proposition, var, constant)
+class SymbolTable(object):
+    """
+    Bijection between the atoms of the formulas and the positive integers used as propositional variables.
+    Definitional variables introduced by the Tseitin encoding have no atom.
+    """
 
+    def __init__(self):
+        self._ids: Dict[Logic, int] = {}
+        self._atoms: List[Optional[Logic]] = [None]  # the variable 0 is not valid in DIMACS
 
-def drop_universal_qualifiers(lc: LogicalExpression) -> LogicalExpression:
-    pass
+    def variable(self, atom: Logic) -> int:
+        var = self._ids.get(atom)
+        if var is None:
+            var = self._ids[atom] = len(self._atoms)
+            self._atoms.append(atom)
 
+        return var
 
-def randomString(stringLength=10):
-    import random
-    import string
-    letters = string.ascii_lowercase
-    return ''.join(random.choice(letters) for i in range(stringLength))
+    def fresh(self, count: int = 1) -> int:
+        """
+        :return: the first of `count` new definitional variables, which are consecutive
+        """
+        self._atoms.extend([None] * count)
+        return len(self._atoms) - count
+
+    def literal(self, lc: Logic) -> int:
+        if type(lc) is NotLogicalExpression:
+            return -self.literal(lc.arg)
+
+        if type(lc) is TruthLogicalExpression and not lc.value:  # ⊥ is encoded as ¬⊤
+            return -self.variable(TRUE)
+
+        return self.variable(lc)
+
+    def atom(self, var: int) -> Optional[Logic]:
+        return self._atoms[abs(var)]
+
+    def __contains__(self, atom: Logic) -> bool:
+        return atom in self._ids
+
+    def __len__(self):
+        """
+        :return: the number of propositional variables (atoms and definitional ones)
+        """
+        return len(self._atoms) - 1
+
+    def atoms(self) -> Iterator[Tuple[int, Logic]]:
+        return iter(self._ids.items())
+
+
+class ClauseSet(object):
+    """
+    A CNF as a list of clauses of integer literals plus the symbol table mapping the variables to the atoms.
+    """
+
+    def __init__(self, symbols: SymbolTable = None):
+        self.symbols: SymbolTable = symbols if symbols is not None else SymbolTable()
+        self.clauses: List[Clause] = []
+
+    def add(self, clause: Clause):
+        self.clauses.append(clause)
+
+    @property
+    def number_of_variables(self) -> int:
+        return len(self.symbols)
+
+    def __len__(self):
+        return len(self.clauses)
+
+    def __iter__(self) -> Iterator[Clause]:
+        return iter(self.clauses)
+
+    def decode(self, clause: Clause) -> str:
+        def literal_name(lit):
+            atom = self.symbols.atom(lit)
+            name = str(atom) if atom is not None else '_t{}'.format(abs(lit))
+            return name if lit > 0 else '¬' + name
+
+        return ' ∨ '.join(map(literal_name, clause)) if clause else '⊥'
+
+    def to_dimacs(self) -> str:
+        lines = ['p cnf {} {}'.format(self.number_of_variables, len(self.clauses))]
+        lines.extend(' '.join(map(str, clause)) + ' 0' for clause in self.clauses)
+        return '\n'.join(lines)
+
+    def __str__(self):
+        return ' ∧ '.join('({})'.format(self.decode(clause)) for clause in self.clauses)
+
+
+class CNFEncoder(object):
+    """
+    Encodes formulas into a ClauseSet.
+    The `tseitin` mode introduces a definitional variable for every distinct (hash-consed) sub-formula, so the
+    number of clauses is linear in the size of the formula DAG. The `distribute` mode applies the textbook
+    NNF + distribution of ∨ over ∧, which is equivalence preserving but can grow exponentially.
+    The same encoder can be fed with many formulas: atoms and definitions are shared among them.
+    """
+    MODES = ('tseitin', 'distribute')
+
+    def __init__(self, mode: str = 'tseitin', clause_set: ClauseSet = None):
+        if mode not in CNFEncoder.MODES:
+            raise ValueError('Unknown CNF mode `{}`, expected one of {}'.format(mode, CNFEncoder.MODES))
+
+        self.mode = mode
+        self.clause_set: ClauseSet = clause_set if clause_set is not None else ClauseSet()
+        self._definitions: Dict[Logic, int] = {}
+
+    @property
+    def symbols(self) -> SymbolTable:
+        return self.clause_set.symbols
+
+    def encode(self, lc: Logic, guard: int = 0) -> List[Clause]:
+        """
+        Adds to the clause set the clauses of `lc`.
+        :param guard: if not 0 the clauses of `lc` (but not the definitions of the Tseitin variables, which are always
+                      safe to keep) are enabled only when the literal `guard` is true, i.e. ¬guard is added to them.
+                      Useful for solving under assumptions.
+        :return: the added clauses (definitions of the Tseitin variables included)
+        """
+        start = len(self.clause_set.clauses)
+        lc = expand_quantifiers(lc)
+        guard = (-guard,) if guard else ()
+
+        if self.mode == 'tseitin':
+            # the top level conjunctions and disjunctions do not need a definitional variable
+            for conjunct in _conjuncts(lc):
+                self.clause_set.add(tuple(self._define(disjunct) for disjunct in _disjuncts(conjunct)) + guard)
+        else:
+            for clause in _distribute(lc.to_nnf()):
+                literals = dict.fromkeys(self._literal(literal) for literal in clause)
+                clause = tuple(literals)
+                if not any(-literal in literals for literal in clause):  # tautologies are dropped
+                    self.clause_set.add(clause + guard)
+
+        return self.clause_set.clauses[start:]
+
+    def define(self, lc: Logic) -> int:
+        """
+        :return: a literal equivalent to `lc`, adding to the clause set the definitions of its Tseitin variables (but
+                 not `lc` itself). The definitions are equivalences, so they do not change the number of models.
+        """
+        return self._define(expand_quantifiers(lc))
+
+    def _literal(self, lc: Logic) -> int:
+        atom = lc.arg if type(lc) is NotLogicalExpression else lc
+        if type(atom) is TruthLogicalExpression and TRUE not in self.symbols:  # ⊤ is an atom forced to be true
+            self.clause_set.add((self.symbols.variable(TRUE),))
+
+        return self.symbols.literal(lc)
+
+    def _define(self, lc: Logic) -> int:
+        """
+        :return: the literal equivalent to `lc`, adding the clauses defining it when needed
+        """
+        return postorder(lc, self._define_combine, self._define_expand)
+
+    def _define_expand(self, lc: Logic) -> Sequence[Logic]:
+        if type(lc) is NotLogicalExpression:
+            return children(lc)
+        if is_literal(lc) or lc in self._definitions:
+            return ()
+        return children(lc)
+
+    def _define_combine(self, lc: Logic, args: List[int]) -> int:
+        if type(lc) is NotLogicalExpression:
+            return -args[0]
+
+        if is_literal(lc):
+            return self._literal(lc)
+
+        var = self._definitions.get(lc)
+        if var is not None:
+            return var
+
+        var = self._definitions[lc] = self.symbols.fresh()
+        add = self.clause_set.add
+        op = type(lc)
+
+        if op is AndLogicalExpression:  # x <=> a ∧ b
+            for arg in args:
+                add((-var, arg))
+            add(tuple([var] + [-arg for arg in args]))
+        elif op is OrLogicalExpression:  # x <=> a ∨ b
+            for arg in args:
+                add((var, -arg))
+            add(tuple([-var] + args))
+        elif op is ImplicationLogicalExpression:  # x <=> ¬a ∨ b
+            a, b = args
+            add((var, a))
+            add((var, -b))
+            add((-var, -a, b))
+        elif op is EquivalenceLogicalExpression:  # x <=> (a <=> b)
+            a, b = args
+            add((-var, -a, b))
+            add((-var, a, -b))
+            add((var, a, b))
+            add((var, -a, -b))
+        else:
+            raise ValueError('Unable to encode `{}` of type {}'.format(lc, op.__name__))
+
+        return var
+
+
+def _flatten(lc: Logic, op: type) -> Iterator[Logic]:
+    stack = [lc]
+    while stack:
+        node = stack.pop()
+        if type(node) is op:
+            stack.extend(reversed(children(node)))
+        else:
+            yield node
+
+
+def _conjuncts(lc: Logic) -> Iterator[Logic]:
+    return _flatten(lc, AndLogicalExpression)
+
+
+def _disjuncts(lc: Logic) -> Iterator[Logic]:
+    return _flatten(lc, OrLogicalExpression)
+
+
+def _distribute_expand(lc: Logic) -> Sequence[Logic]:
+    # the nested conjunctions (disjunctions) are visited at once, without building the clauses of the inner ones
+    if type(lc) is AndLogicalExpression:
+        return list(_conjuncts(lc))
+    if type(lc) is OrLogicalExpression:
+        return list(_disjuncts(lc))
+
+    if not is_literal(lc):
+        raise ValueError('Expected a formula in NNF, found `{}`'.format(lc))
+
+    return ()
+
+
+def _distribute_combine(lc: Logic, args: List[List[Tuple[Logic, ...]]]) -> List[Tuple[Logic, ...]]:
+    if type(lc) is AndLogicalExpression:
+        return [clause for clauses in args for clause in clauses]
+
+    if type(lc) is OrLogicalExpression:
+        return [tuple(chain.from_iterable(clauses)) for clauses in product(*args)]
+
+    return [(lc,)]
+
+
+def _distribute(lc: Logic) -> List[Tuple[Logic, ...]]:
+    """
+    :param lc: a formula in NNF
+    :return: the clauses of the CNF as tuples of literals, cached in the `cnf` namespace of fol.cache
+    """
+    return memoize('cnf', lc, lambda node: postorder(node, _distribute_combine, _distribute_expand))
+
+
+def to_cnf(lc: Logic, mode: str = 'tseitin') -> ClauseSet:
+    """
+    Converts a formula into a compact set of clauses.
+    Quantifiers over closed-world variables are expanded over their constants.
+    :param lc: the formula to convert
+    :param mode: `tseitin` (linear size, equisatisfiable) or `distribute` (equivalent, possibly exponential)
+    :return: the clauses as tuples of integer literals plus the symbol table of the atoms
+    """
+    encoder = CNFEncoder(mode)
+    encoder.encode(lc)
+    return encoder.clause_set
 
 
 class UnboundVariableError(Exception):
@@ -0,0 +1,225 @@
+"""
+:Author: Theodor A. Dumitrescu
+:Date: Oct 18, 2026
+:Version: 0.0.1
+"""
+from typing import Dict, List, Tuple, Union
+
+import numpy as np
+
+from fol.axiom_store import AxiomStore
+from fol.backend.truth import TRUE_VALUE, UNKNOWN_VALUE
+from fol.backend.vectorized import VectorizedEvaluator
+from fol.logic import Logic, LogicalConstant, UniversalQuantifier
+from fol.predicate import Predicate
+
+
+class TNorm(object):
+    """
+    A triangular norm with its dual t-conorm under the standard negation 1 - x.
+    The implication is the S-implication ¬a ∨ b of the t-conorm.
+    """
+    name: str = None
+
+    def conjunction(self, alpha: np.ndarray, beta: np.ndarray) -> np.ndarray:
+        raise NotImplementedError
+
+    def disjunction(self, alpha: np.ndarray, beta: np.ndarray) -> np.ndarray:
+        raise NotImplementedError
+
+    def negation(self, alpha: np.ndarray) -> np.ndarray:
+        return 1. - alpha
+
+    def implication(self, alpha: np.ndarray, beta: np.ndarray) -> np.ndarray:
+        return self.disjunction(self.negation(alpha), beta)
+
+
+class ProductTNorm(TNorm):
+    name = 'product'
+
+    def conjunction(self, alpha, beta):
+        return alpha * beta
+
+    def disjunction(self, alpha, beta):
+        return alpha + beta - alpha * beta
+
+
+class LukasiewiczTNorm(TNorm):
+    name = 'lukasiewicz'
+
+    def conjunction(self, alpha, beta):
+        return np.maximum(alpha + beta - 1., 0.)
+
+    def disjunction(self, alpha, beta):
+        return np.minimum(alpha + beta, 1.)
+
+
+class GodelTNorm(TNorm):
+    name = 'godel'
+
+    def conjunction(self, alpha, beta):
+        return np.minimum(alpha, beta)
+
+    def disjunction(self, alpha, beta):
+        return np.maximum(alpha, beta)
+
+
+TNORMS: Dict[str, TNorm] = {tnorm.name: tnorm for tnorm in (ProductTNorm(), LukasiewiczTNorm(), GodelTNorm())}
+
+
+def get_tnorm(name: Union[str, TNorm]) -> TNorm:
+    if isinstance(name, TNorm):
+        return name
+    if name not in TNORMS:
+        raise ValueError('Unknown t-norm `{}`, expected one of {}'.format(name, tuple(TNORMS)))
+    return TNORMS[name]
+
+
+# semantics used when not given to the evaluator, see `configure`
+DEFAULTS = {'tnorm': 'product', 'p_forall': 2., 'p_exists': 2., 'unknown': .5}
+
+
+def configure(**semantics):
+    """
+    Changes the default semantics of the evaluators, e.g. `configure(tnorm='godel', p_forall=float('inf'))`.
+    """
+    unknown = set(semantics) - set(DEFAULTS)
+    if unknown:
+        raise ValueError('Unknown settings {}, expected some of {}'.format(sorted(unknown), tuple(DEFAULTS)))
+    if 'tnorm' in semantics:
+        get_tnorm(semantics['tnorm'])
+
+    DEFAULTS.update(semantics)
+
+
+def mean(values: np.ndarray, p: float, axis) -> np.ndarray:
+    """
+    Generalized mean (1/n Σ x^p)^(1/p), the max for p = inf.
+    """
+    if np.isinf(p):
+        return np.max(values, axis=axis)
+    if p == 1:
+        return np.mean(values, axis=axis)
+    return np.mean(values ** p, axis=axis) ** (1. / p)
+
+
+def mean_error(values: np.ndarray, p: float, axis) -> np.ndarray:
+    """
+    Generalized mean of the errors 1 - (1/n Σ (1 - x)^p)^(1/p), the min for p = inf.
+    """
+    return 1. - mean(1. - values, p, axis)
+
+
+class FuzzyEvaluator(VectorizedEvaluator):
+    """
+    Real logic (Logic Tensor Network style) valuation of the formulas, computed with numpy over all the groundings
+    at once: the ground atoms have a degree of truth in [0, 1], the connectives are interpreted by a t-norm and the
+    quantifiers by generalized means (`p_exists`) and generalized means of the errors (`p_forall`), both tending to
+    the max / min as p grows.
+    The degrees of a predicate are the ones given with `set_degrees`, or its told facts (1 or 0) where `unknown` is
+    the degree of the atoms neither told true nor false.
+    """
+
+    dtype = np.float64
+
+    def __init__(self,
+                 store: AxiomStore = None,
+                 tnorm: Union[str, TNorm] = None,
+                 p_forall: float = None,
+                 p_exists: float = None,
+                 unknown: float = None):
+        super(FuzzyEvaluator, self).__init__(store)
+
+        tnorm = DEFAULTS['tnorm'] if tnorm is None else tnorm
+        p_forall = DEFAULTS['p_forall'] if p_forall is None else p_forall
+        p_exists = DEFAULTS['p_exists'] if p_exists is None else p_exists
+        unknown = DEFAULTS['unknown'] if unknown is None else unknown
+
+        if p_forall < 1 or p_exists < 1:
+            raise ValueError('The generalized means need p >= 1')
+
+        self.tnorm: TNorm = get_tnorm(tnorm)
+        self.p_forall: float = p_forall
+        self.p_exists: float = p_exists
+        self.unknown: float = unknown
+        self._degrees: Dict[Predicate, np.ndarray] = {}
+
+    def set_degrees(self, predicate: Predicate, degrees):
+        """
+        :param degrees: array of shape (n,) * arity, the degree of the atom having arguments of ids (i, j, ...)
+        """
+        degrees = np.asarray(degrees, dtype=self.dtype)
+        if degrees.ndim != predicate.number_of_arguments:
+            raise ValueError('Expected {} dimensions for the degrees of {}, received {}'
+                             .format(predicate.number_of_arguments, predicate.name, degrees.ndim))
+        if degrees.size and (degrees.min() < 0 or degrees.max() > 1):
+            raise ValueError('The degrees of truth have to be in [0, 1]')
+
+        self._degrees[predicate] = degrees
+
+    def _atom(self, predicate, ids):
+        degrees = self._degrees.get(predicate)
+        if degrees is not None:
+            inside = np.all(ids < np.array(degrees.shape), axis=1)
+            values = np.full(len(ids), self.unknown, dtype=self.dtype)
+            values[inside] = degrees[tuple(ids[inside].T)]
+            return values
+
+        facts = self._table(predicate).get(ids)
+        values = (facts == TRUE_VALUE).astype(self.dtype)
+        values[facts == UNKNOWN_VALUE] = self.unknown
+        return values
+
+    def _constant(self, value):
+        return 1. if value else 0.
+
+    def _not(self, values):
+        return self.tnorm.negation(values)
+
+    def _and(self, alpha, beta):
+        return self.tnorm.conjunction(alpha, beta)
+
+    def _or(self, alpha, beta):
+        return self.tnorm.disjunction(alpha, beta)
+
+    def _implies(self, alpha, beta):
+        return self.tnorm.implication(alpha, beta)
+
+    def _forall(self, values, axis):
+        return mean_error(values, self.p_forall, axis)
+
+    def _exists(self, values, axis):
+        return mean(values, self.p_exists, axis)
+
+    def truth(self, lc: Logic) -> float:
+        """
+        :return: the degree of truth of a closed formula
+        """
+        return float(self._evaluate(lc))
+
+    def degrees(self, lc: Logic) -> np.ndarray:
+        """
+        :return: the degrees of truth of the proposition of a quantified formula for each binding of its variables,
+                 an array having an axis for every variable
+        """
+        return np.broadcast_to(self._evaluate(lc.proposition, self._scope(lc, ())),
+                               tuple(len(var.constants) for var in lc.variables))
+
+    def violations(self, lc: UniversalQuantifier, threshold: float = .5) -> List[Tuple[LogicalConstant, ...]]:
+        """
+        :return: the bindings of the variables of the universal quantifier where its proposition has a degree of
+                 truth lower than the threshold
+        """
+        if type(lc) is not UniversalQuantifier:
+            raise ValueError('Expected a universal quantifier, received `{}`'.format(lc))
+
+        domains = [var.constants for var in lc.variables]
+        rows = np.argwhere(self.degrees(lc) < threshold).tolist()
+        return [tuple(domain[i] for domain, i in zip(domains, row)) for row in rows]
+
+
+def satisfaction(lc: Logic, store: AxiomStore = None, **semantics) -> float:
+    """
+    The degree of truth of a closed formula, see FuzzyEvaluator for the semantics.
+    """
+    return FuzzyEvaluator(store, **semantics).truth(lc)
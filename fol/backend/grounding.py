@@ -0,0 +1,193 @@
+"""
+:Author: Theodor A. Dumitrescu
+:Date: Oct 18, 2026
+:Version: 0.0.1
+"""
+from itertools import product, islice
+from math import prod
+from typing import Iterator, Optional, Mapping, Tuple, Sequence, List
+
+import numpy as np
+
+from fol.axiom_store import AxiomStore
+from fol.backend.cnf import substitute_many, expand_quantifiers, UnboundVariableError, _conjuncts
+from fol.backend.tape import compile_formula
+from fol.backend.vectorized import VectorizedEvaluator, K_TRUE
+from fol.logic import Logic, LogicalConstant, NotLogicalExpression, AndLogicalExpression, OrLogicalExpression, \
+    ImplicationLogicalExpression, EquivalenceLogicalExpression, UniversalQuantifier, LogicalQualifier, \
+    TruthLogicalExpression, TRUE, FALSE, Not, postorder, rebuild, children
+from fol.predicate import LogicalPredicate
+
+# a source of known ground facts: maps a ground atom to its truth value (None when unknown)
+Facts = Mapping[Logic, bool]
+
+_CONNECTIVES = (AndLogicalExpression, OrLogicalExpression, ImplicationLogicalExpression, EquivalenceLogicalExpression)
+
+# bindings of a universal quantifier checked at once against the facts of an AxiomStore
+_BATCH = 4096
+
+
+def _simplify_expand(lc: Logic) -> Sequence[Logic]:
+    op = type(lc)
+    if op is NotLogicalExpression or op in _CONNECTIVES:
+        return children(lc)
+
+    # atoms, terms, truth values and quantifiers (which are not ground)
+    return ()
+
+
+def _simplify_combine(lc: Logic, facts: Optional[Facts], args: List[Logic]) -> Logic:
+    op = type(lc)
+
+    if op is LogicalPredicate:
+        value = facts.get(lc) if facts is not None else None
+        return lc if value is None else (TRUE if value else FALSE)
+
+    if op is NotLogicalExpression:
+        arg = args[0]
+        if type(arg) is TruthLogicalExpression:
+            return FALSE if arg.value else TRUE
+        return Not(arg)
+
+    if op is AndLogicalExpression or op is OrLogicalExpression:
+        absorbing = FALSE if op is AndLogicalExpression else TRUE
+        if any(arg is absorbing for arg in args):
+            return absorbing
+
+        args = [arg for arg in args if type(arg) is not TruthLogicalExpression]
+        if not args:
+            return TRUE if absorbing is FALSE else FALSE
+        if len(args) == 1:
+            return args[0]
+        return rebuild(lc, args)
+
+    if op is ImplicationLogicalExpression:
+        alpha, beta = args
+
+        if alpha is FALSE or beta is TRUE:
+            return TRUE
+        if alpha is TRUE:
+            return beta
+        if beta is FALSE:
+            return Not(alpha)
+        return rebuild(lc, args)
+
+    if op is EquivalenceLogicalExpression:
+        alpha, beta = args
+
+        if type(alpha) is TruthLogicalExpression:
+            alpha, beta = beta, alpha
+        if type(beta) is TruthLogicalExpression:
+            if type(alpha) is TruthLogicalExpression:
+                return TRUE if alpha is beta else FALSE
+            return alpha if beta.value else Not(alpha)
+        return rebuild(lc, args)
+
+    return lc
+
+
+def simplify(lc: Logic, facts: Optional[Facts] = None) -> Logic:
+    """
+    Folds the truth values of the known ground atoms into the formula.
+    :return: TRUE or FALSE if the formula is decided by the facts, otherwise the residual formula
+    """
+    return postorder(lc, lambda node, args: _simplify_combine(node, facts, args), _simplify_expand)
+
+
+def _check_closed_world(lc: LogicalQualifier):
+    for var in lc.variables:
+        if not var.is_closed_world:
+            raise UnboundVariableError('The variable {} of `{}` is not closed world'.format(var, lc))
+
+
+def ground(lc: Logic, facts: Optional[Facts] = None) -> Iterator[Logic]:
+    """
+    Lazily generates the ground instances of a formula whose quantifiers range over closed-world variables.
+    The universal quantifiers at the top level (also nested ones and the ones inside top level conjunctions) are
+    split into independent instances, the bindings of multiple variables are enumerated one at a time without
+    building the cross product. Every other quantifier is expanded in place.
+    Instances satisfied by the known facts are pruned, the others are simplified w.r.t. the facts.
+    :param lc: the formula to ground
+    :param facts: the known ground facts, see `simplify`
+    :raise UnboundVariableError: if a quantified variable is not closed world
+    """
+    evaluator = VectorizedEvaluator(facts) if isinstance(facts, AxiomStore) else None
+    yield from _ground(lc, facts, evaluator)
+
+
+def ground_range(lc: UniversalQuantifier, start: int, stop: int, facts: Optional[Facts] = None) -> Iterator[Logic]:
+    """
+    Like `ground` but only for the bindings of the universal quantifier `lc` whose position (in the order of
+    `itertools.product` over the constants of its variables) is in [start, stop), so the instances of a large
+    quantifier can be generated in independent slices (see fol.backend.parallel).
+    """
+    _check_closed_world(lc)
+    evaluator = VectorizedEvaluator(facts) if isinstance(facts, AxiomStore) else None
+
+    for instance in substitute_many(lc.proposition, lc.variables, _bindings(lc, evaluator, start, stop)):
+        yield from _ground(instance, facts, evaluator)
+
+
+def _ground(lc: Logic, facts: Optional[Facts], evaluator: Optional[VectorizedEvaluator]) -> Iterator[Logic]:
+    for conjunct in _conjuncts(lc):
+        if type(conjunct) is not UniversalQuantifier:
+            instance = simplify(expand_quantifiers(conjunct), facts)
+            if instance is not TRUE:
+                yield instance
+            continue
+
+        _check_closed_world(conjunct)
+        # the proposition is visited once, every binding rebuilds only the nodes where the variables occur
+        for instance in substitute_many(conjunct.proposition, conjunct.variables, _bindings(conjunct, evaluator)):
+            yield from _ground(instance, facts, evaluator)
+
+
+def number_of_bindings(lc: LogicalQualifier) -> int:
+    """
+    :return: the number of bindings of the variables of the quantifier
+    """
+    return prod(len(var.constants) for var in lc.variables)
+
+
+def _bindings(lc: UniversalQuantifier,
+              evaluator: Optional[VectorizedEvaluator],
+              start: int = 0,
+              stop: Optional[int] = None) -> Iterator[Tuple[LogicalConstant, ...]]:
+    """
+    :param evaluator: the VectorizedEvaluator of the facts when they are an AxiomStore, None otherwise
+    :param start: position of the first binding, in the order of `itertools.product` over the domains
+    :param stop: position past the last binding, by default all the bindings
+    :return: the bindings of the variables of the quantifier, without the ones whose instance is satisfied by the
+             facts of the evaluator: the proposition is compiled (see fol.backend.tape) and evaluated in batches
+    """
+    domains = [var.constants for var in lc.variables]
+    size = number_of_bindings(lc)
+    stop = size if stop is None else min(stop, size)
+    if evaluator is None:
+        yield from islice(product(*domains), start, stop)
+        return
+
+    program = compile_formula(lc.proposition, lc.variables)
+    ids = [np.array(evaluator.store.constants.ids(domain), dtype=np.int64) for domain in domains]
+    shape = tuple(map(len, domains))
+
+    for first in range(start, stop, _BATCH):
+        batch = np.stack(np.unravel_index(np.arange(first, min(first + _BATCH, stop)), shape), axis=1)
+        bindings = np.stack([ids[column][batch[:, column]] for column in range(len(domains))], axis=1)
+        for row in batch[program.run(bindings, evaluator) != K_TRUE].tolist():
+            yield tuple(domain[i] for domain, i in zip(domains, row))
+
+
+def count_instances(lc: Logic) -> int:
+    """
+    :return: the number of ground instances generated by `ground` for `lc` when no fact is known
+    """
+    if type(lc) is AndLogicalExpression:
+        return sum(count_instances(arg) for arg in lc._args)
+
+    if type(lc) is not UniversalQuantifier:
+        return 1
+
+    _check_closed_world(lc)
+    # nested universal quantifiers do not depend on the outer binding for their size
+    return number_of_bindings(lc) * count_instances(lc.proposition)
@@ -0,0 +1,243 @@
+"""
+:Author: Theodor A. Dumitrescu
+:Date: Oct 18, 2026
+:Version: 0.0.1
+"""
+import time
+from typing import Dict, List, Optional, Tuple, Set, Iterable
+
+import numpy as np
+
+from fol.axiom_store import AxiomStore, as_ground_literal
+from fol.backend.cnf import CNFEncoder
+from fol.backend.grounding import ground
+from fol.backend.sat import Solver
+from fol.logic import Logic, LogicalConstant, LogicalVariable, LogicalQualifier, UniversalQuantifier, \
+    ExistentialQualifier, AndLogicalExpression, OrLogicalExpression, Not, TRUE, postorder, rebuild, children
+
+
+def _constants_of(lc: Logic) -> Set[LogicalConstant]:
+    found = set()
+    visited = set()
+    stack = [lc]
+    while stack:
+        node = stack.pop()
+        if id(node) in visited:
+            continue
+        visited.add(id(node))
+
+        if type(node) is LogicalConstant:
+            found.add(node)
+        else:
+            stack.extend(children(node))
+
+    return found
+
+
+def _quantified(lc: Logic) -> Tuple[Dict[LogicalVariable, None], List[LogicalVariable], List[LogicalVariable]]:
+    """
+    :return: the quantified variables of the NNF of the formula, the existential ones out of the scope of every
+             universal quantifier and the existential ones within the scope of some
+    """
+    variables: Dict[LogicalVariable, None] = {}
+    outer: List[LogicalVariable] = []
+    nested: List[LogicalVariable] = []
+    stack = [(lc.to_nnf(), False)]
+    while stack:
+        node, universal = stack.pop()
+        if isinstance(node, LogicalQualifier):
+            variables.update(dict.fromkeys(node.variables))
+            if type(node) is ExistentialQualifier:
+                (nested if universal else outer).extend(node.variables)
+            stack.append((node.proposition, universal or type(node) is UniversalQuantifier))
+        elif type(node) is AndLogicalExpression or type(node) is OrLogicalExpression:
+            stack.extend((arg, universal) for arg in node.args)
+
+    return variables, outer, nested
+
+
+class LiftedReasoner(object):
+    """
+    Entailment over the closed-world domains reduced to few representatives of their interchangeable constants.
+    Two constants are interchangeable when they belong to the same domains and have the same ground literals of the
+    unary predicates; the constants occurring in a literal of a predicate of larger arity, or named by an axiom that
+    is not a ground literal or by the query, are never interchangeable with any other (the symmetry is broken).
+    Since the axioms and the negated query are invariant when interchangeable constants are permuted, a class of
+    constants can be replaced by some of its members:
+        - a model of the reduced problem extends to the whole domain copying a representative into the dropped
+          constants, which preserves the truth of every formula (there is no equality), so a reduced model is a
+          countermodel
+        - a model of the whole problem restricted to the representatives still satisfies the universal quantifiers,
+          and the witnesses of the existential quantifiers out of the scope of the universal ones can be permuted
+          into the representatives: a class keeps as many members as those existential variables ranging over it,
+          which covers every pattern of equalities among their witnesses
+    The classes within the domain of an existential variable in the scope of a universal quantifier (whose witnesses
+    depend on the binding) are not reduced, they are grounded as they are.
+    The partition induced by the facts is computed once, the reduced problem is grounded and solved by every query.
+    """
+
+    def __init__(self, store: AxiomStore):
+        self.store: AxiomStore = store
+        self.rules: List[Logic] = []
+        self.inconsistent: bool = False  # some fact has been told with both polarities
+
+        mentioned: Set[LogicalConstant] = set()
+        for axiom in store:
+            literal = as_ground_literal(axiom)
+            if literal is None:
+                self.rules.append(axiom)
+                mentioned.update(_constants_of(axiom))
+            elif store.get(literal[0]) is not literal[1]:
+                self.inconsistent = True
+
+        singletons = store.constants.ids(mentioned)
+        facts = [(predicate, store.fact_ids(predicate, polarity))
+                 for predicate in store.fact_predicates() for polarity in (True, False)]
+        size = len(store.constants)
+        columns = []
+        broken = np.zeros(size, dtype=bool)
+        for predicate, ids in facts:
+            if predicate.number_of_arguments == 1:
+                column = np.zeros(size, dtype=bool)
+                column[ids[:, 0]] = True
+                columns.append(column)
+            else:
+                broken[ids.reshape(-1)] = True
+        broken[singletons] = True
+
+        # the class of every constant id w.r.t. the facts, the ids assigned later have no fact (class 0 when there
+        # is no unary fact at all, otherwise the one of the all-false row)
+        signatures = np.stack(columns, axis=1) if columns else np.zeros((size, 1), dtype=bool)
+        signatures = np.concatenate([signatures, np.zeros((1, signatures.shape[1]), dtype=bool)])
+        _, classes = np.unique(signatures, axis=0, return_inverse=True)
+        classes = classes.reshape(-1).astype(np.int64)
+        self._unknown: int = int(classes[-1])
+        self._classes = classes[:-1]
+        self._classes[broken] = classes.max() + 1 + np.arange(int(np.count_nonzero(broken)))
+
+    def classes(self, formulas: Iterable[Logic]) -> List[Tuple[LogicalConstant, ...]]:
+        """
+        :return: the interchangeable constants of the domains of the quantified variables of the rules and of the
+                 given formulas, class by class
+        """
+        formulas = list(formulas)
+        domains: Dict[Tuple[LogicalConstant, ...], None] = {}
+        broken: Set[LogicalConstant] = set()
+        for lc in self.rules + formulas:
+            domains.update(dict.fromkeys(var.constants for var in _quantified(lc)[0] if var.is_closed_world))
+        for lc in formulas:
+            broken.update(_constants_of(lc))
+
+        universe = list(dict.fromkeys(constant for domain in domains for constant in domain))
+        if not universe:
+            return []
+
+        ids = np.array(self.store.constants.ids(universe), dtype=np.int64)
+        known = ids < len(self._classes)
+        keys = np.full((len(universe), 2 + len(domains)), self._unknown, dtype=np.int64)
+        keys[known, 0] = self._classes[ids[known]]
+        positions = {constant: i for i, constant in enumerate(universe)}
+        singled = [positions[constant] for constant in broken if constant in positions]
+        keys[:, 1] = -1
+        keys[singled, 1] = np.arange(len(singled))
+        for column, domain in enumerate(domains, start=2):
+            keys[:, column] = 0
+            keys[[positions[constant] for constant in domain], column] = 1
+
+        _, first, inverse = np.unique(keys, axis=0, return_index=True, return_inverse=True)
+        inverse = inverse.reshape(-1)
+        members: List[List[LogicalConstant]] = [[] for _ in first]
+        for constant, index in zip(universe, inverse.tolist()):
+            members[index].append(constant)
+
+        # in order of first occurrence in the domains
+        return [tuple(members[index]) for index in np.argsort(first, kind='stable').tolist()]
+
+    def representatives(self, lc: Logic) -> Tuple[Dict[LogicalVariable, LogicalVariable], Dict]:
+        """
+        :return: the variables of the rules and of the negated query bound to the reduced domains (only the ones
+                 losing some constant) and the sizes of the partition (`classes`, `domain_size`, `representatives`)
+        :raise ValueError: if some quantified variable is not closed world
+        """
+        variables: Dict[LogicalVariable, None] = {}
+        witnesses: List[LogicalVariable] = []
+        dependent: List[LogicalVariable] = []
+        for formula in self.rules + [Not(lc)]:
+            found, outer, nested = _quantified(formula)
+            variables.update(found)
+            witnesses.extend(outer)
+            dependent.extend(nested)
+        if not all(var.is_closed_world for var in variables):
+            raise ValueError('Only the closed world domains can be reduced')
+
+        # NOTE(thadumi): the domains are compared as sets, `in` on a tuple of constants would build equivalences
+        domains = {var: set(var.constants) for var in variables}
+        classes = self.classes([lc])
+        kept: Set[LogicalConstant] = set()
+        for members in classes:
+            if any(members[0] in domains[var] for var in dependent):
+                kept.update(members)
+            else:
+                needed = sum(members[0] in domains[var] for var in witnesses)
+                kept.update(members[:max(1, needed)])
+
+        sizes = {'classes': len(classes),
+                 'domain_size': sum(map(len, classes)),
+                 'representatives': len(kept)}
+
+        reduced = {}
+        for var in variables:
+            domain = [constant for constant in var.constants if constant in kept]
+            if len(domain) < len(domains[var]):
+                reduced[var] = LogicalVariable(var.name, constants=domain)
+
+        return reduced, sizes
+
+    def entails(self, lc: Logic, conflict_limit: Optional[int] = None) -> \
+            Optional[Tuple[Optional[bool], Dict[Logic, bool], Dict]]:
+        """
+        :return: whether the query is entailed (None when the solver reached the conflict limit), a countermodel
+                 over the reduced domains and the statistics (the sizes of the partition, `query_clauses`,
+                 `grounding_time`, `solving_time`); None if no domain can be reduced (or the facts are
+                 inconsistent), so the query has to be answered over the whole domains
+        """
+        if self.inconsistent:
+            return None
+
+        start = time.perf_counter()
+        try:
+            reduced, statistics = self.representatives(lc)
+        except ValueError:
+            return None
+        if not reduced:
+            return None
+
+        def combine(node: Logic, args: List[Logic]) -> Logic:
+            if isinstance(node, LogicalQualifier):
+                variables = tuple(reduced.get(var, var) for var in node.variables)
+                if any(new is not var for new, var in zip(variables, node.variables)):
+                    return type(node)(variables, args[0])
+            if type(node) is LogicalVariable:
+                return reduced.get(node, node)
+            return rebuild(node, args) if args else node
+
+        encoder = CNFEncoder()
+        solver = Solver()
+        for formula in self.rules + [Not(lc)]:
+            for instance in ground(postorder(formula, combine), self.store):
+                solver.add_clauses(encoder.encode(instance))
+        statistics['query_clauses'] = len(encoder.clause_set.clauses)
+        statistics['grounding_time'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        status = solver.solve(conflict_limit=conflict_limit)
+        statistics['solving_time'] = time.perf_counter() - start
+
+        if status is None:
+            return None, {}, statistics
+        if not status:
+            return True, {}, statistics
+
+        model = solver.model
+        countermodel = {atom: model.get(var, False) for atom, var in encoder.symbols.atoms() if atom is not TRUE}
+        return False, countermodel, statistics
@@ -0,0 +1,256 @@
+"""
+:Author: Theodor A. Dumitrescu
+:Date: Oct 18, 2026
+:Version: 0.0.1
+"""
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, wait
+from itertools import chain
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from typing import List, Optional, Tuple, Dict, Iterable
+
+import numpy as np
+
+from fol.axiom_store import AxiomStore
+from fol.backend.cnf import CNFEncoder, Clause
+from fol.backend.grounding import ground, ground_range, number_of_bindings, _check_closed_world
+from fol.backend.tape import free_variables
+from fol.logic import Logic, LogicalConstant, UniversalQuantifier, TRUE, children
+from fol.predicate import Predicate, LogicalPredicate
+
+# maximum number of bindings of the universal axioms grounded by a single task
+SPLIT = 1 << 14
+
+# (axiom, first binding, binding past the last one), the whole axiom when the bindings are None
+Item = Tuple[Logic, Optional[int], Optional[int]]
+
+# the facts a worker simplifies the instances with, set by the initializer of its pool (see _initialize)
+_FACTS: Optional[AxiomStore] = None
+
+
+def _context():
+    """
+    Forked workers inherit the facts (and the predicates, see Predicate.__reduce__) without pickling them, but
+    forking a process running other threads may copy a lock held by one of them: the workers are spawned (or
+    started by a fork server) in that case, and they ground without simplifying, which gives more clauses but the
+    same models.
+    """
+    methods = multiprocessing.get_all_start_methods()
+    if 'fork' in methods and threading.active_count() == 1:
+        return multiprocessing.get_context('fork')
+    return multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+
+
+def _initialize(facts: Optional[AxiomStore]):
+    global _FACTS
+
+    _FACTS = facts
+
+
+def _predicates(items: Iterable[Item]) -> List[Predicate]:
+    """
+    :return: the predicates of the axioms in order of first occurrence, the same in the parent and in the workers
+    """
+    found: Dict[Predicate, None] = {}
+    for axiom, _, _ in items:
+        stack = [axiom]
+        while stack:
+            node = stack.pop()
+            if type(node) is LogicalPredicate:
+                found.setdefault(node.predicate)
+            else:
+                stack.extend(reversed(children(node)))
+
+    return list(found)
+
+
+def _plan(axioms: Iterable[Logic], split: int) -> List[List[Item]]:
+    """
+    Splits the grounding of the axioms into tasks of about `split` bindings: the universal axioms larger than that
+    are sliced into binding ranges, the smaller axioms are packed together.
+    """
+    tasks: List[List[Item]] = []
+    task: List[Item] = []
+    size = 0
+
+    for axiom in axioms:
+        if type(axiom) is not UniversalQuantifier:
+            items = [(axiom, None, None)]
+        else:
+            _check_closed_world(axiom)
+            bindings = number_of_bindings(axiom)
+            items = [(axiom, start, min(start + split, bindings)) for start in range(0, bindings, split)]
+
+        for item in items:
+            task.append(item)
+            size += 1 if item[1] is None else item[2] - item[1]
+            if size >= split:
+                tasks.append(task)
+                task, size = [], 0
+
+    if task:
+        tasks.append(task)
+    return tasks
+
+
+def _encode_task(task: Tuple[str, List[Item]]) -> Optional[Tuple[str, Tuple[int, int, int, int], int, List[str]]]:
+    """
+    Grounds and encodes the items of a task into a local clause set, whose variables are numbered from 1.
+    The clauses and the atoms are written as int32 arrays into a shared memory block:
+        - the literals of all the clauses, one after the other
+        - the length of every clause
+        - one row (variable, predicate, constants...) per atom, the predicate is its position in `_predicates` (-1
+          for ⊤) and the constants are positions in the returned list of names, padded with -1
+    :return: the name of the block, the sizes of the arrays (literals, clauses, atoms, row width), the number of
+             local variables and the names of the constants; None when there is no clause
+    """
+    mode, items = task
+    encoder = CNFEncoder(mode)
+    for axiom, start, stop in items:
+        instances = ground(axiom, _FACTS) if start is None else ground_range(axiom, start, stop, _FACTS)
+        for instance in instances:
+            encoder.encode(instance)
+
+    clauses = encoder.clause_set.clauses
+    if not clauses:
+        return None
+
+    lengths = np.fromiter(map(len, clauses), dtype=np.int32, count=len(clauses))
+    literals = np.fromiter(chain.from_iterable(clauses), dtype=np.int32, count=int(lengths.sum()))
+
+    predicates = {predicate: i for i, predicate in enumerate(_predicates(items))}
+    constants: Dict[LogicalConstant, int] = {}
+    atoms = list(encoder.symbols.atoms())
+    # noinspection PyProtectedMember
+    width = 2 + max((len(atom._args) for atom, _ in atoms), default=0)
+    table = np.full((len(atoms), width), -1, dtype=np.int32)
+    for row, (atom, var) in enumerate(atoms):
+        table[row, 0] = var
+        if atom is not TRUE:
+            table[row, 1] = predicates[atom.predicate]
+            # noinspection PyProtectedMember
+            table[row, 2:2 + len(atom._args)] = [constants.setdefault(arg, len(constants)) for arg in atom._args]
+
+    shm = SharedMemory(create=True, size=4 * (len(literals) + len(lengths) + table.size))
+    if os.name == 'posix':  # the parent unlinks the block once read, it must not be released when this worker exits
+        resource_tracker.unregister(getattr(shm, '_name', shm.name), 'shared_memory')
+    try:
+        buffer = np.ndarray(len(literals) + len(lengths) + table.size, dtype=np.int32, buffer=shm.buf)
+        buffer[:len(literals)] = literals
+        buffer[len(literals):len(literals) + len(lengths)] = lengths
+        buffer[len(literals) + len(lengths):] = table.reshape(-1)
+        del buffer
+    finally:
+        shm.close()
+
+    sizes = (len(literals), len(lengths), len(atoms), width)
+    return shm.name, sizes, len(encoder.symbols), [constant.name for constant in constants]
+
+
+def _merge(result, encoder: CNFEncoder, predicates: List[Predicate]) -> List[Clause]:
+    """
+    Adds to the encoder the clauses computed by a worker: its atoms are mapped to the variables of the encoder and
+    its definitional variables to new ones.
+    :return: the added clauses
+    """
+    name, (n_literals, n_clauses, n_atoms, width), n_variables, names = result
+    shm = SharedMemory(name=name)
+    try:
+        buffer = np.ndarray(n_literals + n_clauses + n_atoms * width, dtype=np.int32, buffer=shm.buf)
+        literals = buffer[:n_literals].astype(np.int64)
+        lengths = buffer[n_literals:n_literals + n_clauses].tolist()
+        table = buffer[n_literals + n_clauses:].reshape(n_atoms, width).tolist()
+        del buffer
+    finally:
+        shm.close()
+        shm.unlink()
+
+    symbols = encoder.symbols
+    mapping = np.zeros(n_variables + 1, dtype=np.int64)
+    constants = [LogicalConstant(name) for name in names]
+    for row in table:
+        predicate = row[1]
+        atom = TRUE if predicate < 0 else predicates[predicate](*[constants[i] for i in row[2:] if i >= 0])
+        mapping[row[0]] = symbols.variable(atom)
+
+    definitional = np.flatnonzero(mapping == 0)[1:]
+    if len(definitional):
+        mapping[definitional] = np.arange(len(definitional)) + symbols.fresh(len(definitional))
+
+    flat = (np.sign(literals) * mapping[np.abs(literals)]).tolist()
+    clauses: List[Clause] = []
+    position = 0
+    for length in lengths:
+        clauses.append(tuple(flat[position:position + length]))
+        position += length
+
+    encoder.clause_set.clauses.extend(clauses)
+    return clauses
+
+
+def _release(result):
+    if result is not None:
+        shm = SharedMemory(name=result[0])
+        shm.close()
+        shm.unlink()
+
+
+def encode_parallel(axioms: Iterable[Logic],
+                    encoder: CNFEncoder,
+                    facts: Optional[AxiomStore] = None,
+                    workers: Optional[int] = None,
+                    split: int = SPLIT) -> List[Clause]:
+    """
+    Grounds (see fol.backend.grounding) and encodes the axioms into the clause set of the encoder using a pool of
+    processes. The work is split by axiom and, for the large universal axioms, by ranges of bindings (see `SPLIT`).
+    Every worker encodes its slice with a local numbering of the variables and sends back the clauses as int32
+    arrays through shared memory, the formulas are never pickled back: the atoms travel as (predicate, constants)
+    rows and the definitional variables are renumbered by the parent.
+    The clauses are equisatisfiable with the ones of the serial encoding, but the sub-formulas shared by different
+    slices get a definitional variable per slice.
+    The axioms with free variables and the small workloads (a single task or worker) are encoded in process.
+    :param facts: the known facts the instances are simplified with, they are inherited by the forked workers and
+                  ignored by the spawned ones (on platforms without fork, or when other threads are running)
+    :param workers: number of processes, by default the number of CPUs
+    :param split: maximum number of bindings grounded by a task
+    :return: the added clauses
+    """
+    workers = workers or os.cpu_count() or 1
+    axioms = list(axioms)
+    local = [axiom for axiom in axioms if free_variables(axiom)]
+    tasks = _plan([axiom for axiom in axioms if not free_variables(axiom)], split)
+    if workers <= 1 or len(tasks) <= 1:
+        local, tasks = axioms, []
+
+    start = len(encoder.clause_set.clauses)
+    for axiom in local:
+        for instance in ground(axiom, facts):
+            encoder.encode(instance)
+    clauses = encoder.clause_set.clauses[start:]
+    if not tasks:
+        return clauses
+
+    context = _context()
+    # NOTE(thadumi): the arguments of the initializer are inherited by the forked workers, never pickled
+    with ProcessPoolExecutor(max_workers=min(workers, len(tasks)), mp_context=context, initializer=_initialize,
+                             initargs=(facts if context.get_start_method() == 'fork' else None,)) as executor:
+        pending = [(task, executor.submit(_encode_task, (encoder.mode, task))) for task in tasks]
+        try:
+            while pending:
+                task, future = pending[0]
+                result = future.result()
+                pending.pop(0)
+                if result is not None:
+                    clauses.extend(_merge(result, encoder, _predicates(task)))
+        except BaseException:
+            # the blocks of the tasks not merged yet are released
+            wait([future for _, future in pending])
+            for _, future in pending:
+                if not future.cancelled() and future.exception() is None:
+                    _release(future.result())
+            raise
+
+    return clauses
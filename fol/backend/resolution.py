@@ -0,0 +1,652 @@
+"""
+:Author: Theodor A. Dumitrescu
+:Date: Oct 18, 2026
+:Version: 0.0.1
+"""
+import heapq
+import time
+from collections import deque
+from itertools import count
+from typing import Dict, List, Optional, Tuple, Iterator, Iterable, Set, Any
+
+from fol.axiom_store import AxiomStore, as_ground_literal
+from fol.backend.cnf import FOClause, FOLiteral, Term, first_order_clauses, normalize_clause, \
+    term_variables, map_term
+from fol.logic import Logic, Not, LogicalVariable, LogicalQualifier
+from fol.predicate import Predicate
+
+# default limits of a proof: number of given clauses and seconds
+MAX_GIVEN = 1 << 17
+TIMEOUT = 30.0
+
+# the clauses nesting the Skolem functions deeper are dropped, the proof answers unknown instead of not entailed
+MAX_TERM_DEPTH = 32
+
+# one given clause out of AGE_RATIO is the oldest passive clause instead of the lightest one (fairness)
+AGE_RATIO = 5
+
+# retrieval modes of DiscriminationTree
+UNIFIABLE = 0
+GENERALIZATIONS = 1  # the indexed literals matching the query one
+INSTANCES = 2  # the indexed literals the query one matches
+
+_VARIABLE = '*'
+
+
+def _key(literal: FOLiteral) -> List[Tuple[Any, int]]:
+    """
+    :return: the symbols of the literal in preorder with their arity, starting from (polarity, predicate); every
+             variable is the same symbol `_VARIABLE`
+    """
+    polarity, predicate, args = literal
+    key = [((polarity, predicate), len(args))]
+    stack = list(reversed(args))
+    while stack:
+        term = stack.pop()
+        if type(term) is int:
+            key.append((_VARIABLE, 0))
+        elif type(term) is tuple:
+            key.append(((term[0], len(term) - 1), len(term) - 1))
+            stack.extend(reversed(term[1:]))
+        else:
+            key.append((term, 0))
+
+    return key
+
+
+class _Node(object):
+    __slots__ = ('arity', 'children', 'entries')
+
+    def __init__(self, arity: int):
+        self.arity: int = arity  # of the symbol leading to this node
+        self.children: Dict[Any, '_Node'] = {}
+        self.entries: Dict[Any, None] = {}
+
+
+class DiscriminationTree(object):
+    """
+    Index of literals by the preorder sequence of their symbols, the variables collapsed into a single symbol.
+    The retrieval is imperfect: it returns a superset of the literals unifiable with (or generalizing, or instance
+    of) the query one since the variables are not distinguished, the candidates have to be checked by `unify` or
+    `match`. The literals of different polarity or predicate never meet.
+    """
+
+    def __init__(self):
+        self._root = _Node(0)
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def insert(self, literal: FOLiteral, value):
+        node = self._root
+        for symbol, arity in _key(literal):
+            child = node.children.get(symbol)
+            if child is None:
+                child = node.children[symbol] = _Node(arity)
+            node = child
+
+        if value not in node.entries:
+            node.entries[value] = None
+            self._size += 1
+
+    def remove(self, literal: FOLiteral, value):
+        path = [self._root]
+        symbols = [symbol for symbol, _ in _key(literal)]
+        for symbol in symbols:
+            node = path[-1].children.get(symbol)
+            if node is None:
+                return
+            path.append(node)
+
+        if value in path[-1].entries:
+            del path[-1].entries[value]
+            self._size -= 1
+        # the nodes left without entries nor children are pruned
+        for symbol, parent, node in zip(reversed(symbols), reversed(path[:-1]), reversed(path[1:])):
+            if node.entries or node.children:
+                break
+            del parent.children[symbol]
+
+    def retrieve(self, literal: FOLiteral, mode: int = UNIFIABLE) -> Iterator:
+        """
+        :return: the values of the indexed literals possibly unifiable with (or generalizing, or instance of,
+                 depending on the mode) the given one
+        """
+        query = _key(literal)
+        ends = [0] * len(query)
+        pending: List[int] = []
+        for i in reversed(range(len(query))):
+            # the end of the subterm starting at i: past the ends of its arguments
+            end = i + 1
+            for _ in range(query[i][1]):
+                end = ends[pending.pop()]
+            ends[i] = end
+            pending.append(i)
+
+        return self._retrieve(query, ends, mode)
+
+    def _retrieve(self, query, ends: List[int], mode: int) -> Iterator:
+        stack = [(self._root, 0)]  # the nodes to visit with the position of the query they have reached
+        while stack:
+            node, i = stack.pop()
+            if i == len(query):
+                yield from node.entries
+                continue
+
+            symbol = query[i][0]
+            if symbol is _VARIABLE:
+                if mode == GENERALIZATIONS:
+                    child = node.children.get(_VARIABLE)
+                    if child is not None:
+                        stack.append((child, i + 1))
+                else:
+                    stack.extend((child, i + 1) for child in reversed(self._skip(node, 1)))
+                continue
+
+            if mode != INSTANCES and i:
+                # an indexed variable matches the whole subterm of the query
+                child = node.children.get(_VARIABLE)
+                if child is not None:
+                    stack.append((child, ends[i]))
+            child = node.children.get(symbol)
+            if child is not None:
+                stack.append((child, i + 1))
+
+    @staticmethod
+    def _skip(node: _Node, terms: int) -> List[_Node]:
+        """
+        :return: the nodes reached skipping the given number of indexed terms
+        """
+        reached = []
+        stack = [(node, terms)]
+        while stack:
+            node, terms = stack.pop()
+            if not terms:
+                reached.append(node)
+            else:
+                stack.extend((child, terms - 1 + child.arity) for child in reversed(node.children.values()))
+        return reached
+
+
+def _walk(term: Term, substitution: Dict[int, Term]) -> Term:
+    while type(term) is int:
+        bound = substitution.get(term)
+        if bound is None:
+            break
+        term = bound
+    return term
+
+
+def _occurs(var: int, term: Term, substitution: Dict[int, Term]) -> bool:
+    stack = [term]
+    while stack:
+        term = _walk(stack.pop(), substitution)
+        if type(term) is int:
+            if term == var:
+                return True
+        elif type(term) is tuple:
+            stack.extend(term[1:])
+    return False
+
+
+def _equal(a: Term, b: Term) -> bool:
+    stack = [(a, b)]
+    while stack:
+        a, b = stack.pop()
+        # NOTE(thadumi): the constants are hash-consed, `==` on them would build an equivalence
+        if a is b:
+            continue
+        if type(a) is int or type(b) is int:
+            if type(a) is not type(b) or a != b:
+                return False
+        elif type(a) is tuple and type(b) is tuple and len(a) == len(b) and a[0] == b[0]:
+            stack.extend(zip(a[1:], b[1:]))
+        else:
+            return False
+    return True
+
+
+def unify(xs: Iterable[Term], ys: Iterable[Term], substitution: Dict[int, Term] = None) -> Optional[Dict[int, Term]]:
+    """
+    Robinson unification, with occurs check, of two sequences of terms sharing the variables.
+    :return: the most general unifier (triangular, see `substitute`) extending the given one, None if there is none
+    """
+    substitution = {} if substitution is None else dict(substitution)
+    stack = list(zip(xs, ys))
+    while stack:
+        a, b = stack.pop()
+        a, b = _walk(a, substitution), _walk(b, substitution)
+        # NOTE(thadumi): the equal compound terms are decomposed below, comparing them first would be quadratic
+        if a is b or (type(a) is int and type(b) is int and a == b):
+            continue
+
+        if type(a) is int:
+            if _occurs(a, b, substitution):
+                return None
+            substitution[a] = b
+        elif type(b) is int:
+            if _occurs(b, a, substitution):
+                return None
+            substitution[b] = a
+        elif type(a) is tuple and type(b) is tuple and len(a) == len(b) and a[0] == b[0]:
+            stack.extend(zip(a[1:], b[1:]))
+        else:
+            return None
+
+    return substitution
+
+
+def match(patterns: Iterable[Term], terms: Iterable[Term], substitution: Dict[int, Term] = None) -> \
+        Optional[Dict[int, Term]]:
+    """
+    One way unification: only the variables of the patterns are bound, the ones of the terms are left untouched
+    (even if they have the same number).
+    :return: the substitution making the patterns equal to the terms, None if there is none
+    """
+    substitution = {} if substitution is None else dict(substitution)
+    stack = list(zip(patterns, terms))
+    while stack:
+        pattern, term = stack.pop()
+        if type(pattern) is int:
+            bound = substitution.setdefault(pattern, term)
+            if bound is not term and not _equal(bound, term):
+                return None
+        elif type(pattern) is tuple and type(term) is tuple and len(pattern) == len(term) and pattern[0] == term[0]:
+            stack.extend(zip(pattern[1:], term[1:]))
+        elif pattern is not term:
+            return None
+
+    return substitution
+
+
+def substitute(term: Term, substitution: Dict[int, Term]) -> Term:
+    if type(term) is not int and type(term) is not tuple:
+        return term
+    return map_term(term, lambda t: _walk(t, substitution))
+
+
+def _shift(term: Term, offset: int) -> Term:
+    if type(term) is int:
+        return term + offset
+    if type(term) is not tuple:
+        return term
+    return map_term(term, lambda t: t + offset if type(t) is int else t)
+
+
+def subsumes(c: FOClause, d: FOClause) -> bool:
+    """
+    :return: whether an instance of the clause `c` is a sub-multiset of the clause `d`, so a clause never subsumes
+             its own factors
+    """
+    if len(c) > len(d):
+        return False
+
+    def search(i: int, substitution: Dict[int, Term], used: Tuple[int, ...]) -> bool:
+        if i == len(c):
+            return True
+        polarity, predicate, args = c[i]
+        for j, (other_polarity, other_predicate, other_args) in enumerate(d):
+            if j in used or other_polarity is not polarity or other_predicate is not predicate:
+                continue
+            extended = match(args, other_args, substitution)
+            if extended is not None and search(i + 1, extended, used + (j,)):
+                return True
+        return False
+
+    return search(0, {}, ())
+
+
+def _weight(term: Term) -> int:
+    weight = 0
+    stack = [term]
+    while stack:
+        term = stack.pop()
+        weight += 1
+        if type(term) is tuple:
+            stack.extend(term[1:])
+    return weight
+
+
+def _depth(term: Term) -> int:
+    """
+    :return: the nesting of the Skolem functions in the term, 0 for a variable or a constant
+    """
+    depth = 0
+    stack = [(term, 0)]
+    while stack:
+        term, level = stack.pop()
+        if type(term) is tuple and len(term) > 1:
+            stack.extend((arg, level + 1) for arg in term[1:])
+        else:
+            depth = max(depth, level)
+    return depth
+
+
+class _Clause(object):
+    __slots__ = ('literals', 'variables', 'weight', 'number', 'axiom', 'state', 'indexed', 'selected')
+
+    PASSIVE, ACTIVE, DELETED = range(3)
+
+    def __init__(self, literals: FOClause, number: int, axiom: bool):
+        self.literals: FOClause = literals
+        self.variables: int = 1 + max((var for _, _, args in literals for arg in args for var in term_variables(arg)),
+                                      default=-1)
+        weights = [1 + sum(map(_weight, args)) for _, _, args in literals]
+        self.weight: int = sum(weights)
+        self.number: int = number
+        self.axiom: bool = axiom  # derived from the axioms only
+        self.state: int = _Clause.PASSIVE
+        # the literal indexed for the forward subsumption, the heaviest one so the retrieval is selective
+        self.indexed: int = max(range(len(literals)), key=weights.__getitem__, default=0)
+        # the only literal a resolution can use, the heaviest negative one; None if the clause is positive
+        self.selected: Optional[int] = max((i for i, literal in enumerate(literals) if not literal[0]),
+                                           key=weights.__getitem__, default=None)
+
+    def eligible(self) -> Iterable[int]:
+        return range(len(self.literals)) if self.selected is None else (self.selected,)
+
+
+def _closed_world_variables(lc: Logic) -> Set[LogicalVariable]:
+    found = set()
+    stack = [lc]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, LogicalQualifier):
+            found.update(var for var in node.variables if var.is_closed_world)
+        # noinspection PyProtectedMember
+        stack.extend(getattr(node, '_args', ()))
+    return found
+
+
+class ResolutionProver(object):
+    """
+    Saturation based refutation prover over the first-order clauses of the axioms (see
+    fol.backend.cnf.first_order_clauses), for the queries whose variables cannot be grounded.
+    The calculus is binary resolution with negative selection: a clause having negative literals can be resolved
+    only on its heaviest negative one, against a positive clause, and only the positive clauses are factored. It is
+    refutationally complete, so a saturation without the empty clause means the query is not entailed, and on
+    function-free Horn axioms it derives the same atoms as forward chaining.
+    The given clause loop picks the passive clauses by weight (one out of AGE_RATIO by age) and resolves the given
+    clause against the active ones, the redundant clauses are dropped by forward and backward subsumption.
+    The active literals are kept in discrimination trees: the partners of a resolution are the unifiable eligible
+    literals of opposite polarity, the forward subsumption retrieves the generalizations of the new clause and the
+    backward one the instances of the given clause.
+    The clauses derived from the axioms only are kept for the next queries (so the axioms are saturated
+    incrementally across them), the ones depending on the query are retracted once it is answered.
+    When the prover reads a store (see `update`) the facts of its truth tensors become unit clauses, only for the
+    predicates occurring in the other axioms or in the queries.
+    """
+
+    def __init__(self, store: AxiomStore = None, max_term_depth: int = MAX_TERM_DEPTH):
+        """
+        :param max_term_depth: the clauses nesting the Skolem functions deeper are dropped (see `prove`), so the
+                               axioms generating ever deeper terms do not exhaust the memory
+        """
+        self.store: Optional[AxiomStore] = store
+        self.max_term_depth: int = max_term_depth
+        self._reset()
+
+    def _reset(self):
+        self._numbers = count()
+        self._active: Dict[_Clause, None] = {}
+        self._eligible = DiscriminationTree()  # (clause, position) of the active literals a resolution can use
+        self._literals = DiscriminationTree()  # (clause, position) of every active literal
+        self._subsumers = DiscriminationTree()  # the active clause by its indexed literal
+        # both hold every passive clause, the ones picked from the other are skipped lazily
+        self._heap: List[Tuple[int, int, _Clause]] = []
+        self._queue: deque = deque()
+        self._picks: int = 0
+        self._inconsistent: bool = False  # the empty clause has been derived from the axioms
+        self._truncated_axioms: bool = False  # a clause derived from the axioms only has been dropped by depth
+        self._truncated: bool = False  # a clause depending on the query has been dropped by depth
+        self._position: int = 0  # store[:_position] has been read
+        self._journal: Dict[Predicate, int] = {}  # positions in the journals of the truth tensors already read
+        self._relevant: Set[Predicate] = set()
+        self._versions: Dict[LogicalVariable, int] = {}
+        self.statistics: Dict[str, int] = {'given_clauses': 0, 'generated_clauses': 0, 'subsumed_clauses': 0,
+                                           'truncated_clauses': 0}
+
+    def __len__(self):
+        """
+        :return: the number of active clauses
+        """
+        return len(self._active)
+
+    def add_formula(self, lc: Logic) -> int:
+        """
+        :return: the number of clauses of the axiom added (the subsumed ones are skipped)
+        """
+        literal = as_ground_literal(lc)
+        if literal is not None:
+            atom, polarity = literal
+            # noinspection PyProtectedMember
+            return self.add_clauses([((polarity, atom.predicate, atom._args),)])
+
+        for var in _closed_world_variables(lc):
+            self._versions[var] = var.version
+        clauses = first_order_clauses(lc)
+        self._relevant.update(predicate for clause in clauses for _, predicate, _ in clause)
+        return self.add_clauses(clauses)
+
+    def add_clauses(self, clauses: Iterable[FOClause]) -> int:
+        """
+        Adds axiom clauses, they are saturated with the other axioms by the next proof.
+        :return: the number of clauses added
+        """
+        return sum(self._push(clause, axiom=True) for clause in clauses)
+
+    def update(self) -> int:
+        """
+        Adds the axioms and the facts told to the store since the previous update.
+        :return: the number of clauses added
+        """
+        if self.store is None:
+            return 0
+        if any(var.version != version for var, version in self._versions.items()):
+            self._reset()
+
+        added = 0
+        for axiom in self.store[self._position:]:
+            added += self.add_formula(axiom)
+        self._position = len(self.store)
+
+        return added + self._read_tables()
+
+    def _read_tables(self) -> int:
+        added = 0
+        for predicate in self.store.tabled_predicates():
+            if predicate not in self._relevant:
+                continue
+            table = self.store.table(predicate)
+            ids, values = table.changes_since(self._journal.get(predicate, 0))
+            self._journal[predicate] = table.journal_size
+            constants = self.store.constants
+            added += self.add_clauses([((value, predicate, tuple(map(constants.constant, row))),)
+                                       for row, value in zip(ids.tolist(), values.astype(bool).tolist())])
+        return added
+
+    def _push(self, literals: FOClause, axiom: bool) -> bool:
+        """
+        Adds a new clause to the passive ones, unless an active clause subsumes it.
+        :return: whether the clause has been added
+        """
+        self.statistics['generated_clauses'] += 1
+        if not literals:
+            self._inconsistent |= axiom
+            return False
+        if max((_depth(arg) for _, _, args in literals for arg in args), default=0) > self.max_term_depth:
+            self.statistics['truncated_clauses'] += 1
+            if axiom:
+                self._truncated_axioms = True
+            else:
+                self._truncated = True
+            return False
+        if self._subsumed(literals, axiom):
+            self.statistics['subsumed_clauses'] += 1
+            return False
+
+        clause = _Clause(literals, next(self._numbers), axiom)
+        heapq.heappush(self._heap, (clause.weight, clause.number, clause))
+        self._queue.append(clause)
+        return True
+
+    def _pick(self) -> Optional[_Clause]:
+        """
+        :return: the next given clause, None if there is no passive clause
+        """
+        while True:
+            self._picks += 1
+            pool = self._queue if self._picks % AGE_RATIO == 0 else self._heap
+            if not pool:
+                return None
+            clause = self._queue.popleft() if pool is self._queue else heapq.heappop(self._heap)[2]
+            if clause.state == _Clause.PASSIVE:
+                return clause
+
+    def _activate(self, clause: _Clause):
+        clause.state = _Clause.ACTIVE
+        self._active[clause] = None
+        for i, literal in enumerate(clause.literals):
+            self._literals.insert(literal, (clause, i))
+        for i in clause.eligible():
+            self._eligible.insert(clause.literals[i], (clause, i))
+        self._subsumers.insert(clause.literals[clause.indexed], clause)
+
+    def _delete(self, clause: _Clause):
+        if clause.state == _Clause.ACTIVE:
+            del self._active[clause]
+            for i, literal in enumerate(clause.literals):
+                self._literals.remove(literal, (clause, i))
+            for i in clause.eligible():
+                self._eligible.remove(clause.literals[i], (clause, i))
+            self._subsumers.remove(clause.literals[clause.indexed], clause)
+        clause.state = _Clause.DELETED
+
+    def _subsumed(self, literals: FOClause, axiom: bool) -> bool:
+        """
+        :return: whether an active clause subsumes the given one, a clause derived from the axioms only can be
+                 subsumed only by a clause derived from the axioms too since the others are retracted
+        """
+        for literal in literals:
+            for clause in self._subsumers.retrieve(literal, GENERALIZATIONS):
+                if (clause.axiom or not axiom) and subsumes(clause.literals, literals):
+                    return True
+        return False
+
+    def _subsumed_by(self, given: _Clause) -> Set[_Clause]:
+        """
+        :return: the active clauses subsumed by the given one
+        """
+        candidates = {clause for clause, _ in self._literals.retrieve(given.literals[0], INSTANCES)}
+        return {clause for clause in candidates if clause is not given and (given.axiom or not clause.axiom) and
+                subsumes(given.literals, clause.literals)}
+
+    @staticmethod
+    def _factors(clause: _Clause) -> Iterator[FOClause]:
+        literals = clause.literals
+        for i, (polarity, predicate, args) in enumerate(literals):
+            for j in range(i + 1, len(literals)):
+                other_polarity, other_predicate, other_args = literals[j]
+                if other_polarity is not polarity or other_predicate is not predicate:
+                    continue
+                substitution = unify(args, other_args)
+                if substitution is not None:
+                    factor = normalize_clause(_instance(literals[:j] + literals[j + 1:], substitution))
+                    if factor is not None:
+                        yield factor
+
+    def _inferences(self, given: _Clause) -> Iterator[Tuple[FOClause, bool]]:
+        """
+        :return: the resolvents of the given clause with the active ones and its factors, whether they are derived
+                 from the axioms only
+        """
+        literals = given.literals
+        offset = given.variables
+        for i in given.eligible():
+            polarity, predicate, args = literals[i]
+            for partner, j in list(self._eligible.retrieve((not polarity, predicate, args), UNIFIABLE)):
+                renamed = tuple((p, q, tuple(_shift(arg, offset) for arg in a)) for p, q, a in partner.literals)
+                substitution = unify(args, renamed[j][2])
+                if substitution is None:
+                    continue
+                resolvent = normalize_clause(_instance(literals[:i] + literals[i + 1:] + renamed[:j] +
+                                                       renamed[j + 1:], substitution))
+                if resolvent is not None:
+                    yield resolvent, given.axiom and partner.axiom
+
+        if given.selected is None:
+            for factor in self._factors(given):
+                yield factor, given.axiom
+
+    def _saturate(self, max_given: int, deadline: Optional[float]) -> Optional[bool]:
+        statistics = self.statistics
+        while not self._inconsistent:
+            given = self._pick()
+            if given is None:
+                # saturated, unless some clauses have been dropped
+                return None if self._truncated or self._truncated_axioms else False
+
+            if self._subsumed(given.literals, given.axiom):
+                given.state = _Clause.DELETED
+                statistics['subsumed_clauses'] += 1
+                continue
+            for clause in self._subsumed_by(given):
+                self._delete(clause)
+                statistics['subsumed_clauses'] += 1
+            self._activate(given)
+            statistics['given_clauses'] += 1
+
+            for literals, axiom in list(self._inferences(given)):
+                if not literals:
+                    self._inconsistent |= axiom
+                    return True
+                self._push(literals, axiom)
+
+            if statistics['given_clauses'] >= max_given or (deadline is not None and time.perf_counter() > deadline):
+                return None
+
+        return True
+
+    def _retract(self):
+        """
+        Drops the clauses depending on the query.
+        """
+        for clause in [clause for clause in self._active if not clause.axiom]:
+            self._delete(clause)
+        self._heap = [entry for entry in self._heap if entry[2].axiom and entry[2].state == _Clause.PASSIVE]
+        heapq.heapify(self._heap)
+        self._queue = deque(clause for clause in self._queue if clause.axiom and clause.state == _Clause.PASSIVE)
+
+    def prove(self, query: Logic, max_given: int = MAX_GIVEN, timeout: Optional[float] = TIMEOUT) -> Optional[bool]:
+        """
+        Refutes the negation of the query by saturation, see the statistics of the proof in `statistics`
+        (`given_clauses`, `generated_clauses`, `subsumed_clauses`, `truncated_clauses`).
+        :param max_given: maximum number of given clauses
+        :param timeout: maximum number of seconds
+        :return: True if the query is entailed (the empty clause has been derived), False if the clauses have been
+                 saturated without deriving it, None if a limit has been reached (including a clause dropped by
+                 `max_term_depth`)
+        """
+        self.update()
+        query_clauses = first_order_clauses(Not(query))
+        self._relevant.update(predicate for clause in query_clauses for _, predicate, _ in clause)
+        if self.store is not None:
+            self._read_tables()
+
+        self.statistics = {'given_clauses': 0, 'generated_clauses': 0, 'subsumed_clauses': 0, 'truncated_clauses': 0}
+        self._truncated = False
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        try:
+            for literals in query_clauses:
+                if not literals:
+                    return True
+                self._push(literals, axiom=False)
+            return self._saturate(max_given, deadline)
+        finally:
+            self._retract()
+
+
+def _instance(literals: Iterable[FOLiteral], substitution: Dict[int, Term]) -> List[FOLiteral]:
+    return [(polarity, predicate, tuple(substitute(arg, substitution) for arg in args))
+            for polarity, predicate, args in literals]
@@ -0,0 +1,444 @@
+"""
+:Author: Theodor A. Dumitrescu
+:Date: Oct 18, 2026
+:Version: 0.0.1
+"""
+import heapq
+from typing import List, Optional, Iterable, Dict
+
+# values of the variables
+_TRUE = 1
+_FALSE = -1
+_UNASSIGNED = 0
+
+
+class _Clause(object):
+    __slots__ = ('lits', 'learnt', 'activity', 'lbd', 'deleted')
+
+    def __init__(self, lits: List[int], learnt: bool = False, lbd: int = 0):
+        # the first two literals are the watched ones, the propagated literal is always lits[0]
+        self.lits: List[int] = lits
+        self.learnt: bool = learnt
+        self.activity: float = 0.
+        self.lbd: int = lbd
+        self.deleted: bool = False
+
+
+def _index(lit: int) -> int:
+    return 2 * lit if lit > 0 else -2 * lit + 1
+
+
+def luby(i: int) -> int:
+    """
+    :return: the i-th element (starting from 0) of the Luby sequence 1 1 2 1 1 2 4 1 1 2 ...
+    """
+    size, seq = 1, 0
+    while size < i + 1:
+        seq += 1
+        size = 2 * size + 1
+
+    while size - 1 != i:
+        size = (size - 1) >> 1
+        seq -= 1
+        i = i % size
+
+    return 1 << seq
+
+
+class Solver(object):
+    """
+    Conflict driven clause learning SAT solver over integer literals (DIMACS convention).
+    Features two watched literals propagation, first UIP learning with clause minimization, VSIDS branching with
+    phase saving, Luby restarts and LBD based reduction of the learnt clauses.
+    Clauses can be added between calls of `solve`, which accepts assumption literals, so the learnt clauses are
+    kept across incremental queries.
+    """
+
+    def __init__(self,
+                 restart_base: int = 100,
+                 variable_decay: float = 0.95,
+                 clause_decay: float = 0.999):
+        self._values: List[int] = [_UNASSIGNED]
+        self._levels: List[int] = [0]
+        self._reasons: List[Optional[_Clause]] = [None]
+        self._activity: List[float] = [0.]
+        self._phases: List[bool] = [False]
+        self._seen: List[bool] = [False]
+        self._watches: List[List[_Clause]] = [[], []]
+
+        self._clauses: List[_Clause] = []
+        self._learnts: List[_Clause] = []
+        self._trail: List[int] = []
+        self._trail_lim: List[int] = []
+        self._qhead: int = 0
+        self._heap: list = []
+
+        self._var_inc: float = 1.
+        self._var_decay: float = variable_decay
+        self._cla_inc: float = 1.
+        self._cla_decay: float = clause_decay
+        self._restart_base: int = restart_base
+        self._max_learnts: float = 1000.
+        self._ok: bool = True
+
+        self.model: Dict[int, bool] = {}
+        self.stats: Dict[str, int] = {'conflicts': 0, 'decisions': 0, 'propagations': 0, 'restarts': 0,
+                                      'learnt': 0, 'deleted': 0}
+
+    @property
+    def number_of_variables(self) -> int:
+        return len(self._values) - 1
+
+    @property
+    def number_of_clauses(self) -> int:
+        return len(self._clauses)
+
+    @property
+    def number_of_learnts(self) -> int:
+        return len(self._learnts)
+
+    def _ensure_variable(self, var: int):
+        while len(self._values) <= var:
+            new = len(self._values)
+            self._values.append(_UNASSIGNED)
+            self._levels.append(0)
+            self._reasons.append(None)
+            self._activity.append(0.)
+            self._phases.append(False)
+            self._seen.append(False)
+            self._watches.append([])
+            self._watches.append([])
+            heapq.heappush(self._heap, (0., new))
+
+    def _value(self, lit: int) -> int:
+        value = self._values[lit if lit > 0 else -lit]
+        return value if lit > 0 else -value
+
+    def add_clause(self, clause: Iterable[int]) -> bool:
+        """
+        Adds a clause to the problem, simplifying it w.r.t. the facts already known at the root level.
+        :return: False if the problem became trivially unsatisfiable
+        """
+        if not self._ok:
+            return False
+
+        self._cancel_until(0)
+
+        clause = list(clause)
+        if 0 in clause:
+            raise ValueError('0 is not a valid literal')
+        if clause:
+            self._ensure_variable(max(map(abs, clause)))
+
+        lits = []
+        distinct = set(clause)
+        for lit in dict.fromkeys(clause):
+            if -lit in distinct:
+                return True  # tautology
+
+            value = self._value(lit)
+            if value == _TRUE:
+                return True  # already satisfied
+            if value == _UNASSIGNED:
+                lits.append(lit)
+
+        if not lits:
+            self._ok = False
+        elif len(lits) == 1:
+            self._enqueue(lits[0], None)
+            self._ok = self._propagate() is None
+        else:
+            c = _Clause(lits)
+            self._clauses.append(c)
+            self._attach(c)
+
+        return self._ok
+
+    def add_clauses(self, clauses: Iterable[Iterable[int]]) -> bool:
+        for clause in clauses:
+            if not self.add_clause(clause):
+                return False
+        return True
+
+    def _attach(self, c: _Clause):
+        self._watches[_index(c.lits[0])].append(c)
+        self._watches[_index(c.lits[1])].append(c)
+
+    def _enqueue(self, lit: int, reason: Optional[_Clause]):
+        var = lit if lit > 0 else -lit
+        self._values[var] = _TRUE if lit > 0 else _FALSE
+        self._levels[var] = len(self._trail_lim)
+        self._reasons[var] = reason
+        self._trail.append(lit)
+
+    def _propagate(self) -> Optional[_Clause]:
+        """
+        :return: the conflicting clause if any
+        """
+        values = self._values
+        watches = self._watches
+        trail = self._trail
+        propagations = 0
+
+        while self._qhead < len(trail):
+            false_lit = -trail[self._qhead]
+            self._qhead += 1
+            propagations += 1
+
+            index = 2 * false_lit if false_lit > 0 else -2 * false_lit + 1
+            watchers = watches[index]
+            kept = watches[index] = []
+
+            for i, c in enumerate(watchers):
+                if c.deleted:
+                    continue
+
+                lits = c.lits
+                if lits[0] == false_lit:
+                    lits[0], lits[1] = lits[1], false_lit
+
+                first = lits[0]
+                first_value = values[first] if first > 0 else -values[-first]
+                if first_value == _TRUE:
+                    kept.append(c)
+                    continue
+
+                for k in range(2, len(lits)):
+                    lit = lits[k]
+                    if (values[lit] if lit > 0 else -values[-lit]) != _FALSE:
+                        lits[1], lits[k] = lit, false_lit
+                        watches[2 * lit if lit > 0 else -2 * lit + 1].append(c)
+                        break
+                else:
+                    kept.append(c)
+                    if first_value == _FALSE:
+                        kept.extend(watchers[i + 1:])
+                        self._qhead = len(trail)
+                        self.stats['propagations'] += propagations
+                        return c
+
+                    self._enqueue(first, c)
+
+        self.stats['propagations'] += propagations
+        return None
+
+    def _bump_variable(self, var: int):
+        self._activity[var] += self._var_inc
+        if self._activity[var] > 1e100:
+            self._activity = [activity * 1e-100 for activity in self._activity]
+            self._var_inc *= 1e-100
+            self._rebuild_heap()
+        elif self._values[var] == _UNASSIGNED:
+            heapq.heappush(self._heap, (-self._activity[var], var))
+
+    def _bump_clause(self, c: _Clause):
+        c.activity += self._cla_inc
+        if c.activity > 1e20:
+            for learnt in self._learnts:
+                learnt.activity *= 1e-20
+            self._cla_inc *= 1e-20
+
+    def _rebuild_heap(self):
+        self._heap = [(-self._activity[var], var) for var in range(1, len(self._values))
+                      if self._values[var] == _UNASSIGNED]
+        heapq.heapify(self._heap)
+
+    def _analyze(self, confl: _Clause):
+        """
+        First UIP conflict analysis.
+        :return: the learnt clause (asserting literal first, highest level literal second) and the backjump level
+        """
+        seen = self._seen
+        levels = self._levels
+        level = len(self._trail_lim)
+        learnt = [0]
+        counter = 0
+        lit = 0
+        index = len(self._trail) - 1
+
+        while True:
+            if confl.learnt:
+                self._bump_clause(confl)
+
+            for q in confl.lits if lit == 0 else confl.lits[1:]:
+                var = q if q > 0 else -q
+                if not seen[var] and levels[var] > 0:
+                    seen[var] = True
+                    self._bump_variable(var)
+                    if levels[var] >= level:
+                        counter += 1
+                    else:
+                        learnt.append(q)
+
+            while not seen[abs(self._trail[index])]:
+                index -= 1
+            lit = self._trail[index]
+            index -= 1
+            confl = self._reasons[abs(lit)]
+            seen[abs(lit)] = False
+            counter -= 1
+            if counter == 0:
+                break
+
+        learnt[0] = -lit
+
+        # local minimization: a literal implied by other literals of the clause is redundant
+        minimized = [learnt[0]]
+        for q in learnt[1:]:
+            reason = self._reasons[abs(q)]
+            if reason is None or any(not seen[abs(r)] and levels[abs(r)] > 0 for r in reason.lits[1:]):
+                minimized.append(q)
+        for q in learnt[1:]:
+            seen[abs(q)] = False
+        learnt = minimized
+
+        backjump = 0
+        if len(learnt) > 1:
+            highest = max(range(1, len(learnt)), key=lambda k: levels[abs(learnt[k])])
+            learnt[1], learnt[highest] = learnt[highest], learnt[1]
+            backjump = levels[abs(learnt[1])]
+
+        return learnt, backjump
+
+    def _cancel_until(self, level: int):
+        if len(self._trail_lim) <= level:
+            return
+
+        heap = self._heap
+        for lit in self._trail[self._trail_lim[level]:]:
+            var = lit if lit > 0 else -lit
+            self._values[var] = _UNASSIGNED
+            self._reasons[var] = None
+            self._phases[var] = lit > 0
+            heapq.heappush(heap, (-self._activity[var], var))
+
+        self._qhead = self._trail_lim[level]
+        del self._trail[self._trail_lim[level]:]
+        del self._trail_lim[level:]
+
+        if len(heap) > 4 * len(self._values) + 1000:
+            self._rebuild_heap()
+
+    def _pick_branch_literal(self) -> Optional[int]:
+        heap = self._heap
+        values = self._values
+        while heap:
+            var = heapq.heappop(heap)[1]
+            if values[var] == _UNASSIGNED:
+                return var if self._phases[var] else -var
+
+        return None
+
+    def _locked(self, c: _Clause) -> bool:
+        lit = c.lits[0]
+        return self._reasons[abs(lit)] is c and self._value(lit) == _TRUE
+
+    def _reduce_learnts(self):
+        self._learnts.sort(key=lambda c: (c.lbd, -c.activity))
+        half = len(self._learnts) // 2
+        kept = self._learnts[:half]
+        for c in self._learnts[half:]:
+            if c.lbd <= 2 or self._locked(c):
+                kept.append(c)
+            else:
+                c.deleted = True
+                self.stats['deleted'] += 1
+
+        self._learnts = kept
+
+    def _search(self, conflicts_before_restart: int, assumptions: List[int]) -> Optional[bool]:
+        conflicts = 0
+
+        while True:
+            confl = self._propagate()
+            if confl is not None:
+                conflicts += 1
+                self.stats['conflicts'] += 1
+
+                if not self._trail_lim:
+                    self._ok = False
+                    return False
+
+                learnt, backjump = self._analyze(confl)
+                self._cancel_until(backjump)
+
+                if len(learnt) == 1:
+                    self._enqueue(learnt[0], None)
+                else:
+                    lbd = len({self._levels[abs(lit)] for lit in learnt})
+                    c = _Clause(learnt, learnt=True, lbd=lbd)
+                    self._learnts.append(c)
+                    self._attach(c)
+                    self._bump_clause(c)
+                    self._enqueue(learnt[0], c)
+                    self.stats['learnt'] += 1
+
+                self._var_inc /= self._var_decay
+                self._cla_inc /= self._cla_decay
+                continue
+
+            if conflicts >= conflicts_before_restart:
+                self._cancel_until(0)
+                return None
+
+            if len(self._learnts) - len(self._trail) >= self._max_learnts:
+                self._reduce_learnts()
+                self._max_learnts *= 1.1
+
+            decision = 0
+            while len(self._trail_lim) < len(assumptions):
+                lit = assumptions[len(self._trail_lim)]
+                value = self._value(lit)
+                if value == _TRUE:
+                    self._trail_lim.append(len(self._trail))  # dummy decision level
+                elif value == _FALSE:
+                    return False
+                else:
+                    decision = lit
+                    break
+
+            if decision == 0:
+                decision = self._pick_branch_literal()
+                if decision is None:
+                    return True
+                self.stats['decisions'] += 1
+
+            self._trail_lim.append(len(self._trail))
+            self._enqueue(decision, None)
+
+    def solve(self, assumptions: Iterable[int] = (), conflict_limit: Optional[int] = None) -> Optional[bool]:
+        """
+        :param assumptions: literals assumed to be true only for this call
+        :param conflict_limit: maximum number of conflicts before giving up
+        :return: True if satisfiable (see `model`), False if unsatisfiable (under the assumptions),
+                 None if the conflict limit has been reached
+        """
+        self.model = {}
+        if not self._ok:
+            return False
+
+        assumptions = list(assumptions)
+        for lit in assumptions:
+            self._ensure_variable(abs(lit))
+
+        self._max_learnts = max(self._max_learnts, len(self._clauses) / 3)
+        start = self.stats['conflicts']
+        restart = 0
+        status = None
+
+        while status is None:
+            budget = self._restart_base * luby(restart)
+            if conflict_limit is not None:
+                budget = min(budget, start + conflict_limit - self.stats['conflicts'])
+                if budget <= 0:
+                    break
+
+            status = self._search(budget, assumptions)
+            restart += 1
+            self.stats['restarts'] += status is None
+
+        if status:
+            self.model = {var: self._values[var] == _TRUE for var in range(1, len(self._values))}
+
+        self._cancel_until(0)
+        return status
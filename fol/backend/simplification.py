@@ -0,0 +1,182 @@
+"""
+:Author: Theodor A. Dumitrescu
+:Date: Oct 18, 2026
+:Version: 0.0.1
+"""
+from typing import Dict, List, Optional, Set, Iterator, Tuple
+
+from fol.axiom_store import AxiomStore, as_ground_literal
+from fol.backend.cnf import UnboundVariableError, _conjuncts
+from fol.backend.grounding import ground, simplify
+from fol.logic import Logic, NotLogicalExpression, AndLogicalExpression, TRUE, FALSE, children
+from fol.predicate import Predicate, LogicalPredicate
+
+
+def _atoms_of(lc: Logic) -> Set[LogicalPredicate]:
+    found = set()
+    visited = set()
+    stack = [lc]
+    while stack:
+        node = stack.pop()
+        if id(node) in visited:
+            continue
+        visited.add(id(node))
+
+        if type(node) is LogicalPredicate:
+            found.add(node)
+        else:
+            stack.extend(children(node))
+
+    return found
+
+
+def _as_literal(lc: Logic) -> Optional[Tuple[LogicalPredicate, bool]]:
+    if type(lc) is LogicalPredicate:
+        return lc, True
+    if type(lc) is NotLogicalExpression and type(lc.arg) is LogicalPredicate:
+        return lc.arg, False
+    return None
+
+
+class Simplifier(object):
+    """
+    The ground instances of the axioms of a store simplified when they are told: the truth values of the known
+    facts are folded into every instance, the satisfied instances are dropped and the ones reduced to literals become
+    unit facts (derived, the store is not modified) which are propagated in turn. Only the residual constraints are
+    kept, indexed by the atoms they mention, so a new fact re-simplifies just the residuals it occurs in.
+    The residuals, the derived units and the facts of the store are equivalent to the axioms.
+    An axiom that cannot be grounded (some variable is not closed world) is kept as it is, see `unground`.
+    """
+
+    def __init__(self, store: AxiomStore):
+        self.store: AxiomStore = store
+        self.units: Dict[LogicalPredicate, bool] = {}  # derived facts, in order of derivation
+        self.residuals: Dict[int, Logic] = {}  # the residual constraints by number, in order of creation
+        self.unground: Set[Logic] = set()
+        self.statistics: Dict[str, int] = {'instances': 0, 'satisfied': 0, 'propagations': 0}
+
+        self._watches: Dict[LogicalPredicate, Set[int]] = {}  # atom → residuals mentioning it (possibly dropped)
+        self._next: int = 0  # number of the next residual
+        self._axioms: int = 0  # store[:_axioms] are simplified
+        self._journals: Dict[Predicate, int] = {}  # journal positions of the truth tensors already read
+        self._pending: List[LogicalPredicate] = []  # atoms whose value is known but not propagated yet
+
+    def get(self, atom: Logic, default: Optional[bool] = None) -> Optional[bool]:
+        """
+        :return: the truth value of the ground atom w.r.t. the facts of the store and the derived ones
+        """
+        value = self.units.get(atom)
+        return value if value is not None else self.store.get(atom, default)
+
+    def __len__(self):
+        """
+        :return: the number of residual constraints
+        """
+        return len(self.residuals)
+
+    def residuals_since(self, number: int) -> Iterator[Tuple[int, Logic]]:
+        """
+        :return: the residual constraints (in their current form) created from the `number`-th on, with their numbers
+        """
+        for n in range(number, self._next):
+            residual = self.residuals.get(n)
+            if residual is not None:
+                yield n, residual
+
+    @property
+    def number_of_residuals(self) -> int:
+        """
+        :return: the number of the residual constraints ever created, see `residuals_since`
+        """
+        return self._next
+
+    @property
+    def inconsistent(self) -> bool:
+        return any(residual is FALSE for residual in self.residuals.values())
+
+    def update(self) -> int:
+        """
+        Simplifies the axioms appended to the store since the last call and propagates the facts told since then.
+        :return: the number of residual constraints
+        """
+        for predicate in self.store.tabled_predicates():
+            table = self.store.table(predicate)
+            ids, _ = table.changes_since(self._journals.get(predicate, 0))
+            self._journals[predicate] = table.journal_size
+            constants = self.store.constants
+            for row in ids.tolist():
+                self._known(predicate(*map(constants.constant, row)))
+
+        axioms = self.store[self._axioms:]
+        self._axioms = len(self.store)
+        for axiom in axioms:
+            literal = as_ground_literal(axiom)
+            if literal is not None:
+                self._known(literal[0])
+                continue
+
+            try:
+                for instance in ground(axiom, self.store):
+                    self.statistics['instances'] += 1
+                    self._add(simplify(instance, self))
+            except UnboundVariableError:
+                self.unground.add(axiom)
+            self._propagate()
+
+        self._propagate()
+        return len(self.residuals)
+
+    def _known(self, atom: LogicalPredicate):
+        """
+        A fact of the store has been told, the residuals mentioning it have to be simplified.
+        """
+        derived = self.units.get(atom)
+        if derived is not None and self.store.get(atom) is not derived:
+            self._add(FALSE)
+        if atom in self._watches:
+            self._pending.append(atom)
+
+    def _add(self, lc: Logic, number: Optional[int] = None):
+        """
+        Adds (or replaces if `number` is given) a residual constraint, its literal conjuncts become derived units.
+        """
+        if lc is TRUE:
+            self.statistics['satisfied'] += 1
+            return
+
+        rest = []
+        for conjunct in _conjuncts(lc):
+            literal = _as_literal(conjunct)
+            if literal is None:
+                rest.append(conjunct)
+                continue
+
+            atom, polarity = literal
+            value = self.get(atom)
+            if value is None:
+                self.units[atom] = polarity
+                self._pending.append(atom)
+            elif value is not polarity:
+                rest = [FALSE]
+                break
+
+        if not rest:
+            return
+
+        if number is None:
+            number = self._next
+            self._next += 1
+        residual = rest[0] if len(rest) == 1 else AndLogicalExpression.of(rest)
+        self.residuals[number] = residual
+        for atom in _atoms_of(residual):
+            self._watches.setdefault(atom, set()).add(number)
+
+    def _propagate(self):
+        while self._pending:
+            atom = self._pending.pop()
+            for number in self._watches.pop(atom, ()):
+                residual = self.residuals.pop(number, None)
+                if residual is None:
+                    continue  # already satisfied
+                self.statistics['propagations'] += 1
+                self._add(simplify(residual, self), number)
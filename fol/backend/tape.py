@@ -0,0 +1,315 @@
+"""
+:Author: Theodor A. Dumitrescu
+:Date: Oct 18, 2026
+:Version: 0.0.1
+"""
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from fol.backend.cnf import UnboundVariableError
+from fol.backend.vectorized import VectorizedEvaluator
+from fol.cache import memoize
+from fol.logic import Logic, LogicalConstant, LogicalVariable, NotLogicalExpression, AndLogicalExpression, \
+    OrLogicalExpression, ImplicationLogicalExpression, EquivalenceLogicalExpression, UniversalQuantifier, \
+    ExistentialQualifier, TruthLogicalExpression, LogicalQualifier
+from fol.predicate import LogicalPredicate, Predicate
+
+# opcodes of the instructions
+LOAD = 0  # the values of the atom `operands[0]`
+CONST = 1  # the truth value `operands[0]`
+NOT = 2
+AND = 3
+OR = 4
+IMPLIES = 5
+EQUIV = 6
+FORALL = 7  # aggregation of the sub program `operands[0]` over the domains of its quantified variables
+EXISTS = 8
+
+OPCODES = ('LOAD', 'CONST', 'NOT', 'AND', 'OR', 'IMPLIES', 'EQUIV', 'FORALL', 'EXISTS')
+
+_BINARY = {
+    AndLogicalExpression: AND,
+    OrLogicalExpression: OR,
+    ImplicationLogicalExpression: IMPLIES,
+    EquivalenceLogicalExpression: EQUIV,
+}
+
+
+class Program(object):
+    """
+    A formula lowered to a flat postfix program: the i-th instruction computes the value of a node of the formula
+    from the values of the instructions at the indexes in `operands[i]`, which always precede it. A subformula shared
+    by several parents is computed once. The value of the formula is the one of the last instruction.
+    The program is evaluated over a batch of bindings of its `variables` at once, every instruction producing a numpy
+    array with one value per binding; the bindings of the quantified variables are broadcast along new axes, so an
+    instruction not depending on some variables is computed once for all their bindings.
+    """
+
+    def __init__(self,
+                 variables: Tuple[LogicalVariable, ...],
+                 opcodes: List[int],
+                 operands: List[Tuple[int, int]],
+                 atoms: List[Tuple[Predicate, Tuple[int, ...]]],
+                 constants: List[LogicalConstant],
+                 programs: List['Program'],
+                 domains: List[Tuple[LogicalVariable, ...]]):
+        self.variables: Tuple[LogicalVariable, ...] = variables
+        self.opcodes: np.ndarray = np.array(opcodes, dtype=np.int8)
+        self.operands: np.ndarray = np.array(operands, dtype=np.int32).reshape(-1, 2)
+        # the arguments of an atom are slots of the bindings (>= 0) or constants (-1 - index in `constants`)
+        self.atoms: Tuple[Tuple[Predicate, np.ndarray], ...] = tuple(
+            (predicate, np.array(args, dtype=np.int32)) for predicate, args in atoms)
+        self.constants: Tuple[LogicalConstant, ...] = tuple(constants)
+        # the sub programs of the quantifiers, whose variables are the ones of this program followed by the
+        # quantified ones (`domains`)
+        self.programs: Tuple[Program, ...] = tuple(programs)
+        self.domains: Tuple[Tuple[LogicalVariable, ...], ...] = tuple(domains)
+
+        self._code: List[Tuple[int, int, int]] = [(int(op), int(a), int(b))
+                                                  for op, (a, b) in zip(self.opcodes, self.operands)]
+
+    def __len__(self):
+        return len(self._code)
+
+    def __str__(self):
+        lines = []
+        for i, (op, a, b) in enumerate(self._code):
+            if op == LOAD:
+                predicate, args = self.atoms[a]
+                names = [str(self.variables[slot]) if slot >= 0 else str(self.constants[-1 - slot])
+                         for slot in args.tolist()]
+                lines.append('{}: LOAD {}({})'.format(i, predicate.name, ', '.join(names)))
+            elif op == CONST:
+                lines.append('{}: CONST {}'.format(i, bool(a)))
+            elif op == NOT:
+                lines.append('{}: NOT {}'.format(i, a))
+            elif op in (FORALL, EXISTS):
+                lines.append('{}: {} {} #{}'.format(i, OPCODES[op], ', '.join(map(str, self.domains[a])), a))
+            else:
+                lines.append('{}: {} {} {}'.format(i, OPCODES[op], a, b))
+
+        return '\n'.join(lines)
+
+    def run(self, bindings, evaluator: VectorizedEvaluator = None) -> np.ndarray:
+        """
+        :param bindings: array of shape (n, number of variables), the ids of the constants bound to the variables
+        :param evaluator: the semantics (Kleene's three valued logic by default, see fol.backend.vectorized, or the
+                          degrees of truth of fol.backend.fuzzy) and the facts the atoms are evaluated against
+        :return: the value of the formula for every binding
+        """
+        evaluator = evaluator if evaluator is not None else VectorizedEvaluator()
+        bindings = np.asarray(bindings, dtype=np.int64).reshape(-1, len(self.variables))
+        values = self._run([bindings[:, slot] for slot in range(len(self.variables))], 1, evaluator)
+        return np.broadcast_to(values, (len(bindings),))
+
+    def evaluate(self, constants: Sequence[LogicalConstant], evaluator: VectorizedEvaluator = None):
+        """
+        :return: the value of the formula for a single binding of its variables to the given constants
+        """
+        evaluator = evaluator if evaluator is not None else VectorizedEvaluator()
+        return self.run([evaluator.store.constants.ids(constants)], evaluator)[0]
+
+    # noinspection PyProtectedMember
+    def _run(self, columns: List[np.ndarray], ndim: int, evaluator: VectorizedEvaluator) -> np.ndarray:
+        """
+        :param columns: the ids bound to every variable, arrays of `ndim` dimensions broadcastable to each other (the
+                        bindings of a quantified variable vary along its own axis)
+        :return: the values of the formula, broadcastable to the shape of the bindings: a subformula is computed once
+                 for all the bindings of the variables it does not mention
+        """
+        constants = evaluator.store.constants.ids(self.constants)
+        values: List[Optional[np.ndarray]] = [None] * len(self._code)
+
+        for i, (op, a, b) in enumerate(self._code):
+            if op == LOAD:
+                predicate, args = self.atoms[a]
+                grids = np.broadcast_arrays(*[columns[slot] if slot >= 0 else np.full((1,) * ndim, constants[-1 - slot])
+                                              for slot in args.tolist()])
+                shape = grids[0].shape if grids else (1,) * ndim
+                ids = np.stack([grid.ravel() for grid in grids], axis=1) if grids else np.empty((1, 0), np.int64)
+                values[i] = evaluator._atom(predicate, ids).reshape(shape)
+            elif op == CONST:
+                values[i] = np.full((1,) * ndim, evaluator._constant(bool(a)), dtype=evaluator.dtype)
+            elif op == NOT:
+                values[i] = evaluator._not(values[a])
+            elif op == AND:
+                values[i] = evaluator._and(values[a], values[b])
+            elif op == OR:
+                values[i] = evaluator._or(values[a], values[b])
+            elif op == IMPLIES:
+                values[i] = evaluator._implies(values[a], values[b])
+            elif op == EQUIV:
+                alpha, beta = values[a], values[b]
+                values[i] = evaluator._and(evaluator._implies(alpha, beta), evaluator._implies(beta, alpha))
+            else:
+                values[i] = self._aggregate(op, a, columns, ndim, evaluator)
+
+        return values[-1]
+
+    def _aggregate(self,
+                   op: int,
+                   index: int,
+                   columns: List[np.ndarray],
+                   ndim: int,
+                   evaluator: VectorizedEvaluator) -> np.ndarray:
+        """
+        Runs the sub program with a new axis per quantified variable, broadcast against the bindings of the outer
+        variables, and reduces the new axes.
+        """
+        domains = [evaluator.store.constants.ids(var.constants) for var in self.domains[index]]
+        if not all(domains):  # empty domain
+            return np.full((1,) * ndim, evaluator._constant(op == FORALL), dtype=evaluator.dtype)
+
+        extended = [column.reshape(column.shape + (1,) * len(domains)) for column in columns]
+        for axis, domain in enumerate(domains):
+            shape = [1] * (ndim + len(domains))
+            shape[ndim + axis] = len(domain)
+            extended.append(np.array(domain, dtype=np.int64).reshape(shape))
+
+        values = self.programs[index]._run(extended, ndim + len(domains), evaluator)
+        axes = tuple(range(ndim, ndim + len(domains)))
+        # noinspection PyProtectedMember
+        return evaluator._forall(values, axes) if op == FORALL else evaluator._exists(values, axes)
+
+
+def free_variables(lc: Logic) -> Tuple[LogicalVariable, ...]:
+    """
+    :return: the variables occurring free in the formula, in order of first occurrence
+    """
+    found: Dict[LogicalVariable, None] = {}
+    visited = set()  # a shared sub-formula is visited once per set of bound variables
+    stack = [(lc, frozenset())]
+
+    while stack:
+        node, bound = stack.pop()
+        if (id(node), bound) in visited:
+            continue
+        visited.add((id(node), bound))
+
+        if type(node) is LogicalVariable:
+            if node not in bound and node not in found:
+                found[node] = None
+        elif isinstance(node, LogicalQualifier):
+            stack.append((node.proposition, bound | set(node.variables)))
+        else:
+            # noinspection PyProtectedMember
+            stack.extend((arg, bound) for arg in reversed(getattr(node, '_args', ())))
+
+    return tuple(found)
+
+
+def _quantified_variables(lc: Logic) -> Tuple[LogicalVariable, ...]:
+    """
+    :return: the variables quantified in the formula, in order of first occurrence
+    """
+    found: Dict[LogicalVariable, None] = {}
+    visited = set()
+    stack = [lc]
+
+    while stack:
+        node = stack.pop()
+        if id(node) in visited:
+            continue
+        visited.add(id(node))
+
+        if isinstance(node, LogicalQualifier):
+            found.update(dict.fromkeys(node.variables))
+            stack.append(node.proposition)
+        else:
+            # noinspection PyProtectedMember
+            stack.extend(reversed(getattr(node, '_args', ())))
+
+    return tuple(found)
+
+
+class _Compiler(object):
+
+    def __init__(self, variables: Tuple[LogicalVariable, ...]):
+        self.variables = variables
+        self.slots: Dict[LogicalVariable, int] = {var: i for i, var in enumerate(variables)}
+
+        self.opcodes: List[int] = []
+        self.operands: List[Tuple[int, int]] = []
+        self.atoms: List[Tuple[Predicate, Tuple[int, ...]]] = []
+        self.constants: Dict[LogicalConstant, int] = {}
+        self.programs: List[Program] = []
+        self.domains: List[Tuple[LogicalVariable, ...]] = []
+
+    def _emit(self, op: int, a: int = 0, b: int = 0) -> int:
+        self.opcodes.append(op)
+        self.operands.append((a, b))
+        return len(self.opcodes) - 1
+
+    # noinspection PyProtectedMember
+    def _atom(self, lc: LogicalPredicate) -> int:
+        args = []
+        for arg in lc._args:
+            if type(arg) is LogicalConstant:
+                args.append(-1 - self.constants.setdefault(arg, len(self.constants)))
+            elif arg in self.slots:
+                args.append(self.slots[arg])
+            else:
+                raise UnboundVariableError('The variable {} of `{}` is free'.format(arg, lc))
+
+        self.atoms.append((lc.predicate, tuple(args)))
+        return self._emit(LOAD, len(self.atoms) - 1)
+
+    # noinspection PyProtectedMember
+    def compile(self, lc: Logic) -> Program:
+        # iterative post order visit, every node of the DAG is emitted once
+        emitted: Dict[int, int] = {}
+        stack = [(lc, False)]
+
+        while stack:
+            node, ready = stack.pop()
+            if id(node) in emitted:
+                continue
+
+            op = type(node)
+            if op is LogicalPredicate:
+                emitted[id(node)] = self._atom(node)
+            elif op is TruthLogicalExpression:
+                emitted[id(node)] = self._emit(CONST, int(node.value))
+            elif op is UniversalQuantifier or op is ExistentialQualifier:
+                for var in node.variables:
+                    if not var.is_closed_world:
+                        raise UnboundVariableError('The variable {} of `{}` is not closed world'.format(var, node))
+
+                self.programs.append(compile_formula(node.proposition, self.variables + node.variables))
+                self.domains.append(node.variables)
+                emitted[id(node)] = self._emit(FORALL if op is UniversalQuantifier else EXISTS,
+                                               len(self.programs) - 1)
+            elif op is NotLogicalExpression or op in _BINARY:
+                if not ready:
+                    stack.append((node, True))
+                    stack.extend((arg, False) for arg in reversed(node._args))
+                    continue
+
+                args = [emitted[id(arg)] for arg in node._args]
+                if op is NotLogicalExpression:
+                    emitted[id(node)] = self._emit(NOT, args[0])
+                else:
+                    value = args[0]
+                    for arg in args[1:]:
+                        value = self._emit(_BINARY[op], value, arg)
+                    emitted[id(node)] = value
+            else:
+                raise ValueError('Unable to compile `{}` of type {}'.format(node, op.__name__))
+
+        constants = sorted(self.constants, key=self.constants.get)
+        return Program(self.variables, self.opcodes, self.operands, self.atoms, constants, self.programs, self.domains)
+
+
+def compile_formula(lc: Logic, variables: Sequence[LogicalVariable] = None) -> Program:
+    """
+    Compiles the formula into a Program evaluated over the bindings of the given variables (by default its free
+    variables). The programs are cached in the `program` namespace of fol.cache, by formula and variables, and
+    compiled again when the constants of a quantified variable change.
+    :raise UnboundVariableError: if a free variable of the formula is not among the variables or a quantified
+                                 variable is not closed world
+    """
+    variables = free_variables(lc) if variables is None else tuple(variables)
+
+    # NOTE(thadumi): the program holds the variables, so their ids are not reused while it is cached
+    return memoize('program', lc, _Compiler(variables).compile, _quantified_variables, tuple(map(id, variables)))
@@ -0,0 +1,311 @@
+"""
+:Author: Theodor A. Dumitrescu
+:Date: Oct 18, 2026
+:Version: 0.0.1
+"""
+from __future__ import annotations
+
+import copy
+from typing import Tuple, Optional, Iterator, Dict
+
+import numpy as np
+
+# values stored in the truth tensors
+UNKNOWN_VALUE = -1
+FALSE_VALUE = 0
+TRUE_VALUE = 1
+
+STORAGES = ('dense', 'sparse')
+
+# writes of the sparse storage kept in a dictionary before being merged into the sorted arrays
+_PENDING_WRITES = 1 << 16
+
+
+def _as_ids(ids, arity: int) -> np.ndarray:
+    """
+    :return: the ids as an int64 array of shape (number of atoms, arity)
+    """
+    ids = np.asarray(ids, dtype=np.int64)
+    if ids.ndim == 1 and arity > 1 or ids.ndim == 0:
+        ids = ids.reshape(-1, arity)
+    elif ids.ndim == 1:
+        ids = ids.reshape(-1, 1)
+
+    if ids.ndim != 2 or ids.shape[1] != arity:
+        raise ValueError('Expected ids of shape (n, {}), received {}'.format(arity, ids.shape))
+    if ids.size and ids.min() < 0:
+        raise ValueError('The constant ids have to be non negative')
+
+    return ids
+
+
+class TruthTensor(object):
+    """
+    Three valued (true, false, unknown) truth assignment of the ground atoms of a predicate, indexed by the ids of
+    the constants (see `fol.fol_status.constant_id`).
+    The `dense` storage is an int8 array of shape (n,) * arity growing with the number of constants, the `sparse`
+    storage keeps only the known atoms as sorted int64 keys (the ids packed in a single integer) plus their values.
+    Every write is also recorded in a journal of packed keys so the consumers (e.g. the incremental solver) can
+    fetch the facts added since their last visit.
+    """
+
+    def __init__(self, arity: int, storage: str = 'dense'):
+        if storage not in STORAGES:
+            raise ValueError('Unknown storage `{}`, expected one of {}'.format(storage, STORAGES))
+        if arity <= 0:
+            raise ValueError('A truth tensor needs at least one dimension')
+
+        self.arity: int = arity
+        self.storage: str = storage
+        self._bits: int = 63 // arity  # bits of every id in the packed keys
+
+        self._dense: np.ndarray = np.full((0,) * arity, UNKNOWN_VALUE, dtype=np.int8)
+
+        self._keys: np.ndarray = np.empty(0, dtype=np.int64)
+        self._values: np.ndarray = np.empty(0, dtype=np.int8)
+        self._pending: Dict[int, int] = {}
+
+        self._journal: np.ndarray = np.empty(0, dtype=np.int64)
+        self._journal_size: int = 0
+
+        self._shared: bool = False  # the dense array is shared with a snapshot, see snapshot
+
+    # packing of the ids
+
+    def pack(self, ids: np.ndarray) -> np.ndarray:
+        if ids.size and ids.max() >= 1 << self._bits:
+            raise ValueError('Constant id too large for a predicate with {} arguments'.format(self.arity))
+
+        keys = np.zeros(len(ids), dtype=np.int64)
+        for column in range(self.arity):
+            keys = (keys << self._bits) | ids[:, column]
+        return keys
+
+    def unpack(self, keys: np.ndarray) -> np.ndarray:
+        keys = np.asarray(keys, dtype=np.int64)
+        ids = np.empty((len(keys), self.arity), dtype=np.int64)
+        mask = (1 << self._bits) - 1
+        for column in reversed(range(self.arity)):
+            ids[:, column] = keys & mask
+            keys = keys >> self._bits
+        return ids
+
+    # reads
+
+    def get(self, ids) -> np.ndarray:
+        """
+        :param ids: an array of shape (n, arity) of constant ids
+        :return: the int8 values (TRUE_VALUE, FALSE_VALUE or UNKNOWN_VALUE) of the atoms
+        """
+        ids = _as_ids(ids, self.arity)
+
+        if self.storage == 'dense':
+            values = np.full(len(ids), UNKNOWN_VALUE, dtype=np.int8)
+            inside = np.all(ids < self._dense.shape[0], axis=1)
+            values[inside] = self._dense[tuple(ids[inside].T)]
+            return values
+
+        keys = self.pack(ids)
+        if len(self._pending) > len(keys):  # few reads, the pending writes are overlaid one by one
+            values = self._lookup(keys)
+            for i, key in enumerate(keys.tolist()):
+                values[i] = self._pending.get(key, values[i])
+            return values
+
+        self._flush()
+        return self._lookup(keys)
+
+    def _lookup(self, keys: np.ndarray) -> np.ndarray:
+        values = np.full(len(keys), UNKNOWN_VALUE, dtype=np.int8)
+        if not len(self._keys):
+            return values
+
+        positions = np.searchsorted(self._keys, keys)
+        positions[positions == len(self._keys)] = 0
+        found = self._keys[positions] == keys
+        values[found] = self._values[positions[found]]
+        return values
+
+    def _flush(self):
+        if self._pending:
+            keys = np.fromiter(self._pending.keys(), dtype=np.int64, count=len(self._pending))
+            values = np.fromiter(self._pending.values(), dtype=np.int8, count=len(self._pending))
+            self._pending.clear()
+            self._merge(keys, values)
+
+    def _merge(self, keys: np.ndarray, values: np.ndarray):
+        # the last write of a key wins
+        all_keys = np.concatenate([self._keys, keys])
+        all_values = np.concatenate([self._values, values])
+        order = np.argsort(all_keys, kind='stable')
+        all_keys, all_values = all_keys[order], all_values[order]
+        last = np.append(all_keys[1:] != all_keys[:-1], True)
+        self._keys, self._values = all_keys[last], all_values[last]
+
+    def value(self, *ids: int) -> int:
+        return int(self.get(np.array([ids]))[0])
+
+    def dense(self, size: Optional[int] = None) -> np.ndarray:
+        """
+        :return: the dense array of shape (size,) * arity, size defaults to the largest known id + 1
+        """
+        if self.storage == 'dense':
+            if size is None or size == self._dense.shape[0]:
+                return self._dense
+            self._grow(size)
+            return self._dense[(slice(0, size),) * self.arity]
+
+        self._flush()
+        ids = self.unpack(self._keys)
+        if size is None:
+            size = int(ids.max()) + 1 if len(ids) else 0
+        array = np.full((size,) * self.arity, UNKNOWN_VALUE, dtype=np.int8)
+        inside = np.all(ids < size, axis=1)
+        array[tuple(ids[inside].T)] = self._values[inside]
+        return array
+
+    def known(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        :return: the ids (shape (n, arity)) and the values of the known atoms
+        """
+        if self.storage == 'dense':
+            ids = np.argwhere(self._dense != UNKNOWN_VALUE)
+            return ids, self._dense[tuple(ids.T)]
+
+        self._flush()
+        return self.unpack(self._keys), self._values.copy()
+
+    def items(self) -> Iterator[Tuple[Tuple[int, ...], bool]]:
+        ids, values = self.known()
+        for row, value in zip(ids.tolist(), values.tolist()):
+            yield tuple(row), bool(value)
+
+    def count(self, value: int = None) -> int:
+        """
+        :return: the number of atoms having the given value, or the number of the known atoms
+        """
+        self._flush()
+        values = self._dense if self.storage == 'dense' else self._values
+        if value is None:
+            return int(np.count_nonzero(values != UNKNOWN_VALUE))
+        return int(np.count_nonzero(values == value))
+
+    def snapshot(self) -> TruthTensor:
+        """
+        :return: a copy of the tensor sharing its arrays, it is not affected by the later writes of this tensor (which
+                 replace the sparse arrays and copy the dense one before writing it in place)
+        """
+        self._flush()
+        view = copy.copy(self)
+        view._pending = {}
+        view._shared = True
+        self._shared = True
+        return view
+
+    @property
+    def nbytes(self) -> int:
+        return self._dense.nbytes + self._keys.nbytes + self._values.nbytes + self._journal.nbytes
+
+    # writes
+
+    def clear(self):
+        self._dense = np.full((0,) * self.arity, UNKNOWN_VALUE, dtype=np.int8)
+        self._keys = np.empty(0, dtype=np.int64)
+        self._values = np.empty(0, dtype=np.int8)
+        self._pending.clear()
+        self._journal = np.empty(0, dtype=np.int64)
+        self._journal_size = 0
+        self._shared = False
+
+    def _grow(self, size: int):
+        current = self._dense.shape[0] if self._dense.ndim else 0
+        if size <= current:
+            return
+
+        size = max(size, 2 * current)
+        grown = np.full((size,) * self.arity, UNKNOWN_VALUE, dtype=np.int8)
+        grown[(slice(0, current),) * self.arity] = self._dense
+        self._dense = grown
+        self._shared = False
+
+    def set(self, ids, values) -> np.ndarray:
+        """
+        Assigns the truth values of a batch of atoms.
+        :param ids: an array of shape (n, arity) of constant ids
+        :param values: TRUE_VALUE / FALSE_VALUE (or booleans) for every atom, or a single value
+        :return: the previous values of the atoms
+        """
+        ids = _as_ids(ids, self.arity)
+        values = np.broadcast_to(np.asarray(values).astype(np.int8), (len(ids),))
+        if not len(ids):
+            return np.empty(0, dtype=np.int8)
+
+        previous = self.get(ids)
+
+        if self.storage == 'dense':
+            self._grow(int(ids.max()) + 1)
+            if self._shared:
+                self._dense = self._dense.copy()
+                self._shared = False
+            self._dense[tuple(ids.T)] = values
+            keys = self.pack(ids)
+        else:
+            keys = self.pack(ids)
+            if len(keys) + len(self._pending) <= _PENDING_WRITES:
+                self._pending.update(zip(keys.tolist(), values.tolist()))
+            else:
+                self._flush()
+                self._merge(keys, values)
+
+        changed = keys[previous != values]
+        self._record(changed)
+        return previous
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        """
+        :return: the arrays backing the tensor (`journal` plus `dense` or `keys` and `values`), see restore
+        """
+        if self.storage == 'dense':
+            return {'journal': self._journal[:self._journal_size], 'dense': self._dense}
+
+        self._flush()
+        return {'journal': self._journal[:self._journal_size], 'keys': self._keys, 'values': self._values}
+
+    def restore(self, journal: np.ndarray, dense: np.ndarray = None, keys: np.ndarray = None,
+                values: np.ndarray = None):
+        """
+        Replaces the content of the tensor with the given arrays, which are used as they are (e.g. views of a memory
+        mapped snapshot, see fol.snapshot) and are not copied until written.
+        :param journal: the packed keys of the known atoms
+        :param dense: the array of the `dense` storage
+        :param keys: the sorted packed keys of the `sparse` storage
+        :param values: the values of the `sparse` storage
+        """
+        self.clear()
+        if self.storage == 'dense':
+            self._dense = dense
+        else:
+            self._keys, self._values = keys, values
+        self._journal = journal
+        self._journal_size = len(journal)
+
+    def _record(self, keys: np.ndarray):
+        needed = self._journal_size + len(keys)
+        if needed > len(self._journal):
+            grown = np.empty(max(needed, 2 * len(self._journal), 16), dtype=np.int64)
+            grown[:self._journal_size] = self._journal[:self._journal_size]
+            self._journal = grown
+
+        self._journal[self._journal_size:needed] = keys
+        self._journal_size = needed
+
+    @property
+    def journal_size(self) -> int:
+        return self._journal_size
+
+    def changes_since(self, position: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        :return: the ids and the current values of the atoms written after the given journal position
+        """
+        ids = self.unpack(self._journal[position:self._journal_size])
+        return ids, self.get(ids)
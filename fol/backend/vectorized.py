@@ -0,0 +1,217 @@
+"""
+:Author: Theodor A. Dumitrescu
+:Date: Oct 18, 2026
+:Version: 0.0.1
+"""
+from typing import Dict, List, Optional, Tuple, Sequence
+
+import numpy as np
+
+import fol.fol_status as FOL
+from fol.axiom_store import AxiomStore
+from fol.backend.cnf import UnboundVariableError
+from fol.backend.truth import TruthTensor, TRUE_VALUE, UNKNOWN_VALUE
+from fol.logic import Logic, LogicalConstant, NotLogicalExpression, AndLogicalExpression, OrLogicalExpression, \
+    ImplicationLogicalExpression, EquivalenceLogicalExpression, UniversalQuantifier, ExistentialQualifier, \
+    TruthLogicalExpression, children, traverse
+from fol.predicate import LogicalPredicate, Predicate
+
+# Kleene's strong three valued logic encoded as uint8: ¬x = 2 - x, x ∧ y = min(x, y), x ∨ y = max(x, y)
+K_FALSE = 0
+K_UNKNOWN = 1
+K_TRUE = 2
+
+
+def _to_kleene(values: np.ndarray) -> np.ndarray:
+    # TRUE_VALUE (1) -> 2, FALSE_VALUE (0) -> 0, UNKNOWN_VALUE (-1) -> 1
+    kleene = np.where(values == TRUE_VALUE, K_TRUE, K_FALSE).astype(np.uint8)
+    kleene[values == UNKNOWN_VALUE] = K_UNKNOWN
+    return kleene
+
+
+def _from_kleene(value) -> Optional[bool]:
+    value = int(value)
+    return None if value == K_UNKNOWN else value == K_TRUE
+
+
+class VectorizedEvaluator(object):
+    """
+    Evaluates formulas whose quantifiers range over closed-world variables under the facts of an AxiomStore,
+    with Kleene's three valued semantics (unknown facts are unknown).
+    Every quantified variable is an axis of a numpy array, so a formula is evaluated over all its bindings at once
+    by broadcasting: e.g. `Forall((p, q), Friends(p, q) == Friends(q, p))` compares the truth tensor of Friends with
+    its transpose and reduces the result with a `min`.
+    """
+
+    def __init__(self, store: AxiomStore = None):
+        self.store: AxiomStore = store if store is not None else FOL.AXIOMS
+        self._tables: Dict[Predicate, TruthTensor] = {}
+
+    def _table(self, predicate: Predicate) -> TruthTensor:
+        """
+        :return: the truth tensor of the predicate, built from the told literals when the predicate has none
+        """
+        if predicate in self.store.tabled_predicates():
+            return self.store.table(predicate)
+
+        table = self._tables.get(predicate)
+        if table is None:
+            table = self._tables[predicate] = TruthTensor(predicate.number_of_arguments, 'sparse')
+            facts = [(self.store.constants.ids(atom._args), value) for atom, value in self.store.facts(predicate)]
+            if facts:
+                table.set([ids for ids, _ in facts], [value for _, value in facts])
+
+        return table
+
+    def _evaluate(self, lc: Logic, scope: Tuple[int, ...] = ()) -> np.ndarray:
+        """
+        Evaluates the formula by an iterative visit (see fol.logic.traverse), so its depth is not bounded by the
+        interpreter stack; a sub-formula is evaluated once per scope.
+        :param scope: the ids of the variables bound around the formula, the i-th one is the i-th axis
+        :return: Kleene values broadcastable to the shape of the bindings
+        """
+        return traverse(lc, self._combine, self._expand, scope)
+
+    @staticmethod
+    def _expand(lc: Logic, scope: Tuple[int, ...]) -> Sequence[Tuple[Logic, Tuple[int, ...]]]:
+        op = type(lc)
+        if op is LogicalPredicate:
+            return ()
+        if op is UniversalQuantifier or op is ExistentialQualifier:
+            inner = VectorizedEvaluator._scope(lc, scope)  # rejects the open world variables first
+            if any(not var.constants for var in lc.variables):  # empty domain
+                return ()
+            return ((lc.proposition, inner),)
+        return [(arg, scope) for arg in children(lc)]
+
+    @staticmethod
+    def _scope(lc: Logic, scope: Tuple[int, ...]) -> Tuple[int, ...]:
+        """
+        :return: the scope of the proposition of the quantifier, its variables get the next axes
+        """
+        for var in lc.variables:
+            if not var.is_closed_world:
+                raise UnboundVariableError('The variable {} of `{}` is not closed world'.format(var, lc))
+        return scope + tuple(id(var) for var in lc.variables)
+
+    # noinspection PyProtectedMember
+    def _combine(self, lc: Logic, scope: Tuple[int, ...], args: List[np.ndarray]) -> np.ndarray:
+        op = type(lc)
+        ndim = len(scope)
+
+        if op is LogicalPredicate:
+            indexes = []
+            for arg in lc._args:
+                if type(arg) is LogicalConstant:
+                    indexes.append(np.array(self.store.constants.id(arg)))
+                elif id(arg) in scope:
+                    shape = [1] * ndim
+                    shape[ndim - 1 - scope[::-1].index(id(arg))] = len(arg.constants)  # the innermost binding
+                    indexes.append(np.array(self.store.constants.ids(arg.constants), dtype=np.int64).reshape(shape))
+                else:
+                    raise UnboundVariableError('The variable {} of `{}` is free'.format(arg, lc))
+
+            grids = np.broadcast_arrays(*indexes)
+            shape = grids[0].shape
+            values = self._atom(lc.predicate, np.stack([grid.ravel() for grid in grids], axis=1))
+            return values.reshape(shape if len(shape) == ndim else (1,) * ndim)
+
+        if op is TruthLogicalExpression:
+            return np.full((1,) * ndim, self._constant(lc.value), dtype=self.dtype)
+
+        if op is NotLogicalExpression:
+            return self._not(args[0])
+
+        if op is AndLogicalExpression or op is OrLogicalExpression:
+            connective = self._and if op is AndLogicalExpression else self._or
+            values = args[0]
+            for other in args[1:]:
+                values = connective(values, other)
+            return values
+
+        if op is ImplicationLogicalExpression:
+            return self._implies(args[0], args[1])
+
+        if op is EquivalenceLogicalExpression:
+            alpha, beta = args
+            return self._and(self._implies(alpha, beta), self._implies(beta, alpha))
+
+        if op is UniversalQuantifier or op is ExistentialQualifier:
+            universal = op is UniversalQuantifier
+            if not args:  # empty domain
+                return np.full((1,) * ndim, self._constant(universal), dtype=self.dtype)
+
+            values = args[0]
+            aggregate = self._forall if universal else self._exists
+            return aggregate(values, tuple(range(ndim, values.ndim)))
+
+        raise ValueError('Unable to evaluate `{}` of type {}'.format(lc, op.__name__))
+
+    # semantics of the connectives, overridden by the other valuations (see fol.backend.fuzzy)
+
+    dtype = np.uint8
+
+    def _atom(self, predicate: Predicate, ids: np.ndarray) -> np.ndarray:
+        """
+        :param ids: array of shape (n, arity) of constant ids
+        :return: the values of the n ground atoms
+        """
+        return _to_kleene(self._table(predicate).get(ids))
+
+    def _constant(self, value: bool):
+        return K_TRUE if value else K_FALSE
+
+    def _not(self, values: np.ndarray) -> np.ndarray:
+        return K_TRUE - values
+
+    def _and(self, alpha: np.ndarray, beta: np.ndarray) -> np.ndarray:
+        return np.minimum(alpha, beta)
+
+    def _or(self, alpha: np.ndarray, beta: np.ndarray) -> np.ndarray:
+        return np.maximum(alpha, beta)
+
+    def _implies(self, alpha: np.ndarray, beta: np.ndarray) -> np.ndarray:
+        return self._or(self._not(alpha), beta)
+
+    def _forall(self, values: np.ndarray, axis: Tuple[int, ...]) -> np.ndarray:
+        return np.min(values, axis=axis)
+
+    def _exists(self, values: np.ndarray, axis: Tuple[int, ...]) -> np.ndarray:
+        return np.max(values, axis=axis)
+
+    def truth(self, lc: Logic) -> Optional[bool]:
+        """
+        :return: the truth value of a closed formula, None if it depends on unknown facts
+        """
+        return _from_kleene(self._evaluate(lc))
+
+    def violations(self, lc: UniversalQuantifier, include_unknown: bool = False) -> List[Tuple[LogicalConstant, ...]]:
+        """
+        :return: the bindings of the variables of the universal quantifier falsifying its proposition
+                 (or not satisfying it if `include_unknown`), as tuples of constants
+        """
+        if type(lc) is not UniversalQuantifier:
+            raise ValueError('Expected a universal quantifier, received `{}`'.format(lc))
+
+        values = np.broadcast_to(self._evaluate(lc.proposition, self._scope(lc, ())),
+                                 tuple(len(var.constants) for var in lc.variables))
+        bad = values < K_TRUE if include_unknown else values == K_FALSE
+
+        domains = [var.constants for var in lc.variables]
+        return [tuple(domain[i] for domain, i in zip(domains, row)) for row in np.argwhere(bad).tolist()]
+
+
+def evaluate(lc: Logic, store: AxiomStore = None) -> Optional[bool]:
+    """
+    Vectorized three valued evaluation of a closed formula under the known facts, see VectorizedEvaluator.
+    """
+    return VectorizedEvaluator(store).truth(lc)
+
+
+def violations(lc: UniversalQuantifier,
+               store: AxiomStore = None,
+               include_unknown: bool = False) -> List[Tuple[LogicalConstant, ...]]:
+    """
+    The bindings violating a universal axiom under the known facts, see VectorizedEvaluator.
+    """
+    return VectorizedEvaluator(store).violations(lc, include_unknown)
@@ -0,0 +1,493 @@
+"""
+:Author: Theodor A. Dumitrescu
+:Date: Oct 18, 2026
+:Version: 0.0.1
+"""
+import math
+from itertools import product
+from typing import Dict, List, Optional, Tuple, Iterable, Sequence
+
+from fol.axiom_store import AxiomStore, as_ground_literal
+from fol.backend.cnf import CNFEncoder, Clause, expand_quantifiers, substitute_many, _conjuncts
+from fol.backend.grounding import ground, simplify, _check_closed_world
+from fol.logic import Logic, LogicalConstant, UniversalQuantifier, NotLogicalExpression, TruthLogicalExpression, \
+    TRUE, FALSE
+from fol.predicate import LogicalPredicate
+
+# kinds of the nodes of a Circuit
+LITERAL, FREE, AND, OR = range(4)
+
+_NEGATIVE_INFINITY = -math.inf
+
+
+def _logaddexp(a: float, b: float) -> float:
+    if a == _NEGATIVE_INFINITY:
+        return b
+    if b == _NEGATIVE_INFINITY:
+        return a
+    if a < b:
+        a, b = b, a
+    return a + math.log1p(math.exp(b - a))
+
+
+class Circuit(object):
+    """
+    A smooth d-DNNF over the variables 1..number_of_variables, the nodes in topological order (the root is the last
+    one): a LITERAL node holds an integer literal, a FREE node a variable taking both values (x ∨ ¬x), an AND node
+    decomposable children (disjoint variables) and an OR node deterministic children (disjoint models) over the same
+    variables. TRUE is the AND of no child, FALSE the OR of no child.
+    The weights are given in log space as two sequences indexed by variable, for the positive and the negative
+    literal, so the counts of large circuits do not overflow.
+    """
+
+    def __init__(self, kinds: List[int], payloads: List, number_of_variables: int):
+        self.kinds: List[int] = kinds
+        self.payloads: List = payloads  # literal, variable or children of every node
+        self.number_of_variables: int = number_of_variables
+
+    def __len__(self):
+        return len(self.kinds)
+
+    @property
+    def number_of_edges(self) -> int:
+        return sum(len(payload) for kind, payload in zip(self.kinds, self.payloads) if kind >= AND)
+
+    def _values(self, positive: Sequence[float], negative: Sequence[float]) -> List[float]:
+        values = [0.0] * len(self.kinds)
+        for node, (kind, payload) in enumerate(zip(self.kinds, self.payloads)):
+            if kind == LITERAL:
+                values[node] = positive[payload] if payload > 0 else negative[-payload]
+            elif kind == FREE:
+                values[node] = _logaddexp(positive[payload], negative[payload])
+            elif kind == AND:
+                values[node] = sum(values[child] for child in payload)
+            else:
+                value = _NEGATIVE_INFINITY
+                for child in payload:
+                    value = _logaddexp(value, values[child])
+                values[node] = value
+        return values
+
+    def log_count(self, positive: Sequence[float], negative: Sequence[float]) -> float:
+        """
+        :return: the logarithm of the weighted model count, in a single pass
+        """
+        return self._values(positive, negative)[-1]
+
+    def log_marginals(self, positive: Sequence[float], negative: Sequence[float]) -> Tuple[float, List[float], List[float]]:
+        """
+        Computes by a pass up and a pass down (the partial derivatives w.r.t. the weights) the weighted count of the
+        models where each literal holds.
+        :return: the logarithm of the weighted model count and of the counts of the positive and negative literals,
+                 indexed by variable
+        """
+        values = self._values(positive, negative)
+        derivatives = [_NEGATIVE_INFINITY] * len(values)
+        derivatives[-1] = 0.0
+        counts = ([_NEGATIVE_INFINITY] * (self.number_of_variables + 1),
+                  [_NEGATIVE_INFINITY] * (self.number_of_variables + 1))
+
+        for node in reversed(range(len(values))):
+            derivative = derivatives[node]
+            if derivative == _NEGATIVE_INFINITY:
+                continue
+            kind, payload = self.kinds[node], self.payloads[node]
+
+            if kind == LITERAL:
+                var = abs(payload)
+                side = 0 if payload > 0 else 1
+                counts[side][var] = _logaddexp(counts[side][var], derivative + values[node])
+            elif kind == FREE:
+                counts[0][payload] = _logaddexp(counts[0][payload], derivative + positive[payload])
+                counts[1][payload] = _logaddexp(counts[1][payload], derivative + negative[payload])
+            elif kind == OR:
+                for child in payload:
+                    derivatives[child] = _logaddexp(derivatives[child], derivative)
+            else:
+                # the product of the siblings of every child, without dividing by a zero count
+                zeros = [child for child in payload if values[child] == _NEGATIVE_INFINITY]
+                finite = sum(values[child] for child in payload if values[child] != _NEGATIVE_INFINITY)
+                for child in payload:
+                    if not zeros:
+                        others = finite - values[child]
+                    elif zeros == [child]:
+                        others = finite
+                    else:
+                        continue
+                    derivatives[child] = _logaddexp(derivatives[child], derivative + others)
+
+        return values[-1], counts[0], counts[1]
+
+
+def _normalize(clause: Iterable[int]) -> Optional[Clause]:
+    """
+    :return: the sorted literals of the clause without duplicates, None if it is a tautology
+    """
+    literals = set(clause)
+    if any(-literal in literals for literal in literals):
+        return None
+    return tuple(sorted(literals, key=abs))
+
+
+def _propagate(clauses: Sequence[Clause], assumptions: Iterable[int]) -> Optional[Tuple[List[int], List[Clause]]]:
+    """
+    Unit propagation of the assumptions over occurrence lists: a clause is visited only when one of its literals is
+    assigned, so the propagation is linear in the size of the clauses.
+    :return: the implied literals (the assumptions included) and the clauses they do not satisfy, without their
+             false literals; None on a conflict
+    """
+    occurrences: Dict[int, List[int]] = {}
+    for i, clause in enumerate(clauses):
+        if not clause:
+            return None
+        for literal in clause:
+            occurrences.setdefault(literal, []).append(i)
+    open_literals = [len(clause) for clause in clauses]  # the literals not false of every clause
+    satisfied = [False] * len(clauses)
+
+    assignment: Dict[int, None] = {}
+    pending = list(assumptions) + [clause[0] for clause in clauses if len(clause) == 1]
+    for literal in pending:  # grows while it is visited
+        if literal in assignment:
+            continue
+        if -literal in assignment:
+            return None
+        assignment[literal] = None
+
+        for i in occurrences.get(literal, ()):
+            satisfied[i] = True
+        for i in occurrences.get(-literal, ()):
+            if satisfied[i]:
+                continue
+            open_literals[i] -= 1
+            if not open_literals[i]:
+                return None
+            if open_literals[i] == 1:
+                pending.append(next(other for other in clauses[i] if -other not in assignment))
+
+    residual = [tuple(literal for literal in clause if -literal not in assignment)
+                for clause, done in zip(clauses, satisfied) if not done]
+    return list(assignment), residual
+
+
+def _components(clauses: Sequence[Clause]) -> List[List[Clause]]:
+    """
+    :return: the clauses grouped by connected component (clauses sharing a variable are connected)
+    """
+    parent: Dict[int, int] = {}
+
+    def find(var: int) -> int:
+        root = var
+        while parent[root] != root:
+            root = parent[root]
+        while parent[var] != root:
+            parent[var], var = root, parent[var]
+        return root
+
+    for clause in clauses:
+        first = find(parent.setdefault(abs(clause[0]), abs(clause[0])))
+        for literal in clause[1:]:
+            other = find(parent.setdefault(abs(literal), abs(literal)))
+            if other != first:
+                parent[other] = first
+
+    groups: Dict[int, List[Clause]] = {}
+    for clause in clauses:
+        groups.setdefault(find(abs(clause[0])), []).append(clause)
+    return list(groups.values())
+
+
+class _Compiler(object):
+    """
+    Top-down compilation into a smooth d-DNNF (see `compile_cnf`).
+    """
+
+    def __init__(self, number_of_variables: int):
+        self.number_of_variables = number_of_variables
+        self.kinds: List[int] = []
+        self.payloads: List = []
+        self._unique: Dict[Tuple[int, object], int] = {}
+        self._cache: Dict[frozenset, int] = {}  # component → node
+        self.true = self._node(AND, ())
+        self.false = self._node(OR, ())
+
+    def _node(self, kind: int, payload) -> int:
+        key = (kind, payload)
+        node = self._unique.get(key)
+        if node is None:
+            node = self._unique[key] = len(self.kinds)
+            self.kinds.append(kind)
+            self.payloads.append(payload)
+        return node
+
+    def _and(self, children: Iterable[int]) -> int:
+        children = tuple(child for child in children if child != self.true)
+        if self.false in children:
+            return self.false
+        return children[0] if len(children) == 1 else self._node(AND, children)
+
+    def _or(self, children: Iterable[int]) -> int:
+        children = tuple(child for child in children if child != self.false)
+        return children[0] if len(children) == 1 else self._node(OR, children)
+
+    def _conjunction(self, implied: Iterable[int], free: Iterable[int],
+                     components: List[Tuple[frozenset, List[Clause]]]) -> int:
+        """
+        :return: the node of the implied literals, the free variables and the (already compiled) components of the
+                 residual clauses
+        """
+        children = [self._node(LITERAL, literal) for literal in sorted(implied, key=abs)]
+        children.extend(self._node(FREE, var) for var in sorted(free))
+        children.extend(self._cache[key] for key, _ in components)
+        return self._and(children)
+
+    @staticmethod
+    def _split(implied: List[int], free: Iterable[int], clauses: List[Clause]) -> \
+            Tuple[List[int], Iterable[int], List[Tuple[frozenset, List[Clause]]]]:
+        return implied, free, [(frozenset(component), component) for component in _components(clauses)]
+
+    def _branches(self, clauses: List[Clause]) -> List[Tuple[List[int], Iterable[int], List]]:
+        """
+        :return: the implied literals, the free variables and the residual components of the two values of the most
+                 frequent variable of the component (the conflicting ones are skipped)
+        """
+        occurrences: Dict[int, int] = {}
+        for clause in clauses:
+            for literal in clause:
+                occurrences[abs(literal)] = occurrences.get(abs(literal), 0) + 1
+        variables = set(occurrences)
+        decision = max(occurrences, key=occurrences.get)
+
+        branches = []
+        for literal in (decision, -decision):
+            propagated = _propagate(clauses, (literal,))
+            if propagated is None:
+                continue
+            implied, residual = propagated
+            remaining = {abs(literal) for clause in residual for literal in clause}
+            free = variables - remaining - {abs(literal) for literal in implied}
+            branches.append(self._split(implied, free, residual))
+        return branches
+
+    def _compile_components(self, components: List[Tuple[frozenset, List[Clause]]]):
+        """
+        Compiles the components missing from the cache with an explicit stack (the search is as deep as the number
+        of decisions): a component is combined once the residual components of its branches are compiled.
+        """
+        stack: List[Tuple[frozenset, List[Clause], Optional[List]]] = [(key, clauses, None)
+                                                                        for key, clauses in components]
+        while stack:
+            key, clauses, branches = stack.pop()
+            if key in self._cache:
+                continue
+
+            if branches is None:
+                branches = self._branches(clauses)
+                stack.append((key, clauses, branches))
+                stack.extend((other, residual, None) for _, _, residuals in branches for other, residual in residuals
+                             if other not in self._cache)
+            else:
+                self._cache[key] = self._or([self._conjunction(*branch) for branch in branches])
+
+    def compile(self, clauses: Iterable[Iterable[int]]) -> int:
+        normalized = [clause for clause in map(_normalize, clauses) if clause is not None]
+        propagated = _propagate(list(dict.fromkeys(normalized)), ())
+        if propagated is None:
+            return self.false
+
+        implied, residual = propagated
+        assigned = {abs(literal) for literal in implied} | {abs(literal) for clause in residual for literal in clause}
+        free = [var for var in range(1, self.number_of_variables + 1) if var not in assigned]
+        split = self._split(implied, free, residual)
+        self._compile_components(split[2])
+        return self._conjunction(*split)
+
+
+def compile_cnf(clauses: Iterable[Iterable[int]], number_of_variables: int) -> Circuit:
+    """
+    Compiles a CNF into a smooth d-DNNF by exhaustive DPLL search: the clauses are unit propagated and split into
+    independent components, every component branches on its most frequent variable and is cached, so a component
+    met again under a different partial assignment is compiled once. The variables that disappear from a branch are
+    kept as FREE nodes, which makes the circuit smooth.
+    :param number_of_variables: the variables of the circuit are 1..number_of_variables, the ones occurring in no
+                                clause are free
+    """
+    compiler = _Compiler(number_of_variables)
+    root = compiler.compile(clauses)
+
+    # only the nodes reachable from the root are kept, in topological order
+    kinds, payloads = compiler.kinds, compiler.payloads
+    reachable = [False] * len(kinds)
+    reachable[root] = True
+    for node in reversed(range(root + 1)):
+        if reachable[node] and kinds[node] >= AND:
+            for child in payloads[node]:
+                reachable[child] = True
+
+    renumbered: Dict[int, int] = {}
+    circuit = Circuit([], [], number_of_variables)
+    for node in range(root + 1):
+        if reachable[node]:
+            renumbered[node] = len(circuit.kinds)
+            circuit.kinds.append(kinds[node])
+            payload = payloads[node]
+            circuit.payloads.append(tuple(renumbered[child] for child in payload) if kinds[node] >= AND else payload)
+
+    return circuit
+
+
+def _groundings(lc: Logic, facts: Optional[AxiomStore]) -> Iterable[Logic]:
+    """
+    :return: the ground instances of the universal quantifiers at the top of the formula, simplified w.r.t. the
+             facts; differently from `ground` the conjunctions are not split, so every instance is a whole formula
+    """
+    if type(lc) is not UniversalQuantifier:
+        yield simplify(expand_quantifiers(lc), facts)
+        return
+
+    _check_closed_world(lc)
+    for instance in substitute_many(lc.proposition, lc.variables, product(*[var.constants for var in lc.variables])):
+        yield from _groundings(instance, facts)
+
+
+class WeightedModelCounter(object):
+    """
+    Probabilities of the ground formulas under hard axioms and weighted ones, with the semantics of Markov logic:
+    a world satisfying the hard axioms has a weight exp(Σ wᵢ nᵢ), where nᵢ is the number of the ground instances of
+    the i-th weighted axiom it satisfies. Every ground instance of a weighted axiom gets a Tseitin literal equivalent to
+    it, weighted exp(wᵢ) when true.
+    The CNF is compiled once (see `compile_cnf`) into a circuit answering the marginals of all the atoms by two
+    passes and the probability of a conjunction of literals by one pass; any other query is compiled together with
+    its definition, once.
+    """
+
+    def __init__(self, store: Optional[AxiomStore] = None):
+        """
+        :param store: the hard axioms, the facts of its truth tensors included
+        """
+        self.encoder = CNFEncoder()
+        self._weights: Dict[int, float] = {}  # log weight of the literals made true by the weighted axioms
+        self._circuit: Optional[Circuit] = None
+        self._queries: Dict[Logic, Tuple[Circuit, int]] = {}
+
+        if store is not None:
+            for axiom in store:
+                self.add_axiom(axiom, store)
+            for predicate in store.tabled_predicates():
+                ids, values = store.table(predicate).changes_since(0)
+                for row, value in zip(ids.tolist(), values.tolist()):
+                    literal = self.encoder.symbols.variable(predicate(*map(store.constants.constant, row)))
+                    self.encoder.clause_set.add((literal if value else -literal,))
+
+    @property
+    def circuit(self) -> Circuit:
+        """
+        :return: the compiled axioms, compiled when first needed
+        """
+        if self._circuit is None:
+            self._circuit = compile_cnf(self.encoder.clause_set.clauses, len(self.encoder.symbols))
+        return self._circuit
+
+    def _changed(self):
+        self._circuit = None
+        self._queries.clear()
+
+    def add_axiom(self, lc: Logic, facts: Optional[AxiomStore] = None):
+        """
+        Adds a hard axiom, the ground literals are kept as they are and the other axioms are simplified w.r.t. the
+        facts.
+        """
+        facts = facts if as_ground_literal(lc) is None else None
+        for instance in ground(lc, facts):
+            self.encoder.encode(instance)
+        self._changed()
+
+    def add_weighted_axiom(self, lc: Logic, weight: float, facts: Optional[AxiomStore] = None):
+        """
+        Adds a soft axiom, every ground instance of `lc` weights exp(weight) in the worlds satisfying it.
+        """
+        for instance in _groundings(lc, facts):
+            if type(instance) is TruthLogicalExpression:
+                continue  # it weights the same in every world
+            literal = self.encoder.define(instance)
+            self._weights[literal] = self._weights.get(literal, 0.0) + weight
+        self._changed()
+
+    def _log_weights(self, number_of_variables: int, evidence: Iterable[int] = ()) -> Tuple[List[float], List[float]]:
+        positive = [0.0] * (number_of_variables + 1)
+        negative = [0.0] * (number_of_variables + 1)
+        for literal, weight in self._weights.items():
+            if literal > 0:
+                positive[literal] += weight
+            else:
+                negative[-literal] += weight
+        for literal in evidence:
+            (negative if literal > 0 else positive)[abs(literal)] = _NEGATIVE_INFINITY
+        return positive, negative
+
+    def _literals(self, lc: Logic, circuit: Circuit) -> Optional[Tuple[List[int], int]]:
+        """
+        :return: the literals of the atoms of the circuit in a conjunction of ground literals and the number of the
+                 other atoms (occurring in no axiom, so true with probability 1/2); None if `lc` is not such a
+                 conjunction
+        """
+        symbols = self.encoder.symbols
+        literals = []
+        unknown = {}
+        for conjunct in _conjuncts(lc):
+            polarity = type(conjunct) is not NotLogicalExpression
+            atom = conjunct if polarity else conjunct.arg
+            if type(atom) is not LogicalPredicate or not all(type(arg) is LogicalConstant for arg in atom._args):
+                return None
+            if atom in symbols and symbols.variable(atom) <= circuit.number_of_variables:
+                var = symbols.variable(atom)
+                literals.append(var if polarity else -var)
+            elif unknown.setdefault(atom, polarity) is not polarity:
+                literals.append(0)  # a contradiction
+        return literals, len(unknown)
+
+    def log_probability(self, lc: Logic, facts: Optional[AxiomStore] = None) -> float:
+        """
+        :return: the logarithm of the probability of a ground formula (closed-world quantifiers are expanded)
+        :raise ValueError: if the hard axioms are inconsistent
+        """
+        lc = simplify(expand_quantifiers(lc), facts)
+        circuit = self.circuit
+        literals = self._literals(lc, circuit) if lc is not TRUE and lc is not FALSE else ([], 0)
+        if literals is not None:
+            literals, unknown = literals
+            if lc is FALSE or 0 in literals:
+                return _NEGATIVE_INFINITY
+            total = circuit.log_count(*self._log_weights(circuit.number_of_variables))
+            if total == _NEGATIVE_INFINITY:
+                raise ValueError('The hard axioms are inconsistent')
+            count = circuit.log_count(*self._log_weights(circuit.number_of_variables, literals))
+            return count - total - unknown * math.log(2)
+
+        compiled = self._queries.get(lc)
+        if compiled is None:
+            literal = self.encoder.define(lc)
+            compiled = self._queries[lc] = compile_cnf(self.encoder.clause_set.clauses,
+                                                       len(self.encoder.symbols)), literal
+        circuit, literal = compiled
+        total = circuit.log_count(*self._log_weights(circuit.number_of_variables))
+        if total == _NEGATIVE_INFINITY:
+            raise ValueError('The hard axioms are inconsistent')
+        return circuit.log_count(*self._log_weights(circuit.number_of_variables, (literal,))) - total
+
+    def marginals(self, evidence: Logic = TRUE) -> Dict[Logic, float]:
+        """
+        :param evidence: a conjunction of ground literals of compiled atoms
+        :return: the probability of every atom of the axioms given the evidence
+        :raise ValueError: if the evidence is not a conjunction of literals or it is impossible
+        """
+        circuit = self.circuit
+        literals = self._literals(evidence, circuit) if evidence is not TRUE else ([], 0)
+        if literals is None or literals[1] or 0 in literals[0]:
+            raise ValueError('The evidence has to be a conjunction of ground literals of the compiled atoms')
+
+        total, positive, _ = circuit.log_marginals(*self._log_weights(circuit.number_of_variables, literals[0]))
+        if total == _NEGATIVE_INFINITY:
+            raise ValueError('The evidence is impossible')
+        return {atom: math.exp(positive[var] - total) for atom, var in self.encoder.symbols.atoms()
+                if atom is not TRUE and var <= circuit.number_of_variables}
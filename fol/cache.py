@@ -0,0 +1,146 @@
+"""
+:Author: Theodor A. Dumitrescu
+:Date: Oct 18, 2026
+:Version: 0.0.1
+"""
+import threading
+from collections import OrderedDict, namedtuple
+from typing import Any, Callable, Dict, Hashable, Optional, Sequence
+
+# statistics of a namespace of the transformation cache
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'evictions', 'invalidations', 'size', 'maxsize'])
+
+# namespaces and their default sizes:
+#   nnf     the negation normal form of a formula
+#   cnf     the clauses (tuples of literals) of a formula converted by distribution
+#   ground  a formula whose quantifiers are expanded over the constants of their closed-world variables
+#   program the program of a formula over a tuple of variables, see fol.backend.tape.compile_formula
+DEFAULT_SIZES = {'nnf': 4096, 'cnf': 1024, 'ground': 1024, 'program': 1024}
+
+
+class LRUCache(object):
+    """
+    Bounded map from the formulas to their transformations evicting the least recently used entry.
+    Since the formulas are hash-consed the entries are keyed by the identity of the formula, which is held by the
+    entry so its id cannot be reused while cached, and by a key distinguishing the transformations of the same formula
+    with different arguments. An entry computed from the constants of some variables stores their versions and is
+    invalidated when one of them changes (see LogicalVariable.constants).
+    The namespaces are shared by the threads: the entries are read and written under a lock, the transformation is
+    computed outside of it so two threads missing the same entry may both compute it.
+    """
+
+    def __init__(self, maxsize: int):
+        self._entries: OrderedDict = OrderedDict()
+        self.maxsize: int = maxsize
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+        self.invalidations: int = 0
+        self._lock = threading.Lock()
+
+    def memoize(self, lc, compute: Callable[[Any], Any], dependencies: Callable[[Any], Sequence] = None,
+                key: Hashable = None):
+        """
+        :param lc: the formula
+        :param compute: the transformation, called on a miss
+        :param dependencies: called on a miss, returns the variables whose constants the transformation depends on
+        :param key: the other arguments of the transformation, the objects they refer to must be kept alive by the
+                    result (e.g. ids)
+        :return: the transformation of the formula
+        """
+        index = id(lc) if key is None else (id(lc), key)
+        with self._lock:
+            entry = self._entries.get(index)
+            if entry is not None:
+                variables, versions, result = entry[1:]
+                if all(var.version == version for var, version in zip(variables, versions)):
+                    self.hits += 1
+                    self._entries.move_to_end(index)
+                    return result
+
+                self.invalidations += 1
+                del self._entries[index]
+
+            self.misses += 1
+
+        variables = tuple(dependencies(lc)) if dependencies is not None else ()
+        result = compute(lc)
+
+        # an untouched formula is cheap to transform again and is not worth evicting another entry
+        if result is not lc and self.maxsize > 0:
+            with self._lock:
+                self._entries[index] = (lc, variables, tuple(var.version for var in variables), result)
+                self._shrink()
+
+        return result
+
+    def resize(self, maxsize: int):
+        with self._lock:
+            self.maxsize = maxsize
+            self._shrink()
+
+    def _shrink(self):
+        # NOTE(thadumi): called holding the lock
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = self.invalidations = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.evictions, self.invalidations, len(self._entries),
+                             self.maxsize)
+
+
+_NAMESPACES: Dict[str, LRUCache] = {name: LRUCache(size) for name, size in DEFAULT_SIZES.items()}
+
+
+def namespace(name: str) -> LRUCache:
+    """
+    :raise ValueError: if there is no namespace with the given name
+    """
+    cache = _NAMESPACES.get(name)
+    if cache is None:
+        raise ValueError('Unknown cache namespace `{}`, expected one of {}'.format(name, ', '.join(_NAMESPACES)))
+    return cache
+
+
+def memoize(name: str, lc, compute: Callable[[Any], Any], dependencies: Callable[[Any], Sequence] = None,
+            key: Hashable = None):
+    """
+    :return: the transformation `compute` of the formula, cached in the namespace `name`, see LRUCache.memoize
+    """
+    return namespace(name).memoize(lc, compute, dependencies, key)
+
+
+def configure_cache(name: str, maxsize: int):
+    """
+    Sets the maximum number of entries of a namespace, 0 disables it.
+    """
+    if maxsize < 0:
+        raise ValueError('The size of a cache can not be negative')
+    namespace(name).resize(maxsize)
+
+
+def cache_info(name: Optional[str] = None):
+    """
+    :return: the statistics of the given namespace or a dictionary with the ones of every namespace
+    """
+    if name is not None:
+        return namespace(name).info()
+    return {name: cache.info() for name, cache in _NAMESPACES.items()}
+
+
+def clear_cache(name: Optional[str] = None):
+    """
+    Drops the entries and resets the statistics of the given namespace or of every namespace.
+    """
+    for cache in ([namespace(name)] if name is not None else _NAMESPACES.values()):
+        cache.clear()
@@ -5,49 +5,164 @@
 
 # NOTE(thadumi) should be this be weakref.WeakKeyDictionary references?
 # if so the user should take care of hard referencing every predicate and axiom
-from logic import LogicalExpression
-from predicate import Predicate
+import sys
+import types
+from typing import Dict, Optional, Iterable
+
+from fol.knowledge_base import KnowledgeBase, Answer, Entailment, current, using
+from fol.logic import LogicalExpression, Logic, TRUE, LogicalConstant
+from fol.predicate import Predicate
+
+# the legacy module API: the functions below and the knowledge base symbols they are used with
+__all__ = ['KnowledgeBase', 'Answer', 'Entailment', 'current', 'using',
+           'track_constant', 'constant_id', 'constant_already_defined', 'track_predicate', 'predicate_already_defined',
+           'track_variable', 'variable_already_defined', 'tell', 'tell_many', 'tell_facts', 'tell_weighted',
+           'clear_axioms', 'snapshot', 'probability', 'marginals', 'ask']
+
+# NOTE(thadumi): the state lives in a KnowledgeBase, the functions below work on the current one (see
+# fol.knowledge_base.using) and the module attributes read and write it
+_ATTRIBUTES = {
+    'CONSTANTS': 'constants',
+    'PREDICATES': 'predicates',
+    'VARIABLES': 'variables',
+    'FUNCTIONS': 'functions',
+    'CONSTANT_IDS': 'constant_ids',
+    'AXIOMS': 'axioms',
+    'WEIGHTED_AXIOMS': 'weighted_axioms',
+    'KB_VERSION': 'version',
+    'CHUNK_SIZE': 'chunk_size',
+    'FORWARD_CHAINING': 'forward_chaining',
+    'LIFTED_INFERENCE': 'lifted_inference',
+    'TELL_SIMPLIFICATION': 'tell_simplification',
+    'GROUNDING_WORKERS': 'grounding_workers',
+    '_SIMPLIFIER': '_simplification',
+}
+
+# the state kept across the queries, see fol.knowledge_base._Engines
+_ENGINES = {
+    '_INCREMENTAL': 'incremental',
+    '_MATERIALIZER': 'materializer',
+    '_LIFTED': 'lifted',
+    '_PROVER': 'prover',
+    '_COUNTER': 'counter',
+}
+
+
+def __getattr__(name: str):
+    if name in _ATTRIBUTES:
+        return getattr(current(), _ATTRIBUTES[name])
+    if name in _ENGINES:
+        # noinspection PyProtectedMember
+        return getattr(current()._engines, _ENGINES[name])
+    raise AttributeError('module {} has no attribute {}'.format(__name__, name))
+
+
+class _Module(types.ModuleType):
+
+    def __setattr__(self, name: str, value):
+        if name in _ATTRIBUTES:
+            setattr(current(), _ATTRIBUTES[name], value)
+        elif name in _ENGINES:
+            # noinspection PyProtectedMember
+            setattr(current()._engines, _ENGINES[name], value)
+        else:
+            super().__setattr__(name, value)
+
+
+sys.modules[__name__].__class__ = _Module
 
-CONSTANTS = {}
-PREDICATES = {}
-VARIABLES = {}
-FUNCTIONS = {}  # NOTE(thadumi): useless a function is a predicate with one arg
 
-# TODO(thadumi) define an hash method for LogicalComputation for checking that there are no others axiom already defined
-AXIOMS = []
+def track_constant(constant_name, meta):
+    current().track_constant(constant_name, meta)
 
 
-def track_constant(constant_name, meta):
-    CONSTANTS[constant_name] = meta
+def constant_id(constant: LogicalConstant) -> int:
+    return current().constant_id(constant)
 
 
 def constant_already_defined(name: str) -> bool:
-    return name in CONSTANTS.keys()
+    return current().constant_already_defined(name)
 
 
 def track_predicate(predicate_name: str, meta: Predicate):
-    PREDICATES[predicate_name] = meta
-    return meta
+    return current().track_predicate(predicate_name, meta)
 
 
 def predicate_already_defined(name: str) -> bool:
-    return name in PREDICATES.keys()
+    return current().predicate_already_defined(name)
 
 
 def track_variable(name: str, meta):
-    VARIABLES[name] = meta
+    current().track_variable(name, meta)
 
 
 def variable_already_defined(name: str) -> bool:
-    return name in VARIABLES.keys()
+    return current().variable_already_defined(name)
+
+
+def tell(lc: LogicalExpression) -> bool:
+    return current().tell(lc)
+
+
+def tell_many(axioms: Iterable[LogicalExpression], chunk_size: Optional[int] = None) -> int:
+    """
+    See KnowledgeBase.tell_many.
+    """
+    return current().tell_many(axioms, chunk_size)
+
+
+def tell_facts(predicate: Predicate, ids, values=True) -> int:
+    """
+    See KnowledgeBase.tell_facts.
+    """
+    return current().tell_facts(predicate, ids, values)
+
+
+def tell_weighted(lc: LogicalExpression, weight: float) -> bool:
+    """
+    See KnowledgeBase.tell_weighted.
+    """
+    return current().tell_weighted(lc, weight)
+
+
+def clear_axioms():
+    current().clear_axioms()
+
+
+def snapshot() -> KnowledgeBase:
+    """
+    See KnowledgeBase.snapshot.
+    """
+    return current().snapshot()
+
+
+def _weighted_counter():
+    # noinspection PyProtectedMember
+    return current()._weighted_counter()
+
+
+def _simplifier():
+    # noinspection PyProtectedMember
+    return current()._simplifier()
+
+
+def probability(lc: Logic, evidence: Logic = TRUE) -> float:
+    """
+    See KnowledgeBase.probability.
+    """
+    return current().probability(lc, evidence)
+
 
+def marginals(evidence: Logic = TRUE) -> Dict[Logic, float]:
+    """
+    See KnowledgeBase.marginals.
+    """
+    return current().marginals(evidence)
 
-def tell(lc: LogicalExpression):
-    '''    if isinstance(lc) or isinstance(lc):
-            raise ValueError('An axiom as to be a logical formula')
-    '''
-    AXIOMS.append(lc)
 
+def ask(lc: Logic, conflict_limit: Optional[int] = None) -> Answer:
+    """
+    See KnowledgeBase.ask.
+    """
+    return current().ask(lc, conflict_limit)
 
-def ask(lc):
-    raise Exception  # TODO
@@ -0,0 +1,724 @@
+"""
+:Author: Theodor A. Dumitrescu
+:Date: Oct 18, 2026
+:Version: 0.0.1
+"""
+import contextvars
+import logging
+import math
+import threading
+import time
+from contextlib import contextmanager
+from enum import Enum
+from functools import wraps
+from itertools import islice
+from typing import Dict, Optional, Iterable, List, Tuple, Iterator, Any
+
+from fol.axiom_store import AxiomStore, ConstantIndex, as_ground_literal
+from fol.logic import LogicalExpression, Logic, Not, TRUE, LogicalConstant, LogicalVariable
+from fol.predicate import Predicate
+
+
+class Entailment(Enum):
+    ENTAILED = 'entailed'
+    NOT_ENTAILED = 'not entailed'
+    UNKNOWN = 'unknown'
+
+
+class Answer(object):
+    def __init__(self, status: Entailment, countermodel: Dict[Logic, bool] = None, statistics: Dict = None):
+        self.status: Entailment = status
+        # an assignment of the ground atoms satisfying the axioms but not the query (only when NOT_ENTAILED)
+        self.countermodel: Optional[Dict[Logic, bool]] = countermodel
+        # kb version, timings (in seconds) and sizes of the query, see KnowledgeBase.ask
+        self.statistics: Dict = statistics or {}
+
+    def __bool__(self):
+        return self.status is Entailment.ENTAILED
+
+    def __str__(self):
+        return self.status.value
+
+
+class _Engines(object):
+    """
+    The state kept across the queries of a knowledge base, every engine is built when first needed.
+    """
+
+    def __init__(self):
+        self.incremental = None  # solver and CNF encoding of the axioms, see _IncrementalState
+        self.materializer = None  # the closure of the Horn axioms, see fol.backend.chaining
+        self.lifted = None  # (version, the partition of the constants computed for it), see fol.backend.lifted
+        self.prover = None  # the first-order clauses of the axioms that cannot be grounded, see fol.backend.resolution
+        self.counter = None  # (version, the weighted model counter of the axioms), see fol.backend.wmc
+
+
+class _ThreadEngines(threading.local, _Engines):
+    """
+    The engines of a snapshot, one set per thread so the readers of the same snapshot need no lock.
+    """
+
+
+class _IncrementalState(object):
+    """
+    The grounded and encoded axioms living in a SAT solver reused by every query.
+    The queries are solved under an assumption literal enabling their clauses, so the clauses learnt by the solver
+    are still valid after the query is retracted and are kept for the next ones.
+    """
+
+    def __init__(self, kb: 'KnowledgeBase'):
+        from fol.backend.cnf import CNFEncoder
+        from fol.backend.sat import Solver
+
+        self.kb: KnowledgeBase = kb
+        self.encoder = CNFEncoder()
+        self.solver = Solver()
+        self.encoded_axioms: int = 0  # axioms[:encoded_axioms] are already in the solver
+        self.encoded_facts: Dict[Predicate, int] = {}  # journal positions of the encoded truth tensors
+        self.encoded_residuals: int = 0  # the residual constraints already in the solver, see add_residuals
+        self.encoded_units: int = 0  # the derived units already in the solver, see add_residuals
+        self.unground: List[Logic] = []  # the axioms that could not be grounded, the solver misses some of their clauses
+
+    def add_axioms(self, axioms, simplifier=None) -> int:
+        """
+        :param simplifier: when given, the axioms it has grounded are replaced by its residual constraints
+        :return: the number of clauses added to the solver
+        :raise UnboundVariableError: if some axiom, now or at a previous call, could not be grounded; the other axioms
+                                     are encoded anyway and a failed one is not grounded again
+        """
+        from fol.backend.cnf import UnboundVariableError
+        from fol.backend.grounding import ground
+
+        store = self.kb.axioms
+        axioms = list(axioms)
+        added = 0
+        if simplifier is not None:
+            kept = [axiom for axiom in axioms if as_ground_literal(axiom) is not None or axiom in simplifier.unground]
+            self.encoded_axioms += len(axioms) - len(kept)
+            axioms = kept
+            added += self.add_residuals(simplifier)
+
+        if self.kb.grounding_workers > 1:
+            from fol.backend.parallel import encode_parallel
+
+            rules = [axiom for axiom in axioms if as_ground_literal(axiom) is None]
+            try:
+                clauses = encode_parallel(rules, self.encoder, store, self.kb.grounding_workers)
+            except UnboundVariableError:
+                pass  # nothing has been added, the loop below finds the failing axioms
+            else:
+                self.solver.add_clauses(clauses)
+                added += len(clauses)
+                axioms = [axiom for axiom in axioms if as_ground_literal(axiom) is not None]
+                self.encoded_axioms += len(rules)
+
+        for axiom in axioms:
+            # the ground literals are encoded as they are, the other axioms are simplified w.r.t. them
+            facts = store if as_ground_literal(axiom) is None else None
+            try:
+                for instance in ground(axiom, facts):
+                    clauses = self.encoder.encode(instance)
+                    self.solver.add_clauses(clauses)
+                    added += len(clauses)
+            except UnboundVariableError:
+                self.unground.append(axiom)
+            self.encoded_axioms += 1
+
+        if self.unground:
+            raise UnboundVariableError('The axiom `{}` cannot be grounded'.format(self.unground[0]))
+        return added
+
+    def add_residuals(self, simplifier) -> int:
+        """
+        Adds the residual constraints and the derived units of the simplifier created since the last call. The
+        residuals already in the solver may have been simplified since, the solver propagates the same units.
+        :return: the number of clauses added to the solver
+        """
+        added = 0
+        for _, residual in simplifier.residuals_since(self.encoded_residuals):
+            clauses = self.encoder.encode(residual)
+            self.solver.add_clauses(clauses)
+            added += len(clauses)
+        self.encoded_residuals = simplifier.number_of_residuals
+
+        for atom, value in islice(simplifier.units.items(), self.encoded_units, None):
+            literal = self.encoder.symbols.variable(atom)
+            self.solver.add_clause((literal if value else -literal,))
+            added += 1
+        self.encoded_units = len(simplifier.units)
+
+        return added
+
+    def add_tabled_facts(self) -> int:
+        """
+        Adds as unit clauses the facts written in the truth tensors since the last call.
+        :return: the number of clauses added to the solver
+        """
+        store = self.kb.axioms
+        added = 0
+        for predicate in store.tabled_predicates():
+            table = store.table(predicate)
+            ids, values = table.changes_since(self.encoded_facts.get(predicate, 0))
+            self.encoded_facts[predicate] = table.journal_size
+
+            for row, value in zip(ids.tolist(), values.tolist()):
+                literal = self.encoder.symbols.variable(predicate(*map(store.constants.constant, row)))
+                self.solver.add_clause((literal if value else -literal,))
+                added += 1
+
+        return added
+
+
+def _answer_many(queries: Iterable[Logic], answer, return_exceptions: bool) -> List:
+    """
+    :return: the answers of the queries in their order, computed once per distinct query
+    """
+    answers: Dict[Logic, Any] = {}
+    result = []
+    for lc in queries:
+        if lc not in answers:
+            try:
+                answers[lc] = answer(lc)
+            except Exception as e:
+                if not return_exceptions:
+                    raise
+                answers[lc] = e
+        result.append(answers[lc])
+
+    return result
+
+
+def _writer(method):
+    """
+    Runs the method holding the lock of the knowledge base, which must not be a snapshot. The cached snapshot is
+    dropped since the knowledge base is going to change.
+    """
+
+    @wraps(method)
+    def locked(self: 'KnowledgeBase', *args, **kwargs):
+        if self.read_only:
+            raise ValueError('The snapshot of a knowledge base is read only')
+        with self._lock:
+            self._snapshot = None
+            return method(self, *args, **kwargs)
+
+    return locked
+
+
+def _reader(method):
+    """
+    Runs the method holding the lock of the knowledge base, unless it is a snapshot: nobody writes a snapshot and its
+    engines are per thread.
+    """
+
+    @wraps(method)
+    def locked(self: 'KnowledgeBase', *args, **kwargs):
+        if self.read_only:
+            return method(self, *args, **kwargs)
+        with self._lock:
+            return method(self, *args, **kwargs)
+
+    return locked
+
+
+class KnowledgeBase(object):
+    """
+    The symbol tables, the axioms and the query engines of a knowledge base, so independent knowledge bases can live
+    side by side in a process. The functional API (`fol.constant`, `fol.predicate`, `fol.variable`, `fol.fol_status`)
+    works on the current knowledge base, a default one unless another is bound to the context by `using`.
+    The knowledge base can be shared among threads: the writes and the queries hold its lock. The readers that must
+    not wait for a writer query a snapshot instead (see `snapshot`), a read-only copy taken in O(1) whose containers
+    are copied by the writer only when it writes them next (copy on write).
+    The predicates keep their truth tensor, so a predicate backed by one should belong to a single knowledge base.
+    """
+
+    def __init__(self):
+        self.constants: Dict[str, LogicalConstant] = {}
+        self.predicates: Dict[str, Predicate] = {}
+        self.variables: Dict[str, LogicalVariable] = {}
+        self.functions: Dict[str, Any] = {}  # NOTE(thadumi): useless a function is a predicate with one arg
+
+        # dense ids of the constants, indexing the truth tensors of the predicates
+        self.constant_ids: ConstantIndex = ConstantIndex()
+
+        # the axioms in the order they have been told, indexed by predicate and ground arguments, without duplicates
+        self.axioms: AxiomStore = AxiomStore(self.constant_ids)
+
+        # the soft axioms and their weights, see tell_weighted
+        self.weighted_axioms: List[Tuple[Logic, float]] = []
+
+        # incremented by every tell, the answers report the version they have been computed on
+        self.version: int = 0
+
+        # ground literals written at once into the truth tensors by the bulk tells
+        self.chunk_size: int = 1 << 16
+
+        # answer the queries in the forward chaining closure of the Horn axioms without the solver, see
+        # fol.backend.chaining
+        self.forward_chaining: bool = False
+
+        # answer the queries over closed-world domains reduced to representatives of their interchangeable
+        # constants, see fol.backend.lifted
+        self.lifted_inference: bool = False
+
+        # simplify the axioms w.r.t. the facts when they are told, the queries encode only the residual constraints,
+        # see fol.backend.simplification
+        self.tell_simplification: bool = False
+
+        # processes grounding and encoding the axioms told since the last query (see fol.backend.parallel), in
+        # process if < 2
+        self.grounding_workers: int = 0
+
+        self.read_only: bool = False
+
+        self._lock = threading.RLock()
+        self._engines: _Engines = _Engines()
+        self._simplification = None  # the residual constraints of the axioms, see _simplifier
+        self._snapshot: Optional[KnowledgeBase] = None
+        self._service = None  # the asyncio front end, see service
+
+    # symbols
+
+    @_writer
+    def track_constant(self, name: str, constant: LogicalConstant):
+        self.constants[name] = constant
+        self.constant_ids.id(constant)
+
+    def constant_id(self, constant: LogicalConstant) -> int:
+        return self.constant_ids.id(constant)
+
+    def constant_already_defined(self, name: str) -> bool:
+        return name in self.constants
+
+    @_writer
+    def track_predicate(self, name: str, predicate: Predicate) -> Predicate:
+        self.predicates[name] = predicate
+        return predicate
+
+    def predicate_already_defined(self, name: str) -> bool:
+        return name in self.predicates
+
+    @_writer
+    def track_variable(self, name: str, var: LogicalVariable):
+        self.variables[name] = var
+
+    def variable_already_defined(self, name: str) -> bool:
+        return name in self.variables
+
+    @_writer
+    def constant(self, name: str) -> LogicalConstant:
+        """
+        Defines a constant of this knowledge base, see `fol.constant.constant`.
+        """
+        from fol.constant import constant
+
+        with using(self):
+            return constant(name)
+
+    @_writer
+    def predicate(self, name: str, number_of_arguments: int, storage: str = None) -> Predicate:
+        """
+        Defines a predicate of this knowledge base, see `fol.predicate.predicate`.
+        """
+        from fol.predicate import predicate
+
+        with using(self):
+            return predicate(name, number_of_arguments, storage)
+
+    @_writer
+    def variable(self, name: str, static_value: Any = None,
+                 constants: Tuple[LogicalConstant, ...] = None) -> LogicalVariable:
+        """
+        Defines a variable of this knowledge base, see `fol.variable.variable`.
+        """
+        from fol.variable import variable
+
+        with using(self):
+            return variable(name, static_value, constants)
+
+    # writes
+
+    @_writer
+    def tell(self, lc: LogicalExpression) -> bool:
+        if not self.axioms.append(lc):
+            logging.debug('[tell] `{}` is already an axiom'.format(lc))
+            return False
+
+        self.version += 1
+        if self.tell_simplification:
+            self._simplifier().update()
+        return True
+
+    @_writer
+    def tell_many(self, axioms: Iterable[LogicalExpression], chunk_size: Optional[int] = None) -> int:
+        """
+        Tells every axiom, the ground literals of the predicates backed by a truth tensor are written into it in
+        chunks (see AxiomStore.append_facts).
+        :param chunk_size: by default the `chunk_size` of the knowledge base
+        :return: the number of axioms added
+        """
+        chunk_size = chunk_size if chunk_size is not None else self.chunk_size
+        added = 0
+        pending: Dict[Predicate, Tuple[List, List]] = {}
+
+        def flush(predicate: Predicate) -> int:
+            ids, values = pending.pop(predicate)
+            return self.axioms.append_facts(predicate, ids, values)
+
+        for axiom in axioms:
+            literal = as_ground_literal(axiom)
+            if literal is None or self.axioms.table(literal[0].predicate) is None:
+                added += self.axioms.append(axiom)
+                continue
+
+            atom, polarity = literal
+            ids, values = pending.setdefault(atom.predicate, ([], []))
+            # noinspection PyProtectedMember
+            ids.append(self.constant_ids.ids(atom._args))
+            values.append(polarity)
+            if len(ids) >= chunk_size:
+                added += flush(atom.predicate)
+
+        for predicate in list(pending):
+            added += flush(predicate)
+
+        if added:
+            self.version += 1
+            if self.tell_simplification:
+                self._simplifier().update()
+        return added
+
+    @_writer
+    def tell_facts(self, predicate: Predicate, ids, values=True) -> int:
+        """
+        Tells a batch of ground literals of a predicate given as the ids of their constants (see `constant_id`),
+        without building their formulas, see AxiomStore.append_facts.
+        :return: the number of facts added
+        """
+        added = self.axioms.append_facts(predicate, ids, values)
+        if added:
+            self.version += 1
+            if self.tell_simplification:
+                self._simplifier().update()
+        return added
+
+    @_writer
+    def tell_weighted(self, lc: LogicalExpression, weight: float) -> bool:
+        """
+        Tells a soft axiom of a Markov logic network: every world satisfying the (hard) axioms has a probability
+        proportional to exp(Σ weight * number of the ground instances of a soft axiom it satisfies), see
+        `probability`. The universal quantifiers at the top of `lc` range over its ground instances.
+        """
+        self.weighted_axioms.append((lc, float(weight)))
+        self.version += 1
+        return True
+
+    @_writer
+    def clear_axioms(self):
+        """
+        Removes every axiom, discarding the state kept for the incremental queries.
+        """
+        self.axioms.clear()
+        self.weighted_axioms.clear()
+        self.version += 1
+        self._engines = _Engines()
+        self._simplification = None
+
+    # snapshots
+
+    def snapshot(self) -> 'KnowledgeBase':
+        """
+        :return: a read-only copy of the knowledge base, not affected by the later writes. The snapshot is shared by
+                 the readers until the next write, every thread querying it builds its own engines. The axioms are
+                 grounded by its queries even when `tell_simplification` is set.
+        """
+        if self.read_only:
+            return self
+
+        with self._lock:
+            if self._snapshot is None or self._snapshot.version != self.version:
+                view = KnowledgeBase.__new__(KnowledgeBase)
+                view.__dict__.update(self.__dict__)
+                view.constants = dict(self.constants)
+                view.predicates = dict(self.predicates)
+                view.variables = dict(self.variables)
+                view.functions = dict(self.functions)
+                view.axioms = self.axioms.snapshot()
+                view.weighted_axioms = list(self.weighted_axioms)
+                view.read_only = True
+                view._engines = _ThreadEngines()
+                view._simplification = None
+                view._snapshot = None
+                view._service = None
+                self._snapshot = view
+
+            return self._snapshot
+
+    # queries
+
+    def _incremental_state(self) -> _IncrementalState:
+        engines = self._engines
+        if engines.incremental is None:
+            engines.incremental = _IncrementalState(self)
+
+        return engines.incremental
+
+    def _materializer(self):
+        engines = self._engines
+        if engines.materializer is None:
+            from fol.backend.chaining import Materializer
+            engines.materializer = Materializer(self.axioms)
+
+        return engines.materializer
+
+    def _lifted_reasoner(self):
+        engines = self._engines
+        if engines.lifted is None or engines.lifted[0] != self.version:
+            from fol.backend.lifted import LiftedReasoner
+            engines.lifted = self.version, LiftedReasoner(self.axioms)
+
+        return engines.lifted[1]
+
+    def _weighted_counter(self):
+        engines = self._engines
+        if engines.counter is None or engines.counter[0] != self.version:
+            from fol.backend.wmc import WeightedModelCounter
+            counter = WeightedModelCounter(self.axioms)
+            for lc, weight in self.weighted_axioms:
+                counter.add_weighted_axiom(lc, weight, self.axioms)
+            engines.counter = self.version, counter
+
+        return engines.counter[1]
+
+    def _simplifier(self):
+        if self._simplification is None:
+            from fol.backend.simplification import Simplifier
+            self._simplification = Simplifier(self.axioms)
+
+        return self._simplification
+
+    def _resolution_prover(self):
+        engines = self._engines
+        if engines.prover is None:
+            from fol.backend.resolution import ResolutionProver
+            engines.prover = ResolutionProver(self.axioms)
+
+        return engines.prover
+
+    @_reader
+    def probability(self, lc: Logic, evidence: Logic = TRUE) -> float:
+        """
+        The probability of a ground formula (closed-world quantifiers are expanded) given the evidence, in the
+        Markov logic network of the axioms (hard) and of the weighted axioms (soft, see tell_weighted); the atoms
+        occurring in no axiom are independent and true with probability 1/2.
+        The axioms are compiled once per version into a circuit (see fol.backend.wmc), the conjunctions of ground
+        literals are answered by a pass over it, any other formula is compiled together with the axioms once.
+        :raise ValueError: if the axioms are inconsistent or the evidence is impossible
+        """
+        counter = self._weighted_counter()
+        if evidence is TRUE:
+            return math.exp(counter.log_probability(lc, self.axioms))
+
+        conditioning = counter.log_probability(evidence, self.axioms)
+        if conditioning == -math.inf:
+            raise ValueError('The evidence `{}` is impossible'.format(evidence))
+        return math.exp(counter.log_probability(lc & evidence, self.axioms) - conditioning)
+
+    @_reader
+    def marginals(self, evidence: Logic = TRUE) -> Dict[Logic, float]:
+        """
+        :param evidence: a conjunction of ground literals of atoms occurring in the axioms
+        :return: the probability given the evidence of every ground atom of the axioms, see `probability`; all of
+                 them are computed by two passes over the compiled axioms
+        """
+        return self._weighted_counter().marginals(evidence)
+
+    def _prove(self, lc: Logic) -> Answer:
+        """
+        Answers the query by resolution (see fol.backend.resolution), with the `kb_version`, `resolution`,
+        `proving_time`, `given_clauses`, `generated_clauses`, `subsumed_clauses` and
+        `truncated_clauses` statistics.
+        """
+        start = time.perf_counter()
+        prover = self._resolution_prover()
+        status = prover.prove(lc)
+        statistics = {'kb_version': self.version, 'resolution': True, 'proving_time': time.perf_counter() - start}
+        statistics.update(prover.statistics)
+
+        if status is None:
+            return Answer(Entailment.UNKNOWN, statistics=statistics)
+
+        return Answer(Entailment.ENTAILED if status else Entailment.NOT_ENTAILED, statistics=statistics)
+
+    @_reader
+    def ask(self, lc: Logic, conflict_limit: Optional[int] = None) -> Answer:
+        """
+        Checks whether the axioms entail the given formula, i.e. whether the ground instances of the axioms plus the
+        negated query are unsatisfiable.
+        The solver is kept among the queries: only the axioms told after the last query are grounded and added to
+        it, and the negated query is solved under an assumption literal so the learnt clauses survive it.
+        When `forward_chaining` is set, a ground atom (or a conjunction of ground atoms) in the closure of the Horn
+        axioms is answered as entailed by a lookup, with the `kb_version`, `materialized` and `chaining_time`
+        statistics; the other queries still go to the solver.
+        When `lifted_inference` is set, the query is solved over the closed-world domains reduced to representatives
+        of their interchangeable constants (see fol.backend.lifted), with the `kb_version`, `lifted`, `classes`,
+        `domain_size`, `representatives`, `query_clauses`, `grounding_time` and `solving_time` statistics and a
+        countermodel over the representatives; the queries where no domain can be reduced are grounded as usual.
+        When `tell_simplification` is set, the solver gets the residual constraints of the axioms simplified when
+        told (see fol.backend.simplification) instead of grounding them, with the `residual_constraints` statistic.
+        When the axioms or the query cannot be grounded (a variable has no constants) the query is answered by the
+        resolution prover instead, without countermodel, see _prove.
+        :param lc: the query
+        :param conflict_limit: maximum number of conflicts of the SAT solver before answering UNKNOWN
+        :return: the answer, holding a countermodel when the query is not entailed and the statistics of the query
+                 (`kb_version`, `incremental`, `new_clauses`, `query_clauses`, `learnt_clauses`, `grounding_time`,
+                 `solving_time`)
+        """
+        from fol.backend.cnf import UnboundVariableError
+        from fol.backend.grounding import ground
+
+        if self.forward_chaining:
+            start = time.perf_counter()
+            materializer = self._materializer()
+            materializer.update()
+            if materializer.holds(lc):
+                return Answer(Entailment.ENTAILED, statistics={'kb_version': self.version,
+                                                               'materialized': True,
+                                                               'chaining_time': time.perf_counter() - start})
+
+        if self.lifted_inference:
+            answer = self._lifted_reasoner().entails(lc, conflict_limit)
+            if answer is not None:
+                entailed, countermodel, statistics = answer
+                statistics.update(kb_version=self.version, lifted=True)
+                if entailed is None:
+                    return Answer(Entailment.UNKNOWN, statistics=statistics)
+                if entailed:
+                    return Answer(Entailment.ENTAILED, statistics=statistics)
+                return Answer(Entailment.NOT_ENTAILED, countermodel, statistics)
+
+        incremental = self._engines.incremental is not None
+        state = self._incremental_state()
+        statistics = {'kb_version': self.version,
+                      'incremental': incremental,
+                      'learnt_clauses': state.solver.number_of_learnts}
+
+        start = time.perf_counter()
+        try:
+            simplifier = None
+            if self.tell_simplification and not self.read_only:
+                simplifier = self._simplifier()
+                statistics['residual_constraints'] = simplifier.update()
+            statistics['new_clauses'] = state.add_tabled_facts() + state.add_axioms(
+                self.axioms[state.encoded_axioms:], simplifier)
+
+            selector = state.encoder.symbols.fresh()
+            query_clauses = []
+            for instance in ground(Not(lc), self.axioms):
+                query_clauses.extend(state.encoder.encode(instance, guard=selector))
+        except UnboundVariableError as e:
+            logging.info('[ask] Unable to ground the knowledge base ({}), proving `{}` by resolution'.format(e, lc))
+            return self._prove(lc)
+
+        state.solver.add_clauses(query_clauses)
+        statistics['query_clauses'] = len(query_clauses)
+        statistics['grounding_time'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        status = state.solver.solve(assumptions=(selector,), conflict_limit=conflict_limit)
+        statistics['solving_time'] = time.perf_counter() - start
+
+        model = state.solver.model
+        state.solver.add_clause((-selector,))  # retracts the query
+
+        if status is None:
+            return Answer(Entailment.UNKNOWN, statistics=statistics)
+
+        if not status:
+            return Answer(Entailment.ENTAILED, statistics=statistics)
+
+        countermodel = {atom: model.get(var, False) for atom, var in state.encoder.symbols.atoms() if atom is not TRUE}
+        return Answer(Entailment.NOT_ENTAILED, countermodel, statistics)
+
+    @_reader
+    def ask_many(self, queries: Iterable[Logic], conflict_limit: Optional[int] = None,
+                 return_exceptions: bool = False) -> List[Answer]:
+        """
+        Answers the queries holding the lock once: the axioms told since the last query are grounded and encoded once
+        for all of them (see `ask`) and the repeated queries are answered once.
+        :param return_exceptions: the exception raised by a query is its answer, instead of being raised
+        :return: the answers in the order of the queries
+        """
+        return _answer_many(queries, lambda lc: self.ask(lc, conflict_limit), return_exceptions)
+
+    @_reader
+    def satisfaction(self, lc: Logic, **semantics) -> float:
+        """
+        The degree of truth of a closed formula w.r.t. the facts, see fol.backend.fuzzy.FuzzyEvaluator for the
+        semantics.
+        """
+        return self.satisfaction_many((lc,), **semantics)[0]
+
+    @_reader
+    def satisfaction_many(self, queries: Iterable[Logic], return_exceptions: bool = False,
+                          **semantics) -> List[float]:
+        """
+        The degrees of truth of the queries computed by a single evaluator, which builds the truth tensors of the
+        predicates without one once for all of them, see `satisfaction`.
+        :param return_exceptions: the exception raised by a query is its degree, instead of being raised
+        """
+        from fol.backend.fuzzy import FuzzyEvaluator
+
+        return _answer_many(queries, FuzzyEvaluator(self.axioms, **semantics).truth, return_exceptions)
+
+    # asyncio
+
+    def service(self):
+        """
+        :return: the asyncio front end batching the concurrent queries of the knowledge base, see
+                 fol.service.QueryService for its settings and metrics
+        """
+        with self._lock:
+            if self._service is None:
+                from fol.service import QueryService
+                self._service = QueryService(self)
+
+            return self._service
+
+    async def ask_async(self, lc: Logic, conflict_limit: Optional[int] = None) -> Answer:
+        """
+        See `ask`, the queries submitted together are answered by a batch on an executor (see `service`).
+        """
+        return await self.service().ask(lc, conflict_limit)
+
+    async def satisfaction_async(self, lc: Logic, **semantics) -> float:
+        """
+        See `satisfaction`, the queries submitted together are answered by a batch on an executor (see `service`).
+        """
+        return await self.service().satisfaction(lc, **semantics)
+
+
+# the knowledge base of the functional API when none is bound to the context, see current
+DEFAULT = KnowledgeBase()
+
+_CURRENT: contextvars.ContextVar = contextvars.ContextVar('knowledge_base', default=None)
+
+
+def current() -> KnowledgeBase:
+    """
+    :return: the knowledge base bound to the context (see `using`), the default one otherwise
+    """
+    kb = _CURRENT.get()
+    return kb if kb is not None else DEFAULT
+
+
+@contextmanager
+def using(kb: KnowledgeBase) -> Iterator[KnowledgeBase]:
+    """
+    Binds the knowledge base to the current context (the thread or the asyncio task) for the functional API.
+    """
+    token = _CURRENT.set(kb)
+    try:
+        yield kb
+    finally:
+        _CURRENT.reset(token)
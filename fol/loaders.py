@@ -0,0 +1,140 @@
+"""
+:Author: Theodor A. Dumitrescu
+:Date: Oct 18, 2026
+:Version: 0.0.1
+"""
+import csv
+import os
+from itertools import islice
+from typing import Iterable, Mapping, Optional, Sequence
+
+import numpy as np
+
+import fol.fol_status as FOL
+from fol.constant import constant as define_constant
+from fol.predicate import Predicate
+
+# spellings of the truth column
+TRUE_NAMES = ('1', 'true', 't', 'yes', 'y')
+FALSE_NAMES = ('0', 'false', 'f', 'no', 'n')
+
+
+def _constant_ids(names: np.ndarray) -> np.ndarray:
+    """
+    :return: the ids of the constants having the given names, the unknown ones are defined
+    """
+    unique, inverse = np.unique(names, return_inverse=True)
+    ids = np.empty(len(unique), dtype=np.int64)
+    for i, name in enumerate(unique.tolist()):
+        constant = FOL.CONSTANTS.get(name)
+        if constant is None:
+            constant = define_constant(name)
+        ids[i] = FOL.constant_id(constant)
+
+    return ids[inverse.reshape(-1)].reshape(names.shape)
+
+
+def _truth_values(column: np.ndarray) -> np.ndarray:
+    if column.dtype.kind == 'O':  # e.g. the last column of an array of names and numbers
+        column = np.array(column.tolist())
+    if column.dtype.kind == 'b':
+        return column
+    if column.dtype.kind in 'iuf':
+        invalid = (column != 0) & (column != 1)  # NaN included
+        if invalid.any():
+            raise ValueError('Invalid truth value `{}`'.format(column[invalid][0]))
+        return column == 1
+
+    column = np.char.lower(np.char.strip(column.astype(str)))
+    values = np.isin(column, TRUE_NAMES)
+    invalid = ~values & ~np.isin(column, FALSE_NAMES)
+    if invalid.any():
+        raise ValueError('Invalid truth value `{}`'.format(column[invalid][0]))
+
+    return values
+
+
+def _tell_rows(rows: np.ndarray, predicates: Mapping[str, Predicate]) -> int:
+    names, inverse = np.unique(np.char.strip(rows[:, 0].astype(str)), return_inverse=True)
+    inverse = inverse.reshape(-1)
+    values = _truth_values(rows[:, -1])
+
+    added = 0
+    for i, name in enumerate(names.tolist()):
+        predicate = predicates.get(name)
+        if predicate is None:
+            raise ValueError('Unknown predicate `{}`'.format(name))
+
+        arity = predicate.number_of_arguments
+        if arity > rows.shape[1] - 2:
+            raise ValueError('The rows of the predicate {} need {} arguments'.format(name, arity))
+
+        selected = inverse == i
+        args = np.char.strip(rows[selected, 1:1 + arity].astype(str))
+        added += FOL.tell_facts(predicate, _constant_ids(args), values[selected])
+
+    return added
+
+
+def load_array(rows, predicates: Mapping[str, Predicate] = None, chunk_size: Optional[int] = None) -> int:
+    """
+    Tells the ground facts of an array of rows (predicate, arg1, ..., truth): the arguments past the arity of the
+    predicate are ignored, so unary and binary facts can share a (predicate, arg1, arg2, truth) table.
+    The facts are written into the truth tensors of their predicates (see FOL.tell_facts) chunk by chunk, an array
+    loaded with `np.load(path, mmap_mode='r')` is read lazily.
+    :param rows: array of shape (n, columns) of names, the truth column can also be boolean or numeric (0 or 1)
+    :param predicates: the predicates by name, the ones of the knowledge base by default
+    :param chunk_size: number of rows read at once, by default the `chunk_size` of the knowledge base
+    :return: the number of facts added
+    :raise ValueError: if a row has an unknown predicate, too few arguments or an invalid truth value
+    """
+    predicates = predicates if predicates is not None else FOL.PREDICATES
+    chunk_size = chunk_size if chunk_size is not None else FOL.CHUNK_SIZE
+
+    added = 0
+    for start in range(0, len(rows), chunk_size):
+        chunk = np.asarray(rows[start:start + chunk_size])
+        if chunk.ndim != 2 or chunk.shape[1] < 3:
+            raise ValueError('Expected rows of shape (n, columns >= 3), received {}'.format(chunk.shape))
+        added += _tell_rows(chunk, predicates)
+
+    return added
+
+
+def _chunks(rows: Iterable[Sequence[str]], chunk_size: int) -> Iterable[np.ndarray]:
+    rows = (row for row in rows if row)  # blank lines
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return
+
+        # the rows are padded in the middle, so the truth is the last column whatever the arity
+        width = max(map(len, chunk))
+        yield np.array([row[:-1] + [''] * (width - len(row)) + row[-1:] for row in chunk], dtype=str)
+
+
+def load_csv(path: str,
+             predicates: Mapping[str, Predicate] = None,
+             delimiter: Optional[str] = None,
+             header: bool = False,
+             chunk_size: Optional[int] = None) -> int:
+    """
+    Streams the ground facts of a CSV or TSV file of rows (predicate, arg1, ..., truth), see `load_array`.
+    :param delimiter: by default a tab for the `.tsv` files and a comma otherwise
+    :param header: whether the first row is a header to be skipped
+    :return: the number of facts added
+    """
+    predicates = predicates if predicates is not None else FOL.PREDICATES
+    chunk_size = chunk_size if chunk_size is not None else FOL.CHUNK_SIZE
+    if delimiter is None:
+        delimiter = '\t' if os.path.splitext(path)[1].lower() in ('.tsv', '.tab') else ','
+
+    added = 0
+    with open(path, newline='') as file:
+        reader = csv.reader(file, delimiter=delimiter)
+        if header:
+            next(reader, None)
+        for chunk in _chunks(reader, chunk_size):
+            added += _tell_rows(chunk, predicates)
+
+    return added
@@ -6,10 +6,91 @@
 # for https://www.python.org/dev/peps/pep-0563/
 from __future__ import annotations
 
-from typing import Tuple, Any, List
+import threading
+import weakref
+from typing import Tuple, Any, List, Hashable, Optional, Callable, Sequence, Dict, Iterable
+
+from fol.cache import memoize
+
+# NOTE(thadumi): every node of the expression DAG is hash-consed, i.e. building twice the same structure returns the
+# very same object. The table holds weak references so formulas no longer referenced by the user are released.
+_INTERNED: weakref.WeakValueDictionary = weakref.WeakValueDictionary()
+# guards the insertions in the table, the nodes are built from any thread (e.g. the readers of a snapshot)
+_INTERNED_LOCK = threading.Lock()
+
+# the polynomial rolling the digests (modulo a 127 bits prime) and the hashes (modulo a 61 bits one, so they fit a
+# machine word) of the operands of the n-ary connectives, see NaryLogicalExpression
+_DIGEST_PRIME = (1 << 127) - 1
+_HASH_PRIME = (1 << 61) - 1
+_ROLLING_BASE = 0x9e3779b97f4a7c15
+
+
+class _InternedLogic(type):
+    """
+    Metaclass performing the hash-consing of the logical nodes.
+    Since children are already interned the key of a node is built from the identities of its arguments, so building
+    a node costs O(number of direct children) regardless of the size of the subtree.
+    """
+
+    def __call__(cls, *args, **kwargs):
+        if cls._normalizing:
+            args = cls._normalize(args)
+            if not isinstance(args, tuple):  # the node simplified to an already built one
+                return args
+
+        key = cls._intern_key(*args, **kwargs)
+        if key is None:
+            node = super(_InternedLogic, cls).__call__(*args, **kwargs)
+            node._hash = node._structural_hash()
+            return node
+
+        key = (cls, key)
+        node = _INTERNED.get(key)
+        if node is None:
+            node = super(_InternedLogic, cls).__call__(*args, **kwargs)
+            node._hash = node._structural_hash()
+            node = _intern(key, node)
+
+        return node
+
+
+def _intern(key: Hashable, node: Logic) -> Logic:
+    """
+    :return: the node interned with the given key, the given one unless another thread has interned one meanwhile
+    """
+    with _INTERNED_LOCK:
+        return _INTERNED.setdefault(key, node)
+
+
+def interned_nodes() -> int:
+    """
+    :return: the number of distinct logical nodes currently alive
+    """
+    return len(_INTERNED)
+
+
+class Logic(object, metaclass=_InternedLogic):
+    _hash: int = 0
+    # whether the arguments are passed to `_normalize` before building the node
+    _normalizing: bool = False
+
+    @classmethod
+    def _intern_key(cls, *args, **kwargs) -> Optional[Hashable]:
+        """
+        :return: the identity of the node to be built with the given arguments or None if it should not be interned
+        """
+        return None
+
+    @classmethod
+    def _normalize(cls, args: Tuple[Any, ...]):
+        """
+        :return: the arguments the node is built with or a node to be returned in place of the new one
+        """
+        return args
 
+    def _structural_hash(self) -> int:
+        return hash(type(self).__name__)
 
-class Logic(object):
     def and_(self, other: Logic) -> AndLogicalExpression:
         return self.__and__(other)
 
@@ -41,13 +122,20 @@ class Logic(object):
         return ImplicationLogicalExpression(self, other)
 
     def __eq__(self, other: Logic) -> EquivalenceLogicalExpression:
-        # WARN overriding __eq__ could cause issues on dictionaries
+        # NOTE(thadumi): the resulting equivalence evaluates to the structural equality when used as a boolean
+        # so dictionaries and sets keep working (see EquivalenceLogicalExpression.__bool__)
         return EquivalenceLogicalExpression(self, other)
 
     def __hash__(self):
-        # needed by tf.function for hashing the self argument in logical predicate name
-        # WARN maybe should be considered a better hash value (?)
-        return hash(str(self))
+        # precomputed at construction time from the hashes of the children
+        return self._hash
+
+    def structurally_equals(self, other: Any) -> bool:
+        """
+        Structural equality which, differently from `==`, does not build an equivalence.
+        Since the nodes are hash-consed two structurally equal formulas are the very same object.
+        """
+        return self is other
 
     def to_nnf(self) -> Logic:
         """
@@ -66,14 +154,29 @@ class Logic(object):
         For more information see https://www.sciencedirect.com/topics/computer-science/negation-normal-form
         :return: the NNF of the current expresion according with the previous rules
         """
+        return negation_normal_form(self)
+
+    def _rebuild(self, args: Sequence[Logic]) -> Logic:
+        """
+        :return: a node of the same kind of this one having the given children, see `rebuild`
+        """
         return self
 
+    def _format(self, args: Sequence[str]) -> str:
+        """
+        :return: the representation of this node given the ones of its children, see `to_string`
+        """
+        return str(self)
+
 
 class LogicalTerm(Logic):
     def __init__(self, name: str):
         super(LogicalTerm, self).__init__()
         self._name = name
 
+    def _structural_hash(self) -> int:
+        return hash((type(self).__name__, self._name))
+
     @property
     def name(self):
         return self._name
@@ -83,6 +186,13 @@ class LogicalTerm(Logic):
 
 
 class LogicalConstant(LogicalTerm):
+    @classmethod
+    def _intern_key(cls, name: str):
+        return name.title()
+
+    def __reduce__(self):
+        return LogicalConstant, (self._name,)
+
     def __init__(self, name: str):
         if ' ' in name:
             raise ValueError('The symbolic name of a constant has to be a single word starting with an upper letter'
@@ -101,18 +211,64 @@ class LogicalVariable(LogicalTerm):
 
         self._close_world: bool = constants is not None
         self._constants: List[LogicalConstant] = constants
+        # incremented whenever the constants change, invalidates what has been computed from them (see fol.cache)
+        self._version: int = 0
+
+    def __reduce__(self):
+        # NOTE(thadumi): variables are not interned, the unpickled one is a new variable with the same domain
+        return LogicalVariable, (self._name, self._value, self._constants)
 
     @property
     def is_closed_world(self):
         return self._close_world
 
+    @property
+    def constants(self) -> Tuple[LogicalConstant, ...]:
+        return tuple(self._constants) if self._close_world else ()
+
+    @constants.setter
+    def constants(self, constants: Optional[List[LogicalConstant]]):
+        """
+        Replaces the domain of the variable, None makes it open world.
+        NOTE(thadumi): the constants have to be changed through this setter, mutating in place the list given to the
+        constructor is not noticed by the caches.
+        """
+        self._close_world = constants is not None
+        self._constants = constants
+        self._version += 1
+
+    @property
+    def version(self) -> int:
+        return self._version
+
 
 class LogicalExpression(Logic):
+    @classmethod
+    def _intern_key(cls, args: Tuple[Logic, ...]):
+        return tuple(map(id, args or ()))
+
     def __init__(self, args: Tuple[Logic, ...]):
         self._args: Tuple[Logic, ...] = args or ()
 
+    def _structural_hash(self) -> int:
+        return hash((type(self).__name__, tuple(map(hash, self._args))))
+
+    def _rebuild(self, args: Sequence[Logic]) -> Logic:
+        return type(self)(*args)
+
+    def __reduce__(self):
+        # an unpickled node is built again through the metaclass, so it is interned in the receiving process
+        return type(self), tuple(self._args)
+
+    def __str__(self):
+        return to_string(self)
+
 
 class UnitaryLogicalExpression(LogicalExpression):
+    @classmethod
+    def _intern_key(cls, arg: Logic):
+        return id(arg)
+
     def __init__(self, arg: Logic):
         super(UnitaryLogicalExpression, self).__init__(args=(arg,))
 
@@ -122,6 +278,10 @@ class UnitaryLogicalExpression(LogicalExpression):
 
 
 class BinaryLogicalExpression(LogicalExpression):
+    @classmethod
+    def _intern_key(cls, alpha: Logic, beta: Logic):
+        return id(alpha), id(beta)
+
     def __init__(self,
                  alpha: Logic,
                  beta: Logic):
@@ -136,77 +296,195 @@ class BinaryLogicalExpression(LogicalExpression):
         return self._args[1]
 
 
-# TODO(thadumi): AND should be a monadic type and return itself during an AND operation
-# ie AndLC.and(LC) -> AndLC has a new argument which is LC
-# the same of OR
-# this could be done via __rand__ (the operations are aggregated from lest to right)
-class AndLogicalExpression(BinaryLogicalExpression):
-    def __init__(self, alpha: Logic, beta: Logic):
-        super(AndLogicalExpression, self).__init__(alpha, beta)
+class NaryLogicalExpression(LogicalExpression):
+    """
+    An associative and commutative connective holding all its operands in a single tuple: nested operands of the
+    same kind are flattened, so a chain of `&` or of `|` is a single node however it was parenthesized.
+    The operands are normalized at construction, keeping the order of their first occurrence:
+        - duplicates are dropped (ϕ ∧ ϕ → ϕ)
+        - the neutral truth value is dropped and the absorbing one is returned (ϕ ∧ ⊤ → ϕ, ϕ ∧ ⊥ → ⊥)
+        - complementary literals give the absorbing truth value (ϕ ∧ ¬ϕ → ⊥, ϕ ∨ ¬ϕ → ⊤)
+        - no operand gives the neutral truth value, a single one is returned as it is
+    Appending an operand to a node (`ϕ1 ∧ ... ∧ ϕn ∧ ψ`) costs O(1) besides copying the tuple of the operands, so a
+    chain of n operators costs O(n) Python operations: the node is interned by a rolling digest of the ids of its
+    operands (see `_digest`), its hash is rolled the same way and the positions of the operands are shared by the
+    nodes of the chain (see `_positions`).
+    """
+    _normalizing = True
+
+    # computed on demand for the nodes not built by appending an operand
+    _operand_digest: Optional[int] = None
+    _operand_positions: Optional[Dict[int, int]] = None
+
+    @classmethod
+    def _neutral(cls) -> TruthLogicalExpression:
+        raise NotImplementedError()
+
+    @classmethod
+    def _normalize(cls, args: Tuple[Logic, ...]):
+        if len(args) == 2 and type(args[0]) is cls and type(args[1]) is not cls:
+            return cls._append(args[0], args[1])
+
+        neutral = cls._neutral()
+        absorbing = FALSE if neutral is TRUE else TRUE
+
+        operands: Dict[int, Logic] = {}
+        negated = set()
+        for arg in args:
+            # noinspection PyProtectedMember
+            for operand in (arg._args if type(arg) is cls else (arg,)):
+                if operand is neutral or id(operand) in operands:
+                    continue
+                if operand is absorbing:
+                    return absorbing
+
+                if type(operand) is NotLogicalExpression:
+                    if id(operand.arg) in operands:
+                        return absorbing
+                    negated.add(id(operand.arg))
+                elif id(operand) in negated:
+                    return absorbing
+                operands[id(operand)] = operand
+
+        if not operands:
+            return neutral
+        if len(operands) == 1:
+            return next(iter(operands.values()))
+        return tuple(operands.values())
+
+    @classmethod
+    def _append(cls, node: NaryLogicalExpression, operand: Logic) -> Logic:
+        """
+        The normalization of `node ∧ operand` (resp. ∨) knowing that the operands of the node are already normalized.
+        """
+        neutral = cls._neutral()
+        absorbing = FALSE if neutral is TRUE else TRUE
+        if operand is neutral:
+            return node
+        if operand is absorbing:
+            return absorbing
+
+        n = len(node._args)
+        positions = node._positions()
+        if positions.get(id(operand), n) < n:  # the later positions belong to longer nodes of the chain
+            return node
+
+        if type(operand) is NotLogicalExpression:
+            complement = operand.arg
+        else:
+            complement = _INTERNED.get((NotLogicalExpression, id(operand)))  # None if never built, so not an operand
+        if complement is not None and positions.get(id(complement), n) < n:
+            return absorbing
+
+        digest = (node._digest() * _ROLLING_BASE + id(operand)) % _DIGEST_PRIME
+        key = (cls, (n + 1, id(operand), digest))
+        appended = _INTERNED.get(key)
+        if appended is not None:
+            return appended
+
+        appended = object.__new__(cls)  # the operands are already normalized, see __init__
+        appended._args = node._args + (operand,)
+        appended._hash = (node._hash * _ROLLING_BASE + hash(operand)) % _HASH_PRIME
+        appended._operand_digest = digest
+        with _INTERNED_LOCK:
+            interned = _INTERNED.setdefault(key, appended)
+            if interned is appended and len(positions) == n:  # the node is the longest of its chain
+                positions[id(operand)] = n
+                appended._operand_positions = positions
+
+        return interned
+
+    @classmethod
+    def _intern_key(cls, *args: Logic):
+        return len(args), id(args[-1]), cls._roll(map(id, args), 0, _DIGEST_PRIME)
+
+    @staticmethod
+    def _roll(values: Iterable[int], rolled: int, prime: int) -> int:
+        for value in values:
+            rolled = (rolled * _ROLLING_BASE + value) % prime
+        return rolled
+
+    def _digest(self) -> int:
+        """
+        :return: the polynomial rolling the ids of the operands modulo a 127 bits prime, two different sequences of
+                 operands of the same length and with the same last operand are not expected to ever collide
+        """
+        if self._operand_digest is None:
+            self._operand_digest = self._roll(map(id, self._args), 0, _DIGEST_PRIME)
+        return self._operand_digest
 
-    def __str__(self):
-        return ' ∧ '.join([str(arg) for arg in self._args])
+    def _positions(self) -> Dict[int, int]:
+        """
+        :return: the positions of the operands by id, shared with the nodes appending operands to this one so it may
+                 hold the later operands of a longer node
+        """
+        if self._operand_positions is None:
+            self._operand_positions = {id(arg): i for i, arg in enumerate(self._args)}
+        return self._operand_positions
 
+    def _structural_hash(self) -> int:
+        return self._roll(map(hash, self._args), hash(type(self).__name__) % _HASH_PRIME, _HASH_PRIME)
 
-class OrLogicalExpression(BinaryLogicalExpression):
-    def __init__(self, alpha: Logic, beta: Logic):
-        super(OrLogicalExpression, self).__init__(alpha, beta)
+    @classmethod
+    def of(cls, args: Iterable[Logic]) -> Logic:
+        """
+        :return: the connective of all the given formulas, see `NaryLogicalExpression`
+        """
+        return cls(*args)
 
-    def __str__(self):
-        return ' ∨ '.join([str(arg) for arg in self._args])
+    def __init__(self, *args: Logic):
+        super(NaryLogicalExpression, self).__init__(args=args)
 
+    @property
+    def args(self) -> Tuple[Logic, ...]:
+        return self._args
 
-class NotLogicalExpression(UnitaryLogicalExpression):
-    def __init__(self, arg: Logic):
-        super(NotLogicalExpression, self).__init__(arg)
 
-    def __str__(self):
-        if isinstance(self._args[0], LogicalTerm):
-            return '¬' + str(self._args[0])
-        else:
-            return '¬({})'.format(str(self._args[0]))
+class AndLogicalExpression(NaryLogicalExpression):
+    @classmethod
+    def _neutral(cls) -> TruthLogicalExpression:
+        return TRUE
 
-    def to_nnf(self) -> Logic:
-        child_op = type(self.arg)
-        child = self.arg
+    def _format(self, args: Sequence[str]) -> str:
+        return ' ∧ '.join(args)
 
-        if child_op is OrLogicalExpression:  # ~ (A | B) -> ~A & ~B
-            return Not(child.alpha).to_nnf() & Not(child.beta).to_nnf()
 
-        if child_op is AndLogicalExpression:  # ~ (A & B) -> ~A | ~B
-            return Not(child.alpha).to_nnf() & Not(child.beta).to_nnf()
+class OrLogicalExpression(NaryLogicalExpression):
+    @classmethod
+    def _neutral(cls) -> TruthLogicalExpression:
+        return FALSE
 
-        if child_op is NotLogicalExpression:  # ~ ~A -> A
-            return self.arg.arg.to_nnf()
+    def _format(self, args: Sequence[str]) -> str:
+        return ' ∨ '.join(args)
 
-        if child_op is ExistentialQualifier:  # ~∃x.A -> ∀x.~A
-            return Forall(child.variables, Not(child.proposition).to_nnf())
 
-        if child_op is UniversalQuantifier:  # ~∀x.A -> ∃x.~A
-            return Exists(child.variables, Not(child.proposition).to_nnf())
+class NotLogicalExpression(UnitaryLogicalExpression):
+    def __init__(self, arg: Logic):
+        super(NotLogicalExpression, self).__init__(arg)
 
-        # child_op should be a LogicalTerm or equivalence
-        if child_op is LogicalVariable or child_op is LogicalConstant:
-            return self
+    def _format(self, args: Sequence[str]) -> str:
+        if isinstance(self._args[0], LogicalTerm):
+            return '¬' + args[0]
         else:
-            return Not(child.to_nnf()).to_nnf()
+            return '¬({})'.format(args[0])
 
 
 class ImplicationLogicalExpression(BinaryLogicalExpression):
     def __init__(self, alpha: Logic, beta: Logic):
         super(ImplicationLogicalExpression, self).__init__(alpha, beta)
 
-    def __str__(self):
-        return str(self._args[0]) + ' ⇒ ' + str(self._args[1])
-
-    def to_nnf(self) -> Logic:
-        return Not(self.alpha).to_nnf() | self.beta.to_nnf()
+    def _format(self, args: Sequence[str]) -> str:
+        return args[0] + ' ⇒ ' + args[1]
 
 
 class EquivalenceLogicalExpression(BinaryLogicalExpression):
     def __init__(self, alpha: Logic, beta: Logic):
         super(EquivalenceLogicalExpression, self).__init__(alpha, beta)
 
+    def __bool__(self):
+        # `a == b` used as a condition (e.g. by dict and set lookups) means structural equality
+        return self._args[0].structurally_equals(self._args[1])
+
     def as_cnf(self, first_step=False):
         """
         from α⇔β to (α⇒β)∧(β⇒α)
@@ -221,11 +499,46 @@ class EquivalenceLogicalExpression(BinaryLogicalExpression):
         else:
             return (alpha >> beta).as_cnf() & (beta >> alpha).as_cnf()
 
-    def __str__(self):
-        return str(self._args[0]) + ' ⇔ ' + str(self._args[1])
+    def _format(self, args: Sequence[str]) -> str:
+        return args[0] + ' ⇔ ' + args[1]
+
+
+class TruthLogicalExpression(LogicalExpression):
+    """
+    The logical constants ⊤ and ⊥, produced when a formula is simplified under known facts.
+    Use the module values TRUE and FALSE.
+    """
+
+    @classmethod
+    def _intern_key(cls, value: bool):
+        return bool(value)
+
+    def __init__(self, value: bool):
+        super(TruthLogicalExpression, self).__init__(args=())
+        self.value: bool = bool(value)
+
+    def _structural_hash(self) -> int:
+        return hash((type(self).__name__, self.value))
+
+    def __reduce__(self):
+        return TruthLogicalExpression, (self.value,)
+
+    def _rebuild(self, args: Sequence[Logic]) -> Logic:
+        return self
+
+    def _format(self, args: Sequence[str]) -> str:
+        return '⊤' if self.value else '⊥'
+
+
+TRUE = TruthLogicalExpression(True)
+FALSE = TruthLogicalExpression(False)
 
 
 class LogicalQualifier(UnitaryLogicalExpression):
+    @classmethod
+    def _intern_key(cls, variables: Tuple[LogicalVariable, ...], proposition: LogicalExpression):
+        return tuple(map(id, variables)), id(proposition)
+
     def __init__(self, variables: Tuple[LogicalVariable, ...], proposition: LogicalExpression):
         super(LogicalQualifier, self).__init__(proposition)
         self._vars: Tuple[LogicalVariable, ...] = variables
@@ -239,33 +552,39 @@ class LogicalQualifier(UnitaryLogicalExpression):
     def proposition(self) -> LogicalExpression:
         return self._proposition
 
+    def _structural_hash(self) -> int:
+        return hash((type(self).__name__, tuple(map(hash, self._vars)), hash(self._proposition)))
+
+    def _rebuild(self, args: Sequence[Logic]) -> Logic:
+        return type(self)(self._vars, args[0])
+
+    def __reduce__(self):
+        return type(self), (self._vars, self._proposition)
+
 
 class UniversalQuantifier(LogicalQualifier):
     def __init__(self, variables: Tuple[LogicalVariable, ...], proposition: LogicalExpression):
         super(UniversalQuantifier, self).__init__(variables, proposition)
 
-    def __str__(self):
-        return '∀ ' + ','.join([str(var) for var in self._vars]) + ': ' + str(self._proposition)
+    def _format(self, args: Sequence[str]) -> str:
+        return '∀ ' + ','.join([str(var) for var in self._vars]) + ': ' + args[0]
 
 
 class ExistentialQualifier(LogicalQualifier):
     def __init__(self, variables: Tuple[LogicalVariable, ...], proposition: LogicalExpression):
         super(ExistentialQualifier, self).__init__(variables, proposition)
 
-    def __str__(self):
-        return '∃ ' + ','.join([str(var) for var in self._vars]) + ': ' + str(self._proposition)
+    def _format(self, args: Sequence[str]) -> str:
+        return '∃ ' + ','.join([str(var) for var in self._vars]) + ': ' + args[0]
 
 
 def Not(lc: Logic) -> LogicalExpression:
     return lc.negated()
 
 
-def And(arg1: Logic, arg2: Logic) -> LogicalExpression:
-    return arg1.and_(arg2)
-
-
-def Or(arg1: Logic, arg2: Logic) -> LogicalExpression:
-    return arg1.or_(arg2)
+# n-ary connectives: And(ϕ1, ϕ2, ...) or And.of(formulas), the same for Or
+And = AndLogicalExpression
+Or = OrLogicalExpression
 
 
 def Implies(arg1: Logic, arg2: Logic) -> ImplicationLogicalExpression:
@@ -300,7 +619,231 @@ def Forall(variables, proposition: LogicalExpression) -> UniversalQuantifier:
 def Exists(variables, proposition: LogicalExpression) -> ExistentialQualifier:
     # TODO(thadumi) add doc for Exist functional API
 
-    if type(variables) is not list or type(variables) is not tuple:
+    if type(variables) is not list and type(variables) is not tuple:
         variables = (variables,)
 
+    if type(variables) is list:
+        variables = tuple(variables)
+
     return ExistentialQualifier(variables, proposition)
+
+
+# NOTE(thadumi): the transformations below never recurse in Python, so formulas as deep as the memory allows (e.g. the
+# long chains built by operator chaining) can be printed, converted and rewritten. They all share the same engine.
+
+def children(lc: Logic) -> Tuple[Logic, ...]:
+    """
+    :return: the direct sub-formulas (or the terms, for a predicate) of the node
+    """
+    return getattr(lc, '_args', ())
+
+
+def rebuild(lc: Logic, args: Sequence[Logic]) -> Logic:
+    """
+    :return: a node of the same kind of `lc` having `args` as children, `lc` itself if they are the same
+    """
+    old = children(lc)
+    if len(old) == len(args) and all(new is arg for new, arg in zip(args, old)):
+        return lc
+
+    # noinspection PyProtectedMember
+    return lc._rebuild(args)
+
+
+def postorder(lc: Logic,
+              combine: Callable[[Logic, List[Any]], Any],
+              expand: Callable[[Logic], Sequence[Logic]] = children) -> Any:
+    """
+    Iterative post-order visit of the formula DAG, using an explicit stack instead of the Python one.
+    The result of every distinct node is computed once, so shared sub-formulas are not visited twice.
+    :param combine: (node, results of its children) -> result of the node
+    :param expand: node -> the children to visit before the node, by default its actual children. Return an empty
+                   sequence to stop the visit at the node.
+    :return: the result of the root
+    """
+    results: Dict[int, Any] = {}
+    expanded: Dict[int, Sequence[Logic]] = {}  # also keeps alive the nodes whose ids are the keys
+    stack: List[Logic] = [lc]
+
+    while stack:
+        node = stack[-1]
+        key = id(node)
+        if key in results:
+            stack.pop()
+            continue
+
+        args = expanded.get(key)
+        if args is None:
+            args = expanded[key] = expand(node)
+            missing = [arg for arg in args if id(arg) not in results]
+            if missing:
+                stack.extend(reversed(missing))
+                continue
+
+        stack.pop()
+        results[key] = combine(node, [results[id(arg)] for arg in args])
+
+    return results[id(lc)]
+
+
+def traverse(lc: Logic,
+             combine: Callable[[Logic, Any, List[Any]], Any],
+             expand: Callable[[Logic, Any], Sequence[Tuple[Logic, Any]]],
+             context: Hashable = None) -> Any:
+    """
+    Like `postorder`, but every node is visited within a context (e.g. its polarity, or the variables bound above
+    it) and the result of a node is computed once per context.
+    :param combine: (node, context, results of the children) -> result of the node
+    :param expand: (node, context) -> the (child, context of the child) pairs to visit before the node. The children
+                   are not required to be the actual children of the node (e.g. NNF visits the negations of the
+                   children).
+    :param context: the hashable context of the root
+    :return: the result of the root
+    """
+    results: Dict[Tuple[int, Any], Any] = {}
+    expanded: Dict[Tuple[int, Any], Sequence[Tuple[Logic, Any]]] = {}
+    stack: List[Tuple[Logic, Any]] = [(lc, context)]
+
+    while stack:
+        node, ctx = stack[-1]
+        key = (id(node), ctx)
+        if key in results:
+            stack.pop()
+            continue
+
+        args = expanded.get(key)
+        if args is None:
+            args = expanded[key] = expand(node, ctx)
+            missing = [arg for arg in args if (id(arg[0]), arg[1]) not in results]
+            if missing:
+                stack.extend(reversed(missing))
+                continue
+
+        stack.pop()
+        results[key] = combine(node, ctx, [results[(id(child), child_ctx)] for child, child_ctx in args])
+
+    return results[(id(lc), context)]
+
+
+def transform(lc: Logic, rewrite: Callable[[Logic, List[Logic]], Logic] = None) -> Logic:
+    """
+    Bottom-up rewrite of a formula: `rewrite(node, new children)` is called once per distinct node after its
+    children have been rewritten. By default the node is rebuilt with the new children (see `rebuild`), sharing the
+    untouched sub-formulas.
+    """
+    return postorder(lc, rewrite if rewrite is not None else rebuild)
+
+
+_SLOT = '\x00'
+
+
+def to_string(lc: Logic) -> str:
+    """
+    :return: the textual representation of the formula, see the `_format` of the nodes
+    """
+    # the text of the sub-formulas is never built: every node gives a template where its children are placed,
+    # which are expanded in order into a single list of pieces
+    pieces: List[str] = []
+    stack: List[Any] = [lc]
+
+    while stack:
+        item = stack.pop()
+        if type(item) is str:
+            pieces.append(item)
+            continue
+
+        args = children(item)
+        # noinspection PyProtectedMember
+        template = item._format([_SLOT] * len(args)).split(_SLOT)
+        stack.append(template[-1])
+        for arg, text in zip(reversed(args), reversed(template[:-1])):
+            stack.append(arg)
+            stack.append(text)
+
+    return ''.join(pieces)
+
+
+def _nnf_connective(lc: Logic, negated: bool) -> Optional[type]:
+    """
+    :return: the connective the node turns into in NNF if it is a conjunction or a disjunction of its operands
+    """
+    op = type(lc)
+    if op is AndLogicalExpression:
+        return OrLogicalExpression if negated else AndLogicalExpression
+    if op is OrLogicalExpression or op is ImplicationLogicalExpression:  # ϕ ⊃ ψ  →  ¬ ϕ ∨ ψ
+        return AndLogicalExpression if negated else OrLogicalExpression
+    return None
+
+
+def _nnf_operands(lc: Logic, negated: bool) -> List[Tuple[Logic, bool]]:
+    if type(lc) is ImplicationLogicalExpression:
+        return [(lc.alpha, not negated), (lc.beta, negated)]
+    # noinspection PyProtectedMember
+    return [(arg, negated) for arg in lc._args]
+
+
+def _nnf_expand(lc: Logic, negated: bool) -> Sequence[Tuple[Logic, bool]]:
+    op = type(lc)
+
+    if op is NotLogicalExpression:
+        return [(lc.arg, not negated)]
+
+    connective = _nnf_connective(lc, negated)
+    if connective is not None:
+        # the operands turning into the same connective are gathered at once, so a chain as ϕ1 ⊃ (ϕ2 ⊃ ...) becomes a
+        # single disjunction without building (and flattening) the intermediate ones
+        operands = []
+        stack = _nnf_operands(lc, negated)[::-1]
+        while stack:
+            node, polarity = stack.pop()
+            while type(node) is NotLogicalExpression:
+                node, polarity = node.arg, not polarity
+
+            if _nnf_connective(node, polarity) is connective:
+                stack.extend(_nnf_operands(node, polarity)[::-1])
+            else:
+                operands.append((node, polarity))
+        return operands
+
+    if op is EquivalenceLogicalExpression:
+        if negated:  # ¬ (ϕ1 ≡ ϕ2)  →  (ϕ1 ∧ ¬ ϕ2) ∨ (¬ ϕ1 ∧ ϕ2)
+            return [(lc.alpha, False), (lc.beta, True), (lc.alpha, True), (lc.beta, False)]
+        # ϕ1 ≡ ϕ2  →  (ϕ1 ⊃ ϕ2) ∧ (ϕ2 ⊃ ϕ1)
+        return [(lc.alpha, True), (lc.beta, False), (lc.beta, True), (lc.alpha, False)]
+
+    if isinstance(lc, LogicalQualifier):
+        return [(lc.proposition, negated)]
+
+    return ()  # atoms and truth values
+
+
+def _nnf_combine(lc: Logic, negated: bool, args: List[Logic]) -> Logic:
+    op = type(lc)
+
+    if op is NotLogicalExpression:
+        return args[0]
+
+    connective = _nnf_connective(lc, negated)
+    if connective is not None:
+        return connective.of(args)
+
+    if op is EquivalenceLogicalExpression:
+        if negated:
+            return (args[0] & args[1]) | (args[2] & args[3])
+        return (args[0] | args[1]) & (args[2] | args[3])
+
+    if op is UniversalQuantifier or op is ExistentialQualifier:
+        universal = (op is UniversalQuantifier) is not negated
+        return (UniversalQuantifier if universal else ExistentialQualifier)(lc.variables, args[0])
+
+    if op is TruthLogicalExpression:
+        return (FALSE if lc.value else TRUE) if negated else lc
+
+    return NotLogicalExpression(lc) if negated else lc
+
+
+def negation_normal_form(lc: Logic) -> Logic:
+    """
+    :return: the negation normal form of the formula, see `Logic.to_nnf`, cached in the `nnf` namespace of fol.cache
+    """
+    return memoize('nnf', lc, lambda node: traverse(node, _nnf_combine, _nnf_expand, False))
@@ -6,10 +6,32 @@
 from __future__ import annotations
 
 import logging
-from typing import Tuple
+import weakref
+from typing import Tuple, Optional, Sequence, TYPE_CHECKING
 
-import fol.fol_status as FOL
-from fol.logic import LogicalExpression, LogicalTerm
+from fol.logic import Logic, LogicalExpression, LogicalTerm
+
+if TYPE_CHECKING:
+    from fol.backend.truth import TruthTensor
+
+# the predicates alive in this process by id, so an unpickled predicate is the very same object in the process that
+# pickled it and in the processes forked from it (see Predicate.__reduce__)
+_INSTANCES: weakref.WeakValueDictionary = weakref.WeakValueDictionary()
+
+
+def _unpickle_predicate(name: str, number_of_arguments: int, identity: int) -> Predicate:
+    predicate = _INSTANCES.get(identity)
+    if predicate is not None and predicate.name == name and predicate.number_of_arguments == number_of_arguments:
+        return predicate
+
+    import fol.fol_status as FOL
+
+    predicate = FOL.PREDICATES.get(name)
+    if predicate is not None and predicate.number_of_arguments == number_of_arguments:
+        return predicate
+
+    # an unknown predicate (e.g. in a spawned process) has no known facts
+    return Predicate(name=name, number_of_arguments=number_of_arguments)
 
 
 class Predicate(object):
@@ -18,6 +40,31 @@ class Predicate(object):
         self.name: str = kwargs['name']
         self.number_of_arguments: int = kwargs['number_of_arguments']
 
+        # the known ground atoms as a truth tensor indexed by constant ids, see use_storage
+        self.truth_table: Optional[TruthTensor] = None
+        if kwargs.get('storage') is not None:
+            self.use_storage(kwargs['storage'])
+
+        _INSTANCES[id(self)] = self
+
+    def __reduce__(self):
+        # the truth table is not pickled: the predicate is looked up in the receiving process
+        return _unpickle_predicate, (self.name, self.number_of_arguments, id(self))
+
+    def use_storage(self, storage: str = 'dense') -> TruthTensor:
+        """
+        Backs the ground facts of the predicate with a numpy truth tensor instead of one formula per fact.
+        :param storage: `dense` (one byte per possible ground atom) or `sparse` (only the known atoms)
+        """
+        from fol.backend.truth import TruthTensor
+
+        if self.truth_table is None:
+            self.truth_table = TruthTensor(self.number_of_arguments, storage)
+        elif self.truth_table.storage != storage:
+            raise ValueError('The predicate {} already uses a {} storage'.format(self.name, self.truth_table.storage))
+
+        return self.truth_table
+
     def __call__(self, *args: LogicalTerm, **kwargs) -> LogicalPredicate:
         if len(args) != self.number_of_arguments:
             raise ValueError('The predicate {} is defined with {} arguments but has been called with {} args.'
@@ -26,25 +73,42 @@ class Predicate(object):
 
 
 class LogicalPredicate(LogicalExpression):
+    @classmethod
+    def _intern_key(cls, predicate: Predicate, input_terms: Tuple[LogicalTerm, ...]):
+        return id(predicate), tuple(map(id, input_terms))
+
     def __init__(self,
                  predicate: Predicate,
                  input_terms: Tuple[LogicalTerm, ...]):
         super(LogicalPredicate, self).__init__(input_terms)
         self.predicate = predicate
 
-    def __str__(self):
-        return self.predicate.name + '(' + ', '.join([str(i) for i in self._args]) + ')'
+    def _structural_hash(self) -> int:
+        return hash((self.predicate.name, tuple(map(hash, self._args))))
+
+    def _rebuild(self, args: Sequence[Logic]) -> Logic:
+        return self.predicate(*args)
+
+    def __reduce__(self):
+        return LogicalPredicate, (self.predicate, tuple(self._args))
+
+    def _format(self, args: Sequence[str]) -> str:
+        return self.predicate.name + '(' + ', '.join(args) + ')'
 
 
 def predicate(name: str,
-              number_of_arguments: int, ) -> Predicate:
+              number_of_arguments: int,
+              storage: str = None) -> Predicate:
     """
     TODO(thadumi) doc for predicate
     :param name:
     :param number_of_arguments:
+    :param storage: if `dense` or `sparse` the ground facts are stored in a numpy truth tensor
     :return:
     """
 
+    import fol.fol_status as FOL  # fol_status depends on this module
+
     if FOL.predicate_already_defined(name):
         msg = '[predicate] There is already a predicate having the name `{}`'.format(name)
         logging.error(msg)
@@ -55,7 +119,8 @@ def predicate(name: str,
         raise ValueError('A predicate should be defined with at least one argument.')
 
     config = {'name': name,
-              'number_of_arguments': number_of_arguments
+              'number_of_arguments': number_of_arguments,
+              'storage': storage
               }
 
     p = Predicate(**config)
@@ -0,0 +1,185 @@
+"""
+:Author: Theodor A. Dumitrescu
+:Date: Oct 18, 2026
+:Version: 0.0.1
+"""
+import asyncio
+import time
+from collections import Counter
+from concurrent.futures import Executor
+from typing import Dict, List, Optional, Tuple, Any
+
+from fol.logic import Logic
+
+# the kinds of the queries, see QueryService.submit
+ASK = 'ask'
+SATISFACTION = 'satisfaction'
+
+
+class QueryService(object):
+    """
+    Asyncio front end of a knowledge base: the queries submitted within `window` seconds of each other are answered
+    by one batched call on the executor (KnowledgeBase.ask_many, KnowledgeBase.satisfaction_many), which grounds and
+    encodes the axioms told since the last batch once for all of them and answers the repeated queries once.
+    A single batch runs at a time, the queries arriving meanwhile make up the next one, so the batches grow with the
+    load. The service is used from one event loop at a time: a query submitted from another loop (e.g. a new
+    `asyncio.run` after the previous loop was closed in the middle of a batch) drops the state of the previous one.
+    """
+
+    def __init__(self, kb, window: float = .002, max_batch_size: int = 256, executor: Optional[Executor] = None):
+        """
+        :param kb: the knowledge base answering the queries, see fol.knowledge_base.KnowledgeBase
+        :param window: seconds a query waits for the others before its batch is dispatched
+        :param max_batch_size: a batch is dispatched without waiting for the window once it has this many queries
+        :param executor: where the batches run, the default executor of the loop if None
+        """
+        if window < 0 or max_batch_size < 1:
+            raise ValueError('Expected window >= 0 and max_batch_size >= 1')
+
+        self.kb = kb
+        self.window: float = window
+        self.max_batch_size: int = max_batch_size
+        self.executor: Optional[Executor] = executor
+
+        self.batch_sizes: Counter = Counter()  # number of batches by size
+        self.statistics: Dict[str, Any] = {'queries': 0, 'batches': 0, 'max_queue_depth': 0, 'batch_time': 0.}
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None  # the loop of the futures below
+        self._pending: List[Tuple[str, Tuple, Logic, asyncio.Future]] = []  # (kind, options, query, future)
+        self._in_flight: int = 0  # the queries of the running batch
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._running: Optional[asyncio.Future] = None
+
+    @property
+    def queue_depth(self) -> int:
+        """
+        :return: the number of the queries waiting for their answer, batched or not yet
+        """
+        return len(self._pending) + self._in_flight
+
+    def metrics(self) -> Dict[str, Any]:
+        """
+        :return: the `queue_depth`, the `statistics` and the `mean_batch_size` of the service
+        """
+        metrics = dict(self.statistics, queue_depth=self.queue_depth)
+        metrics['mean_batch_size'] = metrics['queries'] / metrics['batches'] if metrics['batches'] else 0.
+        return metrics
+
+    async def ask(self, lc: Logic, conflict_limit: Optional[int] = None):
+        """
+        See KnowledgeBase.ask.
+        """
+        return await self.submit(ASK, lc, (conflict_limit,))
+
+    async def satisfaction(self, lc: Logic, **semantics) -> float:
+        """
+        See KnowledgeBase.satisfaction.
+        """
+        return await self.submit(SATISFACTION, lc, tuple(sorted(semantics.items())))
+
+    def submit(self, kind: str, lc: Logic, options: Tuple = ()) -> asyncio.Future:
+        """
+        Queues a query for the next batch.
+        :param kind: ASK or SATISFACTION
+        :param options: the arguments of the query, only the queries with the same kind and options share a call
+        :return: the future of the answer
+        """
+        if kind not in (ASK, SATISFACTION):
+            raise ValueError('Unknown kind of query {}'.format(kind))
+
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._reset(loop)
+
+        future = loop.create_future()
+        self._pending.append((kind, options, lc, future))
+        self.statistics['queries'] += 1
+        self.statistics['max_queue_depth'] = max(self.statistics['max_queue_depth'], self.queue_depth)
+
+        if len(self._pending) >= self.max_batch_size:
+            self._dispatch()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._dispatch)
+
+        return future
+
+    def _reset(self, loop: asyncio.AbstractEventLoop):
+        """
+        Moves the service to another loop: the queries of the previous one are dropped, their futures can no longer
+        be awaited if it has been closed, and a batch still running there is no longer waited for.
+        """
+        if self._timer is not None:
+            self._timer.cancel()
+        for _, _, _, future in self._pending:
+            if not future.done() and not future.get_loop().is_closed():
+                future.cancel()
+
+        self._loop = loop
+        self._pending = []
+        self._in_flight = 0
+        self._timer = None
+        self._running = None
+
+    def _dispatch(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._running is not None or not self._pending:
+            return  # the queries wait for the running batch
+
+        batch = self._pending[:self.max_batch_size]
+        del self._pending[:self.max_batch_size]
+        self._in_flight = len(batch)
+        self.statistics['batches'] += 1
+        self.batch_sizes[len(batch)] += 1
+
+        loop = asyncio.get_running_loop()
+        self._running = loop.run_in_executor(self.executor, self._execute, [(kind, options, lc)
+                                                                            for kind, options, lc, _ in batch])
+        self._running.add_done_callback(lambda running: self._resolve(batch, running))
+
+    def _resolve(self, batch, running: asyncio.Future):
+        current = running is self._running  # not a batch of a previous loop, see _reset
+        if current:
+            self._running = None
+            self._in_flight = 0
+
+        if running.exception() is not None:
+            results = [running.exception()] * len(batch)
+        else:
+            results = running.result()
+        for (_, _, _, future), result in zip(batch, results):
+            if future.done():
+                continue  # cancelled by the caller
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+        if current and self._pending:
+            self._dispatch()  # they have already waited for the window
+
+    def _execute(self, batch: List[Tuple[str, Tuple, Logic]]) -> List:
+        """
+        Runs on the executor.
+        :return: the answer of every query, or the exception it raised
+        """
+        start = time.perf_counter()
+        groups: Dict[Tuple[str, Tuple], List[int]] = {}
+        for i, (kind, options, _) in enumerate(batch):
+            groups.setdefault((kind, options), []).append(i)
+
+        results: List = [None] * len(batch)
+        for (kind, options), positions in groups.items():
+            # a failing query gets its exception, the others of the group their answer
+            answers = self._call(kind, options, [batch[i][2] for i in positions])
+            for i, answer in zip(positions, answers):
+                results[i] = answer
+
+        self.statistics['batch_time'] += time.perf_counter() - start
+        return results
+
+    def _call(self, kind: str, options: Tuple, queries: List[Logic]) -> List:
+        if kind == ASK:
+            return self.kb.ask_many(queries, *options, return_exceptions=True)
+        return self.kb.satisfaction_many(queries, return_exceptions=True, **dict(options))
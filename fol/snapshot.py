@@ -0,0 +1,444 @@
+"""
+:Author: Theodor A. Dumitrescu
+:Date: Oct 18, 2026
+:Version: 0.0.1
+"""
+import json
+import mmap
+import os
+import struct
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from fol.knowledge_base import KnowledgeBase, current
+from fol.logic import Logic, LogicalConstant, LogicalVariable, NotLogicalExpression, AndLogicalExpression, \
+    OrLogicalExpression, ImplicationLogicalExpression, EquivalenceLogicalExpression, UniversalQuantifier, \
+    ExistentialQualifier, TruthLogicalExpression, LogicalQualifier
+from fol.predicate import LogicalPredicate, Predicate
+
+MAGIC = b'PYFOLKB\x00'
+FORMAT_VERSION = 1
+
+_HEADER = struct.Struct('<8sI4x')  # magic, format version
+_SEGMENT = struct.Struct('<8sQQ')  # magic, length of the metadata, length of the arrays
+_SEGMENT_MAGIC = b'SEGMENT\x00'
+_ALIGNMENT = 64
+
+# kinds of the records of the formula DAG, a record is [kind, number of operands, operands...]
+_CONSTANT = 0  # constant id
+_VARIABLE = 1  # variable index
+_TRUTH = 2  # value
+_ATOM = 3  # predicate index, argument nodes...
+_NOT = 4  # child nodes...
+_AND = 5
+_OR = 6
+_IMPLIES = 7
+_EQUIV = 8
+_FORALL = 9  # variable indexes..., child node
+_EXISTS = 10
+
+_CONNECTIVES = {
+    NotLogicalExpression: _NOT,
+    AndLogicalExpression: _AND,
+    OrLogicalExpression: _OR,
+    ImplicationLogicalExpression: _IMPLIES,
+    EquivalenceLogicalExpression: _EQUIV,
+}
+_TYPES = {kind: op for op, kind in _CONNECTIVES.items()}
+
+
+def _aligned(position: int) -> int:
+    return -(-position // _ALIGNMENT) * _ALIGNMENT
+
+
+class Snapshot(object):
+    """
+    Binary snapshot of a knowledge base (symbol tables, axioms and truth tensors).
+    The file is a header followed by segments: every `save` appends a segment holding only what changed since the
+    previous save or load of this object and every `load` reads the segments appended since, so a snapshot can be
+    extended and followed incrementally. A segment is a JSON metadata block followed by the arrays it refers to:
+        - the constants in the order of their ids, so the ids of the truth tensors stay valid
+        - the predicates and the variables with their constants
+        - the formulas as a DAG of records referring to the previous nodes, a shared subformula is stored once
+        - the truth tensors, as their arrays the first time and as the changes of their journal later
+    The file is loaded with `mmap` (copy on write) and the arrays of the truth tensors are views of it: the facts are
+    paged in when read and copied only when written, the processes loading the same file share it through the page
+    cache.
+    A segment is validated before being applied, holding the lock of the knowledge base: a segment that cannot be
+    loaded leaves the knowledge base as it was.
+    NOTE(thadumi): a single process should append to a snapshot. The static values of the variables are not stored.
+    """
+
+    def __init__(self, path: str, kb: KnowledgeBase = None):
+        """
+        :param kb: the knowledge base saved and loaded, the current one by default (see fol.knowledge_base.current)
+        """
+        self.path: str = path
+        self.kb: KnowledgeBase = kb if kb is not None else current()
+        self._offset: int = 0  # bytes of the file already read or written
+
+        # the symbols and the nodes numbered as in the file
+        self._constants: int = 0
+        self._registered: Dict[str, None] = {}
+        self._predicates: List[Predicate] = []
+        self._predicate_index: Dict[int, int] = {}
+        self._stored_predicates: int = 0
+        self._variables: List[LogicalVariable] = []
+        self._variable_index: Dict[int, int] = {}
+        self._versions: List[int] = []
+        self._nodes: List[Logic] = []
+        self._node_index: Dict[int, int] = {}
+        self._axioms: int = 0
+        self._journals: Dict[Predicate, int] = {}
+
+    # symbols
+
+    def _predicate(self, predicate: Predicate) -> int:
+        index = self._predicate_index.get(id(predicate))
+        if index is None:
+            index = self._predicate_index[id(predicate)] = len(self._predicates)
+            self._predicates.append(predicate)
+        return index
+
+    def _variable(self, var: LogicalVariable) -> int:
+        index = self._variable_index.get(id(var))
+        if index is None:
+            index = self._variable_index[id(var)] = len(self._variables)
+            self._variables.append(var)
+            self._versions.append(-1)  # the constants are stored with the next segment
+        return index
+
+    def _node(self, node: Logic):
+        self._node_index[id(node)] = len(self._nodes)
+        self._nodes.append(node)
+
+    # writing
+
+    # noinspection PyProtectedMember
+    def _record(self, node: Logic) -> List[int]:
+        op = type(node)
+        if op is LogicalConstant:
+            return [_CONSTANT, 1, self.kb.constant_ids.id(node)]
+        if op is LogicalVariable:
+            return [_VARIABLE, 1, self._variable(node)]
+        if op is TruthLogicalExpression:
+            return [_TRUTH, 1, int(node.value)]
+        if op is LogicalPredicate:
+            args = [self._node_index[id(arg)] for arg in node._args]
+            return [_ATOM, 1 + len(args), self._predicate(node.predicate)] + args
+        if op in _CONNECTIVES:
+            return [_CONNECTIVES[op], len(node._args)] + [self._node_index[id(arg)] for arg in node._args]
+        if op is UniversalQuantifier or op is ExistentialQualifier:
+            variables = [self._variable(var) for var in node.variables]
+            return [_FORALL if op is UniversalQuantifier else _EXISTS, len(variables) + 1] + variables + \
+                [self._node_index[id(node.proposition)]]
+
+        raise ValueError('Unable to store `{}` of type {}'.format(node, op.__name__))
+
+    def _encode(self, roots: Sequence[Logic]) -> List[int]:
+        """
+        :return: the records of the nodes of the formulas not stored yet, children first
+        """
+        records = []
+        stack = [(root, False) for root in reversed(roots)]
+
+        while stack:
+            node, ready = stack.pop()
+            if id(node) in self._node_index:
+                continue
+
+            # noinspection PyProtectedMember
+            children = (node.proposition,) if isinstance(node, LogicalQualifier) else getattr(node, '_args', ())
+            if not ready and children:
+                stack.append((node, True))
+                stack.extend((child, False) for child in reversed(children))
+                continue
+
+            records.extend(self._record(node))
+            self._node(node)
+
+        return records
+
+    def save(self) -> int:
+        """
+        Appends a segment with the symbols, axioms and facts added to the knowledge base since the last save or load.
+        :return: the number of bytes written
+        """
+        # noinspection PyProtectedMember
+        with self.kb._lock:
+            return self._save()
+
+    def _save(self) -> int:
+        kb = self.kb
+        if len(kb.axioms) < self._axioms:
+            raise ValueError('The knowledge base has been cleared since the last save of {}'.format(self.path))
+        if self._offset == 0 and os.path.exists(self.path) and os.path.getsize(self.path):
+            raise ValueError('The snapshot {} has to be loaded before being extended'.format(self.path))
+
+        axioms = kb.axioms[self._axioms:]
+        records = self._encode(axioms)
+        for predicate in kb.predicates.values():
+            self._predicate(predicate)
+        for var in kb.variables.values():
+            self._variable(var)
+
+        blocks: List[Tuple[int, np.ndarray]] = []
+        size = 0
+
+        def put(array: np.ndarray) -> list:
+            nonlocal size
+            array = np.ascontiguousarray(array)
+            position = _aligned(size)
+            blocks.append((position, array))
+            size = position + array.nbytes
+            return [position, array.dtype.str, list(array.shape)]
+
+        meta = {'kb_version': kb.version}
+        meta['predicates'] = [[predicate.name, predicate.number_of_arguments,
+                               kb.predicates.get(predicate.name) is predicate]
+                              for predicate in self._predicates[self._stored_predicates:]]
+
+        # the new variables and the ones whose constants changed
+        variables = []
+        for i, var in enumerate(self._variables):
+            if self._versions[i] != var.version:
+                ids = kb.constant_ids.ids(var.constants) if var.is_closed_world else None
+                variables.append([i, var.name, ids, kb.variables.get(var.name) is var])
+                self._versions[i] = var.version
+        meta['variables'] = variables
+
+        meta['nodes'] = put(np.array(records, dtype=np.int64))
+        meta['axioms'] = put(np.array([self._node_index[id(axiom)] for axiom in axioms], dtype=np.int64))
+
+        tables = []
+        for i, predicate in enumerate(self._predicates):
+            table = predicate.truth_table
+            if table is None:
+                continue
+
+            position = self._journals.get(predicate)
+            if position is None:
+                arrays = {name: put(array) for name, array in table.arrays().items()}
+                tables.append({'predicate': i, 'storage': table.storage, 'base': True, 'arrays': arrays})
+            elif position > table.journal_size:
+                raise ValueError('The facts of {} have been cleared since the last save'.format(predicate.name))
+            elif position < table.journal_size:
+                ids, values = table.changes_since(position)
+                arrays = {'keys': put(table.pack(ids)), 'values': put(values)}
+                tables.append({'predicate': i, 'storage': table.storage, 'base': False, 'arrays': arrays})
+            self._journals[predicate] = table.journal_size
+        meta['tables'] = tables
+
+        # the constants last, storing the rest may have given an id to new ones
+        meta['first_constant'] = self._constants
+        meta['constants'] = [kb.constant_ids.constant(i).name for i in range(self._constants, len(kb.constant_ids))]
+        meta['registered'] = [[name, kb.constant_ids.id(constant)] for name, constant in kb.constants.items()
+                              if name not in self._registered]
+
+        encoded = json.dumps(meta, separators=(',', ':')).encode()
+        with open(self.path, 'ab') as file:
+            start = file.tell()
+            if start == 0:
+                file.write(_HEADER.pack(MAGIC, FORMAT_VERSION))
+
+            segment = file.tell()
+            data = _aligned(segment + _SEGMENT.size + len(encoded))
+            file.write(_SEGMENT.pack(_SEGMENT_MAGIC, len(encoded), size))
+            file.write(encoded.ljust(data - segment - _SEGMENT.size, b' '))
+            for position, array in blocks:
+                file.write(b'\x00' * (data + position - file.tell()))
+                file.write(array.tobytes())
+            end = file.tell()
+
+        self._constants = len(kb.constant_ids)
+        self._registered.update(dict.fromkeys(name for name, _ in meta['registered']))
+        self._stored_predicates = len(self._predicates)
+        self._axioms = len(kb.axioms)
+        self._offset = end
+        return end - start
+
+    # reading
+
+    def load(self) -> int:
+        """
+        Reads into the knowledge base the segments appended since the last save or load.
+        :return: the number of segments read
+        :raise ValueError: if the file is not a snapshot or its constants do not match the ones of the knowledge base
+        """
+        kb = self.kb
+        if kb.read_only:
+            raise ValueError('The snapshot of a knowledge base is read only')
+
+        size = os.path.getsize(self.path)
+        if size <= self._offset:
+            return 0
+
+        with open(self.path, 'rb') as file:
+            buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_COPY)
+
+        if self._offset == 0:
+            magic, version = _HEADER.unpack_from(buffer, 0)
+            if magic != MAGIC:
+                raise ValueError('{} is not a knowledge base snapshot'.format(self.path))
+            if version > FORMAT_VERSION:
+                raise ValueError('Unsupported version {} of the snapshot {}'.format(version, self.path))
+            self._offset = _HEADER.size
+
+        segments = 0
+        # noinspection PyProtectedMember
+        with kb._lock:
+            kb._snapshot = None  # as the writes of the knowledge base, see fol.knowledge_base._writer
+            try:
+                while self._offset + _SEGMENT.size <= size:
+                    magic, length, data_length = _SEGMENT.unpack_from(buffer, self._offset)
+                    if magic != _SEGMENT_MAGIC:
+                        raise ValueError('Corrupted snapshot {} at byte {}'.format(self.path, self._offset))
+
+                    start = self._offset + _SEGMENT.size
+                    data = _aligned(start + length)
+                    if data + data_length > size:  # still being written
+                        break
+
+                    meta = json.loads(buffer[start:start + length].decode())
+                    records = self._view(meta['nodes'], buffer, data).tolist()
+                    axioms = self._view(meta['axioms'], buffer, data).tolist()
+                    self._check(meta, records, axioms)
+                    self._apply(meta, records, axioms, buffer, data)
+                    self._offset = data + data_length
+                    segments += 1
+            finally:
+                if segments:
+                    kb.version += 1
+
+        return segments
+
+    @staticmethod
+    def _view(block: list, buffer: mmap.mmap, data: int) -> np.ndarray:
+        position, dtype, shape = block
+        count = int(np.prod(shape))
+        return np.frombuffer(buffer, dtype=dtype, count=count, offset=data + position).reshape(shape)
+
+    def _check(self, meta: dict, records: List[int], axioms: List[int]):
+        """
+        Validates a segment without changing the knowledge base.
+        :raise ValueError: if the constants of the segment do not match the ones of the knowledge base or its formulas
+                           are corrupted
+        """
+        ids = self.kb.constant_ids
+        size = len(ids)
+        new: Dict[LogicalConstant, int] = {}
+        for i, name in enumerate(meta['constants'], meta['first_constant']):
+            constant = LogicalConstant(name)
+            if i < size:
+                matches = ids.constant(i) is constant
+            else:  # the new constants get the next ids, in order
+                matches = constant not in ids and new.setdefault(constant, i) == i == size + len(new) - 1
+            if not matches:
+                raise ValueError('The constants of the snapshot {} do not match the ones of the knowledge base'
+                                 .format(self.path))
+
+        nodes = len(self._nodes)
+        i = 0
+        while i < len(records):
+            kind, count = records[i], records[i + 1] if i + 1 < len(records) else -1
+            if not _CONSTANT <= kind <= _EXISTS or not 0 <= count <= len(records) - i - 2:
+                raise ValueError('Corrupted snapshot {}: unknown record {}'.format(self.path, kind))
+            i += 2 + count
+            nodes += 1
+
+        if any(not 0 <= index < nodes for index in axioms):
+            raise ValueError('Corrupted snapshot {}: unknown axiom'.format(self.path))
+
+    def _apply(self, meta: dict, records: List[int], axioms: List[int], buffer: mmap.mmap, data: int):
+        kb = self.kb
+
+        for name in meta['constants']:
+            kb.constant_ids.id(LogicalConstant(name))
+        self._constants = meta['first_constant'] + len(meta['constants'])
+        for name, index in meta['registered']:
+            if not kb.constant_already_defined(name):
+                kb.track_constant(name, kb.constant_ids.constant(index))
+            self._registered[name] = None
+
+        for name, arity, registered in meta['predicates']:
+            predicate = kb.predicates.get(name) if registered else None
+            if predicate is None or predicate.number_of_arguments != arity:
+                predicate = Predicate(name=name, number_of_arguments=arity)
+                if registered:
+                    kb.track_predicate(name, predicate)
+            self._predicate(predicate)
+        self._stored_predicates = len(self._predicates)
+
+        for index, name, ids, registered in meta['variables']:
+            constants = [kb.constant_ids.constant(i) for i in ids] if ids is not None else None
+            if index < len(self._variables):
+                var = self._variables[index]
+                var.constants = constants
+            else:
+                var = kb.variables.get(name) if registered else None
+                if var is None:
+                    var = LogicalVariable(name, constants=constants)
+                    if registered:
+                        kb.track_variable(name, var)
+                elif var.constants != tuple(constants or ()) or var.is_closed_world != (ids is not None):
+                    var.constants = constants
+                self._variable(var)
+            self._versions[index] = var.version
+
+        self._decode(records)
+        for index in axioms:
+            kb.axioms.append_formula(self._nodes[index])
+        self._axioms = len(kb.axioms)
+
+        for entry in meta['tables']:
+            predicate = self._predicates[entry['predicate']]
+            arrays = {name: self._view(block, buffer, data) for name, block in entry['arrays'].items()}
+            table = kb.axioms.restore_facts(predicate, entry['storage'], arrays, changes=not entry['base'])
+            self._journals[predicate] = table.journal_size
+
+    def _decode(self, records: List[int]):
+        i = 0
+        while i < len(records):
+            kind, count = records[i], records[i + 1]
+            operands = records[i + 2:i + 2 + count]
+            i += 2 + count
+
+            if kind == _CONSTANT:
+                node = self.kb.constant_ids.constant(operands[0])
+            elif kind == _VARIABLE:
+                node = self._variables[operands[0]]
+            elif kind == _TRUTH:
+                node = TruthLogicalExpression(bool(operands[0]))
+            elif kind == _ATOM:
+                node = self._predicates[operands[0]](*[self._nodes[arg] for arg in operands[1:]])
+            elif kind in _TYPES:
+                node = _TYPES[kind](*[self._nodes[arg] for arg in operands])
+            else:
+                variables = tuple(self._variables[var] for var in operands[:-1])
+                node = (UniversalQuantifier if kind == _FORALL else ExistentialQualifier)(variables,
+                                                                                          self._nodes[operands[-1]])
+            self._node(node)
+
+
+def save(path: str, kb: KnowledgeBase = None) -> Snapshot:
+    """
+    Writes a new snapshot of the knowledge base (the current one by default), replacing the file.
+    :return: the snapshot, whose `save` appends the later changes
+    """
+    if os.path.exists(path):
+        os.remove(path)
+
+    snapshot = Snapshot(path, kb)
+    snapshot.save()
+    return snapshot
+
+
+def load(path: str, kb: KnowledgeBase = None) -> Snapshot:
+    """
+    Loads a snapshot into the knowledge base (the current one by default).
+    :return: the snapshot, whose `load` reads the segments appended later and whose `save` appends the later changes
+    """
+    snapshot = Snapshot(path, kb)
+    snapshot.load()
+    return snapshot
@@ -3,6 +3,3 @@
 :Date: 09/12/19
 :Version: 0.0.1
 """
-
-import logging
-import tensorflow as tf
\ No newline at end of file
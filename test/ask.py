@@ -0,0 +1,73 @@
+import unittest
+
+import fol.fol_status as FOL
+from fol.logic import *
+from test.fixtures import smoke_and_cancer
+
+
+class Ask(unittest.TestCase):
+
+    def setUp(self):
+        smoke_and_cancer(self, 'Ask', 5)
+
+        a, b = self.people[:2]
+        FOL.tell(self.smokes(a))
+        FOL.tell(self.friends(a, b))
+        FOL.tell(Forall(self.p, self.smokes(self.p) >> self.cancer(self.p)))
+        FOL.tell(Forall((self.p, self.q), self.friends(self.p, self.q) == self.friends(self.q, self.p)))
+
+    def test_entailed(self):
+        a, b = self.people[:2]
+        self.assertIs(FOL.ask(self.cancer(a)).status, FOL.Entailment.ENTAILED)
+        self.assertTrue(FOL.ask(self.friends(b, a)))
+        self.assertTrue(FOL.ask(Exists(self.p, self.cancer(self.p))))
+
+    def test_not_entailed_with_countermodel(self):
+        b = self.people[1]
+        answer = FOL.ask(self.cancer(b))
+
+        self.assertIs(answer.status, FOL.Entailment.NOT_ENTAILED)
+        self.assertFalse(answer.countermodel[self.cancer(b)])
+        self.assertTrue(answer.countermodel[self.cancer(self.people[0])])
+
+    def test_incremental_queries(self):
+        a, b, c = self.people[:3]
+        self.assertTrue(FOL.ask(self.cancer(a)))
+
+        FOL.tell(self.smokes(b))
+        answer = FOL.ask(self.cancer(b))
+        self.assertTrue(answer)
+        self.assertTrue(answer.statistics['incremental'])
+        self.assertEqual(answer.statistics['kb_version'], FOL.KB_VERSION)
+        self.assertEqual(answer.statistics['new_clauses'], 1)
+
+        self.assertFalse(FOL.ask(self.cancer(c)))  # the previous query has been retracted
+        self.assertEqual(FOL.ask(self.cancer(c)).statistics['new_clauses'], 0)
+
+    def test_open_world_by_resolution(self):
+        x = LogicalVariable('x')
+        answer = FOL.ask(Forall(x, self.smokes(x)))
+        self.assertIs(answer.status, FOL.Entailment.NOT_ENTAILED)
+        self.assertTrue(answer.statistics['resolution'])
+        self.assertIsNone(answer.countermodel)
+
+        self.assertTrue(FOL.ask(Exists(x, self.smokes(x) & self.cancer(x))))
+
+    def test_unground_axiom(self):
+        a = self.people[0]
+        x = LogicalVariable('x')
+        # the instances of the first conjunct are encoded before the second one fails
+        FOL.tell(Forall(self.p, self.cancer(self.p) | Not(self.smokes(self.p))) & Forall(x, self.friends(x, x)))
+        self.assertTrue(FOL.ask(self.cancer(a)).statistics['resolution'])
+        clauses = FOL._INCREMENTAL.solver.number_of_clauses
+
+        c, d = self.people[2:4]
+        FOL.tell(self.smokes(c) | self.smokes(d))
+        answer = FOL.ask(self.cancer(c) | self.cancer(d))
+        self.assertTrue(answer)
+        self.assertTrue(answer.statistics['resolution'])
+        self.assertEqual(FOL._INCREMENTAL.solver.number_of_clauses, clauses + 1)  # only the new axiom
+
+
+if __name__ == '__main__':
+    unittest.main()
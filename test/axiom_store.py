@@ -0,0 +1,53 @@
+import unittest
+
+from fol.axiom_store import AxiomStore, as_ground_literal
+from fol.backend.grounding import ground
+from fol.logic import *
+from fol.predicate import Predicate
+
+
+class IndexedAxioms(unittest.TestCase):
+
+    def setUp(self):
+        self.a = LogicalConstant('StoreA')
+        self.b = LogicalConstant('StoreB')
+        self.friends = Predicate(name='FriendsStore', number_of_arguments=2)
+        self.smokes = Predicate(name='SmokesStore', number_of_arguments=1)
+        self.p = LogicalVariable('p', constants=(self.a, self.b))
+        self.store = AxiomStore()
+
+    def test_duplicates_are_rejected(self):
+        self.assertTrue(self.store.append(self.friends(self.a, self.b)))
+        self.assertFalse(self.store.append(self.friends(self.a, self.b)))
+        self.assertTrue(self.store.append(Not(self.friends(self.b, self.a))))
+        self.assertEqual(len(self.store), 2)
+        self.assertIn(Not(self.friends(self.b, self.a)), self.store)
+
+    def test_ground_literals_lookup(self):
+        self.store.append(self.friends(self.a, self.b))
+        self.store.append(Not(self.smokes(self.a)))
+        self.store.append(Forall(self.p, self.smokes(self.p) >> self.friends(self.p, self.p)))
+
+        self.assertTrue(self.store.get(self.friends(self.a, self.b)))
+        self.assertFalse(self.store.get(self.smokes(self.a)))
+        self.assertIsNone(self.store.get(self.friends(self.b, self.a)))
+        self.assertIsNone(as_ground_literal(self.smokes(self.p)))
+        self.assertEqual(list(self.store.facts(self.smokes)), [(self.smokes(self.a), False)])
+
+    def test_axioms_by_predicate(self):
+        rule = Forall(self.p, self.smokes(self.p) >> self.friends(self.p, self.p))
+        self.store.append(self.friends(self.a, self.b))
+        self.store.append(rule)
+
+        self.assertEqual(self.store.mentioning(self.smokes), [rule])
+        self.assertEqual(len(self.store.mentioning(self.friends)), 2)
+
+    def test_source_of_facts(self):
+        self.store.append(Not(self.smokes(self.a)))
+        rule = Forall(self.p, self.smokes(self.p) >> self.friends(self.p, self.p))
+
+        self.assertEqual(list(ground(rule, self.store)), [self.smokes(self.b) >> self.friends(self.b, self.b)])
+
+
+if __name__ == '__main__':
+    unittest.main()
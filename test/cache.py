@@ -0,0 +1,114 @@
+import gc
+import threading
+import unittest
+
+from fol import cache
+from fol.backend.cnf import expand_quantifiers, to_cnf
+from fol.logic import *
+from test.fixtures import smoke_and_cancer
+
+
+class TransformationCache(unittest.TestCase):
+
+    def setUp(self):
+        cache.clear_cache()
+        smoke_and_cancer(self, 'Cache', 3)
+        self.p.constants = self.people[:2]
+
+    def tearDown(self):
+        for name, size in cache.DEFAULT_SIZES.items():
+            cache.configure_cache(name, size)
+
+    def test_hits_and_misses(self):
+        formula = Not(self.smokes(self.people[0]) >> self.cancer(self.people[0]))
+        nnf = formula.to_nnf()
+        self.assertIs(formula.to_nnf(), nnf)
+        self.assertEqual(cache.cache_info('nnf')[:2], (1, 1))
+
+        # formulas already in NNF are not stored
+        nnf.to_nnf()
+        self.assertEqual(cache.cache_info('nnf').size, 1)
+
+        to_cnf(formula, 'distribute')
+        to_cnf(formula, 'distribute')
+        self.assertEqual(cache.cache_info('cnf').hits, 1)
+        self.assertEqual(set(cache.cache_info()), set(cache.DEFAULT_SIZES))
+
+        cache.clear_cache('nnf')
+        self.assertEqual(cache.cache_info('nnf'), cache.CacheInfo(0, 0, 0, 0, 0, cache.DEFAULT_SIZES['nnf']))
+        with self.assertRaises(ValueError):
+            cache.cache_info('dnf')
+
+    def test_eviction(self):
+        cache.configure_cache('nnf', 2)
+        formulas = [Not(self.smokes(person) & self.cancer(person)) for person in self.people]
+        for formula in formulas:
+            formula.to_nnf()
+        self.assertEqual(cache.cache_info('nnf').evictions, 1)
+
+        formulas[1].to_nnf()  # the most recent ones are kept
+        formulas[2].to_nnf()
+        formulas[0].to_nnf()
+        info = cache.cache_info('nnf')
+        self.assertEqual((info.hits, info.misses, info.size), (2, 4, 2))
+
+        cache.configure_cache('nnf', 0)
+        self.assertEqual(cache.cache_info('nnf').size, 0)
+        formulas[0].to_nnf()
+        self.assertEqual(cache.cache_info('nnf').size, 0)
+
+    def test_threads(self):
+        lru = cache.LRUCache(2)
+        formula = Not(self.smokes(self.people[0]) & self.cancer(self.people[0]))
+        evicting = []
+
+        class Dependency(object):
+            armed = False
+
+            @property
+            def version(self):
+                # another thread evicts the entry while this one is checking it
+                if self.armed:
+                    self.armed = False
+                    evicting.append(threading.Thread(target=lru.resize, args=(0,)))
+                    evicting[0].start()
+                    evicting[0].join(.1)  # held back by the lock of the cache
+                return 0
+
+        dependency = Dependency()
+        nnf = lru.memoize(formula, lambda lc: lc.to_nnf(), lambda lc: (dependency,))
+        dependency.armed = True
+        self.assertIs(lru.memoize(formula, lambda lc: lc.to_nnf(), lambda lc: (dependency,)), nnf)
+
+        evicting[0].join()
+        self.assertEqual(lru.info()[:3], (1, 1, 1))
+        self.assertEqual(len(lru), 0)
+
+    def test_invalidated_when_the_constants_change(self):
+        axiom = Forall(self.p, self.smokes(self.p) >> self.cancer(self.p))
+        self.assertEqual(len(expand_quantifiers(axiom).args), 2)
+        self.assertEqual(len(expand_quantifiers(axiom).args), 2)
+        self.assertEqual(cache.cache_info('ground').hits, 1)
+
+        version = self.p.version
+        self.p.constants = self.people
+        self.assertEqual(self.p.version, version + 1)
+        self.assertEqual(len(expand_quantifiers(axiom).args), 3)
+        self.assertEqual(cache.cache_info('ground').invalidations, 1)
+
+        self.p.constants = None
+        self.assertFalse(self.p.is_closed_world)
+
+    def test_entries_hold_the_formulas(self):
+        formula = Not(self.smokes(self.people[0]) | self.cancer(self.people[1]))
+        key = id(formula)
+        nnf = formula.to_nnf()
+        del formula
+        gc.collect()
+
+        # the id of a cached formula can not be reused by another one
+        self.assertIs(cache.namespace('nnf')._entries[key][3], nnf)
+
+
+if __name__ == '__main__':
+    unittest.main()
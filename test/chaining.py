@@ -0,0 +1,137 @@
+import unittest
+
+import fol.fol_status as FOL
+from fol.backend.chaining import Materializer, horn_rules
+from fol.logic import *
+from test.fixtures import smoke_and_cancer
+
+
+class HornRules(unittest.TestCase):
+
+    def setUp(self):
+        smoke_and_cancer(self, 'Horn', 3)
+        self.q = LogicalVariable('qHorn')
+
+    def test_recognized(self):
+        p, q = self.p, self.q
+        rules = horn_rules(Forall(p, self.smokes(p) >> self.cancer(p)))
+        self.assertEqual([(rule.body, rule.head) for rule in rules], [((self.smokes(p),), self.cancer(p))])
+
+        rules = horn_rules(Forall(q, Forall(p, (self.friends(p, q) & self.smokes(q)) >> (self.smokes(p) &
+                                                                                       self.cancer(p)))))
+        self.assertEqual([rule.head for rule in rules], [self.smokes(p), self.cancer(p)])
+        self.assertEqual(rules[0].variables, (q, p))
+
+        self.assertEqual(len(horn_rules(Forall(p, self.cancer(p)))[0].body), 0)
+        self.assertIsNotNone(horn_rules(self.smokes(self.people[0]) >> self.cancer(self.people[0])))
+
+    def test_not_horn(self):
+        p, q = self.p, self.q
+        self.assertIsNone(horn_rules(Forall(p, (self.smokes(p) | self.friends(p, p)) >> self.cancer(p))))
+        self.assertIsNone(horn_rules(Forall(p, self.smokes(p) >> Not(self.cancer(p)))))
+        self.assertIsNone(horn_rules(Exists(p, self.smokes(p) >> self.cancer(p))))
+        self.assertIsNone(horn_rules(Forall(p, self.smokes(p) >> self.cancer(q))))  # q is free
+        # an open world variable of the head has to be bound by the body
+        self.assertIsNone(horn_rules(Forall((p, q), self.smokes(p) >> self.cancer(q))))
+        self.assertIsNotNone(horn_rules(Forall((p, q), self.smokes(q) >> self.cancer(p))))
+
+
+class Materialization(unittest.TestCase):
+
+    def setUp(self):
+        smoke_and_cancer(self, 'Chain', 30)
+        self.store = self.kb.axioms
+        self.x, self.y, self.z = (LogicalVariable(name) for name in ('xChain', 'yChain', 'zChain'))
+
+    def test_transitive_closure(self):
+        x, y, z = self.x, self.y, self.z
+        for a, b in zip(self.people, self.people[1:]):
+            self.store.append(self.friends(a, b))
+        self.store.append(Forall((x, y, z), (self.friends(x, y) & self.friends(y, z)) >> self.friends(x, z)))
+
+        materializer = Materializer(self.store)
+        self.assertEqual(materializer.update(), 30 * 29 // 2)
+        self.assertTrue(materializer.holds(self.friends(self.people[0], self.people[29])))
+        self.assertFalse(materializer.holds(self.friends(self.people[29], self.people[0])))
+        self.assertEqual(materializer.update(), 0)
+
+        # a new fact is joined with the closure, a new rule with every known fact
+        extra = LogicalConstant('ChainExtra')
+        self.store.append(self.friends(self.people[29], extra))
+        self.store.append(Forall(x, self.friends(x, extra) >> self.smokes(x)))
+        self.assertEqual(materializer.update(), 30 + 30)
+        self.assertTrue(materializer.holds(self.smokes(self.people[3]) & self.friends(self.people[3], extra)))
+        self.assertEqual(len(set(materializer.facts(self.smokes))), 30)
+
+    def test_domains(self):
+        a, b, c = self.people[:3]
+        p = LogicalVariable('pChain', constants=[a, b])
+        for person in (a, b, c):
+            self.store.append(self.smokes(person))
+        self.store.append(Forall(p, self.smokes(p) >> self.cancer(p)))
+        # the variable of the head missing from the body ranges over its constants
+        self.store.append(Forall((self.x, p), self.cancer(self.x) >> self.friends(self.x, p)))
+
+        materializer = Materializer(self.store)
+        materializer.update()
+        self.assertEqual(set(materializer.facts(self.cancer)), {self.cancer(a), self.cancer(b)})
+        self.assertTrue(materializer.holds(self.friends(b, a)))
+        self.assertFalse(materializer.holds(self.friends(c, a)))
+
+        p.constants = [a, b, c]
+        materializer.update()
+        self.assertTrue(materializer.holds(self.friends(c, c)))
+
+    def test_truth_tensors(self):
+        self.smokes.use_storage('sparse')
+        materializer = Materializer(self.store)
+        self.store.append(Forall(self.x, self.smokes(self.x) >> self.cancer(self.x)))
+        self.store.append_facts(self.smokes, self.store.constants.ids(self.people[:10]), True)
+        self.store.append_facts(self.smokes, self.store.constants.ids(self.people[10:12]), False)
+
+        self.assertEqual(materializer.update(), 20)
+        self.store.append(self.smokes(self.people[20]))
+        self.assertEqual(materializer.update(), 2)
+        self.assertTrue(materializer.holds(self.cancer(self.people[20])))
+        self.assertFalse(materializer.holds(self.cancer(self.people[11])))
+
+
+class ForwardChainingAsk(unittest.TestCase):
+
+    def setUp(self):
+        smoke_and_cancer(self, 'Fwd', 4)
+        FOL.FORWARD_CHAINING = True
+
+    def test_ask(self):
+        a, b = self.people[:2]
+        FOL.tell(self.smokes(a))
+        FOL.tell(Forall(self.p, self.smokes(self.p) >> self.cancer(self.p)))
+
+        answer = FOL.ask(self.cancer(a))
+        self.assertIs(answer.status, FOL.Entailment.ENTAILED)
+        self.assertTrue(answer.statistics['materialized'])
+
+        # the queries outside the closure are answered by the solver
+        answer = FOL.ask(self.cancer(b))
+        self.assertIs(answer.status, FOL.Entailment.NOT_ENTAILED)
+        self.assertNotIn('materialized', answer.statistics)
+        answer = FOL.ask(self.cancer(a) | self.cancer(b))
+        self.assertIs(answer.status, FOL.Entailment.ENTAILED)
+        self.assertNotIn('materialized', answer.statistics)
+
+        FOL.tell(self.smokes(b))
+        self.assertTrue(FOL.ask(self.cancer(b)).statistics['materialized'])
+
+    def test_open_world_rules(self):
+        x = LogicalVariable('xFwd')
+        FOL.tell(Forall(x, self.smokes(x) >> self.cancer(x)))
+        FOL.tell(self.smokes(self.people[3]))
+
+        # the solver cannot ground the open world rule, the closure entails the atom without the resolution prover
+        self.assertTrue(FOL.ask(self.cancer(self.people[3])).statistics['materialized'])
+        FOL.FORWARD_CHAINING = False
+        self.assertTrue(FOL.ask(self.cancer(self.people[3])).statistics['resolution'])
+
+
+if __name__ == '__main__':
+    unittest.main()
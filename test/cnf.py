@@ -0,0 +1,124 @@
+import itertools
+import unittest
+
+from fol.backend.cnf import to_cnf, substitute, substitute_many, UnboundVariableError
+from fol.logic import *
+from fol.predicate import Predicate
+
+
+def evaluate(lc, model):
+    if type(lc) is NotLogicalExpression:
+        return not evaluate(lc.arg, model)
+    if type(lc) is AndLogicalExpression:
+        return all(evaluate(arg, model) for arg in lc.args)
+    if type(lc) is OrLogicalExpression:
+        return any(evaluate(arg, model) for arg in lc.args)
+    if type(lc) is ImplicationLogicalExpression:
+        return not evaluate(lc.alpha, model) or evaluate(lc.beta, model)
+    if type(lc) is EquivalenceLogicalExpression:
+        return evaluate(lc.alpha, model) is evaluate(lc.beta, model)
+    return model[lc]
+
+
+def satisfied(clause_set, assignment):
+    return all(any((lit > 0) == assignment[abs(lit)] for lit in clause) for clause in clause_set)
+
+
+class ConjunctiveNormalForm(unittest.TestCase):
+
+    def setUp(self):
+        self.a = LogicalConstant('Alpha')
+        self.b = LogicalConstant('Beta')
+        self.c = LogicalConstant('Gamma')
+        self.formulas = [
+            Not(self.a >> self.b) | (self.c == self.a),
+            (self.a == self.b) == (self.b == self.c),
+            Not((self.a & self.b) | Not(self.c)) >> self.a,
+        ]
+
+    def test_distribute_is_equivalent(self):
+        atoms = (self.a, self.b, self.c)
+        for formula in self.formulas:
+            clause_set = to_cnf(formula, mode='distribute')
+            for values in itertools.product((False, True), repeat=3):
+                model = dict(zip(atoms, values))
+                assignment = {clause_set.symbols.variable(atom): value for atom, value in model.items()}
+                self.assertEqual(evaluate(formula, model), satisfied(clause_set, assignment), str(formula))
+
+    def test_tseitin_is_equisatisfiable(self):
+        atoms = (self.a, self.b, self.c)
+        for formula in self.formulas:
+            clause_set = to_cnf(formula)
+            n = clause_set.number_of_variables
+            for values in itertools.product((False, True), repeat=3):
+                model = dict(zip(atoms, values))
+                extensible = False
+                for extension in itertools.product((False, True), repeat=n):
+                    assignment = dict(zip(range(1, n + 1), extension))
+                    if all(assignment[clause_set.symbols.variable(atom)] is value for atom, value in model.items()):
+                        extensible |= satisfied(clause_set, assignment)
+                self.assertEqual(evaluate(formula, model), extensible, str(formula))
+
+    def test_tseitin_is_linear(self):
+        atoms = [LogicalConstant('P{}'.format(i)) for i in range(30)]
+        formula = atoms[0]
+        for atom in atoms[1:]:
+            formula = formula == atom
+
+        self.assertLessEqual(len(to_cnf(formula)), 4 * len(atoms))
+
+    def test_closed_world_quantifiers(self):
+        friends = Predicate(name='FriendsCNF', number_of_arguments=2)
+        domain = (self.a, self.b)
+        p = LogicalVariable('p', constants=domain)
+        q = LogicalVariable('q', constants=domain)
+
+        clause_set = to_cnf(Forall((p, q), friends(p, q) >> friends(q, p)), mode='distribute')
+        self.assertEqual(len(clause_set), 2)  # the reflexive instances are tautologies
+        self.assertIn(friends(self.b, self.a), clause_set.symbols)
+
+        with self.assertRaises(UnboundVariableError):
+            to_cnf(Forall(LogicalVariable('x'), friends(self.a, self.b)))
+
+
+class Substitution(unittest.TestCase):
+
+    def setUp(self):
+        self.a, self.b = LogicalConstant('Alpha'), LogicalConstant('Beta')
+        self.friends = Predicate(name='FriendsSubst', number_of_arguments=2)
+        self.smokes = Predicate(name='SmokesSubst', number_of_arguments=1)
+        self.x, self.y = LogicalVariable('xSubst'), LogicalVariable('ySubst')
+
+    def test_bindings(self):
+        x, y, a, b = self.x, self.y, self.a, self.b
+        untouched = self.smokes(a) | self.smokes(b)
+        formula = (self.friends(x, y) >> self.smokes(y)) & untouched
+
+        instance = substitute(formula, {x: a, y: b})
+        self.assertIs(instance, (self.friends(a, b) >> self.smokes(b)) & untouched)
+        self.assertIs(instance.args[1], untouched)  # shared, not copied
+        self.assertIs(substitute(formula, {LogicalVariable('zSubst'): a}), formula)
+
+        # the simultaneous substitution does not replace the terms it introduces
+        self.assertIs(substitute(self.friends(x, y), {x: y, y: x}), self.friends(y, x))
+
+    def test_bound_variables(self):
+        x, y, a, b = self.x, self.y, self.a, self.b
+        formula = self.smokes(x) & Exists(x, self.friends(x, y))
+        self.assertIs(substitute(formula, {x: a, y: b}), self.smokes(a) & Exists(x, self.friends(x, b)))
+        self.assertIs(substitute(Forall(x, self.smokes(x)), {x: a}), Forall(x, self.smokes(x)))
+
+        with self.assertRaises(ValueError):
+            substitute(Exists(x, self.friends(x, y)), {y: x})
+
+    def test_many(self):
+        x, y, a, b = self.x, self.y, self.a, self.b
+        formula = self.friends(x, y) >> Not(self.smokes(x))
+        instances = list(substitute_many(formula, (x, y), [(a, a), (a, b), (b, a)]))
+        self.assertEqual(len(instances), 3)
+        self.assertIs(instances[1], self.friends(a, b) >> Not(self.smokes(a)))
+        self.assertIs(instances[2].beta, Not(self.smokes(b)))
+
+
+if __name__ == '__main__':
+    unittest.main()
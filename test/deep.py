@@ -0,0 +1,105 @@
+import unittest
+
+from fol.axiom_store import AxiomStore, ConstantIndex
+from fol.backend.cnf import to_cnf, replace_variable, move_not_inwards, expand_quantifiers
+from fol.backend.fuzzy import satisfaction
+from fol.backend.grounding import simplify, ground
+from fol.backend.vectorized import evaluate
+from fol.logic import *
+from fol.predicate import Predicate
+
+DEPTH = 100000
+
+
+class DeepFormulas(unittest.TestCase):
+    """
+    The transformations are iterative: formulas far deeper than the recursion limit must not raise RecursionError.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.constants = tuple(LogicalConstant('Deep{}'.format(i)) for i in range(2))
+        cls.x = LogicalVariable('x', constants=cls.constants)
+        cls.atom = Predicate(name='AtomDeep', number_of_arguments=2)
+        cls.atoms = [cls.atom(cls.constants[0], LogicalConstant('DeepAtom{}'.format(i))) for i in range(DEPTH)]
+
+        # a0 ⇒ (a1 ⇒ (a2 ⇒ ...)), right nested
+        chain = cls.atom(cls.x, cls.x)
+        for atom in reversed(cls.atoms):
+            chain = atom >> chain
+        cls.chain = chain
+
+        # ((a0 ∧ a1) ∨ a2) ∧ a3 ..., left nested and alternating so it cannot be flattened
+        alternating = cls.atoms[0]
+        for i, atom in enumerate(cls.atoms[1:]):
+            alternating = alternating & atom if i % 2 else alternating | atom
+        cls.alternating = alternating
+
+    def test_printing(self):
+        text = str(self.chain)
+        self.assertEqual(text.count('⇒'), DEPTH)
+        self.assertTrue(text.startswith('AtomDeep(Deep0, Deepatom0) ⇒ AtomDeep(Deep0, Deepatom1) ⇒'))
+        self.assertTrue(str(self.alternating).endswith('∨ AtomDeep(Deep0, Deepatom{})'.format(DEPTH - 1)))
+
+    def test_nnf(self):
+        nnf = Not(self.alternating).to_nnf()
+        self.assertIs(type(nnf), AndLogicalExpression)  # the last operator was a ∨
+        self.assertIs(nnf.args[-1], Not(self.atoms[-1]))
+        self.assertIs(move_not_inwards(Not(self.alternating)), nnf)
+
+        nnf = self.chain.to_nnf()  # a single disjunction
+        self.assertEqual(len(nnf.args), DEPTH + 1)
+        self.assertIs(nnf.args[0], Not(self.atoms[0]))
+
+    def test_substitution(self):
+        replaced = replace_variable(self.chain, self.x, self.constants[1])
+        last = replaced
+        while type(last) is ImplicationLogicalExpression:
+            self.assertIs(last.alpha.predicate, self.atom)
+            last = last.beta
+        self.assertIs(last, self.atom(self.constants[1], self.constants[1]))
+
+        # untouched sub-formulas are shared
+        self.assertIs(replace_variable(self.alternating, self.x, self.constants[1]), self.alternating)
+
+    def test_quantifiers_and_cnf(self):
+        expanded = expand_quantifiers(Forall(self.x, self.chain))
+        self.assertIs(type(expanded), AndLogicalExpression)
+
+        clauses = to_cnf(self.alternating)
+        self.assertEqual(len(clauses.symbols), 2 * DEPTH - 2)  # an atom or a definition per node but the root
+        self.assertEqual(len(to_cnf(self.chain.to_nnf(), 'distribute')), 1)  # a single disjunction
+
+    def test_simplify_and_ground(self):
+        facts = {atom: True for atom in self.atoms}
+        self.assertIs(simplify(self.alternating, facts), TRUE)
+        self.assertIs(simplify(self.chain, facts), self.atom(self.x, self.x))
+
+        facts[self.atom(self.constants[0], self.constants[0])] = True
+        self.assertEqual(list(ground(Forall(self.x, self.chain), facts)),
+                         [self.atom(self.constants[1], self.constants[1])])
+
+        conjunction = And.of(self.atoms)
+        self.assertEqual(len(list(ground(conjunction))), DEPTH)
+
+    def test_evaluation(self):
+        # a chain of 5000 is already beyond the recursion limit and much cheaper to evaluate
+        atoms = self.atoms[:5000]
+        chain = self.atom(self.x, self.x)
+        for atom in reversed(atoms):
+            chain = atom >> chain
+        rule = Forall(self.x, chain)
+
+        store = AxiomStore(ConstantIndex())
+        for atom in atoms:
+            store.append(atom)
+        self.assertIsNone(evaluate(rule, store))  # AtomDeep(x, x) is unknown
+
+        for constant in self.constants:
+            store.append(self.atom(constant, constant))
+        self.assertIs(evaluate(rule, store), True)
+        self.assertEqual(satisfaction(rule, store), 1.)
+
+
+if __name__ == '__main__':
+    unittest.main()
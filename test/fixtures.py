@@ -0,0 +1,44 @@
+"""
+:Author: Theodor A. Dumitrescu
+:Date: Oct 18, 2026
+:Version: 0.0.1
+"""
+import unittest
+from typing import Mapping
+
+from fol.knowledge_base import KnowledgeBase, using
+from fol.logic import LogicalConstant, LogicalVariable
+from fol.predicate import Predicate
+
+
+def smoke_and_cancer(case: unittest.TestCase,
+                     suffix: str,
+                     people: int,
+                     storage: Mapping[str, str] = None) -> KnowledgeBase:
+    """
+    Sets up the symbols of the smoke and cancer example on a test case, with a fresh knowledge base bound to the
+    context (see fol.knowledge_base.using) until the end of the test, so the functional API works on it:
+        - `kb`: the knowledge base
+        - `people`: the constants `<suffix>0`, `<suffix>1`, ...
+        - `smokes`, `cancer`: the unary predicates `Smokes<suffix>` and `Cancer<suffix>`
+        - `friends`: the binary predicate `Friends<suffix>`
+        - `p`, `q`: the variables `p<suffix>` and `q<suffix>` ranging over the people
+    The suffix keeps the names of the symbols of different test cases apart.
+    :param people: the number of people
+    :param storage: the storage of the truth tensor by predicate attribute, e.g. {'smokes': 'sparse'}, none by default
+    :return: the knowledge base
+    """
+    storage = storage if storage is not None else {}
+
+    kb = case.kb = KnowledgeBase()
+    binding = using(kb)
+    binding.__enter__()
+    case.addCleanup(binding.__exit__, None, None, None)
+
+    case.people = tuple(LogicalConstant('{}{}'.format(suffix, i)) for i in range(people))
+    case.smokes = Predicate(name='Smokes' + suffix, number_of_arguments=1, storage=storage.get('smokes'))
+    case.cancer = Predicate(name='Cancer' + suffix, number_of_arguments=1, storage=storage.get('cancer'))
+    case.friends = Predicate(name='Friends' + suffix, number_of_arguments=2, storage=storage.get('friends'))
+    case.p = LogicalVariable('p' + suffix, constants=case.people)
+    case.q = LogicalVariable('q' + suffix, constants=case.people)
+    return kb
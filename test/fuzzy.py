@@ -0,0 +1,120 @@
+import itertools
+import unittest
+
+import numpy as np
+
+import fol.backend as backend
+from fol.axiom_store import AxiomStore, ConstantIndex
+from fol.backend import fuzzy
+from fol.backend.cnf import UnboundVariableError
+from fol.backend.fuzzy import FuzzyEvaluator, TNORMS, mean, mean_error
+from fol.backend.vectorized import evaluate
+from fol.knowledge_base import Entailment, KnowledgeBase
+from fol.logic import *
+from fol.predicate import Predicate
+
+
+class TNorms(unittest.TestCase):
+
+    def test_boolean_corners(self):
+        alpha, beta = np.meshgrid([0., 1.], [0., 1.])
+        for tnorm in TNORMS.values():
+            np.testing.assert_array_equal(tnorm.conjunction(alpha, beta), np.logical_and(alpha, beta))
+            np.testing.assert_array_equal(tnorm.disjunction(alpha, beta), np.logical_or(alpha, beta))
+            np.testing.assert_array_equal(tnorm.implication(alpha, beta), np.logical_or(alpha == 0, beta))
+
+    def test_values(self):
+        self.assertAlmostEqual(TNORMS['product'].conjunction(.5, .4), .2)
+        self.assertAlmostEqual(TNORMS['product'].disjunction(.5, .4), .7)
+        self.assertAlmostEqual(TNORMS['lukasiewicz'].conjunction(.5, .4), 0.)
+        self.assertAlmostEqual(TNORMS['lukasiewicz'].disjunction(.5, .4), .9)
+        self.assertAlmostEqual(TNORMS['lukasiewicz'].implication(.5, .4), .9)
+        self.assertAlmostEqual(TNORMS['godel'].conjunction(.5, .4), .4)
+
+    def test_means(self):
+        values = np.array([.2, .6, 1.])
+        self.assertAlmostEqual(mean(values, 1, 0), .6)
+        self.assertAlmostEqual(mean(values, 2, 0), np.sqrt((.04 + .36 + 1.) / 3))
+        self.assertAlmostEqual(mean(values, float('inf'), 0), 1.)
+        self.assertAlmostEqual(mean_error(values, float('inf'), 0), .2)
+        self.assertLess(mean_error(values, 8, 0), mean_error(values, 2, 0))  # tends to the min
+
+
+class FuzzyEvaluation(unittest.TestCase):
+
+    def setUp(self):
+        self.people = tuple(LogicalConstant('Fuzzy{}'.format(i)) for i in range(3))
+        self.p = LogicalVariable('p', constants=self.people)
+        self.q = LogicalVariable('q', constants=self.people)
+        self.store = AxiomStore(ConstantIndex())
+
+    def test_degrees(self):
+        smokes = Predicate(name='SmokesFuzzy', number_of_arguments=1)
+        cancer = Predicate(name='CancerFuzzy', number_of_arguments=1)
+        evaluator = FuzzyEvaluator(self.store, tnorm='product', p_forall=1, p_exists=1)
+        evaluator.set_degrees(smokes, [.9, .2, .5])
+        evaluator.set_degrees(cancer, [.95, .1, 1.])
+
+        rule = Forall(self.p, smokes(self.p) >> cancer(self.p))
+        expected = 1 - np.array([.9, .2, .5]) + np.array([.9, .2, .5]) * np.array([.95, .1, 1.])
+        np.testing.assert_allclose(evaluator.degrees(rule), expected)
+        self.assertAlmostEqual(evaluator.truth(rule), expected.mean())
+        self.assertAlmostEqual(evaluator.truth(Exists(self.p, smokes(self.p))), (.9 + .2 + .5) / 3)
+        self.assertAlmostEqual(evaluator.truth(smokes(self.people[0]) & Not(cancer(self.people[1]))), .9 * .9)
+        self.assertEqual(evaluator.violations(rule, threshold=.9), [(self.people[1],)])
+
+    def test_facts_agree_with_kleene(self):
+        friends = Predicate(name='FriendsFuzzy', number_of_arguments=2, storage='dense')
+        for i, (x, y) in enumerate(itertools.product(self.people, repeat=2)):
+            self.store.append(friends(x, y) if i % 3 else Not(friends(x, y)))
+
+        p, q = self.p, self.q
+        formulas = [
+            Forall((p, q), friends(p, q) == friends(q, p)),
+            Forall(p, Exists(q, friends(p, q))),
+            Exists(p, Forall(q, friends(q, p) | Not(friends(p, q)))),
+        ]
+        for formula, tnorm in itertools.product(formulas, TNORMS):
+            degree = FuzzyEvaluator(self.store, tnorm, float('inf'), float('inf')).truth(formula)
+            self.assertEqual(degree, float(evaluate(formula, self.store)), (str(formula), tnorm))
+
+    def test_unknown(self):
+        smokes = Predicate(name='SmokesUnknownFuzzy', number_of_arguments=1, storage='sparse')
+        self.store.append(smokes(self.people[0]))
+        evaluator = FuzzyEvaluator(self.store, 'godel', p_exists=1, unknown=.25)
+        self.assertAlmostEqual(evaluator.truth(Exists(self.p, smokes(self.p))), (1 + .25 + .25) / 3)
+
+    def test_open_world(self):
+        kb = KnowledgeBase()
+        smokes = kb.predicate('SmokesOpenFuzzy', 1)
+        kb.tell(Not(smokes(kb.constant('OpenFuzzy'))))
+
+        x = LogicalVariable('x')  # a degree of 1 would claim that everybody smokes
+        rule = Forall(x, smokes(x))
+        self.assertIs(kb.ask(rule).status, Entailment.NOT_ENTAILED)
+        with self.assertRaises(UnboundVariableError):
+            kb.satisfaction(rule)
+
+    def test_runtime_selection(self):
+        smokes = Predicate(name='SmokesSelectedFuzzy', number_of_arguments=1)
+        self.store.append(smokes(self.people[0]))
+        formula = Exists(self.p, smokes(self.p))
+
+        backend.use_backend('numpy')
+        self.assertIs(backend.get_backend(), fuzzy)
+        with self.assertRaises(ValueError):
+            backend.use_backend('tensorflow')
+
+        fuzzy.configure(tnorm='godel', p_exists=1)
+        try:
+            self.assertAlmostEqual(backend.satisfaction(formula, self.store), (1 + .5 + .5) / 3)
+            self.assertAlmostEqual(backend.satisfaction(formula, self.store, p_exists=float('inf')), 1.)
+        finally:
+            fuzzy.configure(tnorm='product', p_exists=2.)
+
+        with self.assertRaises(ValueError):
+            fuzzy.configure(tnorm='hamacher')
+
+
+if __name__ == '__main__':
+    unittest.main()
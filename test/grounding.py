@@ -0,0 +1,47 @@
+import types
+import unittest
+
+from fol.backend.grounding import ground, simplify, count_instances
+from fol.logic import *
+from test.fixtures import smoke_and_cancer
+
+
+class Grounding(unittest.TestCase):
+
+    def setUp(self):
+        smoke_and_cancer(self, 'Grounding', 4)
+
+    def test_lazy_product(self):
+        axiom = Forall((self.p, self.q), self.friends(self.p, self.q) >> self.friends(self.q, self.p))
+        instances = ground(axiom)
+
+        self.assertIsInstance(instances, types.GeneratorType)
+        first = next(instances)
+        self.assertIs(first, self.friends(self.people[0], self.people[0]) >> self.friends(self.people[0],
+                                                                                             self.people[0]))
+        self.assertEqual(1 + sum(1 for _ in instances), count_instances(axiom))
+
+    def test_facts_prune_instances(self):
+        a, b = self.people[:2]
+        facts = {self.smokes(a): True, self.smokes(b): False, self.friends(a, b): True}
+        axiom = Forall(self.p, self.smokes(self.p) >> self.friends(self.p, b))
+
+        instances = list(ground(axiom, facts))
+        self.assertNotIn(self.smokes(b) >> self.friends(b, b), instances)  # satisfied by ¬Smokes(b)
+        self.assertNotIn(self.smokes(a) >> self.friends(a, b), instances)  # satisfied by Friends(a, b)
+        self.assertEqual(len(instances), len(self.people) - 2)
+
+        self.assertIs(simplify(self.smokes(a) >> self.friends(b, a), facts), self.friends(b, a))
+        self.assertIs(simplify(self.smokes(a) >> self.smokes(b), facts), FALSE)
+
+    def test_existential_is_expanded(self):
+        a = self.people[0]
+        axiom = Forall(self.p, Exists(self.q, self.friends(self.p, self.q)))
+
+        instances = list(ground(axiom, {self.friends(a, a): True}))
+        self.assertEqual(len(instances), len(self.people) - 1)
+        self.assertIsInstance(instances[0], OrLogicalExpression)
+
+
+if __name__ == '__main__':
+    unittest.main()
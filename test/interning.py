@@ -0,0 +1,80 @@
+import gc
+import sys
+import threading
+import unittest
+
+from fol.logic import *
+from fol.logic import interned_nodes
+
+
+class HashConsing(unittest.TestCase):
+
+    def test_same_structure_same_node(self):
+        a = LogicalConstant('Ann')
+        b = LogicalConstant('Bob')
+        x = LogicalVariable('x', constants=(a, b))
+
+        self.assertIs(LogicalConstant('ann'), a)
+        self.assertIs(Not(a) & (a >> b), Not(a) & (a >> b))
+        self.assertIs(Forall(x, Not(x) | a), Forall(x, Not(x) | a))
+        self.assertIsNot(a & b, b & a)
+
+    def test_variables_are_not_merged_by_name(self):
+        x1 = LogicalVariable('x')
+        x2 = LogicalVariable('x')
+
+        self.assertIsNot(Not(x1), Not(x2))
+        self.assertFalse(Not(x1).structurally_equals(Not(x2)))
+
+    def test_structural_hash_and_equality(self):
+        a = LogicalConstant('Ann')
+        b = LogicalConstant('Bob')
+
+        f = (a >> b) == (Not(b) >> Not(a))
+        self.assertIsInstance(f, EquivalenceLogicalExpression)
+        self.assertTrue(f.alpha.structurally_equals(a >> b))
+        self.assertEqual(hash(a & b), hash(LogicalConstant('ann') & LogicalConstant('bob')))
+
+        axioms = {a & b, a & b, a | b}
+        self.assertEqual(len(axioms), 2)
+        self.assertIn(LogicalConstant('ann') | b, axioms)
+
+    def test_threads(self):
+        people = [LogicalConstant('Thread{}'.format(i)) for i in range(50)]
+        barrier = threading.Barrier(4)
+        built = [None] * 4
+
+        def build(thread):
+            barrier.wait()
+            built[thread] = [Not(a) & (a >> b) | Not(b) for a, b in zip(people, people[1:])]
+
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)  # switch between the threads as often as possible
+        try:
+            threads = [threading.Thread(target=build, args=(thread,)) for thread in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            sys.setswitchinterval(interval)
+
+        for formulas in built[1:]:
+            for f, g in zip(built[0], formulas):
+                self.assertIs(f, g)
+
+    def test_released_when_unreferenced(self):
+        a = LogicalConstant('Ann')
+        gc.collect()
+        before = interned_nodes()
+
+        f = Not(a) & (a >> Not(a))
+        self.assertEqual(interned_nodes(), before + 3)
+
+        del f
+        gc.collect()
+        self.assertEqual(interned_nodes(), before)
+
+
+if __name__ == '__main__':
+    unittest.main()
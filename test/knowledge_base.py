@@ -0,0 +1,113 @@
+import threading
+import unittest
+
+import fol.fol_status as FOL
+from fol.knowledge_base import KnowledgeBase, Entailment, current, using
+from fol.logic import *
+from fol.predicate import Predicate
+
+
+class Scoping(unittest.TestCase):
+
+    def test_independent(self):
+        first, second = KnowledgeBase(), KnowledgeBase()
+        a = first.constant('KbA')
+        human = first.predicate('HumanKb', 1)
+        mortal = first.predicate('MortalKb', 1)
+        x = first.variable('xKb', constants=(a,))
+
+        first.tell(human(a))
+        first.tell(Forall(x, human(x) >> mortal(x)))
+        self.assertTrue(first.ask(mortal(a)))
+        self.assertEqual(second.ask(mortal(a)).status, Entailment.NOT_ENTAILED)
+
+        # the names are scoped too
+        self.assertIs(second.constant('KbA'), a)
+        self.assertFalse(FOL.constant_already_defined('KbA'))
+        with self.assertRaises(ValueError):
+            first.constant('KbA')
+
+    def test_using(self):
+        kb = KnowledgeBase()
+        default = current()
+        with using(kb):
+            self.assertIs(current(), kb)
+            FOL.tell(Predicate(name='UsingKb', number_of_arguments=1)(LogicalConstant('KbUsing')))
+            self.assertEqual(FOL.KB_VERSION, 1)
+            self.assertEqual(len(FOL.AXIOMS), 1)
+            FOL.FORWARD_CHAINING = True
+
+        self.assertIs(current(), default)
+        self.assertTrue(kb.forward_chaining)
+        self.assertFalse(FOL.FORWARD_CHAINING)
+        self.assertEqual(len(kb.axioms), 1)
+
+        # every thread starts from the default knowledge base
+        seen = []
+        with using(kb):
+            thread = threading.Thread(target=lambda: seen.append(current()))
+            thread.start()
+            thread.join()
+        self.assertEqual(seen, [default])
+
+
+class Snapshots(unittest.TestCase):
+
+    def setUp(self):
+        self.kb = KnowledgeBase()
+        self.people = tuple(self.kb.constant('KbSnap{}'.format(i)) for i in range(8))
+        self.smokes = self.kb.predicate('SmokesKbSnap', 1)
+        self.cancer = self.kb.predicate('CancerKbSnap', 1, storage='sparse')
+        self.p = self.kb.variable('pKbSnap', constants=self.people)
+        self.kb.tell(Forall(self.p, self.smokes(self.p) >> self.cancer(self.p)))
+
+    def test_isolation(self):
+        a, b = self.people[:2]
+        self.kb.tell(self.smokes(a))
+        view = self.kb.snapshot()
+        self.assertIs(self.kb.snapshot(), view)  # shared until the next write
+
+        self.kb.tell(self.smokes(b))
+        self.kb.tell_facts(self.cancer, [self.kb.constant_id(self.people[2])], False)
+        self.assertIsNot(self.kb.snapshot(), view)
+
+        self.assertTrue(view.ask(self.cancer(a)))
+        self.assertFalse(view.ask(self.cancer(b)))
+        self.assertIsNone(view.axioms.get(self.cancer(self.people[2])))
+        self.assertEqual(len(view.axioms), 2)
+        self.assertEqual(view.version, 2)
+
+        self.assertTrue(self.kb.ask(self.cancer(b)))
+        self.assertTrue(self.kb.ask(Not(self.smokes(self.people[2]))))
+
+        with self.assertRaises(ValueError):
+            view.tell(self.smokes(b))
+        with self.assertRaises(ValueError):
+            view.clear_axioms()
+
+    def test_concurrent_readers(self):
+        view = self.kb.snapshot()
+        answers = []
+        errors = []
+
+        def read():
+            try:
+                answers.extend(view.ask(self.cancer(person)).status for person in self.people)
+            except Exception as e:  # reported by the main thread
+                errors.append(e)
+
+        readers = [threading.Thread(target=read) for _ in range(4)]
+        for reader in readers:
+            reader.start()
+        for person in self.people:
+            self.kb.tell(self.smokes(person))
+        for reader in readers:
+            reader.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(answers, [Entailment.NOT_ENTAILED] * (4 * len(self.people)))
+        self.assertTrue(all(self.kb.ask(self.cancer(person)) for person in self.people))
+
+
+if __name__ == '__main__':
+    unittest.main()
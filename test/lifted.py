@@ -0,0 +1,90 @@
+import unittest
+
+import fol.fol_status as FOL
+from fol.axiom_store import AxiomStore, ConstantIndex
+from fol.backend.lifted import LiftedReasoner
+from fol.logic import *
+from test.fixtures import smoke_and_cancer
+
+
+class Partition(unittest.TestCase):
+
+    def setUp(self):
+        smoke_and_cancer(self, 'Lift', 10)
+        self.store = self.kb.axioms
+        self.q.constants = self.people[:5]
+
+    def test_classes(self):
+        people = self.people
+        for person in people[:3]:
+            self.store.append(self.smokes(person))
+        self.store.append(Not(self.smokes(people[3])))
+        self.store.append(self.friends(people[4], people[5]))
+        self.store.append(Forall(self.p, self.smokes(self.p) >> self.cancer(self.p)))
+        self.store.append(Forall(self.q, self.cancer(self.q) | self.cancer(people[9])))
+
+        reasoner = LiftedReasoner(self.store)
+        classes = reasoner.classes([self.cancer(people[8])])
+        # the facts, the binary facts, the domains, the constants named by the rules and the query split the people
+        self.assertEqual(sorted(classes, key=len), [(people[3],), (people[4],), (people[5],), (people[8],),
+                                                    (people[9],), (people[6], people[7]), people[:3]])
+
+    def test_witnesses(self):
+        self.smokes.use_storage('sparse')
+        x, y = (LogicalVariable(name, constants=self.people) for name in ('xLift', 'yLift'))
+        self.store.append(Exists(x, self.smokes(x)))
+        self.store.append(Exists(y, Not(self.smokes(y))))
+        reasoner = LiftedReasoner(self.store)
+
+        # a representative for every witness, one more for the negated query
+        entailed, countermodel, statistics = reasoner.entails(Forall(self.p, self.smokes(self.p)))
+        self.assertFalse(entailed)
+        self.assertEqual((statistics['classes'], statistics['representatives']), (1, 3))
+        self.assertEqual(sum(countermodel.values()), 1)
+        self.assertTrue(reasoner.entails(Exists(self.p, self.smokes(self.p)) &
+                                         Exists(self.p, Not(self.smokes(self.p))))[0])
+
+    def test_symmetry_breaking(self):
+        # the witness of w depends on p, the domain cannot be reduced
+        self.store.append(Forall(self.p, Exists(LogicalVariable('wLift', constants=self.people),
+                                                self.friends(self.p, self.p))))
+        self.assertIsNone(LiftedReasoner(self.store).entails(self.smokes(self.people[0])))
+
+        store = AxiomStore(ConstantIndex())
+        store.append(Forall(self.p, self.smokes(self.p)))
+        store.append(Forall(LogicalVariable('xOpenLift'), self.cancer(self.people[0])))
+        self.assertIsNone(LiftedReasoner(store).entails(self.smokes(self.people[0])))
+
+
+class LiftedAsk(unittest.TestCase):
+
+    def setUp(self):
+        smoke_and_cancer(self, 'LiftAsk', 30)
+
+    def test_same_answers(self):
+        p, q, people = self.p, self.q, self.people
+        for person in people[:4]:
+            FOL.tell(self.smokes(person))
+        FOL.tell(self.friends(people[0], people[10]))
+        FOL.tell(Forall(p, self.smokes(p) >> self.cancer(p)))
+        FOL.tell(Forall((p, q), (self.friends(p, q) & self.smokes(p)) >> self.smokes(q)))
+        FOL.tell(Exists(p, Not(self.cancer(p))))
+
+        queries = [self.cancer(people[10]), self.cancer(people[20]), Exists(p, self.cancer(p)),
+                   Forall(p, self.cancer(p)), Exists((p, q), Not(self.cancer(p)) & Not(self.cancer(q))),
+                   Exists(p, Forall(q, self.friends(q, p) | self.smokes(q)))]
+        expected = [FOL.ask(query).status for query in queries]
+
+        FOL.LIFTED_INFERENCE = True
+        answers = [FOL.ask(query) for query in queries]
+        self.assertEqual([answer.status for answer in answers], expected)
+        self.assertTrue(all(answer.statistics['lifted'] for answer in answers[:5]))
+        self.assertLess(answers[0].statistics['representatives'], 10)
+        self.assertNotIn('lifted', answers[5].statistics)  # in the negated query the witness of q depends on p
+
+        FOL.tell(self.friends(people[20], people[21]))
+        self.assertEqual(FOL.ask(self.cancer(people[21])).statistics['kb_version'], FOL.KB_VERSION)
+
+
+if __name__ == '__main__':
+    unittest.main()
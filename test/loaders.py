@@ -0,0 +1,138 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+import fol.fol_status as FOL
+from fol.loaders import load_csv, load_array
+from fol.logic import *
+from test.fixtures import smoke_and_cancer
+
+
+class BulkTell(unittest.TestCase):
+
+    def setUp(self):
+        smoke_and_cancer(self, 'Bulk', 4, {'smokes': 'sparse', 'friends': 'dense'})
+
+    def test_tell_many(self):
+        a, b, c, d = self.people
+        version = FOL.KB_VERSION
+        axioms = [self.smokes(a), Not(self.smokes(b)), self.friends(a, b), self.cancer(a),
+                  Forall(self.p, self.smokes(a) >> self.cancer(a)),
+                  self.smokes(a)]
+        self.assertEqual(FOL.tell_many(axioms, chunk_size=2), 5)
+        self.assertEqual(FOL.KB_VERSION, version + 1)
+
+        self.assertEqual(len(FOL.AXIOMS), 2)  # the tabled facts are not kept as formulas
+        self.assertIs(FOL.AXIOMS.get(self.smokes(b)), False)
+        self.assertIs(FOL.AXIOMS.get(self.friends(a, b)), True)
+        self.assertEqual(FOL.tell_many([]), 0)
+        self.assertTrue(FOL.ask(self.cancer(a)))
+
+    def test_tell_facts(self):
+        ids = [[FOL.constant_id(x), FOL.constant_id(y)] for x, y in zip(self.people, self.people[1:])]
+        self.assertEqual(FOL.tell_facts(self.friends, ids), 3)
+        self.assertEqual(FOL.tell_facts(self.friends, ids), 0)
+        self.assertIs(FOL.AXIOMS.get(self.friends(*self.people[:2])), True)
+
+        # a contradiction (even inside the batch) is kept as a formula
+        a, b = self.people[:2]
+        conflicting = [[FOL.constant_id(a)], [FOL.constant_id(b)], [FOL.constant_id(b)]]
+        self.assertEqual(FOL.tell_facts(self.smokes, conflicting, [True, False, True]), 3)
+        self.assertEqual(list(FOL.AXIOMS), [self.smokes(b)])
+        self.assertIs(FOL.AXIOMS.get(self.smokes(b)), False)
+
+    def test_predicates_without_storage(self):
+        a, b = self.people[:2]
+        FOL.tell(Not(self.cancer(a)))
+        ids = [[FOL.constant_id(a)], [FOL.constant_id(b)]]
+        self.assertEqual(FOL.tell_facts(self.cancer, ids, True), 2)  # b and the contradiction on a
+        self.assertEqual(self.cancer.truth_table.storage, 'sparse')
+        self.assertIs(FOL.AXIOMS.get(self.cancer(b)), True)
+        self.assertEqual(self.cancer.truth_table.count(), 2)
+        self.assertIn(Not(self.cancer(a)), FOL.AXIOMS)
+
+
+class Loaders(unittest.TestCase):
+
+    def setUp(self):
+        smoke_and_cancer(self, 'Loaded', 0, {'smokes': 'sparse', 'friends': 'dense'})
+        self.predicates = {'smokes': self.smokes, 'friends': self.friends}
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write(self, name: str, text: str) -> str:
+        path = os.path.join(self.directory.name, name)
+        with open(path, 'w') as file:
+            file.write(text)
+        return path
+
+    def test_csv(self):
+        path = self.write('facts.csv', 'predicate,arg1,arg2,truth\n'
+                                       'friends,Loadann,Loadbob,1\n'
+                                       'smokes,Loadann,,true\n'
+                                       '\n'
+                                       'smokes, Loadbob,,False\n'
+                                       'friends,Loadbob,Loadcid,0\n')
+        self.assertEqual(load_csv(path, self.predicates, header=True, chunk_size=3), 4)
+
+        ann, bob, cid = (LogicalConstant(name) for name in ('Loadann', 'Loadbob', 'Loadcid'))
+        self.assertIs(FOL.AXIOMS.get(self.friends(ann, bob)), True)
+        self.assertIs(FOL.AXIOMS.get(self.friends(bob, cid)), False)
+        self.assertIs(FOL.AXIOMS.get(self.smokes(bob)), False)
+        self.assertIs(FOL.CONSTANTS['Loadcid'], cid)
+        self.assertEqual(len(FOL.AXIOMS), 0)
+
+        # unary rows may omit the second argument
+        path = self.write('facts.tsv', 'smokes\tLoadcid\t1\nfriends\tLoadcid\tLoadann\tyes\n')
+        self.assertEqual(load_csv(path, self.predicates), 2)
+        self.assertIs(FOL.AXIOMS.get(self.friends(cid, ann)), True)
+
+        with self.assertRaises(ValueError):
+            load_csv(self.write('bad.csv', 'smokes,Loadann,,maybe\n'), self.predicates)
+        with self.assertRaises(ValueError):
+            load_csv(self.write('unknown.csv', 'drinks,Loadann,,1\n'), self.predicates)
+
+    def test_array(self):
+        names = ['Arr{}'.format(i) for i in range(50)]
+        rows = np.array([('friends', x, y, (i + j) % 2) for i, x in enumerate(names) for j, y in enumerate(names)],
+                        dtype=object)
+        path = os.path.join(self.directory.name, 'facts.npy')
+        np.save(path, rows.astype(str))
+
+        self.assertEqual(load_array(np.load(path, mmap_mode='r'), self.predicates, chunk_size=1000), 2500)
+        self.assertEqual(self.friends.truth_table.count(1), 1250)
+        self.assertIs(FOL.AXIOMS.get(self.friends(LogicalConstant('Arr0'), LogicalConstant('Arr1'))), True)
+
+        # numeric truth column
+        rows = np.array([('smokes', x, '', i % 2) for i, x in enumerate(names)], dtype=object)
+        self.assertEqual(load_array(rows, self.predicates), 50)
+        self.assertEqual(self.smokes.truth_table.count(1), 25)
+        self.assertEqual(len(FOL.AXIOMS), 0)
+
+        # only 0 and 1 are truth values
+        for value in (.5, -1, float('nan')):
+            with self.assertRaises(ValueError):
+                load_array(np.array([('smokes', 'Arr0', '', 1.), ('smokes', 'Arr1', '', value)], dtype=object),
+                           self.predicates)
+        self.assertIs(FOL.AXIOMS.get(self.smokes(LogicalConstant('Arr1'))), True)
+
+    def test_chunk_size(self):
+        class Rows(list):
+            def __getitem__(self, item):
+                sizes.append(item.stop - item.start)
+                return list.__getitem__(self, item)
+
+        sizes = []
+        rows = Rows([('smokes', 'Chunk{}'.format(i), '', 'true') for i in range(5)])
+        FOL.CHUNK_SIZE = 2  # read when loading
+        self.assertEqual(load_array(rows, self.predicates), 5)
+        self.assertEqual(sizes, [2, 2, 2])
+        self.assertIs(FOL.CONSTANTS['Chunk0'], LogicalConstant('Chunk0'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+import time
+import unittest
+
+from fol.backend.cnf import move_not_inwards
+from fol.logic import *
+
+
+class NaryConnectives(unittest.TestCase):
+
+    def setUp(self):
+        self.a, self.b, self.c, self.d = (LogicalConstant('Nary{}'.format(name)) for name in 'ABCD')
+
+    def test_flattening(self):
+        a, b, c, d = self.a, self.b, self.c, self.d
+        conjunction = a & b & c & d
+        self.assertEqual(conjunction.args, (a, b, c, d))
+        self.assertIs(a & (b & (c & d)), conjunction)
+        self.assertIs((a & b) & (c & d), conjunction)
+        self.assertIs(And.of([a, b, c, d]), conjunction)
+        self.assertIs(And(a, b, c, d), conjunction)
+        self.assertEqual(str(conjunction), 'Narya ∧ Naryb ∧ Naryc ∧ Naryd')
+
+        # different connectives are not merged and the order of the operands is kept
+        mixed = (a | b) & c
+        self.assertEqual(mixed.args, (a | b, c))
+        self.assertIsNot(b & a, a & b)
+
+    def test_duplicates_and_truth_values(self):
+        a, b = self.a, self.b
+        self.assertEqual((a & b & a & b).args, (a, b))
+        self.assertIs(a | a, a)
+        self.assertIs(a & TRUE, a)
+        self.assertIs(a & FALSE, FALSE)
+        self.assertIs(a | TRUE, TRUE)
+        self.assertIs(Or(a, FALSE, b), a | b)
+        self.assertIs(And.of([]), TRUE)
+        self.assertIs(Or.of([]), FALSE)
+        self.assertIs(And.of([a]), a)
+
+    def test_complementary_literals(self):
+        a, b, c = self.a, self.b, self.c
+        self.assertIs(a & b & Not(a), FALSE)
+        self.assertIs(Not(b) | c | b, TRUE)
+        self.assertIs(Or.of([a, Not(b), c, Not(a)]), TRUE)
+        self.assertIsNot(a & Not(b), FALSE)
+
+    def test_nnf(self):
+        a, b, c, d = self.a, self.b, self.c, self.d
+        self.assertIs(Not(a & b & c).to_nnf(), Not(a) | Not(b) | Not(c))
+        self.assertIs(move_not_inwards(Not(a | b | c)), Not(a) & Not(b) & Not(c))
+        # nested implications and disjunctions become a single disjunction
+        self.assertIs((a >> (b | (c >> d))).to_nnf(), Or(Not(a), b, Not(c), d))
+        self.assertIs(Not(a >> Not(b & c)).to_nnf(), And(a, b, c))
+
+    def test_chaining(self):
+        atoms = [LogicalConstant('NaryChain{}'.format(i)) for i in range(20000)]
+        start = time.perf_counter()
+        conjunction = atoms[0]
+        for atom in atoms[1:]:
+            conjunction = conjunction & atom
+        # quadratic in the Python operations it takes minutes
+        self.assertLess(time.perf_counter() - start, 15)
+
+        self.assertEqual(conjunction.args, tuple(atoms))
+        self.assertIs(And.of(atoms), conjunction)
+        self.assertEqual(hash(conjunction), conjunction._structural_hash())  # rolled while appending
+        chained = atoms[0]
+        for atom in atoms[1:]:
+            chained = chained & atom
+        self.assertIs(chained, conjunction)
+
+        self.assertIs(conjunction & atoms[7], conjunction)
+        self.assertIs(conjunction & Not(atoms[7]), FALSE)
+        self.assertIs(Or.of(map(Not, atoms[:100])) | atoms[99], TRUE)
+
+        # appending to a node which is not the longest of its chain
+        a, b, c = self.a, self.b, self.c
+        prefix = And.of(atoms[:3])
+        longer = prefix & a
+        other = prefix & b
+        self.assertEqual(other.args, (*atoms[:3], b))
+        self.assertIs(other & a, And.of(atoms[:3] + [b, a]))
+        self.assertIs(longer & b, And.of(atoms[:3] + [a, b]))
+        self.assertIs(prefix & c & a, And.of(atoms[:3] + [c, a]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,128 @@
+import os
+import pickle
+import threading
+import unittest
+
+import fol.fol_status as FOL
+from fol.fol_status import Entailment
+from fol.backend.cnf import CNFEncoder, UnboundVariableError
+from fol.backend.grounding import ground, ground_range
+from fol.backend.parallel import encode_parallel, _plan, _context
+from fol.backend.sat import Solver
+from fol.logic import *
+from fol.predicate import Predicate
+from test.fixtures import smoke_and_cancer
+
+
+def _shared_blocks():
+    return set(os.listdir('/dev/shm')) if os.path.isdir('/dev/shm') else set()
+
+
+class Pickling(unittest.TestCase):
+
+    def test_nodes_are_interned_again(self):
+        smokes = Predicate(name='SmokesPickled', number_of_arguments=1)
+        a, b = LogicalConstant('Pick0'), LogicalConstant('Pick1')
+        formula = (smokes(a) | Not(smokes(b))) & (TRUE >> smokes(a)) & \
+            EquivalenceLogicalExpression(smokes(a), smokes(b))
+        self.assertIs(pickle.loads(pickle.dumps(formula)), formula)
+
+        x = LogicalVariable('xPickled', constants=[a, b])
+        rule = Forall(x, smokes(x) >> smokes(a))
+        copy = pickle.loads(pickle.dumps(rule))
+        self.assertEqual(str(copy), str(rule))
+        self.assertEqual(copy.variables[0].constants, (a, b))
+        self.assertIs(copy.proposition.beta, smokes(a))
+
+
+class ParallelGrounding(unittest.TestCase):
+
+    def setUp(self):
+        smoke_and_cancer(self, 'Par', 12)
+        x, y = self.p, self.q
+        self.rules = [Forall((x, y), (self.friends(x, y) & self.smokes(x)) >> self.smokes(y)),
+                      Forall(x, self.smokes(x) >> self.cancer(x)),
+                      Exists(x, self.cancer(x) & self.friends(x, self.people[0]))]
+        # the friendship chain reaches the first half of the people
+        self.facts = [self.smokes(self.people[0])] + [self.friends(p, q) for p, q in zip(self.people[:6],
+                                                                                          self.people[1:6])]
+
+    def test_ground_range(self):
+        rule = self.rules[0]
+        store = self.kb.axioms
+        for fact in self.facts:
+            store.append(fact)
+
+        for facts in (None, store):
+            slices = [instance for start in range(0, 144, 50) for instance in ground_range(rule, start, start + 50,
+                                                                                          facts)]
+            self.assertEqual(slices, list(ground(rule, facts)))
+
+    def test_plan(self):
+        tasks = _plan(self.rules, split=50)
+        self.assertEqual([[(start, stop) for _, start, stop in task] for task in tasks],
+                         [[(0, 50)], [(50, 100)], [(100, 144), (0, 12)], [(None, None)]])
+
+    def test_same_models(self):
+        serial, parallel = CNFEncoder(), CNFEncoder()
+        for rule in self.rules:
+            for instance in ground(rule):
+                serial.encode(instance)
+
+        blocks = _shared_blocks()
+        clauses = encode_parallel(self.rules, parallel, workers=2, split=20)
+        self.assertEqual(_shared_blocks(), blocks)  # every block has been released
+        self.assertEqual(clauses, parallel.clause_set.clauses)
+        self.assertEqual({atom for atom, _ in serial.symbols.atoms()}, {atom for atom, _ in parallel.symbols.atoms()})
+
+        # the same queries are entailed by both encodings
+        for query in [self.cancer(self.people[5]), self.smokes(self.people[3]), Not(self.cancer(self.people[11]))]:
+            answers = []
+            for encoder in (serial, parallel):
+                solver = Solver()
+                solver.add_clauses(encoder.clause_set.clauses)
+                for fact in self.facts:
+                    solver.add_clause((encoder.symbols.literal(fact),))
+                answers.append(solver.solve(assumptions=(-encoder.symbols.literal(query),)))
+            self.assertEqual(answers[0], answers[1], query)
+
+    def test_ask(self):
+        for fact in self.facts + self.rules:
+            FOL.tell(fact)
+        expected = [FOL.ask(self.cancer(p)).status for p in self.people]
+        self.assertEqual(expected, [Entailment.ENTAILED] * 6 + [Entailment.NOT_ENTAILED] * 6)
+
+        FOL.GROUNDING_WORKERS = 2
+        FOL.clear_axioms()
+        for fact in self.facts + self.rules:
+            FOL.tell(fact)
+        self.assertEqual([FOL.ask(self.cancer(p)).status for p in self.people], expected)
+        self.assertEqual(FOL._INCREMENTAL.encoded_axioms, len(FOL.AXIOMS))
+
+    def test_threads(self):
+        store = self.kb.axioms
+        for fact in self.facts:
+            store.append(fact)
+        simplified = encode_parallel(self.rules, CNFEncoder(), store, workers=2, split=20)
+        unsimplified = encode_parallel(self.rules, CNFEncoder(), None, workers=2, split=20)
+        self.assertLess(len(simplified), len(unsimplified))
+
+        # with another thread running the workers are not forked, they do not inherit the facts
+        results = []
+        thread = threading.Thread(target=lambda: results.append(
+            (_context().get_start_method(), encode_parallel(self.rules, CNFEncoder(), store, workers=2, split=20))))
+        thread.start()
+        thread.join()
+        method, clauses = results[0]
+        self.assertNotEqual(method, 'fork')
+        self.assertEqual(len(clauses), len(unsimplified))
+
+    def test_errors(self):
+        z = LogicalVariable('zPar')
+        rules = self.rules + [Forall(z, self.smokes(z))]
+        with self.assertRaises(UnboundVariableError):
+            encode_parallel(rules, CNFEncoder(), workers=2, split=20)
+
+
+if __name__ == '__main__':
+    unittest.main()
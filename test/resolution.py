@@ -0,0 +1,189 @@
+import unittest
+
+import fol.fol_status as FOL
+from fol.backend.cnf import first_order_clauses
+from fol.backend.resolution import DiscriminationTree, ResolutionProver, unify, match, substitute, subsumes, \
+    UNIFIABLE, GENERALIZATIONS, INSTANCES
+from fol.logic import *
+from fol.predicate import Predicate
+from test.fixtures import smoke_and_cancer
+
+
+class Clauses(unittest.TestCase):
+
+    def setUp(self):
+        self.a, self.b = LogicalConstant('Res0'), LogicalConstant('Res1')
+        self.p = Predicate(name='PRes', number_of_arguments=1)
+        self.r = Predicate(name='RRes', number_of_arguments=2)
+        self.x, self.y = LogicalVariable('xRes'), LogicalVariable('yRes')
+
+    def test_skolemization(self):
+        x, y = self.x, self.y
+        [[(polarity, predicate, (var, skolem))]] = first_order_clauses(Forall(x, Exists(y, self.r(x, y))))
+        self.assertTrue(polarity)
+        self.assertIs(predicate, self.r)
+        self.assertEqual(var, 0)
+        self.assertEqual(skolem[1:], (0,))  # a function of the universal variable
+
+        # the existential variables out of any universal one become constants, different for every formula
+        [[first]], [[second]] = first_order_clauses(Not(Forall(x, self.p(x)))), first_order_clauses(Exists(x, self.p(x)))
+        self.assertFalse(first[0])
+        self.assertEqual(len(first[2][0]), 1)
+        self.assertNotEqual(first[2][0], second[2][0])
+
+    def test_closed_world_expansion(self):
+        d = LogicalVariable('dRes', constants=[self.a, self.b])
+        [clause] = first_order_clauses(Forall(self.x, self.p(self.x) >> Exists(d, self.r(self.x, d))))
+        self.assertEqual(clause, ((False, self.p, (0,)), (True, self.r, (0, self.a)), (True, self.r, (0, self.b))))
+
+        self.assertEqual(first_order_clauses(Forall(d, self.p(d))), [((True, self.p, (self.a,)),),
+                                                                    ((True, self.p, (self.b,)),)])
+        self.assertEqual(first_order_clauses(self.p(self.a) | Not(self.p(self.a))), [])  # tautology
+
+    def test_definitions(self):
+        atoms = [self.p(LogicalConstant('Res{}'.format(i))) for i in range(16)]
+        formula = OrLogicalExpression.of([atoms[i] & atoms[i + 1] for i in range(0, 16, 2)])
+        # 2^8 clauses when distributed, the conjunctions get a definitional predicate instead
+        self.assertLessEqual(len(first_order_clauses(formula)), 1 + 8 * 2)
+
+
+class Unification(unittest.TestCase):
+
+    def setUp(self):
+        self.a, self.b = LogicalConstant('Res0'), LogicalConstant('Res1')
+
+    def test_unify(self):
+        a, b = self.a, self.b
+        substitution = unify((0, ('f', 1)), (('f', a), 2))
+        self.assertEqual(substitute(0, substitution), ('f', a))
+        self.assertEqual(substitute(2, substitution), ('f', 1))
+
+        self.assertIsNone(unify((0,), (('f', 0),)))  # occurs check
+        self.assertIsNone(unify((a, 0), (b, 0)))
+        self.assertIsNone(unify((('f', 0),), (('g', 0),)))
+        self.assertEqual(substitute(1, unify((0, 1), (a, 0))), a)
+
+    def test_match(self):
+        a = self.a
+        self.assertEqual(match((0, 0), (a, a)), {0: a})
+        self.assertIsNone(match((0, 0), (a, 1)))
+        self.assertIsNone(match((a,), (0,)))  # the variables of the terms are not bound
+        self.assertEqual(match((('f', 0),), (('f', 0),)), {0: 0})
+
+    def test_deep_terms(self):
+        # the terms are walked without recursion
+        deep, other = self.a, 0
+        for _ in range(5000):
+            deep, other = ('f', deep), ('f', other)
+        substitution = unify((other,), (deep,))
+        self.assertIs(substitute(0, substitution), self.a)
+        self.assertIsNone(unify((0,), (('f', other),)))  # occurs check
+        p = Predicate(name='PRes', number_of_arguments=1)
+        self.assertTrue(subsumes(((True, p, (other,)),), ((True, p, (deep,)),)))
+
+    def test_subsumption(self):
+        p = Predicate(name='PRes', number_of_arguments=1)
+        a = self.a
+        self.assertTrue(subsumes(((True, p, (0,)),), ((True, p, (a,)), (False, p, (1,)))))
+        self.assertFalse(subsumes(((True, p, (a,)),), ((True, p, (0,)),)))
+        # a clause does not subsume its factors
+        self.assertFalse(subsumes(((True, p, (0,)), (True, p, (1,))), ((True, p, (0,)),)))
+
+
+class Indexing(unittest.TestCase):
+
+    def test_retrieval(self):
+        p = Predicate(name='PRes', number_of_arguments=2)
+        a, b = LogicalConstant('Res0'), LogicalConstant('Res1')
+        literals = {'general': (True, p, (0, 1)), 'ground': (True, p, (a, ('f', b))),
+                    'skolem': (True, p, (0, ('f', 0))), 'other': (True, p, (b, a)), 'negative': (False, p, (a, a))}
+        tree = DiscriminationTree()
+        for name, literal in literals.items():
+            tree.insert(literal, name)
+        self.assertEqual(len(tree), 5)
+
+        self.assertEqual(set(tree.retrieve((True, p, (a, 0)), UNIFIABLE)), {'general', 'ground', 'skolem'})
+        self.assertEqual(set(tree.retrieve((True, p, (a, ('f', b))), GENERALIZATIONS)),
+                         {'general', 'ground', 'skolem'})
+        self.assertEqual(set(tree.retrieve((True, p, (0, ('f', 1))), INSTANCES)), {'ground', 'skolem'})
+
+        tree.remove(literals['ground'], 'ground')
+        self.assertEqual(set(tree.retrieve((True, p, (a, ('f', b))), GENERALIZATIONS)), {'general', 'skolem'})
+        self.assertEqual(len(tree), 4)
+
+
+class Proving(unittest.TestCase):
+
+    def setUp(self):
+        smoke_and_cancer(self, 'Prover', 6)
+        self.x, self.y, self.z = (LogicalVariable(name) for name in ('xProver', 'yProver', 'zProver'))
+
+    def test_saturation(self):
+        x, y, z = self.x, self.y, self.z
+        store = self.kb.axioms
+        for a, b in zip(self.people, self.people[1:]):
+            store.append(self.friends(a, b))
+        store.append(Forall((x, y, z), (self.friends(x, y) & self.friends(y, z)) >> self.friends(x, z)))
+
+        prover = ResolutionProver(store)
+        self.assertIs(prover.prove(self.friends(self.people[5], self.people[0])), False)
+        active = len(prover)  # the saturated axioms are kept
+        self.assertIs(prover.prove(self.friends(self.people[0], self.people[5])), True)
+        self.assertEqual(prover.statistics['given_clauses'], 1)  # the negated query against the closure
+        self.assertEqual(len(prover), active)  # the clauses derived from the query have been retracted
+        self.assertIs(prover.prove(Exists(y, self.friends(self.people[5], y))), False)
+
+        store.append(Forall(x, Exists(y, self.friends(x, y))))
+        self.assertIs(prover.prove(Exists(y, self.friends(self.people[5], y))), True)
+        # the Skolem function generates longer and longer chains
+        self.assertIsNone(prover.prove(Exists(y, self.friends(y, y)), max_given=50))
+
+    def test_truth_tensors(self):
+        self.smokes.use_storage('sparse')
+        store = self.kb.axioms
+        store.append_facts(self.smokes, store.constants.ids(self.people[:3]), True)
+        prover = ResolutionProver(store)
+        self.assertEqual(prover.update(), 0)  # the facts are read once some axiom or query mentions them
+
+        store.append(Forall(self.x, self.smokes(self.x) >> self.cancer(self.x)))
+        self.assertTrue(prover.prove(self.cancer(self.people[2])))
+        store.append_facts(self.smokes, store.constants.ids(self.people[3:4]), True)
+        self.assertTrue(prover.prove(self.cancer(self.people[3])))
+        self.assertIs(prover.prove(self.cancer(self.people[4])), False)
+
+
+class AskByResolution(unittest.TestCase):
+
+    def setUp(self):
+        smoke_and_cancer(self, 'AskRes', 3)
+        self.x = LogicalVariable('xAskRes')
+
+    def test_ask(self):
+        a, b, _ = self.people
+        FOL.tell(Forall(self.x, self.smokes(self.x) >> self.cancer(self.x)))
+        FOL.tell(self.smokes(a))
+
+        answer = FOL.ask(self.cancer(a))
+        self.assertIs(answer.status, FOL.Entailment.ENTAILED)
+        self.assertTrue(answer.statistics['resolution'])
+        self.assertEqual(answer.statistics['kb_version'], FOL.KB_VERSION)
+        self.assertIs(FOL.ask(self.cancer(b)).status, FOL.Entailment.NOT_ENTAILED)
+
+        FOL.tell(self.smokes(b))
+        self.assertTrue(FOL.ask(self.cancer(b)))
+        self.assertTrue(FOL.ask(Forall(self.x, Not(self.smokes(self.x)) | self.cancer(self.x))))
+
+    def test_term_depth(self):
+        # every smoker has a smoking friend: the Skolem terms nest without bound
+        y = LogicalVariable('yAskRes')
+        FOL.tell(self.smokes(self.people[0]))
+        FOL.tell(Forall(self.x, self.smokes(self.x) >> Exists(y, self.friends(self.x, y) & self.smokes(y))))
+
+        answer = FOL.ask(self.cancer(self.people[0]))
+        self.assertIs(answer.status, FOL.Entailment.UNKNOWN)
+        self.assertGreater(answer.statistics['truncated_clauses'], 0)
+        self.assertTrue(FOL.ask(Exists(y, self.friends(self.people[0], y))))
+
+
+if __name__ == '__main__':
+    unittest.main()
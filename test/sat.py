@@ -0,0 +1,72 @@
+import itertools
+import random
+import unittest
+
+from fol.backend.sat import Solver, luby
+
+
+def brute_force(n, clauses):
+    return any(all(any((lit > 0) == bits[abs(lit) - 1] for lit in clause) for clause in clauses)
+               for bits in itertools.product((False, True), repeat=n))
+
+
+def pigeonhole(pigeons, holes):
+    var = lambda i, j: i * holes + j + 1
+    clauses = [[var(i, j) for j in range(holes)] for i in range(pigeons)]
+    for j in range(holes):
+        for i, k in itertools.combinations(range(pigeons), 2):
+            clauses.append([-var(i, j), -var(k, j)])
+    return clauses
+
+
+class CDCL(unittest.TestCase):
+
+    def test_luby(self):
+        self.assertEqual([luby(i) for i in range(15)], [1, 1, 2, 1, 1, 2, 4, 1, 1, 2, 1, 1, 2, 4, 8])
+
+    def test_random_formulas(self):
+        rnd = random.Random(7)
+        for _ in range(200):
+            n = rnd.randint(3, 10)
+            clauses = [[rnd.choice((1, -1)) * rnd.randint(1, n) for _ in range(rnd.randint(1, 4))]
+                       for _ in range(rnd.randint(1, 50))]
+
+            solver = Solver(restart_base=3)
+            status = solver.add_clauses(clauses) and solver.solve()
+            self.assertEqual(status, brute_force(n, clauses))
+            if status:
+                self.assertTrue(all(any((lit > 0) == solver.model[abs(lit)] for lit in clause)
+                                    for clause in clauses))
+
+    def test_incremental_with_assumptions(self):
+        rnd = random.Random(11)
+        for _ in range(50):
+            n = 8
+            clauses = [[rnd.choice((1, -1)) * rnd.randint(1, n) for _ in range(3)] for _ in range(20)]
+            solver = Solver(restart_base=3)
+            solver.add_clauses(clauses)
+
+            for _ in range(5):
+                assumptions = [rnd.choice((1, -1)) * rnd.randint(1, n) for _ in range(2)]
+                self.assertEqual(bool(solver.solve(assumptions)),
+                                 brute_force(n, clauses + [[lit] for lit in assumptions]))
+
+                clause = [rnd.choice((1, -1)) * rnd.randint(1, n) for _ in range(3)]
+                clauses.append(clause)
+                solver.add_clause(clause)
+                self.assertEqual(bool(solver.solve()), brute_force(n, clauses))
+
+    def test_pigeonhole(self):
+        solver = Solver()
+        solver.add_clauses(pigeonhole(6, 5))
+        self.assertFalse(solver.solve())
+        self.assertGreater(solver.stats['learnt'], 0)
+
+    def test_conflict_limit(self):
+        solver = Solver()
+        solver.add_clauses(pigeonhole(9, 8))
+        self.assertIsNone(solver.solve(conflict_limit=10))
+
+
+if __name__ == '__main__':
+    unittest.main()
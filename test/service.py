@@ -0,0 +1,119 @@
+import asyncio
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from fol.backend.cnf import UnboundVariableError
+from fol.knowledge_base import KnowledgeBase, Entailment
+from fol.logic import *
+from fol.service import QueryService, ASK
+
+
+class Batching(unittest.TestCase):
+
+    def setUp(self):
+        self.kb = KnowledgeBase()
+        self.people = tuple(self.kb.constant('Serv{}'.format(i)) for i in range(6))
+        self.smokes = self.kb.predicate('SmokesServ', 1)
+        self.cancer = self.kb.predicate('CancerServ', 1)
+        self.p = self.kb.variable('pServ', constants=self.people)
+        self.kb.tell(Forall(self.p, self.smokes(self.p) >> self.cancer(self.p)))
+        for person in self.people[:3]:
+            self.kb.tell(self.smokes(person))
+
+    def test_ask(self):
+        queries = [self.cancer(person) for person in self.people] * 2
+
+        async def client():
+            return await asyncio.gather(*(self.kb.ask_async(query) for query in queries))
+
+        answers = asyncio.run(client())
+        self.assertEqual([answer.status for answer in answers],
+                         [self.kb.ask(query).status for query in queries])
+        self.assertIs(answers[0], answers[len(self.people)])  # answered once
+
+        metrics = self.kb.service().metrics()
+        self.assertEqual(metrics['queries'], len(queries))
+        self.assertEqual(metrics['batches'], 1)
+        self.assertEqual(metrics['mean_batch_size'], len(queries))
+        self.assertEqual(metrics['max_queue_depth'], len(queries))
+        self.assertEqual(metrics['queue_depth'], 0)
+
+    def test_window(self):
+        executor = ThreadPoolExecutor(2)
+        self.addCleanup(executor.shutdown)
+        service = QueryService(self.kb, window=.001, max_batch_size=4, executor=executor)
+        queries = [self.cancer(person) for person in self.people] + [self.smokes(person) for person in self.people]
+
+        async def client():
+            answers = []
+            for i in range(0, len(queries), 3):
+                answers += await asyncio.gather(*(service.ask(query) for query in queries[i:i + 3]))
+            degrees = await asyncio.gather(service.satisfaction(Forall(self.p, self.smokes(self.p))),
+                                           service.satisfaction(Forall(self.p, self.smokes(self.p)), unknown=1.))
+            return answers, degrees
+
+        answers, degrees = asyncio.run(client())
+        self.assertEqual([answer.status for answer in answers],
+                         [Entailment.ENTAILED] * 3 + [Entailment.NOT_ENTAILED] * 3 +
+                         [Entailment.ENTAILED] * 3 + [Entailment.NOT_ENTAILED] * 3)
+        self.assertAlmostEqual(degrees[0], self.kb.satisfaction(Forall(self.p, self.smokes(self.p))))
+        self.assertEqual(degrees[1], 1.)
+        self.assertEqual(service.batch_sizes, {3: 4, 2: 1})
+
+    def test_backpressure(self):
+        service = QueryService(self.kb, window=0., max_batch_size=8)
+        queries = [self.cancer(person) for person in self.people] * 4
+
+        async def client():
+            return await asyncio.gather(*(service.ask(query) for query in queries))
+
+        answers = asyncio.run(client())
+        self.assertEqual(len(answers), len(queries))
+        # every batch holds the queries arrived while the previous one was running
+        self.assertEqual(sum(size * count for size, count in service.batch_sizes.items()), len(queries))
+        self.assertLessEqual(max(service.batch_sizes), 8)
+
+    def test_errors(self):
+        x = LogicalVariable('xServ')
+        queries = [self.smokes(self.people[0]), self.smokes(x), Forall(self.p, self.smokes(self.p))]
+
+        async def client():
+            return await asyncio.gather(self.kb.ask_async(self.cancer(self.people[0])),
+                                        *(self.kb.satisfaction_async(query) for query in queries),
+                                        return_exceptions=True)
+
+        answer, true, error, degree = asyncio.run(client())
+        self.assertTrue(answer)
+        self.assertEqual(true, 1.)
+        self.assertIsInstance(error, UnboundVariableError)  # only the failing query of the batch
+        self.assertAlmostEqual(degree, self.kb.satisfaction(queries[2]))
+        self.assertEqual(self.kb.service().queue_depth, 0)
+
+        degrees = self.kb.satisfaction_many(queries, return_exceptions=True)
+        self.assertEqual(degrees[0], 1.)
+        self.assertIsInstance(degrees[1], UnboundVariableError)
+        with self.assertRaises(UnboundVariableError):
+            self.kb.satisfaction_many(queries)
+
+    def test_loops(self):
+        executor = ThreadPoolExecutor(1)
+        self.addCleanup(executor.shutdown)
+        service = QueryService(self.kb, window=0., max_batch_size=1, executor=executor)
+
+        async def submit():
+            return service.submit(ASK, self.cancer(self.people[0]), (None,))
+
+        # the loop is closed before the batch is resolved
+        loop = asyncio.new_event_loop()
+        loop.run_until_complete(submit())
+        loop.close()
+        self.assertEqual(service.queue_depth, 1)
+
+        answer = asyncio.run(asyncio.wait_for(service.ask(self.cancer(self.people[1])), 10))
+        self.assertTrue(answer)
+        self.assertEqual(service.queue_depth, 0)
+        self.assertEqual(service.statistics['batches'], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
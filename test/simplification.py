@@ -0,0 +1,106 @@
+import unittest
+
+import fol.fol_status as FOL
+from fol.backend.simplification import Simplifier
+from fol.logic import *
+from fol.predicate import Predicate
+from test.fixtures import smoke_and_cancer
+
+
+class Simplification(unittest.TestCase):
+
+    def setUp(self):
+        smoke_and_cancer(self, 'Simp', 4)
+        self.store = self.kb.axioms
+        self.treated = Predicate(name='TreatedSimp', number_of_arguments=1)
+
+    def test_residuals(self):
+        a, b, c, d = self.people
+        self.store.append(self.smokes(a))
+        self.store.append(Not(self.cancer(b)))
+        self.store.append(Forall(self.p, self.smokes(self.p) >> self.cancer(self.p)))
+
+        simplifier = Simplifier(self.store)
+        self.assertEqual(simplifier.update(), 2)  # the instances of c and d
+        self.assertEqual(simplifier.units, {self.cancer(a): True, self.smokes(b): False})
+        self.assertEqual(len(self.store), 3)  # the derived facts are not told
+
+        # the units derived by a later axiom propagate into the earlier residuals
+        self.store.append(Forall(self.p, self.cancer(self.p) >> self.treated(self.p)))
+        self.store.append(self.treated(c) >> self.smokes(c))
+        self.store.append(Not(self.treated(d)))
+        self.assertEqual(simplifier.update(), 3)  # the cycle of c
+        self.assertIs(simplifier.get(self.cancer(d)), False)
+        self.assertIs(simplifier.get(self.smokes(d)), False)
+        self.assertIs(simplifier.get(self.treated(a)), True)
+
+        self.store.append(self.smokes(c))
+        self.assertEqual(simplifier.update(), 0)
+        self.assertIs(simplifier.get(self.treated(c)), True)
+        self.assertFalse(simplifier.inconsistent)
+
+        self.store.append(Not(self.treated(a)))
+        simplifier.update()
+        self.assertTrue(simplifier.inconsistent)
+
+    def test_truth_tensors(self):
+        self.smokes.use_storage('sparse')
+        self.store.append(Forall(self.p, self.smokes(self.p) >> self.cancer(self.p)))
+        simplifier = Simplifier(self.store)
+        self.assertEqual(simplifier.update(), 4)
+
+        self.store.append_facts(self.smokes, self.store.constants.ids(self.people[:2]), True)
+        self.assertEqual(simplifier.update(), 2)
+        self.assertIs(simplifier.get(self.cancer(self.people[1])), True)
+
+    def test_open_world(self):
+        self.store.append(Forall(LogicalVariable('xSimp'), self.smokes(self.people[0])))
+        simplifier = Simplifier(self.store)
+        self.assertEqual(simplifier.update(), 0)
+        self.assertEqual(len(simplifier.unground), 1)
+
+
+class SimplifiedAsk(unittest.TestCase):
+
+    def setUp(self):
+        smoke_and_cancer(self, 'SimpAsk', 20)
+
+    def _tell(self):
+        p, q, people = self.p, self.q, self.people
+        for person in people[:10]:
+            FOL.tell(Not(self.cancer(person)))
+        FOL.tell(self.friends(people[10], people[11]))
+        FOL.tell(Forall(p, self.smokes(p) >> self.cancer(p)))
+        FOL.tell(Forall((p, q), (self.friends(p, q) & self.smokes(p)) >> self.smokes(q)))
+
+    def test_same_answers(self):
+        people = self.people
+        queries = [Not(self.smokes(people[3])), self.cancer(people[11]), self.smokes(people[12]),
+                   Forall(self.p, Not(self.cancer(self.p)) >> Not(self.smokes(self.p)))]
+
+        self._tell()
+        FOL.tell(self.smokes(people[10]))
+        expected = [FOL.ask(query).status for query in queries]
+
+        FOL.clear_axioms()
+        FOL.TELL_SIMPLIFICATION = True
+        self._tell()
+        answers = [FOL.ask(query) for query in queries[:1]]
+        FOL.tell(self.smokes(people[10]))  # re-simplifies the residuals mentioning it
+        answers += [FOL.ask(query) for query in queries[1:]]
+
+        self.assertEqual([answer.status for answer in answers], expected)
+        # of the 20 + 400 instances the ones of the first 10 people (who do not smoke) are satisfied
+        self.assertLess(answers[-1].statistics['residual_constraints'], (20 + 400) // 2)
+        self.assertIs(FOL._simplifier().get(self.cancer(people[11])), True)
+
+    def test_open_world(self):
+        FOL.TELL_SIMPLIFICATION = True
+        x = LogicalVariable('xSimpAsk')
+        FOL.tell(Forall(x, self.smokes(x) >> self.cancer(x)))
+        FOL.tell(self.smokes(self.people[0]))
+        self.assertTrue(FOL.ask(self.cancer(self.people[0])).statistics['resolution'])
+
+
+if __name__ == '__main__':
+    unittest.main()
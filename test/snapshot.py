@@ -0,0 +1,159 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+import fol.fol_status as FOL
+from fol import snapshot
+from fol.knowledge_base import KnowledgeBase
+from fol.logic import *
+from fol.predicate import Predicate
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class Snapshot(unittest.TestCase):
+
+    def setUp(self):
+        FOL.clear_axioms()
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'kb.bin')
+
+        self.people = tuple(LogicalConstant('Snap{}'.format(i)) for i in range(4))
+        for person in self.people:
+            FOL.CONSTANT_IDS.id(person)
+        self.smokes = FOL.PREDICATES['SmokesSnap'] = Predicate(name='SmokesSnap', number_of_arguments=1,
+                                                                storage='sparse')
+        self.friends = FOL.PREDICATES['FriendsSnap'] = Predicate(name='FriendsSnap', number_of_arguments=2,
+                                                                  storage='dense')
+        self.cancer = FOL.PREDICATES['CancerSnap'] = Predicate(name='CancerSnap', number_of_arguments=1)
+        self.p = FOL.VARIABLES['pSnap'] = LogicalVariable('pSnap', constants=self.people)
+        self.q = LogicalVariable('qSnap', constants=self.people[:2])
+
+        a, b = self.people[:2]
+        self.rule = Forall(self.p, self.smokes(self.p) >> self.cancer(self.p))
+        FOL.tell_many([self.smokes(a), Not(self.smokes(b)), self.friends(a, b), self.cancer(b), self.rule,
+                       Exists(self.q, self.friends(self.q, a) | Not(self.smokes(self.q)))])
+
+    def tearDown(self):
+        FOL.clear_axioms()
+        for name in ('SmokesSnap', 'FriendsSnap', 'CancerSnap'):
+            FOL.PREDICATES.pop(name, None)
+        FOL.VARIABLES.pop('pSnap', None)
+        self.directory.cleanup()
+
+    def test_round_trip(self):
+        axioms = list(FOL.AXIOMS)
+        snapshot.save(self.path)
+
+        FOL.clear_axioms()
+        self.assertFalse(FOL.ask(self.cancer(self.people[0])))
+        loaded = snapshot.load(self.path)
+
+        # the registered symbols are reused, the other variables are built again
+        self.assertEqual(list(map(str, FOL.AXIOMS)), list(map(str, axioms)))
+        self.assertIs(FOL.AXIOMS[1], self.rule)
+        self.assertIsNot(FOL.AXIOMS[2].variables[0], self.q)
+        self.assertIs(FOL.AXIOMS.get(self.friends(*self.people[:2])), True)
+        self.assertIs(FOL.AXIOMS.get(self.smokes(self.people[1])), False)
+        self.assertTrue(FOL.ask(self.cancer(self.people[0])))
+        self.assertEqual(loaded.load(), 0)
+
+    def test_incremental(self):
+        saved = snapshot.save(self.path)
+        size = os.path.getsize(self.path)
+        c, d = self.people[2:]
+
+        FOL.tell_many([self.smokes(c), self.friends(c, d), Forall(self.q, self.cancer(self.q))])
+        self.p.constants = self.people[:3]
+        self.assertGreater(saved.save(), 0)
+        self.assertGreater(os.path.getsize(self.path), size)
+        axioms = list(FOL.AXIOMS)
+
+        FOL.clear_axioms()
+        self.p.constants = self.people
+        follower = snapshot.Snapshot(self.path)
+        self.assertEqual(follower.load(), 2)
+        self.assertEqual(list(map(str, FOL.AXIOMS)), list(map(str, axioms)))
+        self.assertEqual(self.p.constants, self.people[:3])
+        self.assertIs(FOL.AXIOMS.get(self.friends(c, d)), True)
+
+        # the follower appends the later changes
+        FOL.tell(self.cancer(d))
+        follower.save()
+        FOL.clear_axioms()
+        snapshot.load(self.path)
+        self.assertIs(FOL.AXIOMS.get(self.cancer(d)), True)
+
+        with self.assertRaises(ValueError):
+            snapshot.Snapshot(self.path).save()  # not loaded
+
+    def test_fresh_process(self):
+        snapshot.save(self.path)
+        script = '''
+import json, logging, mmap, sys
+logging.disable(logging.CRITICAL)
+import fol.fol_status as FOL
+from fol import snapshot
+from fol.logic import LogicalConstant
+
+snapshot.load(sys.argv[1])
+smokes, friends = FOL.PREDICATES['SmokesSnap'], FOL.PREDICATES['FriendsSnap']
+a, b = LogicalConstant('Snap0'), LogicalConstant('Snap1')
+
+def mapped(array):
+    while array is not None and not isinstance(array, mmap.mmap):
+        array = array.obj if isinstance(array, memoryview) else array.base
+    return array is not None
+
+print(json.dumps({
+    'axioms': [str(axiom) for axiom in FOL.AXIOMS],
+    'friends': FOL.AXIOMS.get(friends(a, b)),
+    'mapped': [mapped(smokes.truth_table.arrays()['keys']), mapped(friends.truth_table.arrays()['dense'])],
+    'entailed': bool(FOL.ask(FOL.PREDICATES['CancerSnap'](a))),
+}))
+'''
+        output = subprocess.run([sys.executable, '-c', script, self.path], cwd=ROOT, check=True,
+                                stdout=subprocess.PIPE, env=dict(os.environ, PYTHONPATH=ROOT)).stdout
+        report = json.loads(output.decode().splitlines()[-1])
+
+        self.assertEqual(report['axioms'], [str(axiom) for axiom in FOL.AXIOMS])
+        self.assertTrue(report['friends'])
+        self.assertEqual(report['mapped'], [True, True])  # zero copy views of the file
+        self.assertTrue(report['entailed'])
+
+    def test_knowledge_base(self):
+        snapshot.save(self.path)
+
+        kb = KnowledgeBase()
+        loaded = snapshot.load(self.path, kb)
+        self.assertIs(loaded.kb, kb)
+        self.assertEqual(list(map(str, kb.axioms)), list(map(str, FOL.AXIOMS)))
+        self.assertEqual(kb.version, 1)
+        self.assertIsNot(kb.predicates['CancerSnap'], self.cancer)  # the symbols of the other knowledge base
+        self.assertTrue(kb.ask(kb.predicates['CancerSnap'](self.people[0])))
+
+        # the ids of the constants differ: nothing is loaded
+        other = KnowledgeBase()
+        other.constant('Snap1')
+        version = other.version
+        with self.assertRaises(ValueError):
+            snapshot.load(self.path, other)
+        self.assertEqual(len(other.constant_ids), 1)
+        self.assertEqual(len(other.axioms), 0)
+        self.assertEqual(other.version, version)
+
+        with self.assertRaises(ValueError):
+            snapshot.load(self.path, kb.snapshot())  # read only
+
+    def test_not_a_snapshot(self):
+        with open(self.path, 'wb') as file:
+            file.write(b'not a snapshot at all')
+        with self.assertRaises(ValueError):
+            snapshot.load(self.path)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import json
+import os
+import subprocess
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# run in a fresh interpreter: `import fol` plus the knowledge base of the smoke and cancer example
+SCRIPT = '''
+import contextlib, io, json, logging, runpy, sys, time
+
+base = set(sys.modules)
+start = time.perf_counter()
+import fol
+with contextlib.redirect_stdout(io.StringIO()):
+    runpy.run_path('examples/smoke_and_cancer.py')
+elapsed = time.perf_counter() - start
+
+logging.disable(logging.CRITICAL)
+import fol.fol_status as FOL
+print(json.dumps({'elapsed': elapsed, 'modules': sorted(set(sys.modules) - base), 'axioms': len(FOL.AXIOMS)}))
+'''
+
+# generous bounds catching an eager import of a heavy engine rather than measuring the machine
+TIME_BUDGET = 1.5
+MODULES_BUDGET = 60
+
+
+class Startup(unittest.TestCase):
+
+    def test_import_budget(self):
+        output = subprocess.run([sys.executable, '-c', SCRIPT], cwd=ROOT, check=True, stdout=subprocess.PIPE,
+                                stderr=subprocess.DEVNULL, env=dict(os.environ, PYTHONPATH=ROOT)).stdout
+        report = json.loads(output.decode().splitlines()[-1])
+
+        self.assertGreater(report['axioms'], 0)
+        self.assertLess(report['elapsed'], TIME_BUDGET)
+        self.assertLess(len(report['modules']), MODULES_BUDGET, report['modules'])
+        for module in ('numpy', 'fol.backend.sat', 'fol.backend.grounding', 'fol.backend.fuzzy'):
+            self.assertNotIn(module, report['modules'])
+
+    def test_lazy_attributes(self):
+        import fol
+        import fol.backend as backend
+
+        self.assertIs(fol.logic, sys.modules['fol.logic'])
+        self.assertIs(backend.sat, sys.modules['fol.backend.sat'])
+        with self.assertRaises(AttributeError):
+            getattr(backend, 'tensorflow')
+
+        backend.register_backend('lazy', 'fol.backend.missing')
+        try:
+            backend.use_backend('lazy')  # not imported until used
+            with self.assertRaises(ImportError):
+                backend.get_backend()
+        finally:
+            backend.use_backend('numpy')
+            del backend.BACKENDS['lazy']
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,137 @@
+import itertools
+import unittest
+
+import numpy as np
+
+from fol import cache
+from fol.axiom_store import AxiomStore, ConstantIndex
+from fol.backend.cnf import UnboundVariableError, replace_variable, expand_quantifiers
+from fol.backend.fuzzy import FuzzyEvaluator
+from fol.backend.grounding import ground, simplify
+from fol.backend.tape import compile_formula, free_variables, LOAD, AND, FORALL
+from fol.backend.vectorized import VectorizedEvaluator, K_TRUE, K_FALSE, K_UNKNOWN
+from fol.logic import *
+from fol.predicate import Predicate
+
+
+class Tape(unittest.TestCase):
+
+    def setUp(self):
+        self.people = tuple(LogicalConstant('Tape{}'.format(i)) for i in range(4))
+        self.p = LogicalVariable('p', constants=self.people)
+        self.q = LogicalVariable('q', constants=self.people)
+        self.r = LogicalVariable('r', constants=self.people)
+        self.likes = Predicate(name='LikesTape', number_of_arguments=2)
+        self.tall = Predicate(name='TallTape', number_of_arguments=1, storage='dense')
+
+        self.store = AxiomStore(ConstantIndex())
+        for i, (x, y) in enumerate(itertools.product(self.people, repeat=2)):
+            if i % 3:
+                self.store.append(self.likes(x, y) if i % 2 else Not(self.likes(x, y)))
+        for i, x in enumerate(self.people):
+            self.store.append(self.tall(x) if i % 2 else Not(self.tall(x)))
+
+    def test_program(self):
+        p, q = self.p, self.q
+        shared = self.likes(p, q)
+        formula = (shared & self.tall(q)) | (shared >> self.tall(self.people[0]))
+        program = compile_formula(formula)
+
+        self.assertEqual(program.variables, (p, q))
+        self.assertEqual(program.opcodes.tolist().count(LOAD), 3)  # the shared atom is loaded once
+        self.assertIn(AND, program.opcodes.tolist())
+        self.assertEqual(program.constants, (self.people[0],))
+        self.assertIs(compile_formula(formula), program)  # cached
+        self.assertIsNot(compile_formula(formula, (q, p)), program)
+        self.assertIn('LOAD LikesTape(p, q)', str(program))
+
+    def test_cache(self):
+        p, q = self.p, self.q
+        formula = Forall(q, self.likes(p, q) >> self.tall(q))
+        cache.clear_cache('program')
+        program = compile_formula(formula)
+        self.assertIs(compile_formula(formula, (p,)), program)
+        self.assertEqual(cache.cache_info('program')[:2], (1, 2))  # the quantifier compiles its sub program
+        self.assertNotIn('_programs', formula.__dict__)
+
+        # the quantified variables are checked again once their constants change
+        q.constants = None
+        with self.assertRaises(UnboundVariableError):
+            compile_formula(formula)
+        self.assertEqual(cache.cache_info('program').invalidations, 1)
+
+    def test_nested_quantifiers(self):
+        p, q, r = self.p, self.q, self.r
+        # the atoms on p alone are loaded once per binding of p, not per binding of q and r
+        formula = Forall(q, Exists(r, self.likes(p, r) & self.likes(r, q)) | self.tall(p)) & Exists(q, self.tall(q))
+        evaluator = VectorizedEvaluator(self.store)
+        values = compile_formula(formula).run([[i] for i in self.store.constants.ids(self.people)], evaluator)
+        self.assertEqual(values.shape, (len(self.people),))
+        for person, value in zip(self.people, values.tolist()):
+            expected = evaluator.truth(replace_variable(formula, p, person))
+            self.assertEqual(value, {True: K_TRUE, False: K_FALSE, None: K_UNKNOWN}[expected])
+
+    def test_free_variables(self):
+        p, q = self.p, self.q
+        self.assertEqual(free_variables(Forall(p, self.likes(p, q)) & self.tall(p)), (q, p))
+        with self.assertRaises(UnboundVariableError):
+            compile_formula(self.likes(p, q), (p,))
+        with self.assertRaises(UnboundVariableError):
+            compile_formula(Forall(LogicalVariable('open'), self.tall(p)))
+
+    def test_shared_sub_formulas(self):
+        p, q = self.p, self.q
+        # 2^26 paths from the root to the atoms, which are visited once per set of bound variables
+        formula = Exists(q, self.likes(p, q)) | self.tall(p)
+        for _ in range(26):
+            formula = formula >> formula
+        self.assertEqual(free_variables(formula), (p,))
+        self.assertEqual(compile_formula(formula).variables, (p,))
+
+    def test_agrees_with_substitution(self):
+        p, q, r = self.p, self.q, self.r
+        formulas = [
+            self.likes(p, q) == Not(self.likes(q, p)),
+            (self.tall(p) & self.tall(q)) >> self.likes(p, q),
+            Exists(r, self.likes(p, r) & self.likes(r, q)),
+            Forall(r, self.likes(p, r) | Not(self.tall(q))) | TRUE & FALSE,
+        ]
+        evaluator = VectorizedEvaluator(self.store)
+        bindings = list(itertools.product(self.people, repeat=2))
+        ids = [self.store.constants.ids(binding) for binding in bindings]
+
+        for formula in formulas:
+            program = compile_formula(formula, (p, q))
+            values = program.run(ids, evaluator)
+            for (x, y), value in zip(bindings, values.tolist()):
+                instance = replace_variable(replace_variable(formula, p, x), q, y)
+                expected = simplify(expand_quantifiers(instance), self.store)
+                expected = {TRUE: K_TRUE, FALSE: K_FALSE}.get(expected, K_UNKNOWN)
+                self.assertEqual(value, expected, '{} with {}, {}'.format(formula, x, y))
+
+            self.assertEqual(program.evaluate(bindings[5], evaluator), values[5])
+
+    def test_fuzzy_semantics(self):
+        p, q = self.p, self.q
+        evaluator = FuzzyEvaluator(self.store, 'godel', float('inf'), float('inf'))
+        formula = Forall(q, self.likes(p, q) >> self.tall(q))
+        program = compile_formula(formula)
+        self.assertEqual(program.opcodes.tolist()[-1], FORALL)
+
+        degrees = program.run([[i] for i in self.store.constants.ids(self.people)], evaluator)
+        kleene = program.run([[i] for i in self.store.constants.ids(self.people)], VectorizedEvaluator(self.store))
+        np.testing.assert_array_equal(degrees * 2, kleene)
+
+    def test_grounding_prunes_satisfied_bindings(self):
+        p, q = self.p, self.q
+        axiom = Forall((p, q), self.likes(p, q) >> self.tall(q))
+        pruned = list(ground(axiom, self.store))
+        expected = list(ground(axiom, dict((atom, value)
+                                           for predicate in (self.likes, self.tall)
+                                           for atom, value in self.store.facts(predicate))))
+        self.assertEqual(pruned, expected)
+        self.assertNotIn(TRUE, pruned)
+
+
+if __name__ == '__main__':
+    unittest.main()
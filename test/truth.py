@@ -0,0 +1,82 @@
+import unittest
+
+import numpy as np
+
+import fol.fol_status as FOL
+from fol.axiom_store import AxiomStore, ConstantIndex
+from fol.backend.truth import TruthTensor, STORAGES, TRUE_VALUE, FALSE_VALUE, UNKNOWN_VALUE
+from fol.logic import *
+from fol.predicate import Predicate
+
+
+class TruthTensors(unittest.TestCase):
+
+    def test_storages_agree(self):
+        rnd = np.random.RandomState(3)
+        ids = rnd.randint(0, 50, size=(500, 2))
+        values = rnd.randint(0, 2, size=500)
+
+        tables = [TruthTensor(2, storage) for storage in STORAGES]
+        for table in tables:
+            table.set(ids[:250], values[:250])
+            for row, value in zip(ids[250:], values[250:]):  # one at a time
+                table.set([row], value)
+
+        queries = rnd.randint(0, 60, size=(1000, 2))
+        dense, sparse = (table.get(queries) for table in tables)
+        np.testing.assert_array_equal(dense, sparse)
+        self.assertEqual(tables[0].count(), tables[1].count())
+        np.testing.assert_array_equal(tables[0].dense(60), tables[1].dense(60))
+
+        expected = {tuple(row): value for row, value in zip(ids.tolist(), values.tolist())}
+        self.assertEqual(dict(tables[1].items()), {key: bool(value) for key, value in expected.items()})
+        self.assertEqual(tables[0].value(55, 55), UNKNOWN_VALUE)
+
+    def test_journal(self):
+        table = TruthTensor(1, 'sparse')
+        table.set([[1], [2]], [TRUE_VALUE, FALSE_VALUE])
+        position = table.journal_size
+        table.set([[2], [3]], [FALSE_VALUE, TRUE_VALUE])  # the first write does not change anything
+
+        ids, values = table.changes_since(position)
+        self.assertEqual(ids.tolist(), [[3]])
+        self.assertEqual(values.tolist(), [TRUE_VALUE])
+
+    def test_axiom_store_backed_by_tensors(self):
+        people = tuple(LogicalConstant('Tensor{}'.format(i)) for i in range(3))
+        friends = Predicate(name='FriendsTensor', number_of_arguments=2, storage='sparse')
+        store = AxiomStore(ConstantIndex())
+
+        self.assertTrue(store.append(friends(people[0], people[1])))
+        self.assertFalse(store.append(friends(people[0], people[1])))
+        self.assertTrue(store.append(Not(friends(people[1], people[2]))))
+        self.assertEqual(len(store), 0)  # no formula is kept
+
+        self.assertTrue(store.get(friends(people[0], people[1])))
+        self.assertFalse(store.get(friends(people[1], people[2])))
+        self.assertIsNone(store.get(friends(people[2], people[1])))
+        self.assertIn(Not(friends(people[1], people[2])), store)
+
+        ids = [store.constants.ids(pair) for pair in [(people[0], people[1]), (people[2], people[1])]]
+        self.assertEqual(store.truth_values(friends, ids).tolist(), [TRUE_VALUE, UNKNOWN_VALUE])
+        self.assertEqual(len(list(store.facts(friends))), 2)
+
+    def test_ask_over_tensors(self):
+        FOL.clear_axioms()
+        people = tuple(LogicalConstant('Tensor{}'.format(i)) for i in range(3))
+        smokes = Predicate(name='SmokesTensor', number_of_arguments=1, storage='dense')
+        cancer = Predicate(name='CancerTensor', number_of_arguments=1)
+        p = LogicalVariable('p', constants=people)
+
+        FOL.tell(Forall(p, smokes(p) >> cancer(p)))
+        FOL.tell(smokes(people[0]))
+        self.assertTrue(FOL.ask(cancer(people[0])))
+        self.assertFalse(FOL.ask(cancer(people[1])))
+
+        FOL.tell(smokes(people[1]))
+        self.assertTrue(FOL.ask(cancer(people[1])))
+        FOL.clear_axioms()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+import itertools
+import unittest
+
+from fol.axiom_store import AxiomStore, ConstantIndex
+from fol.backend.cnf import UnboundVariableError, expand_quantifiers
+from fol.backend.grounding import simplify
+from fol.backend.vectorized import VectorizedEvaluator, evaluate, violations
+from fol.logic import *
+from fol.predicate import Predicate
+
+
+class VectorizedEvaluation(unittest.TestCase):
+
+    def setUp(self):
+        self.people = tuple(LogicalConstant('Vector{}'.format(i)) for i in range(4))
+        self.p = LogicalVariable('p', constants=self.people)
+        self.q = LogicalVariable('q', constants=self.people)
+
+    def test_symmetry_violations(self):
+        for storage in (None, 'dense', 'sparse'):
+            friends = Predicate(name='FriendsVector', number_of_arguments=2, storage=storage)
+            store = AxiomStore(ConstantIndex())
+            a, b, c, d = self.people
+            for x, y in itertools.product(self.people, repeat=2):
+                store.append(friends(x, y) if (x, y) in [(a, b), (b, a), (c, d)] else Not(friends(x, y)))
+
+            symmetric = Forall((self.p, self.q), friends(self.p, self.q) == friends(self.q, self.p))
+            self.assertFalse(evaluate(symmetric, store))
+            self.assertEqual(set(violations(symmetric, store)), {(c, d), (d, c)})
+            self.assertTrue(evaluate(Forall(self.p, Exists(self.q, friends(self.p, self.q) | friends(self.q, self.p))),
+                                     store))
+            self.assertFalse(evaluate(Forall(self.p, Exists(self.q, friends(self.p, self.q))), store))
+            self.assertTrue(evaluate(Exists(self.p, friends(self.p, b)), store))
+
+    def test_unknown_facts(self):
+        smokes = Predicate(name='SmokesVector', number_of_arguments=1, storage='sparse')
+        cancer = Predicate(name='CancerVector', number_of_arguments=1)
+        store = AxiomStore(ConstantIndex())
+        store.append(smokes(self.people[0]))
+        store.append(smokes(self.people[1]))
+        store.append(cancer(self.people[0]))
+        store.append(Not(cancer(self.people[1])))
+
+        rule = Forall(self.p, smokes(self.p) >> cancer(self.p))
+        self.assertFalse(evaluate(rule, store))
+        self.assertEqual(violations(rule, store), [(self.people[1],)])
+        self.assertEqual(violations(rule, store, include_unknown=True), [(person,) for person in self.people[1:]])
+
+        self.assertIsNone(evaluate(Forall(self.p, smokes(self.p)), store))
+        self.assertEqual(violations(Forall(self.p, cancer(self.p)), store, include_unknown=True),
+                         [(person,) for person in self.people[1:]])
+        self.assertTrue(evaluate(Exists(self.p, cancer(self.p)), store))
+        self.assertIsNone(evaluate(Exists(self.p, Not(smokes(self.p)) & cancer(self.p)), store))
+
+    def test_agrees_with_grounding(self):
+        likes = Predicate(name='LikesVector', number_of_arguments=2)
+        tall = Predicate(name='TallVector', number_of_arguments=1, storage='dense')
+        store = AxiomStore(ConstantIndex())
+        for i, (x, y) in enumerate(itertools.product(self.people, repeat=2)):
+            if i % 3:
+                store.append(likes(x, y) if i % 2 else Not(likes(x, y)))
+        for i, x in enumerate(self.people):
+            store.append(tall(x) if i % 2 else Not(tall(x)))
+
+        p, q = self.p, self.q
+        formulas = [
+            Forall(p, Exists(q, likes(p, q) >> tall(q))),
+            Exists(p, Forall(q, likes(p, q) | Not(tall(p)))),
+            Forall((p, q), (tall(p) & tall(q)) >> likes(p, q)),
+            Exists((p, q), likes(p, q) == Not(likes(q, p))),
+            Forall(p, tall(p) | tall(self.people[1])),
+        ]
+
+        evaluator = VectorizedEvaluator(store)
+        for formula in formulas:
+            expected = simplify(expand_quantifiers(formula), store)
+            expected = expected.value if type(expected) is TruthLogicalExpression else None
+            self.assertEqual(evaluator.truth(formula), expected, str(formula))
+
+    def test_open_world(self):
+        smokes = Predicate(name='SmokesOpenVector', number_of_arguments=1)
+        store = AxiomStore(ConstantIndex())
+        store.append(Not(smokes(self.people[0])))
+
+        x = LogicalVariable('x')  # not an empty domain
+        for quantifier in (Forall, Exists):
+            with self.assertRaises(UnboundVariableError):
+                evaluate(quantifier(x, smokes(x)), store)
+
+        nobody = LogicalVariable('nobody', constants=())
+        self.assertTrue(evaluate(Forall(nobody, smokes(nobody)), store))
+        self.assertFalse(evaluate(Exists(nobody, smokes(nobody)), store))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,157 @@
+import math
+import random
+import unittest
+from itertools import product
+
+import fol.fol_status as FOL
+from fol.axiom_store import AxiomStore, ConstantIndex
+from fol.backend.wmc import compile_cnf, WeightedModelCounter
+from fol.logic import *
+from test.fixtures import smoke_and_cancer
+
+
+def _models(clauses, number_of_variables):
+    for values in product((False, True), repeat=number_of_variables):
+        if all(any(values[abs(literal) - 1] == (literal > 0) for literal in clause) for clause in clauses):
+            yield values
+
+
+class Compilation(unittest.TestCase):
+
+    def setUp(self):
+        self.random = random.Random(7)
+
+    def _random_cnf(self, number_of_variables, number_of_clauses):
+        return [tuple(self.random.choice((1, -1)) * self.random.randint(1, number_of_variables)
+                      for _ in range(self.random.randint(1, 3))) for _ in range(number_of_clauses)]
+
+    def test_counts(self):
+        for _ in range(30):
+            n = self.random.randint(1, 10)
+            clauses = self._random_cnf(n, self.random.randint(0, 2 * n))
+            circuit = compile_cnf(clauses, n)
+            expected = sum(1 for _ in _models(clauses, n))
+            count = circuit.log_count([0.0] * (n + 1), [0.0] * (n + 1))
+            if expected:
+                self.assertAlmostEqual(math.exp(count), expected)
+            else:
+                self.assertEqual(count, -math.inf)
+
+        self.assertEqual(len(compile_cnf([(1,), (-1,)], 1)), 1)  # ⊥
+        self.assertAlmostEqual(math.exp(compile_cnf([], 3).log_count([0.0] * 4, [0.0] * 4)), 8)
+
+    def test_marginals(self):
+        for _ in range(30):
+            n = self.random.randint(1, 8)
+            clauses = self._random_cnf(n, self.random.randint(1, 2 * n))
+            positive = [0.0] + [self.random.uniform(-2, 2) for _ in range(n)]
+            negative = [0.0] + [self.random.uniform(-2, 2) for _ in range(n)]
+
+            weights = [math.exp(sum(positive[i + 1] if value else negative[i + 1] for i, value in enumerate(values)))
+                       for values in _models(clauses, n)]
+            models = list(_models(clauses, n))
+            if not models:
+                continue
+            total, counts, _ = compile_cnf(clauses, n).log_marginals(positive, negative)
+            self.assertAlmostEqual(total, math.log(sum(weights)))
+            for var in range(1, n + 1):
+                expected = sum(weight for weight, values in zip(weights, models) if values[var - 1]) / sum(weights)
+                self.assertAlmostEqual(math.exp(counts[var] - total), expected)
+
+    def test_components(self):
+        # independent chains are compiled once per component, the circuit stays linear in their number
+        clauses = [clause for i in range(0, 300, 3) for clause in ((-i - 1, i + 2), (-i - 2, i + 3))]
+        circuit = compile_cnf(clauses, 300)
+        self.assertAlmostEqual(circuit.log_count([0.0] * 301, [0.0] * 301), 100 * math.log(4))
+        self.assertLess(circuit.number_of_edges, 20 * 300)
+
+    def test_long_chain(self):
+        # the search nests deeper than the interpreter stack, the implication chain has n + 1 models
+        n = 1200
+        circuit = compile_cnf([(-i, i + 1) for i in range(1, n)], n)
+        self.assertAlmostEqual(circuit.log_count([0.0] * (n + 1), [0.0] * (n + 1)), math.log(n + 1))
+
+
+class MarkovLogic(unittest.TestCase):
+
+    def setUp(self):
+        smoke_and_cancer(self, 'Wmc', 3)
+
+    def _brute_force(self, rules, facts, query, evidence=()):
+        """
+        :return: P(query | evidence) summing the weights of the worlds over the atoms of the people
+        """
+        atoms = [self.smokes(a) for a in self.people] + [self.cancer(a) for a in self.people]
+        numerator = denominator = 0.0
+        for values in product((False, True), repeat=len(atoms)):
+            world = dict(zip(atoms, values))
+            if any(world[atom] != value for atom, value in facts + list(evidence)):
+                continue
+            weight = math.exp(sum(w * sum(rule(a, world) for a in self.people) for rule, w in rules))
+            denominator += weight
+            if query(world):
+                numerator += weight
+        return numerator / denominator
+
+    def test_smokers(self):
+        p, people = self.p, self.people
+        FOL.tell(self.smokes(people[0]))
+        FOL.tell_weighted(Forall(p, self.smokes(p) >> self.cancer(p)), 1.5)
+        FOL.tell_weighted(Forall(p, self.smokes(p)), -0.5)
+
+        rules = [(lambda a, world: not world[self.smokes(a)] or world[self.cancer(a)], 1.5),
+                 (lambda a, world: world[self.smokes(a)], -0.5)]
+        facts = [(self.smokes(people[0]), True)]
+        for a in people:
+            self.assertAlmostEqual(FOL.probability(self.cancer(a)),
+                                   self._brute_force(rules, facts, lambda world: world[self.cancer(a)]))
+
+        query = Exists(p, self.cancer(p) & Not(self.smokes(p)))
+        self.assertAlmostEqual(FOL.probability(query), self._brute_force(
+            rules, facts, lambda world: any(world[self.cancer(a)] and not world[self.smokes(a)] for a in people)))
+
+        evidence = Not(self.cancer(people[1]))
+        self.assertAlmostEqual(FOL.probability(self.smokes(people[1]), evidence), self._brute_force(
+            rules, facts, lambda world: world[self.smokes(people[1])], [(self.cancer(people[1]), False)]))
+
+        marginals = FOL.marginals(evidence)
+        self.assertEqual(marginals[self.smokes(people[0])], 1.0)
+        self.assertEqual(marginals[self.cancer(people[1])], 0.0)
+        self.assertAlmostEqual(marginals[self.cancer(people[2])], FOL.probability(self.cancer(people[2]), evidence))
+
+        self.assertEqual(FOL.probability(self.friends(people[0], people[1])), 0.5)  # in no axiom
+        self.assertEqual(FOL.probability(Not(self.smokes(people[0]))), 0.0)
+
+    def test_cached_per_version(self):
+        p, people = self.p, self.people
+        FOL.tell(Forall(p, self.smokes(p) >> self.cancer(p)))
+        FOL.tell_weighted(Forall(p, self.smokes(p)), 1.0)
+
+        # the worlds ¬s ¬c, ¬s c and s c of every person weight 1, 1 and e
+        self.assertAlmostEqual(FOL.probability(self.smokes(people[0])), math.e / (2 + math.e))
+        counter = FOL._weighted_counter()
+        circuit = counter.circuit
+        FOL.probability(self.cancer(people[1]))
+        self.assertIs(FOL._weighted_counter().circuit, circuit)
+
+        FOL.tell(Not(self.cancer(people[0])))
+        self.assertIsNot(FOL._weighted_counter(), counter)
+        self.assertEqual(FOL.probability(self.smokes(people[0])), 0.0)
+
+        FOL.tell(self.smokes(people[0]))
+        with self.assertRaises(ValueError):
+            FOL.probability(self.cancer(people[1]))
+
+    def test_truth_tensors(self):
+        self.smokes.use_storage('sparse')
+        store = AxiomStore(ConstantIndex())
+        store.append_facts(self.smokes, store.constants.ids(self.people[:2]), True)
+        store.append(Forall(self.p, self.smokes(self.p) >> self.cancer(self.p)))
+
+        counter = WeightedModelCounter(store)
+        self.assertEqual(math.exp(counter.log_probability(self.cancer(self.people[1]))), 1.0)
+        self.assertAlmostEqual(math.exp(counter.log_probability(self.cancer(self.people[2]))), 2 / 3)
+
+
+if __name__ == '__main__':
+    unittest.main()